@@ -124,8 +124,17 @@ def sigshutdown_handler(_signo, _stack_frame):
         except Exception as e:
             logger.error(f"Error shutting down Socket.IO server: {str(e)}")
     
-    # With immediate persistence, all data is already saved
-    logger.success('All data already persisted (immediate commits enabled).')
+    # Write out any watch updates still waiting in the write-behind queue
+    try:
+        datastore.write_behind.stop()
+        logger.success('All data persisted.')
+    except Exception as e:
+        logger.critical(f"CRITICAL: Failed to flush pending watch writes: {e}")
+
+    try:
+        datastore.search_index.stop()
+    except Exception as e:
+        logger.error(f"Error closing the search index: {e}")
 
     sys.exit()
 
@@ -15,13 +15,20 @@ class Search(Resource):
         tag_limit = request.args.get('tag', '').strip()
         from changedetectionio.strtobool import strtobool
         partial = bool(strtobool(request.args.get('partial', '0'))) if 'partial' in request.args else False
+        content = bool(strtobool(request.args.get('content', '0'))) if 'content' in request.args else False
 
         # Require a search query
         if not query:
             abort(400, message="Search query 'q' parameter is required")
 
-        # Use the search function from the datastore
-        matching_uuids = self.datastore.search_watches_for_url(query=query, tag_limit=tag_limit, partial=partial)
+        # Use the search function from the datastore, best match first
+        matching_uuids = self.datastore.search_watches_for_url(query=query, tag_limit=tag_limit, partial=partial, content=content)
+        total = len(matching_uuids)
+
+        page = request.args.get('page', type=int)
+        if page:
+            per_page = request.args.get('per_page', type=int) or 100
+            matching_uuids = matching_uuids[(page - 1) * per_page:page * per_page]
 
         # Build the response with watch details
         results = {}
@@ -36,4 +43,6 @@ class Search(Resource):
                 'viewed': watch.viewed
             }
 
+        if page:
+            return results, 200, {'X-Total-Count': str(total)}
         return results, 200
\ No newline at end of file
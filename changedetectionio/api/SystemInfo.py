@@ -31,10 +31,24 @@ class SystemInfo(Resource):
             if time_since_check - (5 * 60) > t:
                 overdue_watches.append(uuid)
         from changedetectionio import __version__ as main_version
+        from changedetectionio.content_fetchers.requests_session_pool import session_pool
+        from changedetectionio.dns_cache import dns_cache
+        from changedetectionio.model.snapshot_cache import snapshot_cache
+        from changedetectionio.model.blob_store import get_blob_store
+        from changedetectionio.gc_cleanup import memory_governor
+        from changedetectionio.conditional_requests import conditional_request_stats
+        blob_store = get_blob_store(self.datastore.datastore_path)
         return {
                    'queue_size': self.update_q.qsize(),
                    'overdue_watches': overdue_watches,
                    'uptime': round(time.time() - self.datastore.start_time, 2),
                    'watch_count': len(self.datastore.data.get('watching', {})),
+                   'requests_connection_pool': session_pool.get_stats(),
+                   'dns_cache': dns_cache.get_stats(),
+                   'watch_write_behind': self.datastore.write_behind.get_stats(),
+                   'snapshot_cache': snapshot_cache.get_stats(),
+                   'snapshot_dedup': blob_store.get_stats() if blob_store else None,
+                   'memory_governor': memory_governor.get_stats(),
+                   'conditional_requests': conditional_request_stats.get_stats(),
                    'version': main_version
                }, 200
\ No newline at end of file
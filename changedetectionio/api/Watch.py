@@ -104,6 +104,7 @@ class Watch(Resource):
         watch['last_changed'] = watch_obj.last_changed
         watch['viewed'] = watch_obj.viewed
         watch['link'] = watch_obj.link,
+        watch['conditional_requests'] = watch_obj.conditional_requests
 
         return watch
 
@@ -493,12 +494,37 @@ class CreateWatch(Resource):
         """List watches."""
         list = {}
 
+        tag_uuids = None
         tag_limit = request.args.get('tag', '').lower()
-        for uuid, watch in self.datastore.data['watching'].items():
-            # Watch tags by name (replace the other calls?)
-            tags = self.datastore.get_all_tags_for_watch(uuid=uuid)
-            if tag_limit and not any(v.get('title').lower() == tag_limit for k, v in tags.items()):
+        if tag_limit:
+            # Watch tags by name, the watches of those tags come from the tag index instead of checking every watch
+            tag_uuids = [k for k, v in self.datastore.data['settings']['application'].get('tags', {}).items()
+                         if v.get('title', '').lower() == tag_limit]
+
+        # Optional paging, the page is fetched already sorted from the watch index (see store/watch_index.py)
+        page = request.args.get('page', type=int)
+        if page:
+            per_page = request.args.get('per_page', type=int) or 100
+            total, uuids = self.datastore.watch_index.query(
+                sort_attribute=request.args.get('sort', 'last_changed'),
+                reverse=request.args.get('order', 'desc') == 'desc',
+                tag_uuids=tag_uuids,
+                skip=(page - 1) * per_page,
+                limit=per_page,
+            )
+        elif tag_uuids is not None:
+            members = set()
+            for tag_uuid in tag_uuids:
+                members |= self.datastore.watch_index.tag_members(tag_uuid)
+            uuids = [uuid for uuid in self.datastore.data['watching'].keys() if uuid in members]
+        else:
+            uuids = [*self.datastore.data['watching'].keys()]
+
+        for uuid in uuids:
+            watch = self.datastore.data['watching'].get(uuid)
+            if not watch:
                 continue
+            tags = self.datastore.get_all_tags_for_watch(uuid=uuid)
 
             list[uuid] = {
                 'last_changed': watch.last_changed,
@@ -567,4 +593,6 @@ class CreateWatch(Resource):
 
                 return {'status': f'OK, queueing {len(watches_to_queue)} watches in background'}, 202
 
+        if page:
+            return list, 200, {'X-Total-Count': str(total)}
         return list, 200
\ No newline at end of file
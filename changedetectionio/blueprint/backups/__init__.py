@@ -114,7 +114,8 @@ def construct_blueprint(datastore: ChangeDetectionStore):
             flash(gettext("Maximum number of backups reached, please remove some"), "error")
             return redirect(url_for('backups.create'))
 
-        # With immediate persistence, all data is already saved
+        # Make sure watch updates still waiting in the write-behind queue are in the backup
+        datastore.write_behind.flush()
         zip_thread = threading.Thread(
             target=create_backup,
             args=(datastore.datastore_path, datastore.data.get("watching")),
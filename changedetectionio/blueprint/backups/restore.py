@@ -38,6 +38,7 @@ def import_from_zip(zip_stream, datastore, include_groups, include_groups_replac
     Raises zipfile.BadZipFile if the stream is not a valid zip.
     """
     from changedetectionio.model import Tag
+    from changedetectionio.model.blob_store import SnapshotBlobStore, get_blob_store, release_snapshots
 
     restored_groups = 0
     skipped_groups = 0
@@ -118,9 +119,17 @@ def import_from_zip(zip_stream, datastore, include_groups, include_groups_replac
                 # Copy UUID directory first so data_dir and history files exist
                 dst_dir = os.path.join(datastore.datastore_path, uuid)
                 if os.path.exists(dst_dir):
+                    # Its snapshots may be shared with other watches, only drop what nothing else uses
+                    snapshot_names = SnapshotBlobStore.snapshot_names(dst_dir)
                     shutil.rmtree(dst_dir)
+                    release_snapshots(datastore.datastore_path, snapshot_names)
                 shutil.copytree(entry.path, dst_dir)
 
+                # Backups have a full copy of every snapshot, share them again
+                blob_store = get_blob_store(datastore.datastore_path)
+                if blob_store:
+                    blob_store.adopt_directory(dst_dir)
+
                 # Mirror _load_watches / rehydrate_entity
                 watch_data['uuid'] = uuid
                 watch_obj = datastore.rehydrate_entity(uuid, watch_data)
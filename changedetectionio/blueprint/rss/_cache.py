@@ -0,0 +1,177 @@
+"""
+Feed and entry caching for the RSS routes.
+
+Every poll of a feed used to read two snapshots of every unviewed watch from disk, render the diff and run the
+notification templates over it, even when nothing had changed since the reader's last poll a minute ago.
+
+- Each feed gets an ETag made from what its output depends on: the feed (main/tag/single watch), the application
+  settings, the request's URL root, and for every watch in it the timestamps being compared, its label and tags.
+  All of that is in memory, a poll that sends If-None-Match/If-Modified-Since for an unchanged feed gets a 304
+  without reading or rendering anything, otherwise the previous output is sent again from memory when it's still
+  the same (RSS_FEED_CACHE_SIZE feeds, default 20). Editing a watch changes the ETag of the feeds it is in.
+- The rendered body of each entry is memoized by (uuid, from timestamp, to timestamp, label, template, format,
+  settings), RSS_ENTRY_CACHE_SIZE entries (default 2000). An edited or deleted watch (`watch_committed`,
+  `watch_deleted`) has its entries dropped, a new change only renders the one new entry.
+- Feeds are streamed, the channel header first and then one <item> at a time as it is rendered.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid as uuid_builder
+from collections import OrderedDict
+
+from loguru import logger
+
+from changedetectionio.store.watch_tracker import WatchSignalListener
+
+
+def _digest(*parts):
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class RSSFeedCache(WatchSignalListener):
+    # Only edits and deletes change what a watch's entries look like
+    watch_signals = ('watch_committed', 'watch_deleted')
+
+    def __init__(self, max_feeds=None, max_entries=None):
+        self.max_feeds = max_feeds if max_feeds is not None else int(os.getenv('RSS_FEED_CACHE_SIZE', 20))
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('RSS_ENTRY_CACHE_SIZE', 2000))
+
+        self._lock = threading.Lock()
+        # etag -> rendered feed bytes
+        self._feeds = OrderedDict()
+        # entry key -> rendered entry, and uuid -> its entry keys
+        self._entries = OrderedDict()
+        self._entries_by_uuid = {}
+        # Bumped whenever a watch is edited, part of the ETag of every feed it is in. ETags from before a restart
+        # never match, the counters start again from 0
+        self._watch_generation = {}
+        self._boot_id = uuid_builder.uuid4().hex
+
+        self.stats = {'not_modified': 0, 'feed_hits': 0, 'feed_misses': 0, 'entry_hits': 0, 'entry_misses': 0}
+
+    def watch_changed(self, uuid):
+        self.forget_watch(uuid)
+
+    def forget_watch(self, uuid):
+        with self._lock:
+            self._watch_generation[uuid] = self._watch_generation.get(uuid, 0) + 1
+            for key in self._entries_by_uuid.pop(uuid, ()):
+                self._entries.pop(key, None)
+
+    def watch_generation(self, uuid):
+        return self._watch_generation.get(uuid, 0)
+
+    @staticmethod
+    def settings_digest(datastore, request):
+        """Everything outside the watches that the output of a feed depends on"""
+        return _digest(datastore.data['settings']['application'], request.url_root)
+
+    def feed_etag(self, *parts):
+        return _digest(self._boot_id, *parts)
+
+    def entry(self, uuid, key_parts, render):
+        """The rendered entry for these key parts, render() is only called when it isn't memoized"""
+        key = (uuid, _digest(*key_parts))
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.stats['entry_hits'] += 1
+                return cached
+
+        self.stats['entry_misses'] += 1
+        rendered = render()
+
+        if self.max_entries:
+            with self._lock:
+                self._entries[key] = rendered
+                self._entries_by_uuid.setdefault(uuid, set()).add(key)
+                while len(self._entries) > self.max_entries:
+                    (old_uuid, old_digest), _rendered = self._entries.popitem(last=False)
+                    keys = self._entries_by_uuid.get(old_uuid)
+                    if keys is not None:
+                        keys.discard((old_uuid, old_digest))
+                        if not keys:
+                            del self._entries_by_uuid[old_uuid]
+        return rendered
+
+    def get_feed(self, etag):
+        with self._lock:
+            body = self._feeds.get(etag)
+            if body is not None:
+                self._feeds.move_to_end(etag)
+                self.stats['feed_hits'] += 1
+            else:
+                self.stats['feed_misses'] += 1
+            return body
+
+    def put_feed(self, etag, body):
+        if not self.max_feeds:
+            return
+        with self._lock:
+            self._feeds[etag] = body
+            while len(self._feeds) > self.max_feeds:
+                self._feeds.popitem(last=False)
+
+    def not_modified(self):
+        self.stats['not_modified'] += 1
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, 'feeds': len(self._feeds), 'entries': len(self._entries)}
+
+
+def feed_response(feed_cache, request, etag, last_modified, fg, entries):
+    """
+    Response for a feed: 304 when the reader already has it, the cached output when it's unchanged, otherwise
+    the feed streamed item by item.
+
+    :param fg: FeedGenerator with the channel information, without entries
+    :param entries: Iterable of feedgen FeedEntry objects in output order, consumed while streaming
+    """
+    import datetime
+
+    from flask import Response, stream_with_context
+    from lxml import etree
+
+    if last_modified:
+        last_modified = datetime.datetime.fromtimestamp(int(last_modified), tz=datetime.timezone.utc)
+
+    def conditional(response):
+        response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified
+        # Readers always revalidate, the ETag makes that cheap
+        response.cache_control.no_cache = True
+        return response
+
+    if request.if_none_match.contains(etag) or (
+            not request.if_none_match and last_modified and request.if_modified_since and last_modified <= request.if_modified_since):
+        feed_cache.not_modified()
+        return conditional(Response(status=304))
+
+    body = feed_cache.get_feed(etag)
+    if body is None:
+        head, tail = fg.rss_str(pretty=False).rsplit(b'</channel>', 1)
+
+        def generate():
+            chunks = [head]
+            yield head
+            for fe in entries:
+                chunk = etree.tostring(fe.rss_entry(), encoding='UTF-8', xml_declaration=False)
+                chunks.append(chunk)
+                yield chunk
+            chunks.append(b'</channel>' + tail)
+            yield chunks[-1]
+            feed_cache.put_feed(etag, b''.join(chunks))
+            logger.trace(f"RSS feed {etag} generated, {len(chunks) - 2} entries")
+
+        response = Response(stream_with_context(generate()))
+    else:
+        response = Response(body)
+
+    response.headers.set('Content-Type', 'application/rss+xml;charset=utf-8')
+    return conditional(response)
@@ -154,3 +154,38 @@ def populate_feed_entry(fe, watch, content, guid, timestamp, link=None, title_su
     dt = dt.replace(tzinfo=pytz.UTC)
     fe.pubDate(dt)
 
+
+
+def unviewed_watches_for_feed(datastore, tag_uuid=None):
+    """
+    (watch, history dates) of the unviewed watches that have a change to show, least recently changed first.
+    Only the unread watches are looked at, see store/watch_index.py
+    """
+    hide_muted = datastore.data['settings']['application'].get('rss_hide_muted_watches')
+    _total, uuids = datastore.watch_index.query(sort_attribute='last_changed', unread_only=True,
+                                                tag_uuids=[tag_uuid] if tag_uuid else None)
+    for uuid in uuids:
+        watch = datastore.data['watching'].get(uuid)
+        if not watch or watch.viewed:
+            continue
+        # @todo tag notification_muted skip also (improve Watch model)
+        if hide_muted and watch.get('notification_muted'):
+            continue
+        dates = list(watch.history.keys())
+        # Re #521 - Don't bother processing this one if theres less than 2 snapshots, means we never had a change detected.
+        if len(dates) < 2:
+            continue
+        yield watch, dates
+
+
+def render_entry_body(feed_cache, settings_digest, datastore, notification_service, watch, timestamp_from, timestamp_to,
+                      watch_label, n_body_template, rss_content_format, date_index_from=None, date_index_to=None):
+    """The rendered notification body and change time of one diff, memoized (see _cache.py)"""
+    def render():
+        n_object = build_notification_context(watch, timestamp_from, timestamp_to,
+                                              watch_label, n_body_template, rss_content_format)
+        res = render_notification(n_object, notification_service, watch, datastore, date_index_from, date_index_to)
+        return {'body': res.get('body', ''), 'change_datetime': str(res['original_context']['change_datetime'])}
+
+    return feed_cache.entry(watch['uuid'], (timestamp_from, timestamp_to, watch_label, n_body_template, rss_content_format,
+                                            settings_digest), render)
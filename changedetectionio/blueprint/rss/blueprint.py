@@ -5,6 +5,7 @@ from flask import Blueprint
 from . import tag as tag_routes
 from . import main_feed
 from . import single_watch
+from ._cache import RSSFeedCache
 
 def construct_blueprint(datastore: ChangeDetectionStore):
     """
@@ -18,9 +19,13 @@ def construct_blueprint(datastore: ChangeDetectionStore):
     """
     rss_blueprint = Blueprint('rss', __name__)
 
+    # Shared by all the feeds, kept on the blueprint because its signal receivers are only weakly referenced
+    rss_blueprint.feed_cache = RSSFeedCache()
+    rss_blueprint.feed_cache.connect_signals()
+
     # Register all route modules
-    main_feed.construct_main_feed_routes(rss_blueprint, datastore)
-    single_watch.construct_single_watch_routes(rss_blueprint, datastore)
-    tag_routes.construct_tag_routes(rss_blueprint, datastore)
+    main_feed.construct_main_feed_routes(rss_blueprint, datastore, rss_blueprint.feed_cache)
+    single_watch.construct_single_watch_routes(rss_blueprint, datastore, rss_blueprint.feed_cache)
+    tag_routes.construct_tag_routes(rss_blueprint, datastore, rss_blueprint.feed_cache)
 
     return rss_blueprint
\ No newline at end of file
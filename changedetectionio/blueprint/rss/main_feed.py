@@ -1,14 +1,15 @@
-from flask import make_response, request, url_for, redirect
+from flask import request, url_for, redirect
 
 
 
-def construct_main_feed_routes(rss_blueprint, datastore):
+def construct_main_feed_routes(rss_blueprint, datastore, feed_cache):
     """
     Construct the main RSS feed routes.
 
     Args:
         rss_blueprint: The Flask blueprint to add routes to
         datastore: The ChangeDetectionStore instance
+        feed_cache: The RSSFeedCache shared by the RSS routes
     """
 
     # Some RSS reader situations ended up with rss/ (forward slash after RSS) due
@@ -21,13 +22,15 @@ def construct_main_feed_routes(rss_blueprint, datastore):
     # from changedetectionio.auth_decorator import login_optionally_required
     @rss_blueprint.route("", methods=['GET'])
     def feed():
+        from feedgen.entry import FeedEntry
         from feedgen.feed import FeedGenerator
         from loguru import logger
         import time
 
         from . import RSS_TEMPLATE_HTML_DEFAULT, RSS_TEMPLATE_PLAINTEXT_DEFAULT
+        from ._cache import feed_response
         from ._util import (validate_rss_token, generate_watch_guid, get_rss_template,
-                           get_watch_label, build_notification_context, render_notification,
+                           get_watch_label, render_entry_body, unviewed_watches_for_feed,
                            populate_feed_entry, add_watch_categories)
         from ...notification_service import NotificationService
 
@@ -46,19 +49,20 @@ def construct_main_feed_routes(rss_blueprint, datastore):
             if limit_tag == tag.get('title', '').lower().strip():
                 limit_tag = uuid
 
-        # Sort by last_changed and add the uuid which is usually the key..
-        sorted_watches = []
-
-        # @todo needs a .itemsWithTag() or something - then we can use that in Jinaj2 and throw this away
-        for uuid, watch in datastore.data['watching'].items():
-            # @todo tag notification_muted skip also (improve Watch model)
-            if datastore.data['settings']['application'].get('rss_hide_muted_watches') and watch.get('notification_muted'):
-                continue
-            if limit_tag and not limit_tag in watch['tags']:
-                continue
-            sorted_watches.append(watch)
-
-        sorted_watches.sort(key=lambda x: x.last_changed, reverse=False)
+        # Everything the feed shows, from memory only, nothing is read from disk or rendered yet
+        feed_watches = []
+        for watch, dates in unviewed_watches_for_feed(datastore, tag_uuid=limit_tag or None):
+            watch_label = get_watch_label(datastore, watch)
+            n_body_template = get_rss_template(datastore, watch, rss_content_format,
+                                               RSS_TEMPLATE_HTML_DEFAULT, RSS_TEMPLATE_PLAINTEXT_DEFAULT)
+            feed_watches.append((watch, dates[-2], dates[-1], watch_label, n_body_template))
+
+        settings_digest = feed_cache.settings_digest(datastore, request)
+        etag = feed_cache.feed_etag('main', limit_tag, settings_digest, [
+            (watch['uuid'], timestamp_from, timestamp_to, watch_label, n_body_template, watch.get('tags'), feed_cache.watch_generation(watch['uuid']))
+            for watch, timestamp_from, timestamp_to, watch_label, n_body_template in feed_watches
+        ])
+        last_modified = max((int(timestamp_to) for _w, _f, timestamp_to, _l, _t in feed_watches), default=None)
 
         fg = FeedGenerator()
         fg.title('changedetection.io')
@@ -66,40 +70,26 @@ def construct_main_feed_routes(rss_blueprint, datastore):
         fg.link(href='https://changedetection.io')
         notification_service = NotificationService(datastore=datastore, notification_q=False)
 
-        for watch in sorted_watches:
-
-            dates = list(watch.history.keys())
-            # Re #521 - Don't bother processing this one if theres less than 2 snapshots, means we never had a change detected.
-            if len(dates) < 2:
-                continue
-
-            if not watch.viewed:
+        def entries():
+            # Most recently changed first
+            for watch, timestamp_from, timestamp_to, watch_label, n_body_template in reversed(feed_watches):
                 # Re #239 - GUID needs to be individual for each event
                 # @todo In the future make this a configurable link back (see work on BASE_URL https://github.com/dgtlmoon/changedetection.io/pull/228)
-                watch_label = get_watch_label(datastore, watch)
-                timestamp_to = dates[-1]
-                timestamp_from = dates[-2]
                 guid = generate_watch_guid(watch, timestamp_to)
                 # Because we are called via whatever web server, flask should figure out the right path
                 diff_link = {'href': url_for('ui.ui_diff.diff_history_page', uuid=watch['uuid'], _external=True)}
 
-                # Get template and build notification context
-                n_body_template = get_rss_template(datastore, watch, rss_content_format,
-                                                   RSS_TEMPLATE_HTML_DEFAULT, RSS_TEMPLATE_PLAINTEXT_DEFAULT)
-
-                n_object = build_notification_context(watch, timestamp_from, timestamp_to,
-                                                     watch_label, n_body_template, rss_content_format)
-
                 # Render notification
-                res = render_notification(n_object, notification_service, watch, datastore)
+                res = render_entry_body(feed_cache, settings_digest, datastore, notification_service, watch,
+                                        timestamp_from, timestamp_to, watch_label, n_body_template, rss_content_format)
 
                 # Create and populate feed entry
-                fe = fg.add_entry()
+                fe = FeedEntry()
                 populate_feed_entry(fe, watch, res['body'], guid, timestamp_to, link=diff_link)
                 fe.title(title=watch_label)  # Override title to not include suffix
                 add_watch_categories(fe, watch, datastore)
+                yield fe
+
+            logger.trace(f"RSS generated in {time.time() - now:.3f}s")
 
-        response = make_response(fg.rss_str())
-        response.headers.set('Content-Type', 'application/rss+xml;charset=utf-8')
-        logger.trace(f"RSS generated in {time.time() - now:.3f}s")
-        return response
+        return feed_response(feed_cache, request, etag, last_modified, fg, entries())
@@ -18,9 +18,7 @@ def construct_blueprint(datastore: ChangeDetectionStore):
 
         sorted_tags = sorted(datastore.data['settings']['application'].get('tags').items(), key=lambda x: x[1]['title'])
 
-        from collections import Counter
-
-        tag_count = Counter(tag for watch in datastore.data['watching'].values() if watch.get('tags') for tag in watch['tags'])
+        tag_count = {tag_uuid: counts['watches'] for tag_uuid, counts in datastore.aggregates.get_summary()['by_tag'].items()}
 
         output = render_template("groups-overview.html",
                                  app_rss_token=datastore.data['settings']['application'].get('rss_access_token'),
@@ -42,39 +42,44 @@ def construct_blueprint(datastore: ChangeDetectionStore, update_q, queuedWatchMe
             datastore.data['watching'][uuid].commit()
             return redirect(url_for('watchlist.index', tag = active_tag_uuid))
 
-        # Sort by last_changed and add the uuid which is usually the key..
-        sorted_watches = []
         with_errors = request.args.get('with_errors') == "1"
         unread_only = request.args.get('unread') == "1"
-        errored_count = 0
         search_q = request.args.get('q').strip().lower() if request.args.get('q') else False
-        for uuid, watch in datastore.data['watching'].items():
-            if with_errors and not watch.get('last_error'):
-                continue
-
-            if unread_only and (watch.viewed or watch.last_changed == 0) :
-                continue
-
-            if active_tag_uuid and not active_tag_uuid in watch['tags']:
-                    continue
-            if watch.get('last_error'):
-                errored_count += 1
-
-            if search_q:
-                if (watch.get('title') and search_q in watch.get('title').lower()) or search_q in watch.get('url', '').lower():
-                    sorted_watches.append(watch)
-                elif watch.get('last_error') and search_q in watch.get('last_error').lower():
-                    sorted_watches.append(watch)
-            else:
-                sorted_watches.append(watch)
+
+        # The template can run on cookie or url query info
+        sort_attribute = request.args.get('sort') or request.cookies.get('sort') or 'last_changed'
+        sort_order = request.args.get('order') or request.cookies.get('order') or 'asc'
+
+        # Title, URL or last error containing the search text, see store/search_index.py
+        matching_uuids = datastore.search_watches_for_url(query=search_q, partial=True) if search_q else None
+
+        # Kept up to date from the watch signals instead of being counted here
+        if active_tag_uuid:
+            errored_count = datastore.aggregates.for_tag(active_tag_uuid)['errored']
+        else:
+            errored_count = datastore.aggregates.errored_count
 
         form = forms.quickWatchForm(request.form)
         page = request.args.get(get_page_parameter(), type=int, default=1)
-        total_count = len(sorted_watches)
+        per_page = datastore.data['settings']['application'].get('pager_size', 50)
+
+        # Only the rows of this page are fetched, already filtered and sorted, see store/watch_index.py
+        # ('asc' has always meant the newest/highest first in the watch list)
+        total_count, page_uuids = datastore.watch_index.query(
+            sort_attribute=sort_attribute,
+            reverse=sort_order == 'asc',
+            tag_uuids=[active_tag_uuid] if active_tag_uuid else None,
+            with_errors=with_errors,
+            unread_only=unread_only,
+            uuids=matching_uuids,
+            skip=(max(page, 1) - 1) * per_page if per_page else 0,
+            limit=per_page or None,
+        )
+        watches = [datastore.data['watching'][uuid] for uuid in page_uuids if uuid in datastore.data['watching']]
 
         pagination = Pagination(page=page,
                                 total=total_count,
-                                per_page=datastore.data['settings']['application'].get('pager_size', 50),
+                                per_page=per_page,
                                 css_framework="semantic",
                                 display_msg=_('displaying <b>{start} - {end}</b> {record_name} in total <b>{total}</b>'),
                                 record_name=_('records'))
@@ -100,14 +105,14 @@ def construct_blueprint(datastore: ChangeDetectionStore, update_q, queuedWatchMe
             processor_badge_texts=processors.get_processor_badge_texts(),
             processor_descriptions=processors.get_processor_descriptions(),
             queue_size=update_q.qsize(),
-            queued_uuids=update_q.get_queued_uuids(),
+            queued_uuids=set(update_q.get_queued_uuids()),
             search_q=request.args.get('q', '').strip(),
-            sort_attribute=request.args.get('sort') if request.args.get('sort') else request.cookies.get('sort'),
-            sort_order=request.args.get('order') if request.args.get('order') else request.cookies.get('order'),
+            sort_attribute=sort_attribute,
+            sort_order=sort_order,
             system_default_fetcher=datastore.data['settings']['application'].get('fetch_backend'),
             tags=sorted_tags,
             unread_changes_count=datastore.unread_changes_count,
-            watches=sorted_watches
+            watches=watches
         )
 
         if session.get('share-link'):
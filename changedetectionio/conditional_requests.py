@@ -0,0 +1,100 @@
+"""
+Conditional HTTP fetches (If-None-Match / If-Modified-Since) for fetchers that support them (html_requests).
+
+Every check used to download the whole page, only then run_changedetection() compared its checksum with
+last-checksum.txt and skipped the rest. Now the ETag and Last-Modified of the response whose checksum was saved are
+kept next to it in last-validators.json, and the next fetch sends them. A "304 Not Modified" raises
+checksumFromPreviousCheckWasTheSame straight from the fetcher, nothing is downloaded or parsed.
+
+The validators are only sent while last-checksum.txt exists and the watch wasn't edited, exactly when an unchanged
+body would have been skipped anyway, so a 304 never skips a check that had to reprocess (clearing the checksums
+forces a full fetch too). Only for plain GETs, a request body or method other than GET always gets the full response.
+
+The same file counts the conditional requests of the watch and how many were answered with a 304.
+
+- DISABLE_CONDITIONAL_REQUESTS   never send validators, for servers that answer 304 when the content did change
+"""
+
+import json
+import os
+import threading
+
+from loguru import logger
+
+from changedetectionio.strtobool import strtobool
+
+VALIDATORS_FILENAME = 'last-validators.json'
+
+
+def conditional_requests_enabled():
+    return not strtobool(os.getenv('DISABLE_CONDITIONAL_REQUESTS', 'False'))
+
+
+def read_validators(data_dir):
+    """{'etag':, 'last_modified':, 'requests':, 'not_modified':} of a watch, {} when there is nothing yet"""
+    if not data_dir:
+        return {}
+    try:
+        with open(os.path.join(data_dir, VALIDATORS_FILENAME), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read {VALIDATORS_FILENAME} in {data_dir}: {e}")
+        return {}
+
+
+def write_validators(data_dir, validators):
+    if not data_dir:
+        return
+    try:
+        with open(os.path.join(data_dir, VALIDATORS_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(validators, f)
+    except OSError as e:
+        logger.warning(f"Could not write {VALIDATORS_FILENAME} in {data_dir}: {e}")
+
+
+def request_headers_for(validators):
+    """The conditional headers to send for these stored validators"""
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+
+def response_validators(headers):
+    """ETag and Last-Modified of a response, weak ETags too, a 304 means the body didn't change for those as well"""
+    if not headers:
+        return {}
+    return {'etag': headers.get('ETag'), 'last_modified': headers.get('Last-Modified')}
+
+
+def hit_stats(validators):
+    requests = validators.get('requests', 0)
+    not_modified = validators.get('not_modified', 0)
+    return {'requests': requests, 'not_modified': not_modified,
+            'hit_ratio': round(not_modified / requests, 4) if requests else None}
+
+
+class ConditionalRequestStats:
+    """Totals of all watches since startup"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'not_modified': 0}
+
+    def record(self, not_modified):
+        with self._lock:
+            self.stats['requests'] += 1
+            if not_modified:
+                self.stats['not_modified'] += 1
+
+    def get_stats(self):
+        with self._lock:
+            return hit_stats(self.stats)
+
+
+conditional_request_stats = ConditionalRequestStats()
@@ -84,10 +84,6 @@ def get_plugin_fetchers():
     return fetchers
 
 
-# Initialize plugins at module load time
-_plugin_fetchers = get_plugin_fetchers()
-
-
 # Decide which is the 'real' HTML webdriver, this is more a system wide config
 # rather than site-specific.
 use_playwright_as_chrome_fetcher = os.getenv('PLAYWRIGHT_DRIVER_URL', False)
@@ -109,3 +105,6 @@ else:
 from changedetectionio.pluggy_interface import register_builtin_fetchers
 register_builtin_fetchers()
 
+# Initialize plugins at module load time (after the built-in ones above, some of those register through the hook too)
+_plugin_fetchers = get_plugin_fetchers()
+
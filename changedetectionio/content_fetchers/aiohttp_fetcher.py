@@ -0,0 +1,301 @@
+"""
+Native asyncio plaintext/HTTP fetcher (html_aiohttp), the non-blocking sibling of html_requests.
+
+html_requests runs blocking `requests` calls in the default thread pool, so a worker event loop can only have as
+many fetches in flight as there are executor threads. This fetcher awaits the socket directly, so a single worker
+event loop can run hundreds of fetches concurrently.
+
+Behaviour follows html_requests: same proxy settings (HTTP_PROXY/HTTPS_PROXY or the per-watch proxy, socks:// through
+`aiohttp-socks`), per-hop private/reserved IP checks on redirects, the same encoding detection,
+and the same EmptyReply/Non200ErrorCodeReceived handling. Direct connections resolve through the DNS cache
+(dns_cache.py) and are pinned to the addresses that passed the private/reserved IP check.
+
+- AIOHTTP_CONNECTOR_LIMIT            max simultaneous connections per worker event loop, default 500
+- AIOHTTP_CONNECTOR_LIMIT_PER_HOST   max simultaneous connections per host, default 0 (no limit)
+"""
+
+from loguru import logger
+from urllib.parse import urljoin, urlparse
+import asyncio
+import hashlib
+import os
+import re
+import socket
+import weakref
+
+import aiohttp
+from aiohttp.abc import AbstractResolver
+from aiohttp_socks import ProxyConnector
+
+from changedetectionio import strtobool
+from changedetectionio.content_fetchers.exceptions import BrowserStepsInUnsupportedFetcher, EmptyReply, Non200ErrorCodeReceived, \
+    checksumFromPreviousCheckWasTheSame
+from changedetectionio.content_fetchers.requests import fetcher as requests_fetcher
+from changedetectionio.pluggy_interface import hookimpl
+from changedetectionio.validate_url import is_private_hostname
+
+REDIRECT_STATUS_CODES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 10
+
+# One ClientSession (and so one connection pool) per event loop and connection route, sessions can't be shared across loops
+# event loop -> {None (direct) / 'http' (any HTTP proxy) / socks proxy url: ClientSession}
+_loop_sessions = weakref.WeakKeyDictionary()
+
+
+class PinnedAddressResolver(AbstractResolver):
+    """Resolve through the DNS cache, connections only go to addresses that passed the private/reserved IP check"""
+
+    async def resolve(self, host, port=0, family=socket.AF_INET):
+        from changedetectionio.dns_cache import dns_cache, resolve_for_connection
+
+        try:
+            addresses = dns_cache.get(host)
+        except socket.gaierror:
+            addresses = None
+        # Cache miss (or a cached failure, let resolve_for_connection raise it) means a blocking lookup, keep it off the loop
+        if addresses is None:
+            addresses = await asyncio.get_running_loop().run_in_executor(None, resolve_for_connection, host)
+        else:
+            addresses = resolve_for_connection(host)
+
+        hosts = []
+        for ip in addresses:
+            ip_family = socket.AF_INET6 if ':' in ip else socket.AF_INET
+            if family not in (socket.AF_UNSPEC, ip_family):
+                continue
+            hosts.append({'hostname': host, 'host': ip, 'port': port, 'family': ip_family, 'proto': 0,
+                          'flags': socket.AI_NUMERICHOST | socket.AI_NUMERICSERV})
+        if not hosts:
+            raise OSError(socket.EAI_NONAME, f"No usable address found for '{host}'")
+        return hosts
+
+    async def close(self):
+        pass
+
+
+def _session_key(proxy):
+    if not proxy:
+        return None
+    return proxy if proxy.startswith('socks') else 'http'
+
+
+def _new_session(key=None):
+    limit = int(os.getenv('AIOHTTP_CONNECTOR_LIMIT', 500))
+    limit_per_host = int(os.getenv('AIOHTTP_CONNECTOR_LIMIT_PER_HOST', 0))
+    if key and key.startswith('socks'):
+        connector = ProxyConnector.from_url(key, limit=limit, limit_per_host=limit_per_host, ssl=False)
+    elif key:
+        # The HTTP proxy (passed per request) is connected to here, it does the DNS for the target itself
+        connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host, ssl=False)
+    else:
+        # aiohttp's own DNS cache is off so that every new connection is pinned and re-checked through ours
+        connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host, ssl=False,
+                                         resolver=PinnedAddressResolver(), use_dns_cache=False)
+
+    # Cookies are tracked per fetch (see fetcher.run()), never shared between watches through the session
+    return aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar(), auto_decompress=True)
+
+
+def get_session(proxy=None):
+    key = _session_key(proxy)
+    loop = asyncio.get_running_loop()
+    sessions = _loop_sessions.setdefault(loop, {})
+    session = sessions.get(key)
+    if session is None or session.closed:
+        session = sessions[key] = _new_session(key=key)
+    return session
+
+
+async def close_sessions():
+    """Close the sessions belonging to the running event loop, call before the loop is shut down"""
+    sessions = _loop_sessions.pop(asyncio.get_running_loop(), {})
+    for session in sessions.values():
+        await session.close()
+
+
+def detect_encoding(body, content_type_header, charset=None):
+    """Same rules as html_requests: the charset in the Content-Type header, then the XML declaration, then chardet"""
+    if charset:
+        return charset
+
+    content_type = (content_type_header or '').lower()
+    if 'xml' in content_type or 'rss' in content_type:
+        xml_encoding_match = re.search(rb'<\?xml[^>]+encoding=["\']([^"\']+)["\']', body[:200])
+        return xml_encoding_match.group(1).decode('ascii') if xml_encoding_match else 'utf-8'
+
+    import chardet
+    return chardet.detect(body)['encoding']
+
+
+def decode_body(body, encoding):
+    if not encoding:
+        encoding = detect_encoding(body, content_type_header=None)
+    try:
+        return str(body, encoding or 'utf-8', errors='replace')
+    except (LookupError, TypeError):
+        return str(body, errors='replace')
+
+
+def headers_to_dict(headers):
+    """requests style case-insensitive headers, repeated headers are joined the same way urllib3 does"""
+    from requests.structures import CaseInsensitiveDict
+
+    result = CaseInsensitiveDict()
+    for key, value in headers.items():
+        result[key] = f"{result[key]}, {value}" if key in result else value
+    return result
+
+
+class fetcher(requests_fetcher):
+    fetcher_description = "Async fast Plaintext/HTTP Client"
+
+    def _proxy_for(self, url):
+        if self.proxy_override:
+            return self.proxy_override
+        if urlparse(url).scheme == 'https':
+            return self.system_https_proxy
+        return self.system_http_proxy
+
+    async def _request(self, method, url, proxy, headers, data, timeout, cookies):
+        from yarl import URL
+
+        socks_proxy = proxy if proxy and proxy.startswith('socks') else None
+        session = get_session(proxy=proxy)
+
+        # Same low-level (connection) retries as the requests HTTPAdapter, not retried on HTTP status codes
+        max_retries = int(os.getenv("REQUESTS_RETRY_MAX_COUNT", "6"))
+        attempt = 0
+        while True:
+            try:
+                async with session.request(method=method,
+                                           url=url,
+                                           data=data,
+                                           headers=headers,
+                                           cookies=cookies.filter_cookies(URL(url)),
+                                           proxy=None if socks_proxy else proxy,
+                                           timeout=timeout,
+                                           allow_redirects=False) as r:
+                    body = await r.read()
+                    cookies.update_cookies(r.cookies, r.url)
+                    return r, body
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                if attempt >= max_retries:
+                    raise
+                attempt += 1
+                logger.debug(f"Retrying {url} after connection error ({attempt}/{max_retries}) - {e!r}")
+                await asyncio.sleep(min(0.5 * (2 ** (attempt - 1)), 10))
+
+    async def run(self,
+                  fetch_favicon=True,
+                  current_include_filters=None,
+                  empty_pages_are_a_change=False,
+                  ignore_status_codes=False,
+                  is_binary=False,
+                  request_body=None,
+                  request_headers=None,
+                  request_method=None,
+                  screenshot_format=None,
+                  timeout=None,
+                  url=None,
+                  watch_uuid=None,
+                  ):
+
+        if self.browser_steps:
+            raise BrowserStepsInUnsupportedFetcher(url=url)
+
+        if not url.lower().startswith(('http://', 'https://')):
+            raise Exception(f"The async HTTP fetcher only supports http:// and https:// URLs, use 'Plaintext requests' for '{urlparse(url).scheme}://'")
+
+        allow_iana_restricted = strtobool(os.getenv('ALLOW_IANA_RESTRICTED_ADDRESSES', 'false'))
+        client_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+        data = request_body.encode('utf-8') if type(request_body) is str else request_body
+        cookies = aiohttp.CookieJar(unsafe=True)
+        proxy = self._proxy_for(url)
+
+        try:
+            # Fresh DNS check at fetch time — catches DNS rebinding regardless of add-time cache.
+            if not allow_iana_restricted:
+                parsed_initial = urlparse(url)
+                if parsed_initial.hostname and is_private_hostname(parsed_initial.hostname):
+                    raise Exception(f"Fetch blocked: '{url}' resolves to a private/reserved IP address. "
+                                    f"Set ALLOW_IANA_RESTRICTED_ADDRESSES=true to allow.")
+
+            r, body = await self._request(method=request_method or 'GET', url=url, proxy=proxy, headers=request_headers,
+                                          data=data, timeout=client_timeout, cookies=cookies)
+
+            # Manually follow redirects so each hop's resolved IP can be validated,
+            # preventing SSRF via an open redirect on a public host.
+            current_url = url
+            for _ in range(MAX_REDIRECTS):
+                if not (r.status in REDIRECT_STATUS_CODES and 'Location' in r.headers):
+                    break
+                redirect_url = urljoin(current_url, r.headers.get('Location', ''))
+                if not allow_iana_restricted:
+                    parsed_redirect = urlparse(redirect_url)
+                    if parsed_redirect.hostname and is_private_hostname(parsed_redirect.hostname):
+                        raise Exception(f"Redirect blocked: '{redirect_url}' resolves to a private/reserved IP address.")
+                current_url = redirect_url
+                r, body = await self._request(method='GET', url=redirect_url, proxy=self._proxy_for(redirect_url),
+                                              headers=request_headers, data=None, timeout=client_timeout, cookies=cookies)
+            else:
+                raise Exception("Too many redirects")
+
+        except asyncio.TimeoutError as e:
+            raise Exception(f"Timed out after {timeout} seconds fetching '{url}'") from e
+        except Exception as e:
+            msg = str(e) or repr(e)
+            if proxy and isinstance(e, (aiohttp.ClientProxyConnectionError, aiohttp.ClientHttpProxyError)):
+                msg = f"Proxy connection failed? {msg}"
+            raise Exception(msg) from e
+
+        content_type = r.headers.get('content-type', '')
+        self.headers = headers_to_dict(r.headers)
+
+        # The validators of the last processed response still match, nothing was downloaded
+        if r.status == 304 and self.conditional_request:
+            self.status_code = r.status
+            logger.debug(f"{url} not modified (304), skipping")
+            raise checksumFromPreviousCheckWasTheSame()
+
+        if not body:
+            logger.debug(f"aiohttp returned empty content for '{url}'")
+            if not empty_pages_are_a_change:
+                raise EmptyReply(url=url, status_code=r.status)
+            else:
+                logger.debug(f"URL {url} gave zero byte content reply with Status Code {r.status}, but empty_pages_are_a_change = True")
+
+        # Don't run encoding detection for PDF (and requests identified as binary) takes a _long_ time
+        encoding = None
+        if not is_binary:
+            encoding = detect_encoding(body, content_type_header=content_type, charset=r.charset)
+
+        if r.status != 200 and not ignore_status_codes:
+            raise Non200ErrorCodeReceived(url=url, status_code=r.status, page_html=decode_body(body, encoding))
+
+        self.status_code = r.status
+        if is_binary:
+            # Binary files just return their checksum until we add something smarter
+            self.content = hashlib.md5(body).hexdigest()
+        else:
+            self.content = decode_body(body, encoding)
+
+        self.raw_content = body
+
+        # If the content is an image, set it as screenshot for SSIM/visual comparison
+        if 'image/' in content_type.lower():
+            self.screenshot = body
+            logger.debug(f"Image content detected ({content_type}), set as screenshot for comparison")
+
+
+# Plugin registration for built-in fetcher
+class AiohttpFetcherPlugin:
+    """Plugin class that registers the async HTTP fetcher as a built-in plugin."""
+
+    @hookimpl
+    def register_content_fetcher(self):
+        """Register the aiohttp fetcher"""
+        return ('html_aiohttp', fetcher)
+
+
+# Create module-level instance for plugin registration
+aiohttp_plugin = AiohttpFetcherPlugin()
@@ -69,6 +69,10 @@ class Fetcher():
     supports_browser_steps = False      # Can execute browser automation steps
     supports_screenshots = False        # Can capture page screenshots
     supports_xpath_element_data = False # Can extract xpath element positions/data for visual selector
+    supports_conditional_requests = False # A 304 to If-None-Match/If-Modified-Since raises checksumFromPreviousCheckWasTheSame
+
+    # Set when the processor added the conditional headers (see conditional_requests.py)
+    conditional_request = False
 
     # Screenshot element locking - prevents layout shifts during screenshot capture
     # Only needed for visual comparison (image_ssim_diff processor)
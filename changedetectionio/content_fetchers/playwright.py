@@ -1,5 +1,4 @@
 import asyncio
-import gc
 import json
 import os
 from urllib.parse import urlparse
@@ -9,6 +8,7 @@ from loguru import logger
 from changedetectionio.content_fetchers import SCREENSHOT_MAX_HEIGHT_DEFAULT, visualselector_xpath_selectors, \
     SCREENSHOT_SIZE_STITCH_THRESHOLD, SCREENSHOT_MAX_TOTAL_HEIGHT, XPATH_ELEMENT_JS, INSTOCK_DATA_JS, FAVICON_FETCHER_JS
 from changedetectionio.content_fetchers.base import Fetcher, manage_user_agent
+from changedetectionio.gc_cleanup import memory_governor
 from changedetectionio.content_fetchers.exceptions import PageUnloadable, Non200ErrorCodeReceived, EmptyReply, ScreenshotUnavailable, \
     BrowserStepsStepException
 
@@ -227,7 +227,7 @@ class fetcher(Fetcher):
                 f.write(screenshot)
             # Clear local reference to allow screenshot bytes to be collected
             del screenshot
-            gc.collect()
+            memory_governor.maybe_collect(reason='browser step screenshot')
 
     async def save_step_html(self, step_n):
         super().save_step_html(step_n=step_n)
@@ -242,7 +242,7 @@ class fetcher(Fetcher):
             f.write(content)
         # Clear local reference
         del content
-        gc.collect()
+        memory_governor.maybe_collect(reason='browser step html')
 
     async def run(self,
                   fetch_favicon=True,
@@ -408,7 +408,7 @@ class fetcher(Fetcher):
 
                 # Force aggressive memory cleanup - screenshots are large and base64 decode creates temporary buffers
                 await self.page.request_gc()
-                gc.collect()
+                memory_governor.maybe_collect(reason='screenshot')
 
             except ScreenshotUnavailable:
                 # Re-raise screenshot unavailable exceptions
@@ -450,9 +450,8 @@ class fetcher(Fetcher):
                 finally:
                     browser = None
 
-                # Force Python GC to release Playwright resources immediately
                 # Playwright objects can have circular references that delay cleanup
-                gc.collect()
+                memory_governor.maybe_collect(reason='playwright cleanup')
 
 
 # Plugin registration for built-in fetcher
@@ -6,7 +6,8 @@ import re
 import asyncio
 
 from changedetectionio import strtobool
-from changedetectionio.content_fetchers.exceptions import BrowserStepsInUnsupportedFetcher, EmptyReply, Non200ErrorCodeReceived
+from changedetectionio.content_fetchers.exceptions import BrowserStepsInUnsupportedFetcher, EmptyReply, Non200ErrorCodeReceived, \
+    checksumFromPreviousCheckWasTheSame
 from changedetectionio.content_fetchers.base import Fetcher
 from changedetectionio.validate_url import is_private_hostname
 
@@ -14,6 +15,7 @@ from changedetectionio.validate_url import is_private_hostname
 # "html_requests" is listed as the default fetcher in store.py!
 class fetcher(Fetcher):
     fetcher_description = "Basic fast Plaintext/HTTP Client"
+    supports_conditional_requests = True
 
     def __init__(self, proxy_override=None, custom_browser_connection_url=None, **kwargs):
         super().__init__(**kwargs)
@@ -35,7 +37,6 @@ class fetcher(Fetcher):
         """Synchronous version of run - the original requests implementation"""
 
         import chardet
-        import requests
         from requests.exceptions import ProxyError, ConnectionError, RequestException
 
         if self.browser_steps:
@@ -55,28 +56,10 @@ class fetcher(Fetcher):
             if self.system_https_proxy:
                 proxies['https'] = self.system_https_proxy
 
-        session = requests.Session()
-
-        # Configure retry adapter for low-level network errors only
-        # Retries connection timeouts, read timeouts, connection resets - not HTTP status codes
-        # Especially helpful in parallel test execution when servers are slow/overloaded
-        # Configurable via REQUESTS_RETRY_MAX_COUNT (default: 3 attempts)
-        from requests.adapters import HTTPAdapter
-        from urllib3.util.retry import Retry
-
-        max_retries = int(os.getenv("REQUESTS_RETRY_MAX_COUNT", "6"))
-        retry_strategy = Retry(
-            total=max_retries,
-            connect=max_retries,  # Retry connection timeouts
-            read=max_retries,     # Retry read timeouts
-            status=0,             # Don't retry on HTTP status codes
-            backoff_factor=0.5,   # Wait 0.3s, 0.6s, 1.2s between retries
-            allowed_methods=["HEAD", "GET", "OPTIONS", "POST"],
-            raise_on_status=False
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        session.mount("http://", adapter)
-        session.mount("https://", adapter)
+        # Keep-alive connections are pooled process wide per proxy/TLS settings, the session itself (cookies etc) is per fetch
+        # Retry for low-level network errors (REQUESTS_RETRY_MAX_COUNT) is configured on the pooled adapter
+        from changedetectionio.content_fetchers.requests_session_pool import session_pool
+        session = session_pool.get_session(proxies=proxies, verify=False)
 
         if strtobool(os.getenv('ALLOW_FILE_URI', 'false')) and url.startswith('file://'):
             from requests_file import FileAdapter
@@ -129,6 +112,13 @@ class fetcher(Fetcher):
                 msg = f"Proxy connection failed? {msg}"
             raise Exception(msg) from e
 
+        # The validators of the last processed response still match, nothing was downloaded
+        if r.status_code == 304 and self.conditional_request:
+            self.status_code = r.status_code
+            self.headers = r.headers
+            logger.debug(f"{url} not modified (304), skipping")
+            raise checksumFromPreviousCheckWasTheSame()
+
         # If the response did not tell us what encoding format to expect, Then use chardet to override what `requests` thinks.
         # For example - some sites don't tell us it's utf-8, but return utf-8 content
         # This seems to not occur when using webdriver/selenium, it seems to detect the text encoding more reliably.
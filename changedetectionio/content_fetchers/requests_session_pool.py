@@ -0,0 +1,212 @@
+"""
+Process wide keep-alive connection pools for the plain requests fetcher (html_requests).
+
+Previously every check built a new requests.Session + HTTPAdapter, so every fetch paid for a new TCP (and TLS)
+handshake even when thousands of watches point at the same few hosts.
+
+The connection pools live in the HTTPAdapter (urllib3 PoolManager), so those are shared process-wide, one per
+proxy/TLS combination, while each fetch still gets its own lightweight requests.Session. That keeps cookies and
+other session state private to a single check (exactly as before), only the sockets are reused.
+
+New direct (non proxied) connections go to the addresses in the DNS cache (dns_cache.py), re-checked against the
+private/reserved ranges at connect time, instead of urllib3 resolving the hostname again on its own.
+
+- REQUESTS_POOL_HOSTS                how many hosts to keep a pool for per adapter (least recently used are closed), default 100
+- REQUESTS_POOL_MAXSIZE_PER_HOST     max idle keep-alive connections kept per host, default 4
+- REQUESTS_POOL_IDLE_TIMEOUT         seconds an adapter (and its connections) may sit unused before it's closed, default 300
+"""
+
+import os
+import threading
+import time
+
+from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+# How often to look for idle adapters to close
+EVICTION_SCAN_INTERVAL_SECONDS = 60
+
+
+class PinnedAddressConnectionMixin:
+    """Connect to the validated addresses from the DNS cache, the hostname is still used for SNI and the Host header"""
+
+    def _new_conn(self):
+        import socket
+        from changedetectionio.dns_cache import resolve_for_connection
+
+        hostname = self._dns_host
+        try:
+            addresses = resolve_for_connection(hostname)
+        except socket.gaierror as e:
+            raise NewConnectionError(self, "Failed to establish a new connection: %s" % e)
+
+        last_error = None
+        for ip in addresses:
+            # urllib3 only uses _dns_host to open the socket
+            self._dns_host = ip
+            try:
+                return super()._new_conn()
+            except (NewConnectionError, ConnectTimeoutError) as e:
+                last_error = e
+            finally:
+                self._dns_host = hostname
+        raise last_error
+
+
+class PinnedHTTPConnection(PinnedAddressConnectionMixin, HTTPConnection):
+    pass
+
+
+class PinnedHTTPSConnection(PinnedAddressConnectionMixin, HTTPSConnection):
+    pass
+
+
+class PinnedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = PinnedHTTPConnection
+
+
+class PinnedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = PinnedHTTPSConnection
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that records whether each request went out on a new or a reused connection."""
+
+    def __init__(self, pool_stats, **kwargs):
+        self.pool_stats = pool_stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        # Only the direct connections, proxied requests go through proxy_manager_for() and the proxy does the DNS
+        self.poolmanager.pool_classes_by_scheme = {'http': PinnedHTTPConnectionPool, 'https': PinnedHTTPSConnectionPool}
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        # The body has not been read yet (requests reads it afterwards), so the connection is still attached
+        conn = getattr(response.raw, 'connection', None) or getattr(response.raw, '_connection', None)
+        if conn is not None:
+            self.pool_stats.record(reused=getattr(conn, '_changedetection_requests_sent', 0) > 0)
+            conn._changedetection_requests_sent = getattr(conn, '_changedetection_requests_sent', 0) + 1
+        return response
+
+
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+
+    def record(self, reused):
+        with self._lock:
+            self.requests += 1
+            if reused:
+                self.reused_connections += 1
+            else:
+                self.new_connections += 1
+
+
+class RequestsSessionPool:
+
+    def __init__(self, pool_hosts=None, pool_maxsize=None, idle_timeout=None):
+        self.pool_hosts = pool_hosts or int(os.getenv('REQUESTS_POOL_HOSTS', 100))
+        self.pool_maxsize = pool_maxsize or int(os.getenv('REQUESTS_POOL_MAXSIZE_PER_HOST', 4))
+        self.idle_timeout = idle_timeout or int(os.getenv('REQUESTS_POOL_IDLE_TIMEOUT', 300))
+        self.stats = PoolStats()
+        self.evicted = 0
+
+        self._lock = threading.Lock()
+        # key -> (adapter, last used)
+        self._adapters = {}
+        self._last_eviction_scan = time.time()
+
+    @staticmethod
+    def _key(proxies, verify):
+        return (tuple(sorted((proxies or {}).items())), verify)
+
+    def _new_adapter(self):
+        from urllib3.util.retry import Retry
+
+        # Configure retry adapter for low-level network errors only
+        # Retries connection timeouts, read timeouts, connection resets - not HTTP status codes
+        # Especially helpful in parallel test execution when servers are slow/overloaded
+        # Configurable via REQUESTS_RETRY_MAX_COUNT (default: 6 attempts)
+        max_retries = int(os.getenv("REQUESTS_RETRY_MAX_COUNT", "6"))
+        retry_strategy = Retry(
+            total=max_retries,
+            connect=max_retries,  # Retry connection timeouts
+            read=max_retries,     # Retry read timeouts
+            status=0,             # Don't retry on HTTP status codes
+            backoff_factor=0.5,   # Wait 0.3s, 0.6s, 1.2s between retries
+            allowed_methods=["HEAD", "GET", "OPTIONS", "POST"],
+            raise_on_status=False
+        )
+        return PooledHTTPAdapter(pool_stats=self.stats,
+                                 max_retries=retry_strategy,
+                                 pool_connections=self.pool_hosts,
+                                 pool_maxsize=self.pool_maxsize)
+
+    def get_adapter(self, proxies=None, verify=False):
+        key = self._key(proxies, verify)
+        now = time.time()
+        with self._lock:
+            if now - self._last_eviction_scan >= EVICTION_SCAN_INTERVAL_SECONDS:
+                self._evict_idle(now)
+
+            entry = self._adapters.get(key)
+            adapter = entry[0] if entry else self._new_adapter()
+            self._adapters[key] = (adapter, now)
+            return adapter
+
+    def _evict_idle(self, now):
+        self._last_eviction_scan = now
+        for key, (adapter, last_used) in list(self._adapters.items()):
+            if now - last_used > self.idle_timeout:
+                del self._adapters[key]
+                self.evicted += 1
+                try:
+                    adapter.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close idle requests connection pool - {str(e)}")
+
+    def get_session(self, proxies=None, verify=False):
+        """
+        A fresh requests.Session (own cookies, headers etc) that sends through the shared pooled adapter.
+
+        Do not call .close() on it, that would close the shared connection pools, just let it go out of scope.
+        """
+        import requests
+
+        session = requests.Session()
+        adapter = self.get_adapter(proxies=proxies, verify=verify)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get_stats(self):
+        with self._lock:
+            pools = len(self._adapters)
+        s = self.stats
+        return {
+            'adapters': pools,
+            'evicted_adapters': self.evicted,
+            'requests': s.requests,
+            'new_connections': s.new_connections,
+            'reused_connections': s.reused_connections,
+            'reuse_ratio': round(s.reused_connections / s.requests, 3) if s.requests else 0,
+        }
+
+    def close_all(self):
+        with self._lock:
+            adapters = [a for a, _ in self._adapters.values()]
+            self._adapters = {}
+        for adapter in adapters:
+            adapter.close()
+
+
+# Process wide instance
+session_pool = RequestsSessionPool()
@@ -0,0 +1,148 @@
+"""
+TTL cache of hostname -> IP address lookups, used by the SSRF (private/reserved IP) checks and by the fetchers when
+they open connections.
+
+Every fetch and every redirect hop used to call socket.getaddrinfo() directly just for the is_private_hostname()
+check, and then the HTTP client resolved the same name again to connect. Now both go through this cache.
+
+DNS rebinding is still defeated because the fetchers pin their connections to the addresses held here (see
+requests_session_pool.py and aiohttp_fetcher.py) and re-check them at connect time, so the IP that is connected to is
+always one that was validated, never a fresh answer that could have changed in between.
+
+The stdlib resolver does not expose record TTLs, so DNS_CACHE_TTL is the upper bound on how long an answer is reused.
+
+- DNS_CACHE_TTL             seconds a successful lookup is reused, default 60, 0 disables the cache
+- DNS_CACHE_NEGATIVE_TTL    seconds a failed lookup (NXDOMAIN etc) is remembered, default 10
+- DNS_CACHE_MAX_ENTRIES     maximum hostnames kept (least recently used are dropped), default 10000
+"""
+
+import ipaddress
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+
+from changedetectionio.strtobool import strtobool
+
+
+class BlockedAddressError(Exception):
+    pass
+
+
+def is_private_ip(ip):
+    ip = ipaddress.ip_address(ip)
+    return ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved
+
+
+def _is_ip_literal(hostname):
+    try:
+        ipaddress.ip_address(hostname.strip('[]'))
+        return True
+    except ValueError:
+        return False
+
+
+class DNSCache:
+
+    def __init__(self, ttl=None, negative_ttl=None, max_entries=None):
+        self.ttl = ttl if ttl is not None else float(os.getenv('DNS_CACHE_TTL', 60))
+        self.negative_ttl = negative_ttl if negative_ttl is not None else float(os.getenv('DNS_CACHE_NEGATIVE_TTL', 10))
+        self.max_entries = max_entries or int(os.getenv('DNS_CACHE_MAX_ENTRIES', 10000))
+
+        self._lock = threading.Lock()
+        # hostname -> (expires, tuple of IP strings, or the socket.gaierror for negative entries)
+        self._entries = OrderedDict()
+        self.stats = {'lookups': 0, 'hits': 0, 'negative_hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0}
+
+    def _lookup(self, hostname):
+        addresses = []
+        for info in socket.getaddrinfo(hostname, None):
+            ip = info[4][0]
+            if ip not in addresses:
+                addresses.append(ip)
+        return tuple(addresses)
+
+    def get(self, hostname, now=None):
+        """Cached answer for hostname or None, never resolves. Raises socket.gaierror for a cached failure."""
+        now = now if now is not None else time.monotonic()
+        with self._lock:
+            entry = self._entries.get(hostname)
+            if entry is None:
+                return None
+            expires, result = entry
+            if expires <= now:
+                del self._entries[hostname]
+                self.stats['expired'] += 1
+                return None
+            self._entries.move_to_end(hostname)
+            self.stats['lookups'] += 1
+            if isinstance(result, socket.gaierror):
+                self.stats['negative_hits'] += 1
+                raise socket.gaierror(*result.args)
+            self.stats['hits'] += 1
+            return result
+
+    def _store(self, hostname, result, ttl, now):
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[hostname] = (now + ttl, result)
+            self._entries.move_to_end(hostname)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def resolve(self, hostname):
+        """Tuple of IP address strings for hostname, raises socket.gaierror when it does not resolve"""
+        if _is_ip_literal(hostname):
+            return (hostname.strip('[]'),)
+
+        cached = self.get(hostname)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            self.stats['lookups'] += 1
+            self.stats['misses'] += 1
+
+        now = time.monotonic()
+        try:
+            addresses = self._lookup(hostname)
+        except socket.gaierror as e:
+            self._store(hostname, e, self.negative_ttl, now)
+            raise
+        self._store(hostname, addresses, self.ttl, now)
+        return addresses
+
+    def invalidate(self, hostname=None):
+        with self._lock:
+            if hostname is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(hostname, None)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        stats['hit_ratio'] = round((stats['hits'] + stats['negative_hits']) / stats['lookups'], 3) if stats['lookups'] else 0
+        return stats
+
+
+def resolve_for_connection(hostname):
+    """
+    The addresses a fetcher should connect to for hostname.
+
+    When ALLOW_IANA_RESTRICTED_ADDRESSES is off, raises BlockedAddressError if any of them is private/reserved, this is
+    the connect time half of the DNS rebinding protection, the connection only ever goes to an address checked here.
+    """
+    addresses = dns_cache.resolve(hostname)
+    if not strtobool(os.getenv('ALLOW_IANA_RESTRICTED_ADDRESSES', 'false')):
+        if any(is_private_ip(ip) for ip in addresses):
+            raise BlockedAddressError(f"Connection blocked: '{hostname}' resolves to a private/reserved IP address.")
+    return addresses
+
+
+# Process wide instance
+dns_cache = DNSCache()
@@ -0,0 +1,157 @@
+"""
+Per-domain and per-proxy politeness limits, checked by the async workers when they take a watch from the queue.
+
+Without these, adding thousands of watches on one site sends every FETCH_WORKERS worker to that host at once (and
+gets throttled) while watches on other hosts wait. Two kinds of limits, both keyed by domain (the host of the
+watch URL) and by proxy id:
+
+- concurrency       maximum checks in flight at the same time
+- requests/minute   checks are started at least 60/n seconds apart
+
+Settings (settings -> requests, 0 means unlimited)
+  domain_concurrency_limit, domain_requests_per_minute, proxy_concurrency_limit, proxy_requests_per_minute
+
+A proxy's 'reuse_time_minimum' from proxies.json is applied here too, as the minimum number of seconds between two
+checks through it.
+
+When a watch can't start, the worker hands it back with RecheckPriorityQueue.defer() and takes the next one, so a
+busy host never ties up a worker slot. release() of a lease tells the queue which keys have room again.
+"""
+
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urlparse
+
+from loguru import logger
+
+# How long a watch waiting for a concurrency slot sleeps if no release() wakes it first
+CONCURRENCY_RETRY_SECONDS = 5
+
+FetchLease = namedtuple('FetchLease', ['keys'])
+
+
+class FetchLimiter:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> number of checks in flight
+        self._in_flight = {}
+        # key -> time.time() when the next check may start (rate limits)
+        self._next_start = {}
+        self.stats = {'acquired': 0, 'blocked_concurrency': 0, 'blocked_rate': 0}
+
+    @staticmethod
+    def limits_from_settings(requests_settings):
+        def limit(name):
+            try:
+                return max(0, int(requests_settings.get(name) or 0))
+            except (TypeError, ValueError):
+                return 0
+
+        return {
+            'domain_concurrency_limit': limit('domain_concurrency_limit'),
+            'domain_requests_per_minute': limit('domain_requests_per_minute'),
+            'proxy_concurrency_limit': limit('proxy_concurrency_limit'),
+            'proxy_requests_per_minute': limit('proxy_requests_per_minute'),
+        }
+
+    def limited_keys_for_watch(self, datastore, uuid):
+        """[(key, concurrency limit, minimum seconds between starts)] that apply to this watch"""
+        watch = datastore.data['watching'].get(uuid)
+        if not watch:
+            return []
+
+        limits = self.limits_from_settings(datastore.data['settings']['requests'])
+        keys = []
+
+        if limits['domain_concurrency_limit'] or limits['domain_requests_per_minute']:
+            # Same host as Watch.domain_only_from_link, without rendering and re-validating (DNS) the link on every dequeue
+            try:
+                domain = urlparse(watch.get('url', '')).hostname
+            except ValueError:
+                domain = None
+            if domain:
+                interval = 60 / limits['domain_requests_per_minute'] if limits['domain_requests_per_minute'] else 0
+                keys.append((f"domain:{domain.lower()}", limits['domain_concurrency_limit'], interval))
+
+        # proxies.json is read from disk, only look at it when there is something to enforce
+        proxy_list = datastore.proxy_list
+        if proxy_list:
+            proxy = datastore.get_preferred_proxy_for_watch(uuid=uuid)
+            if proxy and proxy in proxy_list:
+                interval = 60 / limits['proxy_requests_per_minute'] if limits['proxy_requests_per_minute'] else 0
+                try:
+                    interval = max(interval, int(proxy_list[proxy].get('reuse_time_minimum', 0) or 0))
+                except (TypeError, ValueError):
+                    pass
+                if limits['proxy_concurrency_limit'] or interval:
+                    keys.append((f"proxy:{proxy}", limits['proxy_concurrency_limit'], interval))
+
+        return keys
+
+    def try_acquire(self, limited_keys, now=None):
+        """
+        All or nothing, returns (FetchLease, None, None) when the check may start now,
+        otherwise (None, retry at time.time(), the key that blocked it)
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            for key, concurrency, interval in limited_keys:
+                if concurrency and self._in_flight.get(key, 0) >= concurrency:
+                    self.stats['blocked_concurrency'] += 1
+                    return None, now + CONCURRENCY_RETRY_SECONDS, key
+                next_start = self._next_start.get(key, 0)
+                if interval and next_start > now:
+                    self.stats['blocked_rate'] += 1
+                    return None, next_start, key
+
+            for key, concurrency, interval in limited_keys:
+                self._in_flight[key] = self._in_flight.get(key, 0) + 1
+                if interval:
+                    self._next_start[key] = max(self._next_start.get(key, 0), now) + interval
+            self.stats['acquired'] += 1
+            return FetchLease(keys=tuple(key for key, _, _ in limited_keys)), None, None
+
+    def acquire_for_watch(self, datastore, uuid, now=None):
+        try:
+            return self.try_acquire(self.limited_keys_for_watch(datastore, uuid), now=now)
+        except Exception as e:
+            # Never stop a check because the limits couldn't be worked out
+            logger.error(f"Fetch limiter failed for {uuid}, not limiting - {str(e)}")
+            return FetchLease(keys=()), None, None
+
+    def release(self, lease, now=None):
+        """Returns the keys that now have a free slot"""
+        if not lease or not lease.keys:
+            return ()
+        now = time.time() if now is None else now
+        with self._lock:
+            for key in lease.keys:
+                n = self._in_flight.get(key, 0) - 1
+                if n > 0:
+                    self._in_flight[key] = n
+                else:
+                    self._in_flight.pop(key, None)
+                    # Nothing running and the rate window has passed, forget the key
+                    if self._next_start.get(key, 0) <= now:
+                        self._next_start.pop(key, None)
+        return lease.keys
+
+    def get_stats(self):
+        now = time.time()
+        with self._lock:
+            keys = set(self._in_flight) | {k for k, t in self._next_start.items() if t > now}
+            return {
+                **self.stats,
+                'keys': {
+                    key: {
+                        'in_flight': self._in_flight.get(key, 0),
+                        'next_start_in_seconds': round(max(0.0, self._next_start.get(key, 0) - now), 2),
+                    }
+                    for key in sorted(keys)
+                },
+            }
+
+
+fetch_limiter = FetchLimiter()
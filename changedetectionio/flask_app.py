@@ -957,7 +957,10 @@ def changedetection_app(config=None, datastore_o=None):
                 summary = update_q.get_queue_summary()
                 return jsonify({
                     "status": "success",
-                    "queue_summary": summary
+                    "queue_summary": summary,
+                    "fetch_limits": _get_fetch_limits_status(),
+                    "notifications": _get_notification_status(),
+                    "realtime": socketio_server.broadcaster.get_stats() if socketio_server else None
                 })
             else:
                 # Get queued items with pagination support
@@ -972,9 +975,26 @@ def changedetection_app(config=None, datastore_o=None):
                 return jsonify({
                     "status": "success",
                     "queue_size": update_q.qsize(),
-                    "queued_data": all_queued
+                    "queued_data": all_queued,
+                    "fetch_limits": _get_fetch_limits_status(),
+                    "notifications": _get_notification_status(),
+                    "realtime": socketio_server.broadcaster.get_stats() if socketio_server else None
                 })
 
+    def _get_fetch_limits_status():
+        from changedetectionio.fetch_limiter import fetch_limiter
+        return {
+            'limits': fetch_limiter.limits_from_settings(datastore.data['settings']['requests']),
+            **fetch_limiter.get_stats()
+        }
+
+    def _get_notification_status():
+        from changedetectionio.notification import delivery
+        return {
+            'queue_size': notification_q.qsize(),
+            **delivery.get_stats()
+        }
+
     # Start the async workers during app initialization
     # Can be overridden by ENV or use the default settings
     n_workers = int(os.getenv("FETCH_WORKERS", datastore.data['settings']['requests']['workers']))
@@ -1042,22 +1062,48 @@ def notification_runner(worker_id=0):
     global notification_debug_log
     from datetime import datetime
     import json
+    from changedetectionio.notification.handler import render_notification, send_rendered_notification
+    from changedetectionio.notification.delivery import digest_rendered_notifications, NOTIFICATION_DIGEST_SECONDS, NOTIFICATION_DIGEST_MAX_ITEMS
+
+    def notification_failed(n_object, e):
+        global notification_debug_log
+        logger.error(f"Notification worker {worker_id} - Watch URL: {n_object['watch_url']}  Error {str(e)}")
+
+        # UUID wont be present when we submit a 'test' from the global settings
+        if 'uuid' in n_object:
+            datastore.update_watch(uuid=n_object['uuid'],
+                                   update_obj={'last_notification_error': "Notification error detected, goto notification log."})
+
+        log_lines = str(e).splitlines()
+        notification_debug_log += log_lines
+
+        with app.app_context():
+            app.config['watch_check_update_SIGNAL'].send(app_context=app, watch_uuid=n_object.get('uuid'))
+
     with app.app_context():
         while not app.config.exit.is_set():
             try:
                 # Multiple workers can run concurrently (configurable via NOTIFICATION_WORKERS)
-                n_object = notification_q.get(block=False)
+                # Blocks until something is queued, the timeout is only so that app.config.exit is noticed
+                n_objects = [notification_q.get(block=True, timeout=1)]
             except queue.Empty:
-                app.config.exit.wait(1)
+                continue
 
-            else:
+            # Collect whatever else arrives in the digest window, same-URL notifications are then sent as one
+            if NOTIFICATION_DIGEST_SECONDS > 0:
+                digest_until = time.time() + NOTIFICATION_DIGEST_SECONDS
+                while len(n_objects) < NOTIFICATION_DIGEST_MAX_ITEMS and time.time() < digest_until:
+                    try:
+                        n_objects.append(notification_q.get(block=True, timeout=max(0.01, digest_until - time.time())))
+                    except queue.Empty:
+                        break
 
-                now = datetime.now()
-                sent_obj = None
+            now = datetime.now()
+            rendered = []
+            rendered_n_objects = []
 
+            for n_object in n_objects:
                 try:
-                    from changedetectionio.notification.handler import process_notification
-
                     # Fallback to system config if not set
                     if not n_object.get('notification_body') and datastore.data['settings']['application'].get('notification_body'):
                         n_object['notification_body'] = datastore.data['settings']['application'].get('notification_body')
@@ -1068,33 +1114,36 @@ def notification_runner(worker_id=0):
                     if not n_object.get('notification_format') and datastore.data['settings']['application'].get('notification_format'):
                         n_object['notification_format'] = datastore.data['settings']['application'].get('notification_format')
                     if n_object.get('notification_urls', {}):
-                        sent_obj = process_notification(n_object, datastore)
+                        r = render_notification(n_object, datastore)
+                        if r is not None:
+                            rendered.append(r)
+                            rendered_n_objects.append(n_object)
+                            continue
 
                 except Exception as e:
-                    logger.error(f"Notification worker {worker_id} - Watch URL: {n_object['watch_url']}  Error {str(e)}")
-
-                    # UUID wont be present when we submit a 'test' from the global settings
-                    if 'uuid' in n_object:
-                        datastore.update_watch(uuid=n_object['uuid'],
-                                               update_obj={'last_notification_error': "Notification error detected, goto notification log."})
+                    notification_failed(n_object, e)
 
-                    log_lines = str(e).splitlines()
-                    notification_debug_log += log_lines
+                notification_debug_log += ["{} - SENDING - {}".format(now.strftime("%c"), json.dumps(None))]
 
-                    with app.app_context():
-                        app.config['watch_check_update_SIGNAL'].send(app_context=app, watch_uuid=n_object.get('uuid'))
+            for indexes, r in digest_rendered_notifications(rendered):
+                sent_obj = None
+                try:
+                    send_rendered_notification(r)
+                    sent_obj = r['sent_objs']
+                except Exception as e:
+                    for i in indexes:
+                        notification_failed(rendered_n_objects[i], e)
 
                 # Process notifications
-                notification_debug_log+= ["{} - SENDING - {}".format(now.strftime("%c"), json.dumps(sent_obj))]
-                # Trim the log length
-                notification_debug_log = notification_debug_log[-100:]
+                notification_debug_log += ["{} - SENDING - {}".format(now.strftime("%c"), json.dumps(sent_obj))]
 
+            # Trim the log length
+            notification_debug_log = notification_debug_log[-100:]
 
 
 # Threaded runner, look for new watches to feed into the Queue.
 def ticker_thread_check_time_launch_checks():
-    import random
-    proxy_last_called_time = {}
+    from changedetectionio.recheck_scheduler import RecheckScheduler
     last_health_check = 0
 
     recheck_time_minimum_seconds = int(os.getenv('MINIMUM_SECONDS_RECHECK_TIME', 3))
@@ -1106,6 +1155,12 @@ def ticker_thread_check_time_launch_checks():
         # The time between loops should be less than the first .sleep/wait in def wait_for_all_checks() of tests/util.py
         logger.warning(f"Looks like we're in PYTEST! Setting time between searching for items to add to the queue to {WAIT_TIME_BETWEEN_LOOP}s")
 
+    # Min-heap of next-due times, only the watches that are actually due are looked at each tick
+    scheduler = RecheckScheduler(datastore=datastore,
+                                 recheck_time_minimum_seconds=recheck_time_minimum_seconds,
+                                 reconcile_interval_seconds=1 if IN_PYTEST else None)
+    scheduler.connect_signals()
+
     while not app.config.exit.is_set():
 
         # Periodic worker health check (every 60 seconds)
@@ -1130,49 +1185,46 @@ def ticker_thread_check_time_launch_checks():
             app.config.exit.wait(1)
             continue
 
-        # Get a list of watches by UUID that are currently fetching data
-        running_uuids = worker_pool.get_running_uuids()
+        scheduler.refresh(now=now)
 
-        # Build set of queued UUIDs once for O(1) lookup instead of O(n) per watch
-        queued_uuids = {q_item.item['uuid'] for q_item in update_q.queue}
+        # Only built once something is actually due
+        running_uuids = None
+        tz_name = None
+        queued_count = 0
 
-        # Re #232 - Deepcopy the data incase it changes while we're iterating through it all
-        watch_uuid_list = []
+        # Check for watches outside of the time threshold to put in the thread queue, most over-due first.
         while True:
-            try:
-                # Get a list of watches sorted by last_checked, [1] because it gets passed a tuple
-                # This is so we examine the most over-due first
-                for k in sorted(datastore.data['watching'].items(), key=lambda item: item[1].get('last_checked',0)):
-                    watch_uuid_list.append(k[0])
-
-            except RuntimeError as e:
-                # RuntimeError: dictionary changed size during iteration
-                time.sleep(0.1)
-                watch_uuid_list = []
-            else:
+            now = time.time()
+            next_due = scheduler.peek_due_time()
+            if next_due is None or next_due > now:
                 break
 
-        recheck_time_system_seconds = int(datastore.threshold_seconds)
-
-        # Check for watches outside of the time threshold to put in the thread queue.
-        for watch_index, uuid in enumerate(watch_uuid_list):
             # Re #438 - Check queue size every 100 watches for CPU efficiency (not every watch)
-            if watch_index % 100 == 0:
+            if queued_count % 100 == 0:
                 current_queue_size = update_q.qsize()
                 if current_queue_size >= MAX_QUEUE_SIZE:
                     logger.debug(f"Queue size limit reached ({current_queue_size}/{MAX_QUEUE_SIZE}), stopping scheduler this iteration.")
                     break
 
-            now = time.time()
+            uuid = scheduler.pop_due(now=now)
             watch = datastore.data['watching'].get(uuid)
             if not watch:
                 logger.error(f"Watch: {uuid} no longer present.")
                 continue
 
-            # No need todo further processing if it's paused
+            # No need todo further processing if it's paused, unpausing commits the watch which puts it back in the heap
             if watch['paused']:
                 continue
 
+            if running_uuids is None:
+                # Get a list of watches by UUID that are currently fetching data
+                running_uuids = worker_pool.get_running_uuids()
+                tz_name = datastore.data['settings']['application'].get('scheduler_timezone_default', os.getenv('TZ', 'UTC').strip())
+
+            # Already on its way, the watch_check_update signal when it finishes re-adds it to the heap
+            if uuid in running_uuids or update_q.is_queued(uuid):
+                continue
+
             # @todo - Maybe make this a hook?
             # Time schedule limit - Decide between watch or global settings
             scheduler_source = None
@@ -1184,75 +1236,47 @@ def ticker_thread_check_time_launch_checks():
                 time_schedule_limit = watch.get('time_schedule_limit')
                 scheduler_source = 'watch'
 
-            tz_name = datastore.data['settings']['application'].get('scheduler_timezone_default', os.getenv('TZ', 'UTC').strip())
-
             if time_schedule_limit and time_schedule_limit.get('enabled'):
                 logger.trace(f"{uuid} Time scheduler - Using scheduler settings from {scheduler_source}")
+                # Schedule windows are set in whole minutes, look again at the start of the next minute
+                next_minute = (int(now // 60) + 1) * 60
                 try:
                     result = is_within_schedule(time_schedule_limit=time_schedule_limit,
                                                 default_tz=tz_name
                                                 )
                     if not result:
                         logger.trace(f"{uuid} Time scheduler - not within schedule skipping.")
+                        scheduler.defer(uuid, next_minute)
                         continue
                 except Exception as e:
                     logger.error(
                         f"{uuid} - Recheck scheduler, error handling timezone, check skipped - TZ name '{tz_name}' - {str(e)}")
-                    return False
-
-            # If they supplied an individual entry minutes to threshold.
-            threshold = recheck_time_system_seconds if watch.get('time_between_check_use_default') else watch.threshold_seconds()
-
-            # #580 - Jitter plus/minus amount of time to make the check seem more random to the server
-            jitter = datastore.data['settings']['requests'].get('jitter_seconds', 0)
-            if jitter > 0:
-                if watch.jitter_seconds == 0:
-                    watch.jitter_seconds = random.uniform(-abs(jitter), jitter)
-
-            seconds_since_last_recheck = now - watch['last_checked']
-
-            if seconds_since_last_recheck >= (threshold + watch.jitter_seconds) and seconds_since_last_recheck >= recheck_time_minimum_seconds:
-                if not uuid in running_uuids and uuid not in queued_uuids:
-
-                    # Proxies can be set to have a limit on seconds between which they can be called
-                    watch_proxy = datastore.get_preferred_proxy_for_watch(uuid=uuid)
-                    if watch_proxy and watch_proxy in list(datastore.proxy_list.keys()):
-                        # Proxy may also have some threshold minimum
-                        proxy_list_reuse_time_minimum = int(datastore.proxy_list.get(watch_proxy, {}).get('reuse_time_minimum', 0))
-                        if proxy_list_reuse_time_minimum:
-                            proxy_last_used_time = proxy_last_called_time.get(watch_proxy, 0)
-                            time_since_proxy_used = int(time.time() - proxy_last_used_time)
-                            if time_since_proxy_used < proxy_list_reuse_time_minimum:
-                                # Not enough time difference reached, skip this watch
-                                logger.debug(f"> Skipped UUID {uuid} "
-                                        f"using proxy '{watch_proxy}', not "
-                                        f"enough time between proxy requests "
-                                        f"{time_since_proxy_used}s/{proxy_list_reuse_time_minimum}s")
-                                continue
-                            else:
-                                # Record the last used time
-                                proxy_last_called_time[watch_proxy] = int(time.time())
-
-                    # Use Epoch time as priority, so we get a "sorted" PriorityQueue, but we can still push a priority 1 into it.
-                    priority = int(time.time())
-
-                    # Into the queue with you
-                    queued_successfully = worker_pool.queue_item_async_safe(update_q,
-                                                                               queuedWatchMetaData.PrioritizedItem(priority=priority,
-                                                                                                                   item={'uuid': uuid})
-                                                                               )
-                    if queued_successfully:
-                        logger.debug(
-                            f"> Queued watch UUID {uuid} "
-                            f"last checked at {watch['last_checked']} "
-                            f"queued at {now:0.2f} priority {priority} "
-                            f"jitter {watch.jitter_seconds:0.2f}s, "
-                            f"{now - watch['last_checked']:0.2f}s since last checked")
-                    else:
-                        logger.critical(f"CRITICAL: Failed to queue watch UUID {uuid} in ticker thread!")
-                        
-                    # Reset for next time
-                    watch.jitter_seconds = 0
+                    scheduler.defer(uuid, next_minute)
+                    continue
+
+            # Use Epoch time as priority, so we get a "sorted" PriorityQueue, but we can still push a priority 1 into it.
+            priority = int(time.time())
+
+            # Into the queue with you
+            queued_successfully = worker_pool.queue_item_async_safe(update_q,
+                                                                       queuedWatchMetaData.PrioritizedItem(priority=priority,
+                                                                                                           item={'uuid': uuid})
+                                                                       )
+            if queued_successfully:
+                queued_count += 1
+                logger.debug(
+                    f"> Queued watch UUID {uuid} "
+                    f"last checked at {watch['last_checked']} "
+                    f"queued at {now:0.2f} priority {priority} "
+                    f"jitter {watch.jitter_seconds:0.2f}s, "
+                    f"{now - watch['last_checked']:0.2f}s since last checked")
+            else:
+                logger.critical(f"CRITICAL: Failed to queue watch UUID {uuid} in ticker thread!")
+                # Try again next tick
+                scheduler.defer(uuid, now + WAIT_TIME_BETWEEN_LOOP)
+
+            # Reset for next time
+            watch.jitter_seconds = 0
 
         # Should be low so we can break this out in testing
         app.config.exit.wait(WAIT_TIME_BETWEEN_LOOP)
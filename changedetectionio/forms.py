@@ -963,6 +963,23 @@ class globalSettingsRequestForm(Form):
                            validators=[validators.NumberRange(min=1, max=999,
                                                               message=_l("Should be between 1 and 999"))])
 
+    domain_concurrency_limit = IntegerField(_l('Maximum checks at the same time per domain'),
+                                            render_kw={"style": "width: 5em;"},
+                                            validators=[validators.Optional(),
+                                                        validators.NumberRange(min=0, message=_l("Should contain zero or more"))])
+    domain_requests_per_minute = IntegerField(_l('Maximum checks per minute per domain'),
+                                              render_kw={"style": "width: 5em;"},
+                                              validators=[validators.Optional(),
+                                                          validators.NumberRange(min=0, message=_l("Should contain zero or more"))])
+    proxy_concurrency_limit = IntegerField(_l('Maximum checks at the same time per proxy'),
+                                           render_kw={"style": "width: 5em;"},
+                                           validators=[validators.Optional(),
+                                                       validators.NumberRange(min=0, message=_l("Should contain zero or more"))])
+    proxy_requests_per_minute = IntegerField(_l('Maximum checks per minute per proxy'),
+                                             render_kw={"style": "width: 5em;"},
+                                             validators=[validators.Optional(),
+                                                         validators.NumberRange(min=0, message=_l("Should contain zero or more"))])
+
     extra_proxies = FieldList(FormField(SingleExtraProxy), min_entries=5)
     extra_browsers = FieldList(FormField(SingleExtraBrowser), min_entries=5)
 
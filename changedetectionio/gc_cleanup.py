@@ -2,13 +2,110 @@
 
 import ctypes
 import gc
+import os
 import re
 import psutil
 import sys
 import threading
+import time
 import importlib
 from loguru import logger
 
+
+def _malloc_trim():
+    """Hand freed C-level memory (brotli, lxml, screenshots) back to the OS, glibc only"""
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except Exception:
+        pass  # malloc_trim not available on all systems (e.g., macOS, musl)
+
+
+class MemoryGovernor:
+    """
+    Decides when a full gc.collect() + malloc_trim() is worth it.
+
+    These used to run after every brotli write, history trim and check, in every worker, a full collection walks the
+    whole heap and holds the GIL so each one stalled all the other workers. Now the places that produce a lot of
+    garbage call maybe_collect(), which collects only when the process RSS grew by MEMORY_GC_RSS_GROWTH_MB since the
+    last collection, is above MEMORY_GC_RSS_LIMIT_MB, or MEMORY_GC_MAX_INTERVAL seconds passed, and never more often
+    than every MEMORY_GC_MIN_INTERVAL seconds. Python's own generational GC keeps running as normal in between.
+    """
+
+    def __init__(self, rss_growth_mb=None, rss_limit_mb=None, min_interval=None, max_interval=None):
+        self.rss_growth = int(rss_growth_mb if rss_growth_mb is not None else os.getenv('MEMORY_GC_RSS_GROWTH_MB', 64)) * 1024 * 1024
+        # 0 disables the absolute limit
+        self.rss_limit = int(rss_limit_mb if rss_limit_mb is not None else os.getenv('MEMORY_GC_RSS_LIMIT_MB', 0)) * 1024 * 1024
+        self.min_interval = float(min_interval if min_interval is not None else os.getenv('MEMORY_GC_MIN_INTERVAL', 10))
+        self.max_interval = float(max_interval if max_interval is not None else os.getenv('MEMORY_GC_MAX_INTERVAL', 300))
+
+        self._process = psutil.Process()
+        self._lock = threading.Lock()
+        self._last_collect = time.monotonic()
+        self._rss_after_last = self._rss()
+
+        self.stats = {'checks': 0, 'collections': 0, 'skipped': 0, 'pause_seconds_total': 0.0, 'pause_seconds_max': 0.0,
+                      'reclaimed_bytes_total': 0, 'rss_bytes': self._rss_after_last}
+
+    def _rss(self):
+        try:
+            return self._process.memory_info().rss
+        except Exception:
+            return 0
+
+    def maybe_collect(self, reason=''):
+        """Cheap enough to call after every write or check, returns True when it collected"""
+        self.stats['checks'] += 1
+        since = time.monotonic() - self._last_collect
+        if since < self.min_interval:
+            return False
+
+        rss = self._rss()
+        self.stats['rss_bytes'] = rss
+        if not (since >= self.max_interval
+                or rss - self._rss_after_last >= self.rss_growth
+                or (self.rss_limit and rss >= self.rss_limit)):
+            return False
+        return self.collect(reason=reason, rss_before=rss)
+
+    def collect(self, reason='', rss_before=None):
+        """Full collection and malloc_trim() now, skipped when another thread is already doing it"""
+        if not self._lock.acquire(blocking=False):
+            self.stats['skipped'] += 1
+            return False
+        try:
+            if rss_before is None:
+                rss_before = self._rss()
+            t = time.perf_counter()
+            unreachable = gc.collect()
+            _malloc_trim()
+            pause = time.perf_counter() - t
+            self.record(rss_before=rss_before, pause=pause)
+            logger.debug(f"Memory governor collected ({reason or 'interval'}) in {pause * 1000:.1f}ms, {unreachable} unreachable objects, "
+                         f"RSS {rss_before / 1024 / 1024:,.1f} -> {self._rss_after_last / 1024 / 1024:,.1f} MB")
+            return True
+        finally:
+            self._lock.release()
+
+    def record(self, rss_before, pause):
+        """Account for a collection, also one done by memory_cleanup()"""
+        rss = self._rss()
+        self._last_collect = time.monotonic()
+        self._rss_after_last = rss
+        self.stats['collections'] += 1
+        self.stats['pause_seconds_total'] += pause
+        self.stats['pause_seconds_max'] = max(self.stats['pause_seconds_max'], pause)
+        self.stats['reclaimed_bytes_total'] += max(rss_before - rss, 0)
+        self.stats['rss_bytes'] = rss
+
+    def get_stats(self):
+        return {**self.stats,
+                'pause_seconds_total': round(self.stats['pause_seconds_total'], 4),
+                'pause_seconds_max': round(self.stats['pause_seconds_max'], 4)}
+
+
+memory_governor = MemoryGovernor()
+
+
 def memory_cleanup(app=None):
     """
     Perform comprehensive memory cleanup operations and log memory usage
@@ -22,9 +119,11 @@ def memory_cleanup(app=None):
     """
     # Get current process
     process = psutil.Process()
-    
+    started = time.perf_counter()
+    rss_before = process.memory_info().rss
+
     # Log initial memory usage with nicely formatted numbers
-    current_memory = process.memory_info().rss / 1024 / 1024
+    current_memory = rss_before / 1024 / 1024
     logger.debug(f"Memory cleanup started - Current memory usage: {current_memory:,.2f} MB")
 
     # 1. Standard garbage collection - force full collection on all generations
@@ -39,8 +138,7 @@ def memory_cleanup(app=None):
     
 
     # 3. Call libc's malloc_trim to release memory back to the OS
-    libc = ctypes.CDLL("libc.so.6")
-    libc.malloc_trim(0)
+    _malloc_trim()
     current_memory = process.memory_info().rss / 1024 / 1024
     logger.debug(f"After malloc_trim(0) - Memory usage: {current_memory:,.2f} MB")
     
@@ -154,8 +252,9 @@ def memory_cleanup(app=None):
     
     # Final garbage collection pass
     gc.collect()
-    libc.malloc_trim(0)
-    
+    _malloc_trim()
+    memory_governor.record(rss_before=rss_before, pause=time.perf_counter() - started)
+
     # Log final memory usage
     final_memory = process.memory_info().rss / 1024 / 1024
     logger.info(f"Memory cleanup completed - Final memory usage: {final_memory:,.2f} MB")
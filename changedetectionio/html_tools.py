@@ -15,6 +15,13 @@ TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.I | re.S)
 META_CS  = re.compile(r'<meta[^>]+charset=["\']?\s*([a-z0-9_\-:+.]+)', re.I)
 META_CT  = re.compile(r'<meta[^>]+http-equiv=["\']?content-type["\']?[^>]*content=["\'][^>]*charset=([a-z0-9_\-:+.]+)', re.I)
 
+# Tags that inscriptis cannot render as meaningful text and which can be very large.
+# svg/math: produce path-data/MathML garbage; canvas/iframe/template: no inscriptis handlers.
+# video/audio/picture are kept — they may contain meaningful fallback text or captions.
+HTML_TO_TEXT_STRIP_TAGS = ['head', 'script', 'style', 'noscript', 'svg', 'math', 'canvas', 'iframe', 'template']
+BODY_HIDING_STYLE_RE = re.compile(r'\b(?:display\s*:\s*none|visibility\s*:\s*hidden)\b', re.IGNORECASE)
+XML_DECLARATION_RE = re.compile(r'^<\?xml [^>]+?\?>')
+
 # 'price' , 'lowPrice', 'highPrice' are usually under here
 # All of those may or may not appear on different websites - I didnt find a way todo case-insensitive searching here
 LD_JSON_PRODUCT_OFFER_SELECTORS = ["json:$..offers", "json:$..Offers"]
@@ -453,77 +460,240 @@ def extract_json_as_string(content, json_filter, ensure_is_ldjson_info_type=None
 
     return stripped_text_from_html
 
-# Mode     - "content" return the content without the matches (default)
-#          - "line numbers" return a list of line numbers that match (int list)
-#
-# wordlist - list of regex's (str) or words (str)
-# Preserves all linefeeds and other whitespacing, its not the job of this to remove that
-def strip_ignore_text(content, wordlist, mode="content"):
-    ignore_text = []
-    ignore_regex = []
-    ignore_regex_multiline = []
-    ignored_lines = []
+def _literal_terms_regex(terms):
+    """
+    One regex matching any of the (already lowercased) plain text terms, built as a prefix trie so the regex engine
+    walks shared prefixes once instead of trying every term at every position.
 
-    if not content:
-        return ''
+    Only "does the line contain any term" matters, so a term that extends a shorter term is dropped (if "abc" is a
+    term, "abcd" can never be the only match).
+    """
+    trie = {}
+    for term in sorted(set(terms), key=len):
+        node = trie
+        for ch in term:
+            if '' in node:
+                break
+            node = node.setdefault(ch, {})
+        else:
+            node.clear()
+            node[''] = True
 
-    for k in wordlist:
-        # Skip empty strings to avoid matching everything
-        if not k or not k.strip():
-            continue
-        # Is it a regex?
-        res = re.search(PERL_STYLE_REGEX, k, re.IGNORECASE)
-        if res:
-            res = re.compile(perl_style_slash_enclosed_regex_to_options(k))
-            if res.flags & re.DOTALL or res.flags & re.MULTILINE:
-                ignore_regex_multiline.append(res)
+    def build(node):
+        out = []
+        # Single child chains are just a literal run, no group needed
+        while '' not in node and len(node) == 1:
+            ch, node = next(iter(node.items()))
+            out.append(re.escape(ch))
+        if '' not in node:
+            out.append('(?:' + '|'.join(re.escape(ch) + build(child) for ch, child in sorted(node.items())) + ')')
+        return ''.join(out)
+
+    return re.compile(build(trie)) if trie else None
+
+
+def _combine_line_regexes(regexes):
+    """
+    Fold the per-line regexes into one alternation so each line is searched once, not once per regex.
+    Each keeps its own flags as a scoped (?flags:...) group, regexes with groups (backreferences would be renumbered)
+    or in verbose mode (a # comment would run past the group) are left on their own.
+    """
+    combinable = [r for r in regexes if not r.groups and not r.flags & re.VERBOSE]
+    if len(combinable) < 2:
+        return regexes
+
+    flag_letters = {re.IGNORECASE: 'i', re.ASCII: 'a'}
+    parts = []
+    for r in combinable:
+        # perl_style_slash_enclosed_regex_to_options() always gives "(?flags)pattern"
+        pattern = re.sub(r'^\(\?[a-zA-Z]+\)', '', r.pattern, count=1)
+        flags = ''.join(letter for flag, letter in flag_letters.items() if r.flags & flag)
+        parts.append(f"(?{flags}:{pattern})" if flags else f"(?:{pattern})")
+
+    try:
+        combined = re.compile('|'.join(parts))
+    except (re.error, OverflowError, RecursionError):
+        return regexes
+    return [combined] + [r for r in regexes if r not in combinable]
+
+
+# Everything str.splitlines() breaks on
+LINE_BOUNDARY_CHARS = frozenset('\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029')
+
+
+class _TextLines:
+    """The lines of a text, plus its lowercase form and line start offsets, shared by every LineMatcher"""
+
+    def __init__(self, content):
+        self.content = content
+        self.lines = content.splitlines(keepends=True)
+        self._lowered = None
+        self._starts = None
+
+    def lowered(self):
+        if self._lowered is None:
+            lowered = self.content.lower()
+            if len(lowered) == len(self.content):
+                starts = [0]
+                for line in self.lines:
+                    starts.append(starts[-1] + len(line))
             else:
-                ignore_regex.append(res)
-        else:
-            ignore_text.append(k.strip())
+                # Some characters lowercase to more than one (İ), so work line by line to keep the offsets right
+                lowered_lines = [line.lower() for line in self.lines]
+                lowered = ''.join(lowered_lines)
+                starts = [0]
+                for line in lowered_lines:
+                    starts.append(starts[-1] + len(line))
+            self._lowered, self._starts = lowered, starts
+        return self._lowered, self._starts
 
-    for r in ignore_regex_multiline:
-        for match in r.finditer(content):
-            content_lines = content[:match.end()].splitlines(keepends=True)
-            match_lines = content[match.start():match.end()].splitlines(keepends=True)
 
-            end_line = len(content_lines)
-            start_line = end_line - len(match_lines)
+class LineMatcher:
+    """
+    An ignore_text/trigger_text/text_should_not_be_present wordlist compiled once, use compile_wordlist() to get one.
 
-            if end_line - start_line <= 1:
-                # Match is empty or in the middle of the line
-                ignored_lines.append(start_line)
+    Plain text entries are matched case-insensitively with a single combined regex over the lowercased text, /regex/
+    entries are compiled once and run per line (or over the whole text for /regex/s and /regex/m).
+    """
+
+    def __init__(self, wordlist):
+        terms = []
+        self.regexes = []
+        self.multiline_regexes = []
+
+        for k in wordlist:
+            # Skip empty strings to avoid matching everything
+            if not k or not k.strip():
+                continue
+            # Is it a regex?
+            res = re.search(PERL_STYLE_REGEX, k, re.IGNORECASE)
+            if res:
+                res = re.compile(perl_style_slash_enclosed_regex_to_options(k))
+                if res.flags & re.DOTALL or res.flags & re.MULTILINE:
+                    self.multiline_regexes.append(res)
+                else:
+                    self.regexes.append(res)
             else:
-                for i in range(start_line, end_line):
-                    ignored_lines.append(i)
+                terms.append(k.strip().lower())
+
+        # A term with a line break inside can only ever match the end of a line (lines keep their line ending), the
+        # combined regex runs over the whole text so those few are checked line by line instead
+        self.line_break_terms = [t for t in terms if LINE_BOUNDARY_CHARS.intersection(t)]
+        self.terms_regex = _literal_terms_regex([t for t in terms if t not in self.line_break_terms])
+        self.regexes = _combine_line_regexes(self.regexes)
+
+    def __bool__(self):
+        return bool(self.terms_regex or self.line_break_terms or self.regexes or self.multiline_regexes)
+
+    def matching_lines(self, text_lines):
+        """Set of 0-based line numbers (of a _TextLines) that match any entry"""
+        content = text_lines.content
+        lines = text_lines.lines
+        matched = set()
+
+        for r in self.multiline_regexes:
+            for match in r.finditer(content):
+                content_lines = content[:match.end()].splitlines(keepends=True)
+                match_lines = content[match.start():match.end()].splitlines(keepends=True)
+
+                end_line = len(content_lines)
+                start_line = end_line - len(match_lines)
+
+                if end_line - start_line <= 1:
+                    # Match is empty or in the middle of the line
+                    matched.add(start_line)
+                else:
+                    matched.update(range(start_line, end_line))
 
-    line_index = 0
-    lines = content.splitlines(keepends=True)
-    for line in lines:
-        # Always ignore blank lines in this mode. (when this function gets called)
-        got_match = False
-        for l in ignore_text:
-            if l.lower() in line.lower():
-                got_match = True
+        if self.terms_regex:
+            from bisect import bisect_right
+            lowered, starts = text_lines.lowered()
+            search = self.terms_regex.search
+            m = search(lowered)
+            while m:
+                line_index = bisect_right(starts, m.start()) - 1
+                matched.add(line_index)
+                # One hit is enough, carry on from the next line
+                m = search(lowered, starts[line_index + 1])
 
-        if not got_match:
-            for r in ignore_regex:
-                if r.search(line):
-                    got_match = True
+        if self.line_break_terms:
+            for line_index, line in enumerate(lines):
+                if line_index not in matched and any(t in line.lower() for t in self.line_break_terms):
+                    matched.add(line_index)
 
-        if got_match:
-            ignored_lines.append(line_index)
+        if self.regexes:
+            for line_index, line in enumerate(lines):
+                if line_index not in matched and any(r.search(line) for r in self.regexes):
+                    matched.add(line_index)
 
-        line_index += 1
+        return set(i for i in matched if i >= 0 and i < len(lines))
 
-    ignored_lines = set([i for i in ignored_lines if i >= 0 and i < len(lines)])
+
+@lru_cache(maxsize=256)
+def _compile_wordlist(wordlist):
+    return LineMatcher(wordlist)
+
+
+def compile_wordlist(wordlist):
+    """Compiled LineMatcher for a list of words/regexes, the same list is only ever compiled once"""
+    if isinstance(wordlist, LineMatcher):
+        return wordlist
+    return _compile_wordlist(tuple(wordlist))
+
+
+class RuleMatches:
+    """Line numbers (0-based) hit by each rule list of a CompiledRules for one text"""
+
+    def __init__(self, text_lines, ignored, triggered, blocked):
+        self.text_lines = text_lines
+        self.ignored = ignored
+        self.triggered = triggered
+        self.blocked = blocked
+
+    def without_ignored_lines(self):
+        lines = self.text_lines.lines
+        return ''.join([lines[i] for i in range(len(lines)) if i not in self.ignored])
+
+
+class CompiledRules:
+    """
+    A watch's ignore_text, trigger_text and text_should_not_be_present compiled together, so evaluate() splits and
+    lowercases the text only once for all three.
+    """
+
+    def __init__(self, ignore_text=(), trigger_text=(), text_should_not_be_present=()):
+        self.ignore = compile_wordlist(ignore_text)
+        self.trigger = compile_wordlist(trigger_text)
+        self.block = compile_wordlist(text_should_not_be_present)
+
+    def evaluate(self, content, ignore=True):
+        text_lines = _TextLines(content or '')
+        return RuleMatches(
+            text_lines,
+            ignored=self.ignore.matching_lines(text_lines) if ignore and self.ignore else set(),
+            triggered=self.trigger.matching_lines(text_lines) if self.trigger else set(),
+            blocked=self.block.matching_lines(text_lines) if self.block else set(),
+        )
+
+
+# Mode     - "content" return the content without the matches (default)
+#          - "line numbers" return a list of line numbers that match (int list)
+#
+# wordlist - list of regex's (str) or words (str), or a LineMatcher from compile_wordlist()
+# Preserves all linefeeds and other whitespacing, its not the job of this to remove that
+def strip_ignore_text(content, wordlist, mode="content"):
+    if not content:
+        return ''
+
+    text_lines = _TextLines(content)
+    lines = text_lines.lines
+    ignored_lines = compile_wordlist(wordlist).matching_lines(text_lines)
 
     # Used for finding out what to highlight
     if mode == "line numbers":
-        return [i + 1 for i in ignored_lines]
+        return [i + 1 for i in sorted(ignored_lines)]
 
-    output_lines = set(range(len(lines))) - ignored_lines
-    return ''.join([lines[i] for i in output_lines])
+    return ''.join([lines[i] for i in range(len(lines)) if i not in ignored_lines])
 
 def cdata_in_document_to_text(html_content: str, render_anchor_tag_content=False) -> str:
     from xml.sax.saxutils import escape as xml_escape
@@ -538,6 +708,17 @@ def cdata_in_document_to_text(html_content: str, render_anchor_tag_content=False
 # NOTE!! ANYTHING LIBXML, HTML5LIB ETC WILL CAUSE SOME SMALL MEMORY LEAK IN THE LOCAL "LIB" IMPLEMENTATION OUTSIDE PYTHON
 
 
+def _inscriptis_parser_config(render_anchor_tag_content=False):
+    from inscriptis.model.config import ParserConfig
+
+    if render_anchor_tag_content:
+        return ParserConfig(
+            annotation_rules={"a": ["hyperlink"]},
+            display_links=True
+        )
+    return None
+
+
 def html_to_text(html_content: str, render_anchor_tag_content=False, is_rss=False, timeout=10) -> str:
     """
     Convert HTML content to plain text using inscriptis.
@@ -552,15 +733,8 @@ def html_to_text(html_content: str, render_anchor_tag_content=False, is_rss=Fals
     and reliable behavior.
     """
     from inscriptis import get_text
-    from inscriptis.model.config import ParserConfig
 
-    if render_anchor_tag_content:
-        parser_config = ParserConfig(
-            annotation_rules={"a": ["hyperlink"]},
-            display_links=True
-        )
-    else:
-        parser_config = None
+    parser_config = _inscriptis_parser_config(render_anchor_tag_content)
     if is_rss:
         html_content = re.sub(r'<title([\s>])', r'<h1\1', html_content)
         html_content = re.sub(r'</title>', r'</h1>', html_content)
@@ -572,10 +746,7 @@ def html_to_text(html_content: str, render_anchor_tag_content=False, is_rss=Fals
         from bs4 import BeautifulSoup
         soup = BeautifulSoup(html_content, 'html.parser')
         # Strip tags that inscriptis cannot render as meaningful text and which can be very large.
-        # svg/math: produce path-data/MathML garbage; canvas/iframe/template: no inscriptis handlers.
-        # video/audio/picture are kept — they may contain meaningful fallback text or captions.
-        for tag in soup.find_all(['head', 'script', 'style', 'noscript', 'svg',
-                                  'math', 'canvas', 'iframe', 'template']):
+        for tag in soup.find_all(HTML_TO_TEXT_STRIP_TAGS):
             tag.decompose()
 
         # SPAs often use <body style="display:none"> to hide content until JS loads.
@@ -583,7 +754,7 @@ def html_to_text(html_content: str, render_anchor_tag_content=False, is_rss=Fals
         body_tag = soup.find('body')
         if body_tag and body_tag.get('style'):
             style = body_tag['style']
-            if re.search(r'\b(?:display\s*:\s*none|visibility\s*:\s*hidden)\b', style, re.IGNORECASE):
+            if BODY_HIDING_STYLE_RE.search(style):
                 logger.debug(f"html_to_text: Removing hiding styles from body tag (found: '{style}')")
                 del body_tag['style']
 
@@ -592,6 +763,207 @@ def html_to_text(html_content: str, render_anchor_tag_content=False, is_rss=Fals
     text_content = get_text(html_content, config=parser_config)
     return text_content
 
+# Single parse pipeline
+#
+# include_filters(), xpath_filter(), element_removal() and html_to_text() above each parse the document again
+# (BeautifulSoup per CSS rule, lxml per XPath rule, BeautifulSoup + inscriptis for the text), on 1-10MB SPA pages
+# that is most of the CPU time and peak memory of a check.
+# These work on one lxml tree instead, parsed once with html_to_tree(), the text is then rendered by inscriptis
+# straight from that same tree.
+
+@lru_cache(maxsize=1000)
+def css_selector_to_xpath(css_selector):
+    """Translate a CSS selector for use against an lxml tree, raises cssselect.SelectorError if it can't be translated."""
+    from cssselect import HTMLTranslator
+    return HTMLTranslator().css_to_xpath(css_selector.strip())
+
+
+def _drop_element(element):
+    """Remove an element but keep the text that follows it (its tail), same as BeautifulSoup's decompose()."""
+    parent = element.getparent()
+    if parent is None:
+        return
+    if element.tail:
+        previous = element.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or '') + element.tail
+        else:
+            parent.text = (parent.text or '') + element.tail
+    parent.remove(element)
+
+
+def _append_text(container, text):
+    if len(container):
+        container[-1].tail = (container[-1].tail or '') + text
+    else:
+        container.text = (container.text or '') + text
+
+
+def html_to_tree(html_content: str):
+    """
+    Parse HTML into an lxml.html tree exactly the way inscriptis would, returns None for empty content.
+    """
+    from lxml.etree import ParserError
+    from lxml.html import fromstring
+
+    html_content = html_content.strip()
+    if not html_content:
+        return None
+
+    # strip XML declaration, if necessary
+    if html_content.startswith("<?xml "):
+        html_content = XML_DECLARATION_RE.sub("", html_content, count=1)
+
+    try:
+        return fromstring(html_content)
+    except ParserError:
+        return fromstring("<pre>" + html_content + "</pre>")
+
+
+def tree_to_html(tree) -> str:
+    from lxml.html import tostring
+
+    if tree is None:
+        return ''
+    return tostring(tree, encoding='unicode')
+
+
+def tree_include_filters(tree, include_filters: List[str], append_pretty_line_formatting=False):
+    """
+    Single parse version of include_filters(), xpath_filter() and xpath1_filter().
+
+    Runs every CSS/XPath rule against the same tree and returns a new tree holding copies of the matches in order,
+    or None when nothing (except whitespace) matched.
+    """
+    from copy import deepcopy
+    from lxml import etree
+    from lxml.html import Element
+    import elementpath
+    from elementpath.xpath3 import XPath3Parser
+
+    # <body> because inscriptis indents the contents of a <div>, this renders the same as the joined string fragments
+    container = Element('body')
+    namespaces = {'re': 'http://exslt.org/regular-expressions'}
+    # elementpath wraps the whole document on every select(), build that once for all the XPath rules
+    node_tree = None
+
+    for filter_rule in include_filters:
+        if filter_rule[0] == '/' or filter_rule.startswith('xpath:'):
+            if node_tree is None:
+                node_tree = elementpath.get_node_tree(root=tree)
+            r = elementpath.select(node_tree, filter_rule.replace('xpath:', '').strip(), namespaces=namespaces, parser=XPath3Parser)
+            if type(r) != list:
+                r = [r]
+        elif filter_rule.startswith('xpath1:'):
+            r = tree.xpath(filter_rule.replace('xpath1:', '').strip(), namespaces=namespaces)
+        else:
+            r = tree.xpath(css_selector_to_xpath(filter_rule))
+
+        # Same as 'len(html_block)' in the string based versions, separators only go between matches of one rule
+        block_has_content = False
+        for element in r:
+            # When there's more than 1 match, then add the suffix to separate each line
+            # And where the matched result doesn't include something that will cause Inscriptis to add a newline
+            # (This way each 'match' reliably has a new-line in the diff)
+            if append_pretty_line_formatting and block_has_content and (not hasattr(element, 'tag') or not element.tag in (['br', 'hr', 'div', 'p'])):
+                container.append(Element('br'))
+
+            if isinstance(element, etree._Element):
+                match = deepcopy(element)
+                # Copies would otherwise carry along the text that followed them in the original document
+                match.tail = None
+                container.append(match)
+                block_has_content = True
+            else:
+                if isinstance(element, bytes):
+                    text = element.decode('utf-8')
+                elif isinstance(element, str):
+                    text = str(element)
+                else:
+                    text = elementpath_tostring(element)
+                _append_text(container, text)
+                block_has_content = block_has_content or bool(text)
+
+    if not len(container) and not (container.text or '').strip():
+        return None
+
+    return container
+
+
+def tree_element_removal(tree, selectors: List[str]):
+    """Single parse version of element_removal(), removes elements matching CSS or XPath selectors from the tree in place."""
+    from lxml import etree
+
+    css_selectors = []
+    xpath_selectors = []
+
+    for selector in selectors:
+        if selector.strip().startswith(('xpath:', 'xpath1:', '//')):
+            xpath_selectors.append(selector.removeprefix('xpath:').removeprefix('xpath1:'))
+        else:
+            css_selectors.append(selector.strip().strip(","))
+
+    # Collect first then remove, so the matches dont shift while removing
+    if xpath_selectors:
+        elements_to_remove = []
+        for selector in xpath_selectors:
+            elements_to_remove.extend(e for e in tree.xpath(selector) if isinstance(e, etree._Element))
+        for element in elements_to_remove:
+            _drop_element(element)
+
+    if css_selectors:
+        combined_css_selector = " , ".join(list(set(css_selectors)))
+        for element in tree.xpath(css_selector_to_xpath(combined_css_selector)):
+            _drop_element(element)
+
+    return tree
+
+
+def _fragment_root(container):
+    """
+    Pick the root element the same way lxml.html.fromstring() does for a string of joined fragments,
+    so the include filter results render exactly like the string based filters did.
+    """
+    from lxml.html import defs
+
+    root = container
+    while len(root) == 1 and not (root.text or '').strip() and not (root[0].tail or '').strip():
+        if root[0].tag != 'body':
+            # Just one element, it was probably a single element passed in
+            return root[0]
+        # A lone <body> match becomes the fake container itself
+        root = root[0]
+
+    # A fake container, <div> if there is any block level content, otherwise <span>
+    root.tag = 'div' if any(el.tag in defs.block_tags for el in root.iter() if isinstance(el.tag, str)) else 'span'
+    return root
+
+
+def tree_to_text(tree, render_anchor_tag_content=False) -> str:
+    """Single parse version of html_to_text() (non-RSS), renders the text with inscriptis directly from the tree."""
+    from inscriptis import Inscriptis
+
+    if tree is None:
+        return ''
+
+    for element in list(tree.iter(*HTML_TO_TEXT_STRIP_TAGS)):
+        _drop_element(element)
+
+    # SPAs often use <body style="display:none"> to hide content until JS loads.
+    # inscriptis respects CSS display rules, so strip hiding styles from the body tag.
+    for body_tag in tree.iter('body'):
+        style = body_tag.get('style')
+        if style and BODY_HIDING_STYLE_RE.search(style):
+            logger.debug(f"tree_to_text: Removing hiding styles from body tag (found: '{style}')")
+            del body_tag.attrib['style']
+
+    # The detached <body> from tree_include_filters()
+    if tree.tag == 'body' and tree.getparent() is None:
+        tree = _fragment_root(tree)
+
+    return Inscriptis(tree, _inscriptis_parser_config(render_anchor_tag_content)).get_text()
+
+
 # Does LD+JSON exist with a @type=='product' and a .price set anywhere?
 def has_ldjson_product_info(content):
     try:
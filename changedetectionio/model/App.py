@@ -31,6 +31,11 @@ class model(dict):
                     'time_between_check': {'weeks': None, 'days': None, 'hours': 3, 'minutes': None, 'seconds': None},
                     'timeout': int(getenv("DEFAULT_SETTINGS_REQUESTS_TIMEOUT", "45")),  # Default 45 seconds
                     'workers': int(getenv("DEFAULT_SETTINGS_REQUESTS_WORKERS", "5")),  # Number of threads, lower is better for slow connections
+                    # Politeness limits checked when a worker takes a watch from the queue, 0 = unlimited (see fetch_limiter.py)
+                    'domain_concurrency_limit': 0,
+                    'domain_requests_per_minute': 0,
+                    'proxy_concurrency_limit': 0,
+                    'proxy_requests_per_minute': 0,
                     'default_ua': {
                         'html_requests': getenv("DEFAULT_SETTINGS_HEADERS_USERAGENT", DEFAULT_SETTINGS_HEADERS_USERAGENT),
                         'html_webdriver': None,
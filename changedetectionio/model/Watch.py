@@ -32,13 +32,16 @@ from changedetectionio.strtobool import strtobool
 from changedetectionio.jinja2_custom import render as jinja_render
 from . import watch_base
 from .persistence import EntityPersistenceMixin
+from .snapshot_cache import snapshot_cache
+from .blob_store import content_digest, get_blob_store, release_snapshots
+from . import snapshot_delta
+import functools
 import os
 import re
 from pathlib import Path
 from loguru import logger
 
 from .. import jinja2_custom as safe_jinja
-from ..html_tools import TRANSLATE_WHITESPACE_TABLE
 
 FAVICON_RESAVE_THRESHOLD_SECONDS=86400
 BROTLI_COMPRESS_SIZE_THRESHOLD = int(os.getenv('SNAPSHOT_BROTLI_COMPRESSION_THRESHOLD', 1024*20))
@@ -49,8 +52,8 @@ mtable = {'seconds': 1, 'minutes': 60, 'hours': 3600, 'days': 86400, 'weeks': 86
 def _brotli_save(contents, filepath, mode=None, fallback_uncompressed=False):
     """
     Save compressed data using native brotli with streaming compression.
-    Uses chunked compression to minimize peak memory usage and malloc_trim()
-    to force release of C-level memory back to the OS.
+    Uses chunked compression to minimize peak memory usage, the memory governor (gc_cleanup.py) releases
+    C-level memory back to the OS once enough has piled up.
 
     Args:
         contents: data to compress (str or bytes)
@@ -65,8 +68,7 @@ def _brotli_save(contents, filepath, mode=None, fallback_uncompressed=False):
         Exception: if compression fails and fallback_uncompressed is False
     """
     import brotli
-    import gc
-    import ctypes
+    from changedetectionio.gc_cleanup import memory_governor
 
     # Ensure contents are bytes
     if isinstance(contents, str):
@@ -102,15 +104,9 @@ def _brotli_save(contents, filepath, mode=None, fallback_uncompressed=False):
 
         logger.debug(f"Finished brotli compression - From {original_size} to {total_compressed_size} bytes.")
 
-        # Cleanup: Delete compressor, force Python GC, then force C-level memory release
+        # A full collection and malloc_trim() after every write stalled all workers, only when memory grew enough
         del compressor
-        gc.collect()
-
-        # Force release of C-level memory back to OS (since brotli is a C library)
-        try:
-            ctypes.CDLL('libc.so.6').malloc_trim(0)
-        except Exception:
-            pass  # malloc_trim not available on all systems (e.g., macOS)
+        memory_governor.maybe_collect(reason='brotli')
 
         return filepath
 
@@ -128,6 +124,12 @@ def _brotli_save(contents, filepath, mode=None, fallback_uncompressed=False):
             raise Exception(f"Brotli compression failed for {filepath}: {e}")
 
 
+def _write_file(filepath, data):
+    with open(filepath, 'wb') as f:
+        f.write(data)
+    return filepath
+
+
 class model(EntityPersistenceMixin, watch_base):
     """
     Watch domain model for monitoring URL changes.
@@ -224,6 +226,12 @@ class model(EntityPersistenceMixin, watch_base):
     """
     __newest_history_key = None
     __history_n = 0
+    # (index stat signature, {timestamp: snapshot path}) - not copied by deepcopy/pickle because the name contains 'cache'
+    __history_cache = None
+    # history.txt is read on first use rather than in __init__, so loading thousands of watches at startup stays cheap
+    __history_index_loaded = False
+    # (rule lists, html_tools.CompiledRules) - not copied by deepcopy/pickle because the name contains 'cache'
+    __compiled_rules_cache = None
     jitter_seconds = 0
 
     def __init__(self, *arg, **kw):
@@ -241,8 +249,10 @@ class model(EntityPersistenceMixin, watch_base):
         if self.get('default'):
             del self['default']
 
-        # Be sure the cached timestamp is ready
-        bump = self.history
+    def _ensure_history_index(self):
+        """Read history.txt once if nothing has needed it yet (newest key, count etc)"""
+        if not self.__history_index_loaded:
+            bump = self.history
 
     # Note: __deepcopy__, __getstate__, and __setstate__ are inherited from watch_base
     # This prevents memory leaks by sharing __datastore reference instead of copying it
@@ -257,6 +267,7 @@ class model(EntityPersistenceMixin, watch_base):
 
     @property
     def has_unviewed(self):
+        self._ensure_history_index()
         return int(self.newest_history_key) > int(self['last_viewed']) and self.__history_n >= 2
 
     @property
@@ -315,13 +326,18 @@ class model(EntityPersistenceMixin, watch_base):
         # JSON Data, Screenshots, Textfiles (history index and snapshots), HTML in the future etc
         # But preserve processor config files (they're configuration, not history data)
         # Use glob not rglob here for safety.
+        removed = []
         for item in pathlib.Path(str(self.data_dir)).glob("*.*"):
             # Skip processor config files
             if item.name in processor_config_files:
                 continue
             os.unlink(item)
+            removed.append(item.name)
+        snapshot_cache.invalidate_dir(self.data_dir)
+        release_snapshots(self._datastore_path, removed)
 
         # Force the attr to recalculate
+        self.__history_cache = None
         bump = self.history
 
         # Do this last because it will trigger a recheck due to last_checked being zero
@@ -404,6 +420,7 @@ class model(EntityPersistenceMixin, watch_base):
     @property
     def last_changed(self):
         # last_changed will be the newest snapshot, but when we have just one snapshot, it should be 0
+        self._ensure_history_index()
         if self.__history_n <= 1:
             return 0
         if self.__newest_history_key:
@@ -412,8 +429,15 @@ class model(EntityPersistenceMixin, watch_base):
 
     @property
     def history_n(self):
+        self._ensure_history_index()
         return self.__history_n
 
+    @property
+    def conditional_requests(self):
+        """How many fetches sent If-None-Match/If-Modified-Since and how many got a 304, see conditional_requests.py"""
+        from changedetectionio.conditional_requests import read_validators, hit_stats
+        return hit_stats(read_validators(self.data_dir))
+
     @property
     def history(self):
         """History index is just a text file as a list
@@ -425,47 +449,87 @@ class model(EntityPersistenceMixin, watch_base):
 
             We read in this list as the history information
 
+            The parsed index is kept in memory and only re-read when the index file's mtime/inode/size changes,
+            save_history_blob() and history_trim() update it in place, so repeated access is a single stat() call.
+            The returned dict is shared, treat it as read-only.
         """
-        tmp_history = {}
 
         # In the case we are only using the watch for processing without history
         if not self.data_dir:
             return []
 
-        # Read the history file as a dict
         fname = os.path.join(self.data_dir, self.history_index_filename)
-        if os.path.isfile(fname):
+        signature = self._history_index_signature(fname)
+        cached = self.__history_cache
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        tmp_history = {}
+
+        # Read the history file as a dict
+        if signature is not None:
             logger.debug(f"Reading watch history index for {self.get('uuid')}")
             with open(fname, "r", encoding='utf-8') as f:
                 for i in f.readlines():
                     if ',' in i:
                         k, v = i.strip().split(',', 2)
+                        tmp_history[k] = self._history_snapshot_path(v)
 
-                        # The index history could contain a relative path, so we need to make the fullpath
-                        # so that python can read it
-                        # Cross-platform: check for any path separator (works on Windows and Unix)
-                        if os.sep not in v and '/' not in v and '\\' not in v:
-                            # Relative filename only, no path separators
-                            v = os.path.join(self.data_dir, v)
-                        else:
-                            # It's possible that they moved the datadir on older versions
-                            # So the snapshot exists but is in a different path
-                            # Cross-platform: use os.path.basename instead of split('/')
-                            snapshot_fname = os.path.basename(v)
-                            proposed_new_path = os.path.join(self.data_dir, snapshot_fname)
-                            if not os.path.exists(v) and os.path.exists(proposed_new_path):
-                                v = proposed_new_path
-
-                        tmp_history[k] = v
-
-        if len(tmp_history):
-            self.__newest_history_key = list(tmp_history.keys())[-1]
+        self._set_history_cache(signature, tmp_history)
+        return tmp_history
+
+    def compiled_rules(self, ignore_text, trigger_text, text_should_not_be_present):
+        """
+        html_tools.CompiledRules for these (watch + tag + global merged) rule lists, compiled once and reused on every
+        check until the watch is edited or the lists change.
+        """
+        key = (tuple(ignore_text), tuple(trigger_text), tuple(text_should_not_be_present))
+        cached = self.__compiled_rules_cache
+        if cached is not None and cached[0] == key and not self.was_edited:
+            return cached[1]
+
+        from changedetectionio.html_tools import CompiledRules
+        rules = CompiledRules(*key)
+        self.__compiled_rules_cache = (key, rules)
+        return rules
+
+    @staticmethod
+    def _history_index_signature(fname):
+        """Identifies a version of the history index file, None when it doesn't exist."""
+        try:
+            st = os.stat(fname)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return (fname, st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _history_snapshot_path(self, v):
+        # The index history could contain a relative path, so we need to make the fullpath
+        # so that python can read it
+        # Cross-platform: check for any path separator (works on Windows and Unix)
+        if os.sep not in v and '/' not in v and '\\' not in v:
+            # Relative filename only, no path separators
+            return os.path.join(self.data_dir, v)
+
+        # It's possible that they moved the datadir on older versions
+        # So the snapshot exists but is in a different path
+        # Cross-platform: use os.path.basename instead of split('/')
+        snapshot_fname = os.path.basename(v)
+        proposed_new_path = os.path.join(self.data_dir, snapshot_fname)
+        if not os.path.exists(v) and os.path.exists(proposed_new_path):
+            return proposed_new_path
+        return v
+
+    def _set_history_cache(self, signature, history):
+        # Swap in a whole new tuple so readers in other threads never see a dict being modified
+        self.__history_cache = (signature, history) if signature is not None else None
+
+        if len(history):
+            self.__newest_history_key = next(reversed(history))
         else:
             self.__newest_history_key = None
 
-        self.__history_n = len(tmp_history)
-
-        return tmp_history
+        self.__history_n = len(history)
+        self.__history_index_loaded = True
 
     @property
     def has_history(self):
@@ -543,9 +607,10 @@ class model(EntityPersistenceMixin, watch_base):
         # Binary files are NEVER saved with .br compression, only text files are
         binary_extensions = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.pdf', '.bin', '.jfif')
         is_binary = any(filepath.endswith(ext) for ext in binary_extensions)
+        is_delta = snapshot_delta.is_delta(filepath)
 
         # Only look for .br versions for text files
-        if not is_binary:
+        if not is_binary and not is_delta:
             # See if a brotli version exists and switch to that (text files only)
             if not filepath.endswith('.br') and os.path.isfile(f"{filepath}.br"):
                 filepath = f"{filepath}.br"
@@ -555,22 +620,40 @@ class model(EntityPersistenceMixin, watch_base):
                 if os.path.isfile(filepath.replace('.br', '')):
                     filepath = filepath.replace('.br', '')
 
+        # The same few newest snapshots are read over and over, see snapshot_cache.py
+        cache_key = snapshot_cache.key(filepath)
+        contents = snapshot_cache.get(cache_key)
+        if contents is not None:
+            return contents
+
+        # SNAPSHOT_DELTA, rebuilt from the snapshot it builds on, which lands in the cache too
+        if is_delta:
+            data_dir = os.path.dirname(filepath)
+            contents = snapshot_delta.apply_delta(
+                snapshot_delta.read_delta(filepath),
+                lambda name: self.get_history_snapshot(filepath=os.path.join(data_dir, name))
+            )
+
         # Handle .br compressed text files
-        if filepath.endswith('.br'):
+        elif filepath.endswith('.br'):
             # Brotli doesnt have a fileheader to detect it, so we rely on filename
             # https://www.rfc-editor.org/rfc/rfc7932
             # Note: .br should ONLY exist for text files, never binary
             with open(filepath, 'rb') as f:
-                return brotli.decompress(f.read()).decode('utf-8')
+                contents = brotli.decompress(f.read()).decode('utf-8')
 
         # Binary file - return raw bytes
-        if is_binary:
+        elif is_binary:
             with open(filepath, 'rb') as f:
-                return f.read()
+                contents = f.read()
 
         # Text file - decode to string
-        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            return f.read()
+        else:
+            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                contents = f.read()
+
+        snapshot_cache.put(cache_key, contents)
+        return contents
 
     def _write_atomic(self, dest, data, mode='wb'):
         """Write data atomically to dest using a temp file"""
@@ -582,9 +665,47 @@ class model(EntityPersistenceMixin, watch_base):
             tmp_path = tmp.name
         os.replace(tmp_path, dest)
 
+    def _history_line_indexes_remove(self, delete_part):
+        """Take the snapshots about to be deleted out of the line indexes (if check_unique_lines ever created any)"""
+        indexes = self._history_line_indexes()
+        if not indexes:
+            return
+        for k, v in delete_part.items():
+            try:
+                contents = self.get_history_snapshot(filepath=v)
+            except Exception as e:
+                # Can't subtract it, rebuild from the remaining history on next use
+                logger.warning(f"[{self.get('uuid')}] Could not read {v} for the history line index - {str(e)}")
+                for index in indexes:
+                    Path(index.path).unlink(missing_ok=True)
+                return
+            for index in indexes:
+                index.remove_snapshot(k, contents)
+        for index in indexes:
+            self._write_history_line_index(index)
+
+    def _history_rebase_deltas(self, keep_part, removed):
+        """Rewrite the kept .delta snapshots that build on a snapshot about to be removed as keyframes, in place"""
+        removed_names = set(os.path.basename(v) for v in removed)
+        if not removed_names:
+            return
+        # Oldest first, a later delta building on a rewritten one doesn't need rewriting too
+        for filepath in dict.fromkeys(keep_part.values()):
+            if not snapshot_delta.is_delta(filepath):
+                continue
+            try:
+                if removed_names.isdisjoint(snapshot_delta.chain(filepath)):
+                    continue
+                contents = self.get_history_snapshot(filepath=filepath)
+                self._write_atomic(filepath, snapshot_delta.make_keyframe(contents))
+                snapshot_cache.invalidate_paths([filepath])
+                logger.debug(f"[{self.get('uuid')}] Rewrote {filepath} as a keyframe")
+            except Exception as e:
+                logger.critical(f"[{self.get('uuid')}] Could not rebase {filepath} - {str(e)}")
+
     def history_trim(self, newest_n_items):
         from pathlib import Path
-        import gc
+        from changedetectionio.gc_cleanup import memory_governor
         # Sort by timestamp (key)
         sorted_items = sorted(self.history.items(), key=lambda x: int(x[0]))
 
@@ -593,13 +714,20 @@ class model(EntityPersistenceMixin, watch_base):
         logger.info( f"[{self.get('uuid')}] Trimming history to most recent {newest_n_items} items, keeping {len(keep_part)} items deleting {len(delete_part)} items.")
 
         if delete_part:
-            for item in delete_part.items():
+            self._history_line_indexes_remove(delete_part)
+            # Snapshots are named by their content, a kept entry can point at the same file as a deleted one
+            still_used = set(keep_part.values())
+            removed = [v for v in set(delete_part.values()) if v not in still_used]
+            self._history_rebase_deltas(keep_part, removed)
+            snapshot_cache.invalidate_paths(removed)
+            for item in removed:
                 try:
-                    Path(item[1]).unlink(missing_ok=True)
+                    Path(item).unlink(missing_ok=True)
                 except Exception as e:
                     logger.critical(f"{str(e)}")
                 finally:
-                    logger.debug(f"[{self.get('uuid')}] Deleted {item[1]} history snapshot")
+                    logger.debug(f"[{self.get('uuid')}] Deleted {item} history snapshot")
+            release_snapshots(self._datastore_path, removed)
         try:
             dest = os.path.join(self.data_dir, self.history_index_filename)
             output = "\r\n".join(
@@ -607,14 +735,50 @@ class model(EntityPersistenceMixin, watch_base):
                 for k, v in keep_part.items()
             )+"\r\n"
             self._write_atomic(dest=dest, data=output, mode='w')
+            self._set_history_cache(self._history_index_signature(dest), keep_part)
         except Exception as e:
             logger.critical(f"{str(e)}")
+            self.__history_cache = None
         finally:
             logger.debug(f"[{self.get('uuid')}] Updated history index {dest}")
 
         # reimport
         bump = self.history
-        gc.collect()
+        memory_governor.maybe_collect(reason='history trim')
+
+    def _save_history_delta(self, contents, snapshot_id):
+        """
+        Write the text as a delta on the newest snapshot, the file name or None when a full snapshot should be written
+        (first one, keyframe due, too different)
+        """
+        snapshot_fname = f"{snapshot_id}{snapshot_delta.DELTA_SUFFIX}"
+        dest = os.path.join(self.data_dir, snapshot_fname)
+        if os.path.exists(dest):
+            # Snapshots are named by their content, this version was seen before
+            return snapshot_fname
+        if any(os.path.exists(os.path.join(self.data_dir, f"{snapshot_id}.{ext}")) for ext in ('txt', 'txt.br')):
+            return None
+
+        history = self.history
+        if not history:
+            return None
+        base = history[list(history.keys())[-1]]
+        if not base.endswith(('.txt', '.txt.br', snapshot_delta.DELTA_SUFFIX)):
+            return None
+
+        try:
+            depth = snapshot_delta.chain_depth(base) + 1
+            if depth >= snapshot_delta.keyframe_interval():
+                return None
+            encoded = snapshot_delta.make_delta(os.path.basename(base), self.get_history_snapshot(filepath=base), contents, depth)
+        except Exception as e:
+            logger.warning(f"{self.get('uuid')} - Could not build delta on {base}, writing a full snapshot: {e}")
+            return None
+        if encoded is None:
+            return None
+
+        self._write_atomic(dest, encoded)
+        return snapshot_fname
 
     # Save some text file to the appropriate path and bump the history
     # result_obj from fetch_site_status.run()
@@ -624,6 +788,9 @@ class model(EntityPersistenceMixin, watch_base):
 
         self.ensure_data_dir_exists()
         skip_brotli = strtobool(os.getenv('DISABLE_BROTLI_TEXT_SNAPSHOT', 'False'))
+        # SNAPSHOT_DEDUP, identical content is stored once for all watches, see blob_store.py
+        blob_store = get_blob_store(self._datastore_path)
+        snapshot_fname = None
 
         # Binary data - detect file type and save without compression
         if isinstance(contents, bytes):
@@ -639,14 +806,32 @@ class model(EntityPersistenceMixin, watch_base):
                 logger.warning(f"puremagic detection failed: {e}, using 'bin' extension")
                 ext = 'bin'
 
-            snapshot_fname = f"{snapshot_id}.{ext}"
-            dest = os.path.join(self.data_dir, snapshot_fname)
-            self._write_atomic(dest, contents)
+            if blob_store:
+                snapshot_fname = blob_store.link(content_digest(contents), ext, self.data_dir,
+                                                 functools.partial(_write_file, data=contents))
+            if not snapshot_fname:
+                snapshot_fname = f"{snapshot_id}.{ext}"
+                dest = os.path.join(self.data_dir, snapshot_fname)
+                self._write_atomic(dest, contents)
             logger.trace(f"Saved binary snapshot as {snapshot_fname} ({len(contents)} bytes)")
 
         # Text data - use brotli compression if enabled and above threshold
         else:
-            if not skip_brotli and len(contents) > BROTLI_COMPRESS_SIZE_THRESHOLD:
+            compress = not skip_brotli and len(contents) > BROTLI_COMPRESS_SIZE_THRESHOLD
+            # SNAPSHOT_DELTA, only what changed since the previous snapshot, see snapshot_delta.py
+            if snapshot_delta.delta_enabled():
+                snapshot_fname = self._save_history_delta(contents, snapshot_id)
+            if blob_store and not snapshot_fname:
+                if compress:
+                    import brotli
+                    write = functools.partial(_brotli_save, contents, mode=brotli.MODE_TEXT, fallback_uncompressed=True)
+                else:
+                    write = functools.partial(_write_file, data=contents.encode('utf-8'))
+                snapshot_fname = blob_store.link(content_digest(contents), 'txt.br' if compress else 'txt', self.data_dir, write)
+
+            if snapshot_fname:
+                logger.trace(f"Saved text snapshot as {snapshot_fname}")
+            elif compress:
                 # Compressed text
                 import brotli
                 snapshot_fname = f"{snapshot_id}.txt.br"
@@ -669,18 +854,39 @@ class model(EntityPersistenceMixin, watch_base):
                 dest = os.path.join(self.data_dir, snapshot_fname)
                 self._write_atomic(dest, contents.encode('utf-8'))
 
+        # The count below is only right if the existing index was read
+        self._ensure_history_index()
+
         # Append to history.txt atomically
         index_fname = os.path.join(self.data_dir, self.history_index_filename)
         index_line = f"{timestamp},{snapshot_fname}\n"
 
+        # Only extend the in-memory index if it matches what was on disk before our append, otherwise re-read it later
+        cached = self.__history_cache
+        cache_is_current = cached is not None and cached[0] == self._history_index_signature(index_fname)
+
         with open(index_fname, 'a', encoding='utf-8') as f:
             f.write(index_line)
             f.flush()
             os.fsync(f.fileno())
 
         # Update internal state
-        self.__newest_history_key = timestamp
-        self.__history_n += 1
+        if cache_is_current:
+            history = dict(cached[1])
+            history[str(timestamp)] = os.path.join(self.data_dir, snapshot_fname)
+            self._set_history_cache(self._history_index_signature(index_fname), history)
+        else:
+            self.__history_cache = None
+            self.__newest_history_key = timestamp
+            self.__history_n += 1
+
+        # Keep the check_unique_lines index (if any) current, the contents are already in memory
+        self._history_line_indexes_append(timestamp, contents)
+
+        # The search index takes the new text from here instead of reading the snapshot back
+        watch_snapshot_saved = signal('watch_snapshot_saved')
+        if watch_snapshot_saved:
+            watch_snapshot_saved.send(watch_uuid=self.get('uuid'), timestamp=str(timestamp), contents=contents)
 
         # MANUAL CHAIN RESOLUTION: Watch → Global
         # With Pydantic, this would become: maxlen = watch.resolved_history_snapshot_max_length
@@ -711,38 +917,79 @@ class model(EntityPersistenceMixin, watch_base):
                 seconds += x * n
         return seconds
 
-    # Iterate over all history texts and see if something new exists
-    # Always applying .strip() to start/end but optionally replace any other whitespace
-    def lines_contain_something_unique_compared_to_history(self, lines: list, ignore_whitespace=False):
-        local_lines = set([])
-        if lines:
-            if ignore_whitespace:
-                if isinstance(lines[0], str): # Can be either str or bytes depending on what was on the disk
-                    local_lines = set([l.translate(TRANSLATE_WHITESPACE_TABLE).lower() for l in lines])
-                else:
-                    local_lines = set([l.decode('utf-8').translate(TRANSLATE_WHITESPACE_TABLE).lower() for l in lines])
-            else:
-                if isinstance(lines[0], str): # Can be either str or bytes depending on what was on the disk
-                    local_lines = set([l.strip().lower() for l in lines])
-                else:
-                    local_lines = set([l.decode('utf-8').strip().lower() for l in lines])
+    def _history_line_index(self, ignore_whitespace=False, build=False, known_contents=None):
+        """
+        Load the persisted line index for this watch and bring it up to date with history.txt.
+        Without build=True it is only returned if check_unique_lines already created one.
+        known_contents {timestamp: contents} saves reading snapshots back that the caller already has in memory.
+        """
+        from .history_line_index import HistoryLineIndex
+        path = HistoryLineIndex.filename(self.data_dir, ignore_whitespace)
+        index = HistoryLineIndex.load(path, ignore_whitespace=ignore_whitespace)
+        if index is None and not build:
+            return None
 
+        history = self.history
+        if index is None or not index.snapshots.issubset(history.keys()):
+            # New, or it covers snapshots that are gone (and their lines can't be subtracted anymore)
+            if index is not None:
+                logger.debug(f"[{self.get('uuid')}] History line index {path} is out of sync, rebuilding")
+            index = HistoryLineIndex(path, ignore_whitespace=ignore_whitespace)
+
+        known_contents = known_contents or {}
+        missing = [k for k in history.keys() if k not in index.snapshots]
+        for k in missing:
+            contents = known_contents[k] if k in known_contents else self.get_history_snapshot(filepath=history[k])
+            index.add_snapshot(k, contents)
+
+        if missing or index.needs_compaction:
+            self._write_history_line_index(index)
+        return index
+
+    def _history_line_indexes_append(self, timestamp, contents):
+        """Append a new snapshot to the line indexes that exist on disk, without loading or rewriting them"""
+        from .history_line_index import HistoryLineIndex
+        if not self.data_dir or not os.path.isdir(self.data_dir):
+            return
+        for ignore_whitespace in (False, True):
+            path = HistoryLineIndex.filename(self.data_dir, ignore_whitespace)
+            if not os.path.isfile(path):
+                continue
+            try:
+                if HistoryLineIndex.append_snapshot(path, timestamp, contents, ignore_whitespace=ignore_whitespace):
+                    # Compacts the journal into the index
+                    self._history_line_index(ignore_whitespace=ignore_whitespace)
+            except Exception as e:
+                logger.error(f"[{self.get('uuid')}] Could not append to history line index {path} - {str(e)}")
 
-        # Compare each lines (set) against each history text file (set) looking for something new..
-        existing_history = set({})
-        for k, v in self.history.items():
-            content = self.get_history_snapshot(filepath=v)
+    def _write_history_line_index(self, index):
+        try:
+            index.save(self._write_atomic)
+        except Exception as e:
+            logger.error(f"[{self.get('uuid')}] Could not write history line index {index.path} - {str(e)}")
 
-            if ignore_whitespace:
-                alist = set([line.translate(TRANSLATE_WHITESPACE_TABLE).lower() for line in content.splitlines()])
-            else:
-                alist = set([line.strip().lower() for line in content.splitlines()])
+    def _history_line_indexes(self, known_contents=None):
+        """The line indexes that exist on disk for this watch (one per ignore_whitespace variant)"""
+        if not self.data_dir or not os.path.isdir(self.data_dir):
+            return []
+        indexes = (self._history_line_index(ignore_whitespace=v, known_contents=known_contents) for v in (False, True))
+        return [index for index in indexes if index]
 
-            existing_history = existing_history.union(alist)
+    # Check the new lines against the line index of all history texts and see if something new exists
+    # Always applying .strip() to start/end but optionally replace any other whitespace
+    def lines_contain_something_unique_compared_to_history(self, lines: list, ignore_whitespace=False):
+        from .history_line_index import line_hashes
+        # Can be either str or bytes depending on what was on the disk
+        local_lines = line_hashes(lines, ignore_whitespace=ignore_whitespace) if lines else set()
+        if not local_lines:
+            return False
+
+        self.ensure_data_dir_exists()
+        index = self._history_line_index(ignore_whitespace=ignore_whitespace, build=True)
 
-        # Check that everything in local_lines(new stuff) already exists in existing_history - it should
+        # Check that everything in local_lines(new stuff) already exists in the history - it should
         # if not, something new happened
-        return not local_lines.issubset(existing_history)
+        return not index.contains_all(local_lines)
 
     def get_screenshot(self):
         fname = os.path.join(self.data_dir, "last-screenshot.png")
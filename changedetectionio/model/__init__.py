@@ -374,13 +374,16 @@ class watch_base(dict):
         # Call parent update first
         super().update(*args, **kwargs)
 
+        # Not tracking yet (still in __init__) or already marked, no need to look at every key
+        if getattr(self, '_watch_base__watch_was_edited', True):
+            return
+
         # Mark as edited for any writable fields that were updated
         # Handle both update(dict) and update(key=value) forms
-        if args:
-            for key in args[0].keys():
-                self._mark_field_as_edited(key)
-        for key in kwargs.keys():
+        for key in (*(args[0].keys() if args else ()), *kwargs.keys()):
             self._mark_field_as_edited(key)
+            if self.__watch_was_edited:
+                break
 
 
     def pop(self, key, *args):
@@ -662,6 +665,7 @@ class watch_base(dict):
             return
 
         # Save to disk via subclass implementation
+        entity_type = None
         try:
             # Determine entity type from module name (Watch.py -> watch, Tag.py -> tag)
             entity_type = _determine_entity_type(self.__class__)
@@ -669,4 +673,12 @@ class watch_base(dict):
             self._save_to_disk(data_dict, uuid)
             logger.debug(f"Committed {entity_type} {uuid} to {uuid}/{filename}")
         except Exception as e:
-            logger.error(f"Failed to commit {uuid}: {e}")
\ No newline at end of file
+            logger.error(f"Failed to commit {uuid}: {e}")
+
+        # Let interested parties (recheck scheduler etc) know this entity may have changed
+        if entity_type == 'watch':
+            from blinker import signal
+            signal('watch_committed').send(watch_uuid=uuid)
+        elif entity_type == 'tag':
+            from blinker import signal
+            signal('tag_committed').send(tag_uuid=uuid)
\ No newline at end of file
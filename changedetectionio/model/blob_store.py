@@ -0,0 +1,202 @@
+"""
+Optional content-addressed store for history snapshots (SNAPSHOT_DEDUP=True).
+
+Many watches flip between a handful of states (A/B tests, rotating banners) and several watches often track the same
+page, so most snapshots on disk are byte-identical copies of another one.
+
+With it enabled every snapshot is kept once under {datastore}/blobs/ab/<sha256>.<ext> and the watch's directory gets a
+hard link to it with the same name, that is what history.txt lists. The link count of a blob is its reference count:
+- the content is only written (and brotli compressed) the first time it's seen, after that it's one link() call
+- history_trim(), clear_watch(), deleting a watch or a restore replacing it simply remove their links, the data of
+  a snapshot still referenced anywhere else can't go away, release() then drops blobs nobody links to any more
+- everything that reads or copies the watch directory (diffs, backups) sees ordinary files
+
+Where hard links aren't possible (some network filesystems) snapshots are written the normal way instead.
+"""
+
+import hashlib
+import os
+import re
+import threading
+import time
+import uuid as uuid_builder
+
+from loguru import logger
+
+from changedetectionio.strtobool import strtobool
+
+BLOBS_DIRNAME = 'blobs'
+BLOB_NAME_RE = re.compile(r'^[0-9a-f]{64}\.[a-z0-9.]+$')
+# Leftovers of a write that never finished
+STALE_TEMP_SECONDS = 3600
+
+
+def content_digest(contents):
+    if isinstance(contents, str):
+        contents = contents.encode('utf-8')
+    return hashlib.sha256(contents).hexdigest()
+
+
+class SnapshotBlobStore:
+
+    def __init__(self, datastore_path):
+        self.root = os.path.join(datastore_path, BLOBS_DIRNAME)
+        self.links_supported = True
+        self.stats = {'written': 0, 'deduplicated': 0, 'released': 0, 'fallbacks': 0}
+
+    def path(self, name):
+        return os.path.join(self.root, name[:2], name)
+
+    def link(self, digest, ext, data_dir, write):
+        """
+        Hard link the blob <digest>.<ext> into data_dir, calling write(path) to create it first if it's new.
+
+        write() returns the path it actually wrote, which may have another extension when it had to fall back
+        (.txt instead of .txt.br).
+
+        :return: The snapshot's file name in data_dir, None when hard links can't be used here
+        """
+        if not self.links_supported:
+            return None
+
+        name = f"{digest}.{ext}"
+        # Twice, in case release() removed the blob just between checking for it and linking to it
+        for _attempt in range(2):
+            dest = os.path.join(data_dir, name)
+            if os.path.exists(dest):
+                # This watch already has this content
+                self.stats['deduplicated'] += 1
+                return name
+            blob = self.path(name)
+            try:
+                if os.path.exists(blob):
+                    self.stats['deduplicated'] += 1
+                else:
+                    os.makedirs(os.path.dirname(blob), exist_ok=True)
+                    tmp = os.path.join(os.path.dirname(blob), f".tmp-{uuid_builder.uuid4().hex}.{ext}")
+                    written = write(tmp)
+                    if written != tmp:
+                        name = f"{digest}.{os.path.basename(written).split('.', 1)[1]}"
+                        blob = self.path(name)
+                        dest = os.path.join(data_dir, name)
+                    os.replace(written, blob)
+                    self.stats['written'] += 1
+                os.link(blob, dest)
+                return name
+            except FileExistsError:
+                return name
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Snapshot deduplication disabled, can't hard link in {self.root}: {e}")
+                self.links_supported = False
+                break
+
+        self.stats['fallbacks'] += 1
+        return None
+
+    def release(self, names):
+        """Drop the blobs of these snapshot file names that no watch links to any more"""
+        for name in names:
+            name = os.path.basename(str(name))
+            if not BLOB_NAME_RE.match(name):
+                continue
+            blob = self.path(name)
+            try:
+                if os.stat(blob).st_nlink <= 1:
+                    os.unlink(blob)
+                    self.stats['released'] += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not release snapshot blob {blob}: {e}")
+
+    @staticmethod
+    def snapshot_names(data_dir):
+        """The snapshot files in a watch directory that may be links to blobs, to release() after removing it"""
+        try:
+            names = os.listdir(data_dir)
+        except OSError:
+            return []
+        return [name for name in names if BLOB_NAME_RE.match(name)]
+
+    def adopt_directory(self, data_dir):
+        """
+        Replace the snapshots in data_dir that were copied from somewhere (a restored backup) with links to the blob
+        that has the same content, or make them the blob when there is none yet
+        """
+        adopted = 0
+        for entry in os.scandir(data_dir):
+            if not entry.is_file() or not BLOB_NAME_RE.match(entry.name):
+                continue
+            blob = self.path(entry.name)
+            try:
+                if os.path.exists(blob):
+                    if os.path.samefile(blob, entry.path):
+                        continue
+                    tmp = f"{entry.path}.tmp-link"
+                    os.link(blob, tmp)
+                    os.replace(tmp, entry.path)
+                else:
+                    os.makedirs(os.path.dirname(blob), exist_ok=True)
+                    os.link(entry.path, blob)
+                adopted += 1
+            except OSError as e:
+                logger.warning(f"Could not deduplicate {entry.path}: {e}")
+                break
+        return adopted
+
+    def collect_garbage(self):
+        """Remove every blob nobody links to (after a crash or something removed watch directories directly)"""
+        removed = 0
+        if not os.path.isdir(self.root):
+            return removed
+        now = time.time()
+        for dirpath, _dirnames, filenames in os.walk(self.root):
+            for filename in filenames:
+                filepath = os.path.join(dirpath, filename)
+                try:
+                    st = os.stat(filepath)
+                    if filename.startswith('.tmp-'):
+                        if now - st.st_mtime > STALE_TEMP_SECONDS:
+                            os.unlink(filepath)
+                    elif st.st_nlink <= 1:
+                        os.unlink(filepath)
+                        removed += 1
+                except OSError:
+                    pass
+        if removed:
+            logger.info(f"Removed {removed} unreferenced snapshot blobs from {self.root}")
+        self.stats['released'] += removed
+        return removed
+
+    def get_stats(self):
+        return {**self.stats, 'links_supported': self.links_supported}
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_blob_store(datastore_path, enabled=None):
+    """
+    The blob store of this datastore, None when SNAPSHOT_DEDUP is off and it isn't asked for explicitly.
+    Releasing should also happen with it off, blobs written while it was on are still there.
+    """
+    if not datastore_path:
+        return None
+    if enabled is None:
+        enabled = strtobool(os.getenv('SNAPSHOT_DEDUP', 'False'))
+    if not enabled:
+        return None
+    with _stores_lock:
+        store = _stores.get(datastore_path)
+        if store is None:
+            store = _stores[datastore_path] = SnapshotBlobStore(datastore_path)
+        return store
+
+
+def release_snapshots(datastore_path, names):
+    """Drop the blobs behind these removed snapshot files, whether SNAPSHOT_DEDUP is on now or not"""
+    if datastore_path and os.path.isdir(os.path.join(datastore_path, BLOBS_DIRNAME)):
+        get_blob_store(datastore_path, enabled=True).release(names)
@@ -0,0 +1,221 @@
+"""
+Persisted index of the (normalised) lines found in a watch's history, used by check_unique_lines.
+
+Instead of decompressing and splitting every snapshot on each detected change, a 64bit hash of every distinct line is
+kept together with the number of snapshots that contain it, so "is there anything new" only has to hash the new lines.
+
+One file per normalisation, next to history.txt:
+  history-lines.idx         line.strip().lower()
+  history-lines-nows.idx    all whitespace removed, lower() (ignore_whitespace)
+
+File layout: one JSON header line {"version": 1, "snapshots": [timestamps covered], "lines": n}, followed by n
+little-endian uint64 hashes and then n uint32 counts.
+
+A saved snapshot is not folded into that file straight away, rewriting it would cost I/O in the size of the whole
+history for every snapshot. Its line hashes are appended to <index>.journal instead, one record per snapshot
+({"snapshot": timestamp, "lines": n} header line and n uint64 hashes), replayed on load. Once the journal is larger
+than the index itself both are compacted into a new index, so the rewrites stay proportional to what was appended.
+A torn record at the end of the journal only means those snapshots are read back from the history once.
+
+Counting snapshots per line (not just a set) lets history_trim() subtract the snapshots it deletes without re-reading
+all of the remaining history. A hash collision can only hide a unique line (~1 in 2^64 per line).
+"""
+
+from array import array
+from hashlib import blake2b
+import json
+import os
+import sys
+
+from loguru import logger
+
+from ..html_tools import TRANSLATE_WHITESPACE_TABLE
+
+INDEX_VERSION = 1
+INDEX_FILENAMES = {
+    False: 'history-lines.idx',
+    True: 'history-lines-nows.idx',
+}
+JOURNAL_SUFFIX = '.journal'
+
+
+def normalise_line(line, ignore_whitespace=False):
+    if isinstance(line, bytes):
+        line = line.decode('utf-8')
+    if ignore_whitespace:
+        return line.translate(TRANSLATE_WHITESPACE_TABLE).lower()
+    return line.strip().lower()
+
+
+def line_hashes(lines, ignore_whitespace=False, memo=None):
+    """Set of 64bit hashes of the normalised lines, memo {line: hash} skips re-hashing lines seen in other snapshots"""
+    if memo is None:
+        memo = {}
+    hashes = set()
+    for line in {normalise_line(line, ignore_whitespace) for line in lines}:
+        h = memo.get(line)
+        if h is None:
+            h = memo[line] = int.from_bytes(blake2b(line.encode('utf-8'), digest_size=8).digest(), 'little')
+        hashes.add(h)
+    return hashes
+
+
+def _as_little_endian(a):
+    if sys.byteorder != 'little':
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a
+
+
+class HistoryLineIndex:
+    """Line hash -> number of snapshots containing it, for the snapshots (history timestamps) in self.snapshots"""
+
+    def __init__(self, path, ignore_whitespace=False):
+        self.path = path
+        self.ignore_whitespace = ignore_whitespace
+        self.snapshots = set()
+        self.counts = {}
+        # Set by load(), the journal has to be folded into the index file
+        self.needs_compaction = False
+        # Only lives as long as this object (one check or one save), snapshots mostly share the same lines
+        self._hash_memo = {}
+
+    @classmethod
+    def filename(cls, data_dir, ignore_whitespace=False):
+        return os.path.join(data_dir, INDEX_FILENAMES[bool(ignore_whitespace)])
+
+    @classmethod
+    def journal_path(cls, path):
+        return path + JOURNAL_SUFFIX
+
+    @classmethod
+    def append_snapshot(cls, path, timestamp, contents, ignore_whitespace=False):
+        """
+        Append one snapshot to the journal of the index at path, without loading the index.
+        Returns True when the journal outgrew the index and should be compacted (load() + save()).
+        """
+        hashes = line_hashes(contents.splitlines(), ignore_whitespace) if isinstance(contents, str) else set()
+        header = json.dumps({'snapshot': str(timestamp), 'lines': len(hashes)})
+        journal = cls.journal_path(path)
+        with open(journal, 'ab') as f:
+            f.write(header.encode('utf-8') + b'\n' + _as_little_endian(array('Q', hashes)).tobytes())
+        return os.path.getsize(journal) > os.path.getsize(path)
+
+    def _replay_journal(self):
+        """Apply the journal records, False if it ended in a torn or unreadable record"""
+        try:
+            with open(self.journal_path(self.path), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return True
+
+        pos = 0
+        while pos < len(data):
+            end = data.find(b'\n', pos)
+            if end == -1:
+                return False
+            try:
+                record = json.loads(data[pos:end])
+                n = int(record['lines'])
+                timestamp = str(record['snapshot'])
+            except Exception:
+                return False
+            pos = end + 1 + n * 8
+            if pos > len(data):
+                return False
+            hashes = array('Q')
+            hashes.frombytes(data[end + 1:pos])
+            self.add_snapshot_hashes(timestamp, _as_little_endian(hashes))
+        return True
+
+    @classmethod
+    def load(cls, path, ignore_whitespace=False):
+        """Returns None if there is no (usable) index file, it is then rebuilt from the history"""
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline())
+                if header.get('version') != INDEX_VERSION:
+                    return None
+                n = int(header['lines'])
+                hashes = array('Q')
+                counts = array('I')
+                hashes.frombytes(f.read(n * 8))
+                counts.frombytes(f.read(n * 4))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable history line index {path} - {str(e)}")
+            return None
+
+        if len(hashes) != n or len(counts) != n:
+            logger.warning(f"Ignoring truncated history line index {path}")
+            return None
+
+        index = cls(path, ignore_whitespace=ignore_whitespace)
+        index.snapshots = set(header['snapshots'])
+        index.counts = dict(zip(_as_little_endian(hashes), _as_little_endian(counts)))
+
+        journal = cls.journal_path(path)
+        if os.path.isfile(journal):
+            if not index._replay_journal():
+                logger.warning(f"Ignoring the rest of the damaged history line index journal {journal}")
+                index.needs_compaction = True
+            elif os.path.getsize(journal) > os.path.getsize(path):
+                index.needs_compaction = True
+        return index
+
+    def save(self, write_atomic):
+        """Write the whole index and drop the journal folded into it, write_atomic(dest, data) is the Watch's own writer"""
+        header = json.dumps({
+            'version': INDEX_VERSION,
+            'snapshots': sorted(self.snapshots, key=int),
+            'lines': len(self.counts),
+        })
+        data = header.encode('utf-8') + b'\n' + \
+               _as_little_endian(array('Q', self.counts.keys())).tobytes() + \
+               _as_little_endian(array('I', self.counts.values())).tobytes()
+        write_atomic(self.path, data)
+        # Replaying it again after a crash right here is harmless, the snapshots are already covered
+        try:
+            os.unlink(self.journal_path(self.path))
+        except FileNotFoundError:
+            pass
+        self.needs_compaction = False
+
+    def add_snapshot(self, timestamp, contents):
+        """Add one snapshot (str), binary snapshots only get marked as covered as they never contain text lines"""
+        if str(timestamp) in self.snapshots:
+            return False
+        hashes = ()
+        if isinstance(contents, str):
+            hashes = line_hashes(contents.splitlines(), self.ignore_whitespace, memo=self._hash_memo)
+        return self.add_snapshot_hashes(timestamp, hashes)
+
+    def add_snapshot_hashes(self, timestamp, hashes):
+        timestamp = str(timestamp)
+        if timestamp in self.snapshots:
+            return False
+        self.snapshots.add(timestamp)
+        counts = self.counts
+        for h in hashes:
+            counts[h] = counts.get(h, 0) + 1
+        return True
+
+    def remove_snapshot(self, timestamp, contents):
+        timestamp = str(timestamp)
+        if timestamp not in self.snapshots:
+            return False
+        self.snapshots.discard(timestamp)
+        if isinstance(contents, str):
+            counts = self.counts
+            for h in line_hashes(contents.splitlines(), self.ignore_whitespace, memo=self._hash_memo):
+                n = counts.get(h, 0)
+                if n > 1:
+                    counts[h] = n - 1
+                else:
+                    counts.pop(h, None)
+        return True
+
+    def contains_all(self, hashes):
+        counts = self.counts
+        return all(h in counts for h in hashes)
@@ -0,0 +1,110 @@
+"""
+Process-wide LRU of decompressed history snapshots.
+
+Watch.get_history_snapshot() used to brotli-decompress the whole file on every call, while the same one or two newest
+snapshots of a watch are read again and again within seconds (notification rendering, the diff page, the RSS feeds,
+the levenshtein conditions plugin, the API history diff).
+
+Entries are keyed by (path, mtime, size) of the file actually read, so a snapshot that is replaced on disk is simply
+a miss (and its old text is dropped when the new one is cached), and are bounded by the total size of the cached text (SNAPSHOT_CACHE_MAX_BYTES, default 32MB, 0 disables).
+A single snapshot bigger than an eighth of that is never cached so one huge page can't flush everything else.
+history_trim() and clear_watch() drop what they delete.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+
+def _size_of(contents):
+    # str is counted by its length, near enough to what it takes in memory for mostly ASCII text
+    return len(contents)
+
+
+class SnapshotCache:
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv('SNAPSHOT_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+        self.max_item_bytes = self.max_bytes // 8
+
+        self._lock = threading.Lock()
+        # (path, mtime_ns, size) -> contents
+        self._entries = OrderedDict()
+        self._keys_by_path = {}
+        self._bytes = 0
+
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    @staticmethod
+    def key(filepath):
+        """Cache key of the file as it is on disk now, raises FileNotFoundError like open() would"""
+        st = os.stat(filepath)
+        return (filepath, st.st_mtime_ns, st.st_size)
+
+    def get(self, key):
+        with self._lock:
+            contents = self._entries.get(key)
+            if contents is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return contents
+
+    def put(self, key, contents):
+        size = _size_of(contents)
+        if not self.max_bytes or size > self.max_item_bytes:
+            return
+        with self._lock:
+            # Only the current version of a file is kept
+            previous_key = self._keys_by_path.get(key[0])
+            if previous_key is not None:
+                self._bytes -= _size_of(self._entries.pop(previous_key))
+            self._entries[key] = contents
+            self._keys_by_path[key[0]] = key
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                del self._keys_by_path[evicted_key[0]]
+                self._bytes -= _size_of(evicted)
+                self.stats['evictions'] += 1
+
+    def _drop(self, match):
+        with self._lock:
+            for path in [path for path in self._keys_by_path if match(path)]:
+                self._bytes -= _size_of(self._entries.pop(self._keys_by_path.pop(path)))
+                self.stats['invalidations'] += 1
+
+    def invalidate_paths(self, filepaths):
+        """Forget these snapshot files, with or without their .br suffix"""
+        names = set()
+        for filepath in filepaths:
+            filepath = str(filepath)
+            names.add(filepath)
+            names.add(filepath[:-3] if filepath.endswith('.br') else f"{filepath}.br")
+        self._drop(lambda path: path in names)
+
+    def invalidate_dir(self, data_dir):
+        """Forget every snapshot of one watch"""
+        prefix = os.path.join(str(data_dir), '')
+        self._drop(lambda path: path.startswith(prefix))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_path.clear()
+            self._bytes = 0
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hit_ratio': round(self.stats['hits'] / lookups, 3) if lookups else 0,
+            }
+
+
+snapshot_cache = SnapshotCache()
@@ -0,0 +1,241 @@
+"""
+Line-level delta encoded text snapshots (SNAPSHOT_DELTA=True).
+
+Every text snapshot used to be a full (brotli compressed) copy even when one line of a long page changed, with
+history_snapshot_max_length unset that adds up to gigabytes per watch over time.
+
+With it enabled a new text snapshot is stored as "<snapshot_id>.delta" holding only what differs from the previous
+snapshot of the watch, every SNAPSHOT_DELTA_KEYFRAME_INTERVAL (default 10) versions, or whenever the delta wouldn't
+be much smaller, the full text is written instead (a keyframe, the usual .txt/.txt.br file), so reading any version
+never has to go back more than that many files.
+
+A .delta file is brotli compressed JSON:
+  {"version": 1, "base": "<file name of the snapshot it builds on, in the same directory, or null>",
+   "depth": <deltas between this one and its keyframe>, "ops": [[start, end], "inserted lines", ...]}
+[start, end] copies those lines of the base, strings are inserted as they are, base null means "ops" is the full
+text (a delta turned into a keyframe by history_trim()).
+
+Watch.get_history_snapshot() rebuilds versions transparently, the rebuilt text of every version on the way is kept
+in the snapshot cache (snapshot_cache.py), so reading the next version is one more delta. history_trim() turns the
+kept deltas that build on a removed snapshot into keyframes before removing it.
+
+python3 -m changedetectionio.model.snapshot_delta converts an existing datastore, see migrate_history().
+"""
+
+import difflib
+import json
+import os
+
+from loguru import logger
+
+from changedetectionio.strtobool import strtobool
+
+DELTA_FORMAT_VERSION = 1
+DELTA_SUFFIX = '.delta'
+# Inserted text above this share of the new version, a keyframe is smaller or about the same
+MAX_INSERTED_RATIO = 0.5
+
+
+def delta_enabled():
+    return strtobool(os.getenv('SNAPSHOT_DELTA', 'False'))
+
+
+def keyframe_interval():
+    return max(int(os.getenv('SNAPSHOT_DELTA_KEYFRAME_INTERVAL', 10)), 1)
+
+
+def is_delta(filepath):
+    return str(filepath).endswith(DELTA_SUFFIX)
+
+
+def _compress(delta):
+    import brotli
+    return brotli.compress(json.dumps(delta, separators=(',', ':')).encode('utf-8'), mode=brotli.MODE_TEXT, quality=6)
+
+
+def read_delta(filepath):
+    import brotli
+    with open(filepath, 'rb') as f:
+        return json.loads(brotli.decompress(f.read()).decode('utf-8'))
+
+
+def chain_depth(filepath):
+    """How many deltas a new version built on this snapshot would be away from its keyframe"""
+    if not is_delta(filepath):
+        return 0
+    delta = read_delta(filepath)
+    return delta['depth'] if delta.get('base') else 0
+
+
+def make_delta(base_name, base_text, text, depth):
+    """
+    The encoded delta turning base_text into text, None when a keyframe is the better choice
+    """
+    base_lines = base_text.splitlines(keepends=True)
+    lines = text.splitlines(keepends=True)
+
+    ops = []
+    inserted = 0
+    matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            ops.append([i1, i2])
+        elif j2 > j1:
+            chunk = ''.join(lines[j1:j2])
+            inserted += len(chunk)
+            ops.append(chunk)
+
+    if inserted > len(text) * MAX_INSERTED_RATIO:
+        return None
+
+    return _compress({'version': DELTA_FORMAT_VERSION, 'base': base_name, 'depth': depth, 'ops': ops})
+
+
+def make_keyframe(text):
+    """A .delta that doesn't need any other file, for rewriting a delta in place"""
+    return _compress({'version': DELTA_FORMAT_VERSION, 'base': None, 'depth': 0, 'ops': [text]})
+
+
+def apply_delta(delta, read_base):
+    """
+    :param read_base: Callable returning the text of the base snapshot, given its file name
+    """
+    if not delta.get('base'):
+        return ''.join(delta['ops'])
+
+    base_lines = read_base(delta['base']).splitlines(keepends=True)
+    parts = []
+    for op in delta['ops']:
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return ''.join(parts)
+
+
+def chain(filepath):
+    """File names this delta depends on, nearest first"""
+    names = []
+    data_dir = os.path.dirname(filepath)
+    while is_delta(filepath):
+        base = read_delta(filepath).get('base')
+        if not base:
+            break
+        names.append(base)
+        filepath = os.path.join(data_dir, base)
+    return names
+
+
+def _unused_path(data_dir, stem, suffix):
+    # Never one of the files being converted, they are still read until the end
+    n = 0
+    while True:
+        name = f"{stem}{suffix}" if not n else f"{stem}.{n}{suffix}"
+        if not os.path.exists(os.path.join(data_dir, name)):
+            return os.path.join(data_dir, name)
+        n += 1
+
+
+def migrate_history(watch, to_delta=True):
+    """
+    Rewrite the text snapshots of one watch as delta chains (or back to full copies with to_delta=False), history.txt
+    is rewritten to point at the new files once all of them exist, the old files are removed last.
+
+    :return: (bytes before, bytes after)
+    """
+    from pathlib import Path
+    from .Watch import BROTLI_COMPRESS_SIZE_THRESHOLD, _brotli_save
+
+    history = dict(watch.history)
+    if not history:
+        return 0, 0
+
+    binary_extensions = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.pdf', '.bin', '.jfif')
+    old_files = set(history.values())
+    size_before = sum(os.path.getsize(f) for f in old_files if os.path.isfile(f))
+
+    new_history = {}
+    written = {}
+    previous = None
+    for timestamp, filepath in history.items():
+        if filepath.endswith(binary_extensions):
+            new_history[timestamp] = filepath
+            previous = None
+            continue
+        if filepath in written:
+            new_history[timestamp] = written[filepath]
+            previous = (written[filepath], watch.get_history_snapshot(filepath=filepath))
+            continue
+
+        text = watch.get_history_snapshot(filepath=filepath)
+        stem = os.path.basename(filepath).split('.', 1)[0]
+        dest = None
+        if to_delta and previous is not None:
+            depth = chain_depth(previous[0]) + 1
+            if depth < keyframe_interval():
+                encoded = make_delta(os.path.basename(previous[0]), previous[1], text, depth)
+                if encoded is not None:
+                    dest = _unused_path(watch.data_dir, stem, DELTA_SUFFIX)
+                    watch._write_atomic(dest, encoded)
+        if dest is None:
+            if len(text) > BROTLI_COMPRESS_SIZE_THRESHOLD:
+                import brotli
+                dest = _brotli_save(text, _unused_path(watch.data_dir, stem, '.txt.br'), mode=brotli.MODE_TEXT, fallback_uncompressed=True)
+            else:
+                dest = _unused_path(watch.data_dir, stem, '.txt')
+                watch._write_atomic(dest, text.encode('utf-8'))
+
+        written[filepath] = dest
+        new_history[timestamp] = dest
+        previous = (dest, text)
+
+    index = os.path.join(watch.data_dir, watch.history_index_filename)
+    watch._write_atomic(index, "".join(f"{k},{Path(v).name}\n" for k, v in new_history.items()), mode='w')
+    for filepath in old_files - set(new_history.values()):
+        Path(filepath).unlink(missing_ok=True)
+
+    size_after = sum(os.path.getsize(f) for f in set(new_history.values()) if os.path.isfile(f))
+    return size_before, size_after
+
+
+def main():
+    """
+    python3 -m changedetectionio.model.snapshot_delta -d /datastore [-r]
+
+    Converts the history of every watch to delta chains, -r converts it back to full snapshots.
+    Only run it while changedetection.io is stopped.
+    """
+    import getopt
+    import sys
+
+    from changedetectionio.model import Watch
+
+    opts, _args = getopt.getopt(sys.argv[1:], "d:r")
+    opts = dict(opts)
+    datastore_path = opts.get('-d', '/datastore')
+    to_delta = '-r' not in opts
+
+    total_before = total_after = 0
+    for entry in sorted(os.scandir(datastore_path), key=lambda e: e.name):
+        watch_json = os.path.join(entry.path, 'watch.json')
+        if not entry.is_dir() or not os.path.isfile(watch_json):
+            continue
+        with open(watch_json, 'r', encoding='utf-8') as f:
+            watch_data = json.load(f)
+        watch_data['uuid'] = entry.name
+        watch = Watch.model(datastore_path=datastore_path, __datastore={'settings': {'application': {}}, 'watching': {}},
+                            default=watch_data)
+        try:
+            before, after = migrate_history(watch, to_delta=to_delta)
+        except Exception as e:
+            logger.error(f"{entry.name} - history not converted: {e}")
+            continue
+        total_before += before
+        total_after += after
+        logger.info(f"{entry.name} - {len(watch.history)} snapshots, {before} -> {after} bytes")
+
+    logger.success(f"Snapshots {total_before} -> {total_after} bytes")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,220 @@
+"""
+Delivery side of the notifications, used by handler.process_notification() and flask_app.notification_runner()
+
+- Apprise instances are kept per unique set of (rendered) notification URLs, so the URLs are parsed and the plugins
+  are set up once instead of for every notification.
+- Digests: with NOTIFICATION_DIGEST_SECONDS set, a notification runner that takes a notification from the queue also
+  waits up to that many seconds for more. Those that go to exactly the same URLs (for example many watches of one tag
+  changing in the same recheck sweep) are sent as one message with the bodies one after the other.
+- Metrics per endpoint, 'scheme://host' for the HTTP-style and mail URLs and only 'scheme://' for the others
+  (their host part is often a token), see get_stats().
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import urlparse
+
+import apprise
+from loguru import logger
+
+from .apprise_plugin.assets import apprise_asset
+from .apprise_plugin.discord import NotifyDiscordCustom
+
+NOTIFICATION_DIGEST_SECONDS = float(os.getenv('NOTIFICATION_DIGEST_SECONDS', 0))
+NOTIFICATION_DIGEST_MAX_ITEMS = int(os.getenv('NOTIFICATION_DIGEST_MAX_ITEMS', 20))
+APPRISE_INSTANCE_CACHE_SIZE = int(os.getenv('APPRISE_INSTANCE_CACHE_SIZE', 200))
+
+# Same limits as handler.apply_service_tweaks(), a digest is split into several messages to stay under them
+DIGEST_BODY_LIMITS = {
+    'tgram://': 3600,
+    'discord://': 1700,
+    'https://discordapp.com/api/webhooks': 1700,
+    'https://discord.com/api': 1700,
+}
+
+_ENDPOINT_HOST_SCHEMES = {'http', 'https', 'json', 'jsons', 'xml', 'xmls', 'form', 'forms', 'post', 'posts', 'get',
+                          'gets', 'put', 'puts', 'delete', 'deletes', 'head', 'heads', 'patch', 'patchs', 'mailto',
+                          'mailtos'}
+
+_plugins_lock = threading.Lock()
+
+
+def register_apprise_plugins():
+    """Override Apprise's built-in Discord plugin with ours (colored embeds for the diff), only once"""
+    with _plugins_lock:
+        if apprise.plugins.N_MGR['discord'] is not NotifyDiscordCustom:
+            apprise.plugins.N_MGR.remove('discord')
+            apprise.plugins.N_MGR.add(NotifyDiscordCustom, schemas='discord')
+
+
+def endpoint_label(url):
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return 'unknown'
+    scheme = (parsed.scheme or 'unknown').lower()
+    if scheme in _ENDPOINT_HOST_SCHEMES and parsed.hostname:
+        return f"{scheme}://{parsed.hostname}"
+    return f"{scheme}://"
+
+
+class AppriseInstances:
+    """Least recently used apprise.Apprise objects, keyed by the tuple of URLs added to them"""
+
+    def __init__(self, max_size=APPRISE_INSTANCE_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._instances = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get(self, urls):
+        key = tuple(urls)
+        with self._lock:
+            apobj = self._instances.get(key)
+            if apobj is not None:
+                self._instances.move_to_end(key)
+                self.stats['hits'] += 1
+                return apobj
+            self.stats['misses'] += 1
+
+        register_apprise_plugins()
+        apobj = apprise.Apprise(debug=True, asset=apprise_asset)
+        # Every URL has to be added, the warning Apprise logs for a bad one is what reports it to the user
+        added = [apobj.add(url) for url in urls]
+
+        # Not kept when a URL was rejected, so the next notification reports it again
+        if all(added):
+            with self._lock:
+                self._instances[key] = apobj
+                while len(self._instances) > self.max_size:
+                    self._instances.popitem(last=False)
+        return apobj
+
+    def clear(self):
+        with self._lock:
+            self._instances.clear()
+
+    def __len__(self):
+        return len(self._instances)
+
+
+class DeliveryMetrics:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, urls, seconds, ok, notifications=1, queued_at=None):
+        """One Apprise notify() call to these URLs, which delivered 'notifications' queued notifications"""
+        now = time.time()
+        queued_seconds = now - queued_at if queued_at else None
+        with self._lock:
+            for label in {endpoint_label(url) for url in urls}:
+                m = self._endpoints.get(label)
+                if m is None:
+                    m = self._endpoints[label] = {'sent': 0, 'failed': 0, 'notifications': 0, 'send_seconds_total': 0.0,
+                                                  'send_seconds_max': 0.0, 'queued_seconds_max': 0.0,
+                                                  'recent': deque(maxlen=1000)}
+                m['sent' if ok else 'failed'] += 1
+                m['notifications'] += notifications
+                m['send_seconds_total'] += seconds
+                m['send_seconds_max'] = max(m['send_seconds_max'], seconds)
+                if queued_seconds is not None:
+                    m['queued_seconds_max'] = max(m['queued_seconds_max'], queued_seconds)
+                m['recent'].append(now)
+
+    def get_stats(self):
+        now = time.time()
+        with self._lock:
+            stats = {}
+            for label, m in sorted(self._endpoints.items()):
+                calls = m['sent'] + m['failed']
+                stats[label] = {
+                    'sent': m['sent'],
+                    'failed': m['failed'],
+                    'notifications': m['notifications'],
+                    'sent_last_minute': sum(1 for t in m['recent'] if now - t <= 60),
+                    'send_ms_avg': round(m['send_seconds_total'] / calls * 1000, 1) if calls else 0,
+                    'send_ms_max': round(m['send_seconds_max'] * 1000, 1),
+                    'queued_ms_max': round(m['queued_seconds_max'] * 1000, 1),
+                }
+            return stats
+
+    def clear(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+apprise_instances = AppriseInstances()
+delivery_metrics = DeliveryMetrics()
+
+
+def notify(urls, notifications=1, queued_at=None, **notify_kwargs):
+    apobj = apprise_instances.get(urls)
+    start = time.time()
+    ok = False
+    try:
+        ok = apobj.notify(**notify_kwargs)
+        return ok
+    finally:
+        delivery_metrics.record(urls, time.time() - start, ok=bool(ok), notifications=notifications, queued_at=queued_at)
+
+
+def _digest_body_limit(urls):
+    limits = [limit for url in urls for prefix, limit in DIGEST_BODY_LIMITS.items() if url.startswith(prefix)]
+    return min(limits) if limits else None
+
+
+def _merge(members):
+    if len(members) == 1:
+        return members[0]
+    first = members[0]
+    separator = '<hr>\n' if first['body_format'] == apprise.NotifyFormat.HTML.value else '\n\n---\n\n'
+    return {
+        **first,
+        'title': f"{first['title']} (+{len(members) - 1} more)",
+        'body': separator.join(m['body'] for m in members),
+        'sent_objs': [sent for m in members for sent in m['sent_objs']],
+        # Screenshots can't be combined
+        'attach': None,
+        'queued_at': min((m['queued_at'] for m in members if m['queued_at']), default=None),
+        'notifications': len(members),
+    }
+
+
+def digest_rendered_notifications(rendered):
+    """
+    Groups handler.render_notification() results going to the same URLs in the same body format,
+    returns [(indexes into rendered, rendered notification to send)], in the order they were queued
+    """
+    groups = OrderedDict()
+    for i, r in enumerate(rendered):
+        groups.setdefault((tuple(r['apprise_urls']), r['body_format']), []).append(i)
+
+    batches = []
+    for (urls, _), indexes in groups.items():
+        limit = _digest_body_limit(urls)
+        chunk = []
+        length = 0
+        for i in indexes:
+            body_length = len(rendered[i]['body'] or '')
+            if chunk and limit and length + body_length > limit:
+                batches.append((chunk, _merge([rendered[n] for n in chunk])))
+                chunk, length = [], 0
+            chunk.append(i)
+            length += body_length
+        batches.append((chunk, _merge([rendered[n] for n in chunk])))
+
+    if len(batches) < len(rendered):
+        logger.debug(f"Notification digest - {len(rendered)} notifications sent as {len(batches)} messages")
+    return batches
+
+
+def get_stats():
+    return {
+        'endpoints': delivery_metrics.get_stats(),
+        'apprise_instances': {'cached': len(apprise_instances), **apprise_instances.stats},
+        'digest_seconds': NOTIFICATION_DIGEST_SECONDS,
+    }
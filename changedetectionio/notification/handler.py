@@ -299,12 +299,23 @@ def apply_service_tweaks(url, n_body, n_title, requested_output_format):
 
 
 def process_notification(n_object: NotificationContextData, datastore):
+    rendered = render_notification(n_object, datastore)
+    if rendered is None:
+        return None
+    send_rendered_notification(rendered)
+    # Return what was sent for better logging
+    return rendered['sent_objs']
+
+
+def render_notification(n_object: NotificationContextData, datastore):
+    """
+    Everything process_notification() does before handing over to Apprise, the result goes to send_rendered_notification()
+    (or is first merged with others by delivery.digest_rendered_notifications())
+    """
     from changedetectionio.jinja2_custom import render as jinja_render
     from . import USE_SYSTEM_DEFAULT_NOTIFICATION_FORMAT_FOR_WATCH, default_notification_format, valid_notification_formats
     # be sure its registered
     from .apprise_plugin.custom_handlers import apprise_http_custom_handler
-    # Register custom Discord plugin
-    from .apprise_plugin.discord import NotifyDiscordCustom
 
     if not isinstance(n_object, NotificationContextData):
         raise TypeError(f"Expected NotificationContextData, got {type(n_object)}")
@@ -331,23 +342,13 @@ def process_notification(n_object: NotificationContextData, datastore):
 
     logger.trace(f"Complete notification body including Jinja and placeholders calculated in  {time.time() - now:.2f}s")
 
-    # https://github.com/caronc/apprise/wiki/Development_LogCapture
-    # Anything higher than or equal to WARNING (which covers things like Connection errors)
-    # raise it as an exception
-
     sent_objs = []
+    # URLs for Apprise, the Apprise object for this set of URLs is re-used (see delivery.py)
+    apprise_urls = []
 
     if 'as_async' in n_object:
         apprise_asset.async_mode = n_object.get('as_async')
 
-    apobj = apprise.Apprise(debug=True, asset=apprise_asset)
-
-    # Override Apprise's built-in Discord plugin with our custom one
-    # This allows us to use colored embeds for diff content
-    # First remove the built-in discord plugin, then add our custom one
-    apprise.plugins.N_MGR.remove('discord')
-    apprise.plugins.N_MGR.add(NotifyDiscordCustom, schemas='discord')
-
     if not n_object.get('notification_urls'):
         return None
 
@@ -361,98 +362,120 @@ def process_notification(n_object: NotificationContextData, datastore):
         )
     )
 
-    with (apprise.LogCapture(level=apprise.logging.DEBUG) as logs):
-        for url in n_object['notification_urls']:
+    n_body = n_title = ''
+    apprise_input_format = "NO-THANKS-WE-WILL-MANAGE-ALL-OF-THIS"
 
-            n_body = jinja_render(template_str=n_object.get('notification_body', ''), **notification_parameters)
-            n_title = jinja_render(template_str=n_object.get('notification_title', ''), **notification_parameters)
+    for url in n_object['notification_urls']:
 
-            if n_object.get('markup_text_links_to_html_links'):
-                n_body = markup_text_links_to_html(body=n_body)
+        n_body = jinja_render(template_str=n_object.get('notification_body', ''), **notification_parameters)
+        n_title = jinja_render(template_str=n_object.get('notification_title', ''), **notification_parameters)
 
-            url = url.strip()
-            if not url or url.startswith('#'):
-                logger.debug(f"Skipping commented out or empty notification URL - '{url}'")
-                continue
+        if n_object.get('markup_text_links_to_html_links'):
+            n_body = markup_text_links_to_html(body=n_body)
 
-            logger.info(f">> Process Notification: AppRise start notifying '{url}'")
-            url = jinja_render(template_str=url, **notification_parameters)
+        url = url.strip()
+        if not url or url.startswith('#'):
+            logger.debug(f"Skipping commented out or empty notification URL - '{url}'")
+            continue
 
-            # If it's a plaintext document, and they want HTML type email/alerts, so it needs to be escaped
-            watch_mime_type = n_object.get('watch_mime_type')
-            if watch_mime_type and 'text/' in watch_mime_type.lower() and not 'html' in watch_mime_type.lower():
-                if 'html' in requested_output_format:
-                    from markupsafe import escape
-                    n_body = str(escape(n_body))
+        logger.info(f">> Process Notification: AppRise start notifying '{url}'")
+        url = jinja_render(template_str=url, **notification_parameters)
 
+        # If it's a plaintext document, and they want HTML type email/alerts, so it needs to be escaped
+        watch_mime_type = n_object.get('watch_mime_type')
+        if watch_mime_type and 'text/' in watch_mime_type.lower() and not 'html' in watch_mime_type.lower():
             if 'html' in requested_output_format:
-                # Since the n_body is always some kind of text from the 'diff' engine, attempt to preserve whitespaces that get sent to the HTML output
-                # But only where its more than 1 consecutive whitespace, otherwise "and this" becomes "and&nbsp;this" etc which is too much.
-                n_body = n_body.replace('  ', '&nbsp;&nbsp;')
-
-            (url, n_body, n_title) = apply_service_tweaks(url=url, n_body=n_body, n_title=n_title, requested_output_format=requested_output_format_original)
-
-            apprise_input_format = "NO-THANKS-WE-WILL-MANAGE-ALL-OF-THIS"
-
-            if not 'format=' in url:
-                parsed_url = urlparse(url)
-                prefix_add_to_url = '?' if not parsed_url.query else '&'
-
-                # THIS IS THE TRICK HOW TO DISABLE APPRISE DOING WEIRD AUTO-CONVERSION WITH BREAKING BR TAGS ETC
-                if 'html' in requested_output_format:
-                    url = f"{url}{prefix_add_to_url}format={NotifyFormat.HTML.value}"
-                    apprise_input_format = NotifyFormat.HTML.value
-                elif 'text' in requested_output_format:
-                    url = f"{url}{prefix_add_to_url}format={NotifyFormat.TEXT.value}"
-                    apprise_input_format = NotifyFormat.TEXT.value
-
-                elif requested_output_format == NotifyFormat.MARKDOWN.value:
-                    # Convert markdown to HTML ourselves since not all plugins do this
-                    from apprise.conversion import markdown_to_html
-                    # Make sure there are paragraph breaks around horizontal rules
-                    n_body = n_body.replace('---', '\n\n---\n\n')
-                    n_body = markdown_to_html(n_body)
-                    url = f"{url}{prefix_add_to_url}format={NotifyFormat.HTML.value}"
-                    requested_output_format = NotifyFormat.HTML.value
-                    apprise_input_format = NotifyFormat.HTML.value  # Changed from MARKDOWN to HTML
-
-            else:
-                # ?format was IN the apprise URL, they are kind of on their own here, we will try our best
-                if 'format=html' in url:
-                    n_body = newline_re.sub('<br>\r\n', n_body)
-                    # This will also prevent apprise from doing conversion
-                    apprise_input_format = NotifyFormat.HTML.value
-                    requested_output_format = NotifyFormat.HTML.value
-                elif 'format=text' in url:
-                    apprise_input_format = NotifyFormat.TEXT.value
-                    requested_output_format = NotifyFormat.TEXT.value
-
-#@todo on null:// (only if its a 1 url with null) probably doesnt need to actually .add/setup/etc
-            sent_objs.append({'title': n_title,
-                              'body': n_body,
-                              'url': url,
-                              # So that we can do a null:// call and get back exactly what would have been sent
-                              'original_context': n_object })
-
-            if not url.startswith('null://'):
-                apobj.add(url)
-
-            # Since the output is always based on the plaintext of the 'diff' engine, wrap it nicely.
-            # It should always be similar to the 'history' part of the UI.
-            if url.startswith('mail') and 'html' in requested_output_format:
-                if not '<pre' in n_body and not '<body' in n_body: # No custom HTML-ish body was setup already
-                    n_body = as_monospaced_html_email(content=n_body, title=n_title)
+                from markupsafe import escape
+                n_body = str(escape(n_body))
+
+        if 'html' in requested_output_format:
+            # Since the n_body is always some kind of text from the 'diff' engine, attempt to preserve whitespaces that get sent to the HTML output
+            # But only where its more than 1 consecutive whitespace, otherwise "and this" becomes "and&nbsp;this" etc which is too much.
+            n_body = n_body.replace('  ', '&nbsp;&nbsp;')
+
+        (url, n_body, n_title) = apply_service_tweaks(url=url, n_body=n_body, n_title=n_title, requested_output_format=requested_output_format_original)
+
+        apprise_input_format = "NO-THANKS-WE-WILL-MANAGE-ALL-OF-THIS"
+
+        if not 'format=' in url:
+            parsed_url = urlparse(url)
+            prefix_add_to_url = '?' if not parsed_url.query else '&'
+
+            # THIS IS THE TRICK HOW TO DISABLE APPRISE DOING WEIRD AUTO-CONVERSION WITH BREAKING BR TAGS ETC
+            if 'html' in requested_output_format:
+                url = f"{url}{prefix_add_to_url}format={NotifyFormat.HTML.value}"
+                apprise_input_format = NotifyFormat.HTML.value
+            elif 'text' in requested_output_format:
+                url = f"{url}{prefix_add_to_url}format={NotifyFormat.TEXT.value}"
+                apprise_input_format = NotifyFormat.TEXT.value
+
+            elif requested_output_format == NotifyFormat.MARKDOWN.value:
+                # Convert markdown to HTML ourselves since not all plugins do this
+                from apprise.conversion import markdown_to_html
+                # Make sure there are paragraph breaks around horizontal rules
+                n_body = n_body.replace('---', '\n\n---\n\n')
+                n_body = markdown_to_html(n_body)
+                url = f"{url}{prefix_add_to_url}format={NotifyFormat.HTML.value}"
+                requested_output_format = NotifyFormat.HTML.value
+                apprise_input_format = NotifyFormat.HTML.value  # Changed from MARKDOWN to HTML
+
+        else:
+            # ?format was IN the apprise URL, they are kind of on their own here, we will try our best
+            if 'format=html' in url:
+                n_body = newline_re.sub('<br>\r\n', n_body)
+                # This will also prevent apprise from doing conversion
+                apprise_input_format = NotifyFormat.HTML.value
+                requested_output_format = NotifyFormat.HTML.value
+            elif 'format=text' in url:
+                apprise_input_format = NotifyFormat.TEXT.value
+                requested_output_format = NotifyFormat.TEXT.value
+
+        sent_objs.append({'title': n_title,
+                          'body': n_body,
+                          'url': url,
+                          # So that we can do a null:// call and get back exactly what would have been sent
+                          'original_context': n_object })
 
         if not url.startswith('null://'):
-            apobj.notify(
-                title=n_title,
-                body=n_body,
-                # `body_format` Tell apprise what format the INPUT is in, specify a wrong/bad type and it will force skip conversion in apprise
-                # &format= in URL Tell apprise what format the OUTPUT should be in (it can convert between)
-                body_format=apprise_input_format,
-                # False is not an option for AppRise, must be type None
-                attach=n_object.get('screenshot', None)
-            )
+            apprise_urls.append(url)
+
+        # Since the output is always based on the plaintext of the 'diff' engine, wrap it nicely.
+        # It should always be similar to the 'history' part of the UI.
+        if url.startswith('mail') and 'html' in requested_output_format:
+            if not '<pre' in n_body and not '<body' in n_body: # No custom HTML-ish body was setup already
+                n_body = as_monospaced_html_email(content=n_body, title=n_title)
+
+    return {
+        'sent_objs': sent_objs,
+        'apprise_urls': apprise_urls,
+        'title': n_title,
+        'body': n_body,
+        # `body_format` Tell apprise what format the INPUT is in, specify a wrong/bad type and it will force skip conversion in apprise
+        # &format= in URL Tell apprise what format the OUTPUT should be in (it can convert between)
+        'body_format': apprise_input_format,
+        # False is not an option for AppRise, must be type None
+        'attach': n_object.get('screenshot', None),
+        'queued_at': n_object.get('notification_timestamp'),
+    }
+
+
+def send_rendered_notification(rendered):
+    from .delivery import notify
+
+    if not rendered.get('apprise_urls'):
+        return
+
+    # https://github.com/caronc/apprise/wiki/Development_LogCapture
+    # Anything higher than or equal to WARNING (which covers things like Connection errors)
+    # raise it as an exception
+    with (apprise.LogCapture(level=apprise.logging.DEBUG) as logs):
+        notify(rendered['apprise_urls'],
+               notifications=rendered.get('notifications', 1),
+               queued_at=rendered.get('queued_at'),
+               title=rendered['title'],
+               body=rendered['body'],
+               body_format=rendered['body_format'],
+               attach=rendered['attach'])
 
         # Returns empty string if nothing found, multi-line string otherwise
         log_value = logs.getvalue()
@@ -461,9 +484,6 @@ def process_notification(n_object: NotificationContextData, datastore):
             logger.critical(log_value)
             raise Exception(log_value)
 
-    # Return what was sent for better logging - after the for loop
-    return sent_objs
-
 
 # Notification title + body content parameters get created here.
 # ( Where we prepare the tokens in the notification to be replaced with actual values )
@@ -237,12 +237,15 @@ def register_builtin_fetchers():
     This is called from content_fetchers/__init__.py after all fetchers are imported
     to avoid circular import issues.
     """
-    from changedetectionio.content_fetchers import requests, playwright, puppeteer, webdriver_selenium
+    from changedetectionio.content_fetchers import requests, aiohttp_fetcher, playwright, puppeteer, webdriver_selenium
 
     # Register each built-in fetcher plugin
     if hasattr(requests, 'requests_plugin'):
         plugin_manager.register(requests.requests_plugin, 'builtin_requests')
 
+    if hasattr(aiohttp_fetcher, 'aiohttp_plugin'):
+        plugin_manager.register(aiohttp_fetcher.aiohttp_plugin, 'builtin_aiohttp')
+
     if hasattr(playwright, 'playwright_plugin'):
         plugin_manager.register(playwright.playwright_plugin, 'builtin_playwright')
 
@@ -3,6 +3,7 @@ import hashlib
 
 from changedetectionio.browser_steps.browser_steps import browser_steps_get_valid_steps
 from changedetectionio.content_fetchers.base import Fetcher
+from changedetectionio.content_fetchers.exceptions import checksumFromPreviousCheckWasTheSame
 from changedetectionio.strtobool import strtobool
 from copy import deepcopy
 from abc import abstractmethod
@@ -65,6 +66,59 @@ class difference_detection_processor():
             self.last_raw_content_checksum = checksum
         except IOError as e:
             logger.warning(f"Failed to write checksum file for {self.watch_uuid}: {e}")
+            return
+
+        self.update_last_validators(data_dir)
+
+    def update_last_validators(self, data_dir):
+        """
+        Keep the ETag/Last-Modified of the response that checksum came from, for the next conditional fetch.
+        A fetcher without conditional requests (or a response without validators) clears them, they would belong
+        to an older response.
+        """
+        from changedetectionio.conditional_requests import read_validators, write_validators, response_validators
+
+        if self.fetcher.supports_conditional_requests:
+            current = response_validators(self.fetcher.headers)
+        else:
+            current = {'etag': None, 'last_modified': None}
+
+        validators = read_validators(data_dir)
+        if not any(current.values()) and not any(validators.get(k) for k in current):
+            return
+        validators.update(current)
+        write_validators(data_dir, validators)
+
+    def _conditional_request_headers(self, request_method, request_body, request_headers):
+        """If-None-Match/If-Modified-Since to send, {} when the full response is needed (see conditional_requests.py)"""
+        from changedetectionio.conditional_requests import conditional_requests_enabled, read_validators, request_headers_for
+
+        if not self.fetcher.supports_conditional_requests or not conditional_requests_enabled():
+            return {}
+        if not self.last_raw_content_checksum or self.watch.has_browser_steps:
+            return {}
+        if (request_method or 'GET').upper() != 'GET' or request_body:
+            return {}
+        # The live watch, edits since this check started also need the body
+        watch = self.datastore.data['watching'].get(self.watch_uuid)
+        if not watch or watch.was_edited:
+            return {}
+        if 'If-None-Match' in request_headers or 'If-Modified-Since' in request_headers:
+            return {}
+        return request_headers_for(read_validators(watch.data_dir))
+
+    def _record_conditional_request(self, not_modified):
+        from changedetectionio.conditional_requests import conditional_request_stats, read_validators, write_validators
+
+        conditional_request_stats.record(not_modified)
+        watch = self.datastore.data['watching'].get(self.watch_uuid)
+        if not watch or not watch.data_dir:
+            return
+        validators = read_validators(watch.data_dir)
+        validators['requests'] = validators.get('requests', 0) + 1
+        if not_modified:
+            validators['not_modified'] = validators.get('not_modified', 0) + 1
+        write_validators(watch.data_dir, validators)
 
     def read_last_raw_content_checksum(self):
         """
@@ -111,9 +165,11 @@ class difference_detection_processor():
         # Requests, playwright, other browser via wss:// etc, fetch_extra_something
         prefer_fetch_backend = self.watch.get('fetch_backend', 'system')
 
+        # The watch's tags, textfile headers and proxy, merged once and kept until something changes
+        effective_config = self.datastore.effective_config.get(self.watch.get('uuid'))
+
         # Proxy ID "key"
-        preferred_proxy_id = preferred_proxy_id if preferred_proxy_id else self.datastore.get_preferred_proxy_for_watch(
-            uuid=self.watch.get('uuid'))
+        preferred_proxy_id = preferred_proxy_id if preferred_proxy_id else effective_config.preferred_proxy_id
 
         # Pluggable content self.fetcher
         if not prefer_fetch_backend or prefer_fetch_backend == 'system':
@@ -184,7 +240,7 @@ class difference_detection_processor():
 
         request_headers.update(self.watch.get('headers', {}))
         request_headers.update(self.datastore.get_all_base_headers())
-        request_headers.update(self.datastore.get_all_headers_in_textfile_for_watch(uuid=self.watch.get('uuid')))
+        request_headers.update(effective_config.headers_from_textfiles())
 
         # https://github.com/psf/requests/issues/4525
         # Requests doesnt yet support brotli encoding, so don't put 'br' here, be totally sure that the user cannot
@@ -217,23 +273,36 @@ class difference_detection_processor():
         # Requests for PDF's, images etc should be passwd the is_binary flag
         is_binary = self.watch.is_pdf
 
+        # Only download it when it changed since the last check, see conditional_requests.py
+        conditional_headers = self._conditional_request_headers(request_method, request_body, request_headers)
+        if conditional_headers:
+            request_headers.update(conditional_headers)
+            self.fetcher.conditional_request = True
+
         # And here we go! call the right browser with browser-specific settings
         empty_pages_are_a_change = self.datastore.data['settings']['application'].get('empty_pages_are_a_change', False)
         # All fetchers are now async
-        await self.fetcher.run(
-            current_include_filters=self.watch.get('include_filters'),
-            empty_pages_are_a_change=empty_pages_are_a_change,
-            fetch_favicon=self.watch.favicon_is_expired(),
-            ignore_status_codes=ignore_status_codes,
-            is_binary=is_binary,
-            request_body=request_body,
-            request_headers=request_headers,
-            request_method=request_method,
-            screenshot_format=self.screenshot_format,
-            timeout=timeout,
-            url=url,
-            watch_uuid=self.watch_uuid,
-        )
+        try:
+            await self.fetcher.run(
+                current_include_filters=self.watch.get('include_filters'),
+                empty_pages_are_a_change=empty_pages_are_a_change,
+                fetch_favicon=self.watch.favicon_is_expired(),
+                ignore_status_codes=ignore_status_codes,
+                is_binary=is_binary,
+                request_body=request_body,
+                request_headers=request_headers,
+                request_method=request_method,
+                screenshot_format=self.screenshot_format,
+                timeout=timeout,
+                url=url,
+                watch_uuid=self.watch_uuid,
+            )
+        except checksumFromPreviousCheckWasTheSame:
+            if self.fetcher.conditional_request:
+                self._record_conditional_request(not_modified=True)
+            raise
+        if self.fetcher.conditional_request:
+            self._record_conditional_request(not_modified=False)
 
         # @todo .quit here could go on close object, so we can run JS if change-detected
         await self.fetcher.quit(watch=self.watch)
@@ -250,26 +319,9 @@ class difference_detection_processor():
         Returns:
             dict: Parsed JSON data, or empty dict if file doesn't exist
         """
-        import json
-        import os
-
-        watch = self.datastore.data['watching'].get(self.watch_uuid)
-        data_dir = watch.data_dir
-
-        if not data_dir:
-            return {}
-
-        filepath = os.path.join(data_dir, filename)
-
-        if not os.path.isfile(filepath):
-            return {}
-
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            logger.warning(f"Failed to read extra watch config {filename}: {e}")
-            return {}
+        # Only parsed again when the file changes, see store/effective_config.py
+        effective_config = self.datastore.effective_config.get(self.watch_uuid)
+        return effective_config.extra_watch_config(filename) if effective_config else {}
 
     def update_extra_watch_config(self, filename, data, merge=True):
         """
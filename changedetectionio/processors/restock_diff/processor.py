@@ -140,7 +140,6 @@ def _extract_itemprop_availability_worker(pipe_conn):
         pipe_conn: Pipe connection to receive HTML and send result
     """
     import json
-    import gc
 
     html_content = None
     result_data = None
@@ -152,7 +151,6 @@ def _extract_itemprop_availability_worker(pipe_conn):
 
         # Explicitly delete html_bytes to free memory
         del html_bytes
-        gc.collect()
 
         # Perform extraction in subprocess (uses extruct/lxml)
         result_data = get_itemprop_availability(html_content)
@@ -166,7 +164,6 @@ def _extract_itemprop_availability_worker(pipe_conn):
 
         # Clean up before exit
         del result_data, html_content, result
-        gc.collect()
 
     except MoreThanOnePriceFound:
         # Serialize the specific exception type
@@ -196,7 +193,7 @@ def _extract_itemprop_availability_worker(pipe_conn):
             del result_data
         except (NameError, UnboundLocalError):
             pass
-        gc.collect()
+        # No gc.collect(), the process exits and gives everything back anyway
         pipe_conn.close()
 
 
@@ -249,7 +246,6 @@ def extract_itemprop_availability_safe(html_content) -> Restock:
     if platform.system() == 'Linux':
         import multiprocessing
         import json
-        import gc
 
         try:
             ctx = multiprocessing.get_context('spawn')
@@ -263,7 +259,6 @@ def extract_itemprop_availability_safe(html_content) -> Restock:
 
             # Explicitly delete html_bytes copy immediately after sending
             del html_bytes
-            gc.collect()
 
             # Receive result as JSON
             result_bytes = parent_conn.recv_bytes()
@@ -276,9 +271,8 @@ def extract_itemprop_availability_safe(html_content) -> Restock:
             parent_conn.close()
             child_conn.close()
 
-            # Clean up all subprocess-related objects
+            # Clean up all subprocess-related objects, the memory governor collects after the check when it's worth it
             del p, parent_conn, child_conn, result_bytes
-            gc.collect()
 
             # Handle result or re-raise exception
             if result['success']:
@@ -286,14 +280,12 @@ def extract_itemprop_availability_safe(html_content) -> Restock:
                 restock_obj = Restock(result['data'])
                 # Clean up result dict
                 del result
-                gc.collect()
                 return restock_obj
             else:
                 # Re-raise the exception that occurred in subprocess
                 exception_type = result['exception_type']
                 exception_msg = result.get('exception_message', '')
                 del result
-                gc.collect()
 
                 if exception_type == 'MoreThanOnePriceFound':
                     raise MoreThanOnePriceFound()
@@ -303,7 +295,6 @@ def extract_itemprop_availability_safe(html_content) -> Restock:
         except Exception as e:
             # If multiprocessing itself fails, log and fall back to direct call
             logger.warning(f"Subprocess extraction failed: {e}, falling back to direct call")
-            gc.collect()
             return get_itemprop_availability(html_content)
     else:
         # Non-Linux: direct call (no subprocess overhead needed)
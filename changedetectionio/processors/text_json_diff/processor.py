@@ -10,7 +10,7 @@ from changedetectionio.conditions import execute_ruleset_against_all_plugins
 from changedetectionio.content_fetchers.exceptions import checksumFromPreviousCheckWasTheSame
 from ..base import difference_detection_processor
 from changedetectionio.html_tools import PERL_STYLE_REGEX, cdata_in_document_to_text, TRANSLATE_WHITESPACE_TABLE
-from changedetectionio import html_tools, content_fetchers
+from changedetectionio import html_tools, content_fetchers, strtobool
 from changedetectionio.blueprint.price_data_follower import PRICE_DATA_TRACK_ACCEPT
 from loguru import logger
 
@@ -170,15 +170,28 @@ class RuleEngine:
     """Evaluates blocking rules (triggers, conditions, text_should_not_be_present)."""
 
     @staticmethod
-    def evaluate_trigger_text(content, trigger_patterns):
+    def compile_rules(watch, filter_config):
+        """ignore/trigger/block rules for this watch, compiled once per watch config (see Watch.compiled_rules)"""
+        return watch.compiled_rules(
+            ignore_text=filter_config.ignore_text,
+            trigger_text=filter_config.trigger_text,
+            text_should_not_be_present=filter_config.text_should_not_be_present
+        )
+
+    @staticmethod
+    def evaluate_trigger_text(content, trigger_patterns, matches=None):
         """
         Check if trigger text is present. If trigger_text is configured,
         content is blocked UNLESS the trigger is found.
         Returns True if blocked, False if allowed.
+        matches: optional html_tools.RuleMatches already evaluated against content
         """
         if not trigger_patterns:
             return False
 
+        if matches is not None:
+            return not matches.triggered
+
         # Assume blocked if trigger_text is configured
         result = html_tools.strip_ignore_text(
             content=str(content),
@@ -189,14 +202,18 @@ class RuleEngine:
         return not bool(result)
 
     @staticmethod
-    def evaluate_text_should_not_be_present(content, patterns):
+    def evaluate_text_should_not_be_present(content, patterns, matches=None):
         """
         Check if forbidden text is present. If found, block the change.
         Returns True if blocked, False if allowed.
+        matches: optional html_tools.RuleMatches already evaluated against content
         """
         if not patterns:
             return False
 
+        if matches is not None:
+            return bool(matches.blocked)
+
         result = html_tools.strip_ignore_text(
             content=str(content),
             wordlist=patterns,
@@ -344,6 +361,64 @@ class ContentProcessor:
         """Remove elements matching subtractive selectors."""
         return html_tools.element_removal(self.filter_config.subtractive_selectors, content)
 
+    def use_single_parse_pipeline(self, stream_content_type):
+        """
+        Should this document go through the single parse lxml pipeline (HTML_SINGLE_PARSE_PIPELINE=True)?
+
+        Only plain HTML where the result is rendered to text, and only when every CSS selector can be
+        translated for lxml, anything else keeps using the string based filters.
+        """
+        if not strtobool(os.getenv('HTML_SINGLE_PARSE_PIPELINE', 'False')):
+            return False
+
+        if (not stream_content_type.is_html or stream_content_type.is_rss or stream_content_type.is_xml
+                or self.watch.is_source_type_url or self.filter_config.has_include_json_filters):
+            return False
+
+        css_rules = []
+        if self.filter_config.has_include_filters:
+            css_rules += [r for r in self.filter_config.include_filters if not (r[0] == '/' or r.startswith('xpath'))]
+        if self.filter_config.has_subtractive_selectors:
+            css_rules += [r.strip().strip(",") for r in self.filter_config.subtractive_selectors
+                          if not r.strip().startswith(('xpath:', 'xpath1:', '//'))]
+        try:
+            for rule in css_rules:
+                html_tools.css_selector_to_xpath(rule)
+        except Exception as e:
+            # cssselect not installed, or a selector only BeautifulSoup/soupsieve understands
+            logger.debug(f"Watch UUID {self.watch.get('uuid')} - Not using single parse pipeline - {str(e)}")
+            return False
+
+        return True
+
+    def single_parse_html_to_text(self, content):
+        """
+        Parse the HTML once and run include filters, subtractive selectors and text extraction on that same tree.
+
+        Returns (tree, text), the tree is only turned back into HTML if something else needs it.
+        """
+        html_tree = html_tools.html_to_tree(content)
+
+        if self.filter_config.has_include_filters:
+            html_tree = html_tools.tree_include_filters(
+                tree=html_tree,
+                include_filters=self.filter_config.include_filters,
+                append_pretty_line_formatting=not self.watch.is_source_type_url
+            ) if html_tree is not None else None
+
+            if html_tree is None:
+                raise FilterNotFoundInResponse(
+                    msg=self.filter_config.include_filters,
+                    screenshot=self.fetcher.screenshot,
+                    xpath_data=self.fetcher.xpath_data
+                )
+
+        if self.filter_config.has_subtractive_selectors and html_tree is not None:
+            html_tools.tree_element_removal(html_tree, self.filter_config.subtractive_selectors)
+
+        do_anchor = self.datastore.data["settings"]["application"].get("render_anchor_tag_content", False)
+        return html_tree, html_tools.tree_to_text(html_tree, render_anchor_tag_content=do_anchor)
+
     def extract_text_from_html(self, html_content, stream_content_type):
         """Convert HTML to plain text."""
         do_anchor = self.datastore.data["settings"]["application"].get("render_anchor_tag_content", False)
@@ -447,30 +522,36 @@ class perform_site_check(difference_detection_processor):
         # === FILTER APPLICATION ===
         # Start with content reference, avoid copy until modification
         html_content = content
+        html_tree = None
 
-        # Apply include filters (CSS, XPath, JSON)
-        # Except for plaintext (incase they tried to confuse the system, it will HTML escape
-        #if not stream_content_type.is_plaintext:
-        if filter_config.has_include_filters:
-            html_content = content_processor.apply_include_filters(content, stream_content_type)
-
-        # Apply subtractive selectors
-        if filter_config.has_subtractive_selectors:
-            html_content = content_processor.apply_subtractive_selectors(html_content)
-
-        # === TEXT EXTRACTION ===
-        if watch.is_source_type_url:
-            # For source URLs, keep raw content
-            stripped_text = html_content
-        elif stream_content_type.is_plaintext:
-            # For plaintext, keep as-is without HTML-to-text conversion
-            stripped_text = html_content
+        if content_processor.use_single_parse_pipeline(stream_content_type):
+            # One lxml parse shared by the include filters, subtractive selectors and text extraction
+            html_tree, stripped_text = content_processor.single_parse_html_to_text(content)
+            html_content = None
         else:
-            # Extract text from HTML/RSS content (not generic XML)
-            if stream_content_type.is_html or stream_content_type.is_rss:
-                stripped_text = content_processor.extract_text_from_html(html_content, stream_content_type)
-            else:
+            # Apply include filters (CSS, XPath, JSON)
+            # Except for plaintext (incase they tried to confuse the system, it will HTML escape
+            #if not stream_content_type.is_plaintext:
+            if filter_config.has_include_filters:
+                html_content = content_processor.apply_include_filters(content, stream_content_type)
+
+            # Apply subtractive selectors
+            if filter_config.has_subtractive_selectors:
+                html_content = content_processor.apply_subtractive_selectors(html_content)
+
+            # === TEXT EXTRACTION ===
+            if watch.is_source_type_url:
+                # For source URLs, keep raw content
                 stripped_text = html_content
+            elif stream_content_type.is_plaintext:
+                # For plaintext, keep as-is without HTML-to-text conversion
+                stripped_text = html_content
+            else:
+                # Extract text from HTML/RSS content (not generic XML)
+                if stream_content_type.is_html or stream_content_type.is_rss:
+                    stripped_text = content_processor.extract_text_from_html(html_content, stream_content_type)
+                else:
+                    stripped_text = html_content
 
         # === TEXT TRANSFORMATIONS ===
         if watch.get('trim_text_whitespace'):
@@ -497,7 +578,7 @@ class perform_site_check(difference_detection_processor):
                 status_code=self.fetcher.get_last_status_code(),
                 screenshot=self.fetcher.screenshot,
                 has_filters=filter_config.has_include_filters,
-                html_content=html_content,
+                html_content=html_content if html_content is not None else html_tools.tree_to_html(html_tree),
                 xpath_data=self.fetcher.xpath_data
             )
 
@@ -518,9 +599,13 @@ class perform_site_check(difference_detection_processor):
         # === CHECKSUM CALCULATION ===
         text_for_checksuming = stripped_text
 
+        # ignore_text, trigger_text and text_should_not_be_present are matched together in one go
+        rules = rule_engine.compile_rules(watch, filter_config)
+        rule_matches = rules.evaluate(stripped_text)
+
         # Apply ignore_text for checksum calculation
-        if filter_config.ignore_text:
-            text_for_checksuming = html_tools.strip_ignore_text(stripped_text, filter_config.ignore_text)
+        if rules.ignore:
+            text_for_checksuming = rule_matches.without_ignored_lines()
 
             # Optionally remove ignored lines from output
             strip_ignored_lines = watch.get('strip_ignored_lines')
@@ -528,6 +613,8 @@ class perform_site_check(difference_detection_processor):
                 strip_ignored_lines = self.datastore.data['settings']['application'].get('strip_ignored_lines')
             if strip_ignored_lines:
                 stripped_text = text_for_checksuming
+                # Trigger/block rules then look at the text without the ignored lines
+                rule_matches = rules.evaluate(stripped_text, ignore=False)
 
         # Calculate checksum
         ignore_whitespace = self.datastore.data['settings']['application'].get('ignore_whitespace', False)
@@ -537,11 +624,11 @@ class perform_site_check(difference_detection_processor):
         blocked = False
 
         # Check trigger_text
-        if rule_engine.evaluate_trigger_text(stripped_text, filter_config.trigger_text):
+        if rule_engine.evaluate_trigger_text(stripped_text, filter_config.trigger_text, matches=rule_matches):
             blocked = True
 
         # Check text_should_not_be_present
-        if rule_engine.evaluate_text_should_not_be_present(stripped_text, filter_config.text_should_not_be_present):
+        if rule_engine.evaluate_text_should_not_be_present(stripped_text, filter_config.text_should_not_be_present, matches=rule_matches):
             blocked = True
 
         # Check custom conditions
@@ -585,6 +672,7 @@ class perform_site_check(difference_detection_processor):
         # Python would clean these up automatically, but explicit `del` frees memory
         # immediately rather than waiting for function return, reducing peak memory usage.
         del content
+        del html_tree
         if 'html_content' in locals() and html_content is not stripped_text:
             del html_content
         if 'text_content_before_ignored_filter' in locals() and text_content_before_ignored_filter is not stripped_text:
@@ -1,9 +1,13 @@
 from blinker import signal
 from loguru import logger
 from typing import Dict, List, Any, Optional
+from collections import deque
+import bisect
 import heapq
+import itertools
 import queue
 import threading
+import time
 
 # Janus is no longer required - we use pure threading.Queue for multi-loop support
 # try:
@@ -12,6 +16,151 @@ import threading
 #     pass  # Not needed anymore
 
 
+class _SortedKeyIndex:
+    """
+    Sorted (priority, sequence) keys with O(log n) insert/remove/rank, an order-statistics list.
+
+    Keys live in buckets of up to 2*LOAD sorted keys (bisect inside a bucket is cheap, list inserts are memmoves),
+    `_maxes` holds the last key of every bucket and a Fenwick tree over the bucket lengths gives the number of keys
+    before any bucket in O(log buckets). The tree is only rebuilt when buckets are split or emptied.
+    """
+
+    LOAD = 512
+
+    def __init__(self):
+        self._lists = []
+        self._maxes = []
+        self._tree = []
+        self._tree_valid = False
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def clear(self):
+        self.__init__()
+
+    def load(self, keys):
+        """Replace the contents with these keys, one sort instead of an insert per key"""
+        keys = sorted(keys)
+        self.__init__()
+        self._lists = [keys[i:i + self.LOAD] for i in range(0, len(keys), self.LOAD)]
+        self._maxes = [sub[-1] for sub in self._lists]
+        self._len = len(keys)
+
+    def _build_tree(self):
+        tree = [len(sub) for sub in self._lists]
+        for i in range(len(tree)):
+            parent = i | (i + 1)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._tree_valid = True
+
+    def _tree_add(self, i, delta):
+        if not self._tree_valid:
+            return
+        tree = self._tree
+        while i < len(tree):
+            tree[i] += delta
+            i |= i + 1
+
+    def _count_before_bucket(self, i):
+        """Number of keys in the buckets before bucket i"""
+        if not self._tree_valid:
+            self._build_tree()
+        total = 0
+        tree = self._tree
+        i -= 1
+        while i >= 0:
+            total += tree[i]
+            i = (i & (i + 1)) - 1
+        return total
+
+    def add(self, key):
+        lists, maxes = self._lists, self._maxes
+        if not lists:
+            lists.append([key])
+            maxes.append(key)
+            self._tree_valid = False
+        else:
+            i = bisect.bisect_left(maxes, key)
+            if i == len(maxes):
+                i -= 1
+                lists[i].append(key)
+                maxes[i] = key
+            else:
+                bisect.insort(lists[i], key)
+            if len(lists[i]) > self.LOAD * 2:
+                sub = lists[i]
+                lists.insert(i + 1, sub[self.LOAD:])
+                del sub[self.LOAD:]
+                maxes.insert(i, sub[-1])
+                self._tree_valid = False
+            else:
+                self._tree_add(i, 1)
+        self._len += 1
+
+    def remove(self, key):
+        lists, maxes = self._lists, self._maxes
+        i = bisect.bisect_left(maxes, key)
+        if i == len(maxes):
+            raise KeyError(key)
+        sub = lists[i]
+        j = bisect.bisect_left(sub, key)
+        if j == len(sub) or sub[j] != key:
+            raise KeyError(key)
+        del sub[j]
+        self._len -= 1
+        if not sub:
+            del lists[i]
+            del maxes[i]
+            self._tree_valid = False
+        else:
+            maxes[i] = sub[-1]
+            self._tree_add(i, -1)
+
+    def first(self):
+        return self._lists[0][0] if self._lists else None
+
+    def rank(self, key):
+        """Number of keys smaller than key"""
+        i = bisect.bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return self._len
+        return self._count_before_bucket(i) + bisect.bisect_left(self._lists[i], key)
+
+    def islice(self, start=0, stop=None):
+        """Keys in sorted order from position start to stop, without copying the rest"""
+        stop = self._len if stop is None else min(stop, self._len)
+        pos = 0
+        for sub in self._lists:
+            if start >= stop:
+                return
+            if pos + len(sub) > start:
+                for key in sub[start - pos:stop - pos]:
+                    yield key
+                start = min(pos + len(sub), stop)
+            pos += len(sub)
+
+    def __iter__(self):
+        for sub in self._lists:
+            yield from sub
+
+    def __reversed__(self):
+        for sub in reversed(self._lists):
+            yield from reversed(sub)
+
+
+# How long the next deferred item on a wait key waits if nothing else moves it along
+DEFERRED_FALLBACK_SECONDS = 5
+
+
+def _resolve_waiter(future, result=True):
+    if not future.done():
+        future.set_result(result)
+
+
 class RecheckPriorityQueue:
     """
     Thread-safe priority queue supporting multiple async event loops.
@@ -19,13 +168,14 @@ class RecheckPriorityQueue:
     ARCHITECTURE:
     - Multiple async workers, each with its own event loop in its own thread
     - Hybrid sync/async design for maximum scalability
-    - Sync interface for ticker thread (threading.Queue)
-    - Async interface for workers (asyncio.Event - NO executor threads!)
+    - Sync interface for ticker thread and Flask routes (threading.Condition)
+    - Async interface for workers (per-loop futures - NO executor threads!)
 
     SCALABILITY:
-    - Scales to 100-200+ workers without executor thread exhaustion
-    - Async workers wait on asyncio.Event (pure coroutines, no threads)
-    - Sync callers use threading.Queue (backward compatible)
+    - An idle async worker parks an asyncio future from its own loop in a FIFO of waiters
+    - put() wakes exactly one waiter with loop.call_soon_threadsafe(), the item is picked up immediately
+    - Waiting uses 0 threads, 1000+ workers don't need 1000+ executor threads just to sit on the queue
+    - Sync callers block on a threading.Condition (backward compatible)
 
     WHY NOT JANUS:
     - Janus binds to ONE event loop at creation time
@@ -36,22 +186,47 @@ class RecheckPriorityQueue:
     - With 200 workers, run_in_executor() would block 200 threads
     - Exhausts ThreadPoolExecutor, starves Flask HTTP handlers
     - Pure async approach uses 0 threads while waiting
+
+    INDEXING:
+    - A watch UUID is only ever queued once, uuid -> entry map gives O(1) "is it queued"
+    - Queuing an already queued UUID with a higher priority (lower number) re-prioritises it
+    - Entries are ordered by (priority, sequence) in an order-statistics index, so the queue position of a UUID,
+      removal and re-prioritisation are O(log n) and pages of the queue are read without copying it all
+    - Same priority is first in, first out
+
+    DEFERRED ITEMS:
+    - A worker that may not start a check yet (see fetch_limiter.py) hands the item back with defer()
+    - Deferred items wait in a FIFO per wait key (domain/proxy) and still count as queued (qsize(), is_queued())
+    - One item per wait key is moved back to the ready queue when its retry time comes, or at once when
+      wake_deferred() says the key has room, so a busy host doesn't cycle thousands of items through the workers
     """
 
     def __init__(self, maxsize: int = 0):
         try:
             import asyncio
 
-            # Sync interface: threading.Queue for ticker thread and Flask routes
-            self._notification_queue = queue.Queue(maxsize=maxsize if maxsize > 0 else 0)
+            self._maxsize = maxsize if maxsize > 0 else 0
 
             # Priority storage - thread-safe
-            self._priority_items = []
+            # key -> (priority, sequence, item), key is the watch UUID (or a unique token for items without one)
+            self._entries = {}
+            self._order = _SortedKeyIndex()
+            self._sequence = itertools.count()
             self._lock = threading.RLock()
 
-            # No event signaling needed - pure polling approach
-            # Workers check queue every 50ms (latency acceptable: 0-500ms)
-            # Scales to 1000+ workers: each sleeping worker = ~4KB coroutine, not thread
+            # Sync waiters (ticker thread, Flask routes, tests) wait on these
+            self._not_empty = threading.Condition(self._lock)
+            self._not_full = threading.Condition(self._lock)
+
+            # Deferred items - key -> (wait key, item), wait key -> FIFO of keys, heap of (due time.time(), seq, wait key)
+            self._deferred = {}
+            self._deferred_fifo = {}
+            self._deferred_due = []
+            self._deferred_due_at = {}
+
+            # Async waiters - (loop, future) of each idle worker, oldest first
+            # Scales to 1000+ workers: each sleeping worker = ~4KB coroutine + one future, not a thread
+            self._async_waiters = deque()
 
             # Signals for UI updates
             self.queue_length_signal = signal('queue_length')
@@ -66,23 +241,31 @@ class RecheckPriorityQueue:
         """Thread-safe sync put with priority ordering"""
         logger.trace(f"RecheckQueue.put() called for item: {self._get_item_uuid(item)}, block={block}, timeout={timeout}")
         try:
-            # CRITICAL: Add to both priority storage AND notification queue atomically
-            # to prevent desynchronization where item exists but no notification
             with self._lock:
-                heapq.heappush(self._priority_items, item)
-
-                # Add notification - use blocking with timeout for safety
-                # Notification queue is unlimited size, so should never block in practice
-                # but timeout ensures we detect any unexpected issues (deadlock, etc)
-                try:
-                    self._notification_queue.put(True, block=True, timeout=5.0)
-                except Exception as notif_e:
-                    # Notification failed - MUST remove from priority_items to keep in sync
-                    # This prevents "Priority queue inconsistency" errors in get()
-                    logger.critical(f"CRITICAL: Notification queue put failed, removing from priority_items: {notif_e}")
-                    self._priority_items.remove(item)
-                    heapq.heapify(self._priority_items)
-                    raise  # Re-raise to be caught by outer exception handler
+                key = self._get_item_key(item)
+                if key in self._deferred:
+                    # Already waiting for its domain/proxy to have room, queuing it again wouldn't make it start sooner
+                    logger.trace(f"Item already queued and deferred: {key}")
+                    return True
+                existing = self._entries.get(key)
+                if existing is not None:
+                    # Already queued, only ever move it forward
+                    if item.priority < existing[0]:
+                        self._order.remove((existing[0], existing[1], key))
+                        self._add_entry(key, item)
+                        logger.trace(f"Re-prioritised already queued item: {key} {existing[0]} -> {item.priority}")
+                    else:
+                        logger.trace(f"Item already queued with priority {existing[0]}: {key}")
+                    return True
+
+                # Unlimited size by default, so should never block in practice
+                if self._maxsize and len(self._entries) >= self._maxsize:
+                    if not block or not self._not_full.wait_for(lambda: len(self._entries) < self._maxsize,
+                                                                 timeout=timeout if timeout is not None else 5.0):
+                        raise queue.Full
+
+                self._add_entry(key, item)
+                self._wake_one_waiter()
 
             # Signal emission after successful queue - log but don't fail the operation
             # Item is already safely queued, so signal failure shouldn't affect queue state
@@ -104,15 +287,24 @@ class RecheckPriorityQueue:
         logger.trace(f"RecheckQueue.get() called, block={block}, timeout={timeout}")
         import queue as queue_module
         try:
-            # Wait for notification (this doesn't return the actual item, just signals availability)
-            self._notification_queue.get(block=block, timeout=timeout)
-
             # Get highest priority item
+            deadline = time.monotonic() + timeout if timeout is not None else None
             with self._lock:
-                if not self._priority_items:
-                    logger.critical(f"CRITICAL: Queue notification received but no priority items available")
-                    raise Exception("Priority queue inconsistency")
-                item = heapq.heappop(self._priority_items)
+                while True:
+                    self._promote_due_deferred()
+                    if self._entries:
+                        break
+                    if not block:
+                        raise queue_module.Empty
+                    # Wake up in time for the next deferred item too
+                    wait = self._seconds_until_deferred_due()
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise queue_module.Empty
+                        wait = remaining if wait is None else min(wait, remaining)
+                    self._not_empty.wait(timeout=wait)
+                item = self._pop_first()
 
             # Signal emission after successful retrieval - log but don't lose the item
             # Item is already retrieved, so signal failure shouldn't affect queue state
@@ -160,18 +352,15 @@ class RecheckPriorityQueue:
 
     async def async_get(self, executor=None, timeout=1.0):
         """
-        Efficient async get using executor for blocking call.
-
-        HYBRID APPROACH: Best of both worlds
-        - Uses run_in_executor for efficient blocking (no polling overhead)
-        - Single timeout (no double-timeout race condition)
-        - Scales well: executor sized to match worker count
+        Async get that waits on a future of the calling event loop, no executor thread is used.
 
-        With FETCH_WORKERS=10: 10 threads blocked max (acceptable)
-        With FETCH_WORKERS=200: Need executor with 200+ threads (see worker_pool.py)
+        - If something is queued it is returned straight away
+        - Otherwise the worker registers (loop, future) and put() resolves the future of the longest waiting worker
+          via loop.call_soon_threadsafe(), then it takes the highest priority item
+        - A worker that was woken but lost the item to another getter just waits again for what is left of timeout
 
         Args:
-            executor: ThreadPoolExecutor (sized to match worker count)
+            executor: Unused, kept for API compatibility
             timeout: Maximum time to wait in seconds
 
         Returns:
@@ -182,14 +371,46 @@ class RecheckPriorityQueue:
         """
         logger.trace(f"RecheckQueue.async_get() called, timeout={timeout}")
         import asyncio
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout is not None else None
+
         try:
-            # Use run_in_executor to call sync get efficiently
-            # No outer asyncio.wait_for wrapper = no double timeout issue!
-            loop = asyncio.get_event_loop()
-            item = await loop.run_in_executor(
-                executor,
-                lambda: self.get(block=True, timeout=timeout)
-            )
+            while True:
+                with self._lock:
+                    self._promote_due_deferred()
+                    if self._entries:
+                        item = self._pop_first()
+                        break
+                    remaining = deadline - loop.time() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        raise queue.Empty
+                    # Wake up in time for the next deferred item too
+                    until_due = self._seconds_until_deferred_due()
+                    if until_due is not None:
+                        remaining = until_due if remaining is None else min(remaining, until_due)
+                    waiter = (loop, loop.create_future())
+                    self._async_waiters.append(waiter)
+
+                # The timeout resolves the same future with False, so there is no wait_for() wrapper to race with
+                timer = loop.call_later(remaining, _resolve_waiter, waiter[1], False) if remaining is not None else None
+                try:
+                    woken = await waiter[1]
+                except asyncio.CancelledError:
+                    self._forget_async_waiter(waiter)
+                    raise
+                finally:
+                    if timer:
+                        timer.cancel()
+
+                if not woken:
+                    self._forget_async_waiter(waiter)
+                    if deadline is not None and loop.time() >= deadline:
+                        raise queue.Empty
+
+            try:
+                self._emit_get_signals()
+            except Exception as signal_e:
+                logger.error(f"Failed to emit get signals but item retrieved successfully: {signal_e}")
 
             logger.trace(f"RecheckQueue.async_get() successfully retrieved item: {self._get_item_uuid(item)}")
             return item
@@ -197,6 +418,8 @@ class RecheckPriorityQueue:
         except queue.Empty:
             logger.trace(f"RecheckQueue.async_get() timed out - queue is empty")
             raise
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.critical(f"CRITICAL: Failed to async get item from queue: {type(e).__name__}: {str(e)}")
             raise
@@ -206,7 +429,7 @@ class RecheckPriorityQueue:
         """Get current queue size"""
         try:
             with self._lock:
-                return len(self._priority_items)
+                return len(self._entries) + len(self._deferred)
         except Exception as e:
             logger.critical(f"CRITICAL: Failed to get queue size: {str(e)}")
             return 0
@@ -215,34 +438,71 @@ class RecheckPriorityQueue:
         """Check if queue is empty"""
         return self.qsize() == 0
 
+    def is_queued(self, uuid: str) -> bool:
+        """O(1) check if a watch UUID is waiting in the queue (deferred or not)"""
+        return uuid in self._entries or uuid in self._deferred
+
+    __contains__ = is_queued
+
     def get_queued_uuids(self) -> list:
         """Get list of all queued UUIDs efficiently with single lock"""
         try:
             with self._lock:
-                return [item.item['uuid'] for item in self._priority_items if hasattr(item, 'item') and 'uuid' in item.item]
+                return [key for key in itertools.chain(self._entries, self._deferred) if isinstance(key, str)]
         except Exception as e:
             logger.critical(f"CRITICAL: Failed to get queued UUIDs: {str(e)}")
             return []
 
+    def remove(self, uuid: str) -> bool:
+        """Take a queued watch UUID out of the queue, returns False if it wasn't queued"""
+        try:
+            with self._lock:
+                if self._deferred.pop(uuid, None) is not None:
+                    # Its key is skipped when the FIFO gets to it
+                    pass
+                elif self._pop_entry(uuid) is None:
+                    return False
+                self._not_full.notify()
+            self._emit_get_signals()
+            return True
+        except Exception as e:
+            logger.critical(f"CRITICAL: Failed to remove {uuid} from queue: {str(e)}")
+            return False
+
+    def reprioritise(self, uuid: str, priority) -> bool:
+        """Change the priority of a queued watch UUID (either direction), returns False if it wasn't queued"""
+        try:
+            with self._lock:
+                if uuid in self._deferred:
+                    self._deferred[uuid][1].priority = priority
+                    return True
+                entry = self._entries.get(uuid)
+                if entry is None:
+                    return False
+                self._order.remove((entry[0], entry[1], uuid))
+                entry[2].priority = priority
+                self._add_entry(uuid, entry[2])
+            return True
+        except Exception as e:
+            logger.critical(f"CRITICAL: Failed to re-prioritise {uuid}: {str(e)}")
+            return False
+
     def clear(self):
         """Clear all items from both priority storage and notification queue"""
         try:
             with self._lock:
                 # Clear priority items
-                self._priority_items.clear()
-
-                # Drain all notifications to prevent stale notifications
-                # This is critical for test cleanup to prevent queue desynchronization
-                drained = 0
-                while not self._notification_queue.empty():
-                    try:
-                        self._notification_queue.get_nowait()
-                        drained += 1
-                    except queue.Empty:
-                        break
-
-                if drained > 0:
-                    logger.debug(f"Cleared queue: removed {drained} notifications")
+                cleared = len(self._entries) + len(self._deferred)
+                self._entries.clear()
+                self._order.clear()
+                self._deferred.clear()
+                self._deferred_fifo.clear()
+                self._deferred_due.clear()
+                self._deferred_due_at.clear()
+                self._not_full.notify_all()
+
+                if cleared > 0:
+                    logger.debug(f"Cleared queue: removed {cleared} items")
 
             return True
         except Exception as e:
@@ -263,37 +523,38 @@ class RecheckPriorityQueue:
         """Provide compatibility with original queue access"""
         try:
             with self._lock:
-                return list(self._priority_items)
+                return [self._entries[key][2] for _, _, key in self._order]
         except Exception as e:
             logger.critical(f"CRITICAL: Failed to get queue list: {str(e)}")
             return []
     
     def get_uuid_position(self, target_uuid: str) -> Dict[str, Any]:
-        """Find position of UUID in queue"""
+        """Find position of UUID in queue (number of items with a higher priority)"""
         try:
             with self._lock:
-                queue_list = list(self._priority_items)
-                total_items = len(queue_list)
-                
-                if total_items == 0:
-                    return {'position': None, 'total_items': 0, 'priority': None, 'found': False}
-                
-                # Find target item
-                for item in queue_list:
-                    if (hasattr(item, 'item') and isinstance(item.item, dict) and 
-                        item.item.get('uuid') == target_uuid):
-                        
-                        # Count items with higher priority
-                        position = sum(1 for other in queue_list if other.priority < item.priority)
-                        return {
-                            'position': position,
-                            'total_items': total_items, 
-                            'priority': item.priority,
-                            'found': True
-                        }
-                
-                return {'position': None, 'total_items': total_items, 'priority': None, 'found': False}
-                
+                total_items = len(self._entries) + len(self._deferred)
+                if target_uuid in self._deferred:
+                    # Waiting for its domain/proxy, it is behind everything that is ready to go
+                    return {
+                        'position': len(self._entries),
+                        'total_items': total_items,
+                        'priority': self._deferred[target_uuid][1].priority,
+                        'found': True,
+                        'deferred': True,
+                    }
+                entry = self._entries.get(target_uuid)
+                if entry is None:
+                    return {'position': None, 'total_items': total_items, 'priority': None, 'found': False}
+
+                # Sequence numbers start at 0, so (priority, -1) sorts before everything with this priority
+                return {
+                    'position': self._order.rank((entry[0], -1)),
+                    'total_items': total_items,
+                    'priority': entry[0],
+                    'found': True,
+                    'deferred': False,
+                }
+
         except Exception as e:
             logger.critical(f"CRITICAL: Failed to get UUID position for {target_uuid}: {str(e)}")
             return {'position': None, 'total_items': 0, 'priority': None, 'found': False}
@@ -302,31 +563,30 @@ class RecheckPriorityQueue:
         """Get all queued UUIDs with pagination"""
         try:
             with self._lock:
-                queue_list = sorted(self._priority_items)  # Sort by priority
-                total_items = len(queue_list)
+                total_items = len(self._entries)
                 
                 if total_items == 0:
-                    return {'items': [], 'total_items': 0, 'returned_items': 0, 'has_more': False}
+                    return {'items': [], 'total_items': 0, 'returned_items': 0, 'has_more': False,
+                            'deferred_items': len(self._deferred)}
                 
                 # Apply pagination
                 end_idx = min(offset + limit, total_items) if limit else total_items
-                items_to_process = queue_list[offset:end_idx]
-                
+
                 result = []
-                for position, item in enumerate(items_to_process, start=offset):
-                    if (hasattr(item, 'item') and isinstance(item.item, dict) and 
-                        'uuid' in item.item):
+                for position, (priority, _, key) in enumerate(self._order.islice(offset, end_idx), start=offset):
+                    if isinstance(key, str):
                         result.append({
-                            'uuid': item.item['uuid'],
+                            'uuid': key,
                             'position': position,
-                            'priority': item.priority
+                            'priority': priority
                         })
                 
                 return {
                     'items': result,
                     'total_items': total_items,
                     'returned_items': len(result),
-                    'has_more': (offset + len(result)) < total_items
+                    'has_more': (offset + len(result)) < total_items,
+                    'deferred_items': len(self._deferred),
                 }
                 
         except Exception as e:
@@ -337,20 +597,20 @@ class RecheckPriorityQueue:
         """Get queue summary statistics"""
         try:
             with self._lock:
-                queue_list = list(self._priority_items)
-                total_items = len(queue_list)
+                total_items = len(self._entries)
+                deferred = self._get_deferred_summary()
                 
                 if total_items == 0:
                     return {
                         'total_items': 0, 'priority_breakdown': {},
-                        'immediate_items': 0, 'clone_items': 0, 'scheduled_items': 0
+                        'immediate_items': 0, 'clone_items': 0, 'scheduled_items': 0,
+                        **deferred
                     }
                 
                 immediate_items = clone_items = scheduled_items = 0
                 priority_counts = {}
                 
-                for item in queue_list:
-                    priority = item.priority
+                for priority, _, _ in self._entries.values():
                     priority_counts[priority] = priority_counts.get(priority, 0) + 1
                     
                     if priority == 1:
@@ -367,7 +627,8 @@ class RecheckPriorityQueue:
                     'clone_items': clone_items,
                     'scheduled_items': scheduled_items,
                     'min_priority': min(priority_counts.keys()) if priority_counts else None,
-                    'max_priority': max(priority_counts.keys()) if priority_counts else None
+                    'max_priority': max(priority_counts.keys()) if priority_counts else None,
+                    **deferred
                 }
                 
         except Exception as e:
@@ -375,7 +636,148 @@ class RecheckPriorityQueue:
             return {'total_items': 0, 'priority_breakdown': {}, 'immediate_items': 0, 
                    'clone_items': 0, 'scheduled_items': 0}
     
+    def defer(self, item, not_before: Optional[float] = None, wait_key: Optional[str] = None) -> bool:
+        """
+        Hand an item back that may not start yet, it goes back in the ready queue at not_before (time.time()) or
+        when wake_deferred() is called for its wait_key, whichever is first. Items waiting on the same wait_key are
+        released one at a time, oldest first.
+        """
+        try:
+            with self._lock:
+                key = self._get_item_key(item)
+                if key in self._entries or key in self._deferred:
+                    # Queued again in the meantime (recheck button etc), that one will run
+                    return True
+                wait_key = wait_key or key
+                self._deferred[key] = (wait_key, item)
+                self._deferred_fifo.setdefault(wait_key, deque()).append(key)
+                self._schedule_deferred(wait_key, not_before if not_before is not None else time.time())
+            logger.trace(f"Deferred {self._get_item_uuid(item)} waiting on {wait_key} until {not_before}")
+            return True
+        except Exception as e:
+            logger.critical(f"CRITICAL: Failed to defer item {self._get_item_uuid(item)}: {str(e)}")
+            return False
+
+    def wake_deferred(self, wait_keys) -> int:
+        """Something waiting on these keys can go now (a check on that domain/proxy finished), returns items moved"""
+        moved = 0
+        with self._lock:
+            for wait_key in wait_keys:
+                if wait_key in self._deferred_fifo and self._promote_deferred(wait_key):
+                    moved += 1
+        return moved
+
     # PRIVATE METHODS
+    def _schedule_deferred(self, wait_key, due):
+        """Must hold self._lock, keeps the earliest due time per wait key (older heap entries are skipped)"""
+        current = self._deferred_due_at.get(wait_key)
+        if current is not None and current <= due:
+            return
+        self._deferred_due_at[wait_key] = due
+        new_earliest = not self._deferred_due or due < self._deferred_due[0][0]
+        heapq.heappush(self._deferred_due, (due, next(self._sequence), wait_key))
+        if new_earliest:
+            # Sleeping getters worked out their timeout from the old earliest time
+            self._wake_one_waiter()
+
+    def _promote_deferred(self, wait_key):
+        """Must hold self._lock, move the oldest item waiting on wait_key to the ready queue"""
+        fifo = self._deferred_fifo.get(wait_key)
+        promoted = False
+        while fifo:
+            entry = self._deferred.pop(fifo.popleft(), None)
+            if entry is None:
+                # remove()d while it was waiting
+                continue
+            key = self._get_item_key(entry[1])
+            self._add_entry(key, entry[1])
+            self._wake_one_waiter()
+            promoted = True
+            break
+
+        self._deferred_due_at.pop(wait_key, None)
+        if fifo:
+            # Normally the promoted item re-defers itself or its check finishing wakes the next one, this is the
+            # fallback if it went on to wait for a different key
+            self._schedule_deferred(wait_key, time.time() + DEFERRED_FALLBACK_SECONDS)
+        else:
+            self._deferred_fifo.pop(wait_key, None)
+        return promoted
+
+    def _promote_due_deferred(self):
+        """Must hold self._lock"""
+        heap = self._deferred_due
+        if not heap:
+            return
+        now = time.time()
+        while heap and heap[0][0] <= now:
+            due, _, wait_key = heapq.heappop(heap)
+            if self._deferred_due_at.get(wait_key) == due:
+                self._promote_deferred(wait_key)
+
+    def _seconds_until_deferred_due(self):
+        """Must hold self._lock"""
+        if not self._deferred_due:
+            return None
+        return max(0.0, self._deferred_due[0][0] - time.time())
+
+    def _get_deferred_summary(self):
+        """Must hold self._lock"""
+        by_key = {}
+        for wait_key, _ in self._deferred.values():
+            by_key[wait_key] = by_key.get(wait_key, 0) + 1
+        busiest = sorted(by_key.items(), key=lambda kv: kv[1], reverse=True)[:20]
+        return {'deferred_items': len(self._deferred), 'deferred_by_key': dict(busiest)}
+
+    def _get_item_key(self, item):
+        """Watch UUID for the uuid -> entry map, anything without one is never treated as a duplicate"""
+        if hasattr(item, 'item') and isinstance(item.item, dict) and item.item.get('uuid'):
+            return item.item['uuid']
+        return object()
+
+    def _add_entry(self, key, item):
+        """Must hold self._lock"""
+        sequence = next(self._sequence)
+        self._entries[key] = (item.priority, sequence, item)
+        self._order.add((item.priority, sequence, key))
+
+    def _pop_first(self):
+        """Must hold self._lock and have something queued"""
+        item = self._pop_entry(self._order.first()[2])
+        self._not_full.notify()
+        return item
+
+    def _wake_one_waiter(self):
+        """Must hold self._lock, hand the wakeup to one sync waiter and the longest waiting async worker"""
+        self._not_empty.notify()
+        while self._async_waiters:
+            loop, future = self._async_waiters.popleft()
+            try:
+                loop.call_soon_threadsafe(_resolve_waiter, future)
+                return
+            except RuntimeError:
+                # Loop closed (worker stopped), try the next one
+                # (a stopped but not yet closed loop loses the wakeup, the others still find the item on their next
+                # pass through async_get() after their timeout)
+                continue
+
+    def _forget_async_waiter(self, waiter):
+        """A waiter gave up (timeout, cancelled), if put() already picked it pass the wakeup on"""
+        with self._lock:
+            try:
+                self._async_waiters.remove(waiter)
+            except ValueError:
+                if self._entries:
+                    self._wake_one_waiter()
+
+    def _pop_entry(self, key):
+        """Must hold self._lock, returns the item or None"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self._order.remove((entry[0], entry[1], key))
+        return entry[2]
+
     def _get_item_uuid(self, item) -> str:
         """Safely extract UUID from item for logging"""
         try:
@@ -449,8 +851,8 @@ class NotificationQueue:
                 logger.debug(f"Notification blocked - all notifications are muted: {item.get('uuid', 'unknown')}")
                 return False
 
-            with self._lock:
-                self._notification_queue.put(item, block=block, timeout=timeout)
+            # queue.Queue does its own locking, holding self._lock here would block get() callers while a put() waits
+            self._notification_queue.put(item, block=block, timeout=timeout)
             self._emit_notification_signal(item)
             logger.trace(f"NotificationQueue.put() successfully queued notification: {item.get('uuid', 'unknown')}")
             return True
@@ -485,8 +887,8 @@ class NotificationQueue:
         """Thread-safe sync get"""
         logger.trace(f"NotificationQueue.get() called, block={block}, timeout={timeout}")
         try:
-            with self._lock:
-                item = self._notification_queue.get(block=block, timeout=timeout)
+            # Not under self._lock, a blocking get() would otherwise hold up every put() until it times out
+            item = self._notification_queue.get(block=block, timeout=timeout)
             logger.trace(f"NotificationQueue.get() retrieved item: {item.get('uuid', 'unknown') if isinstance(item, dict) else 'unknown'}")
             return item
         except queue.Empty as e:
@@ -0,0 +1,161 @@
+"""
+Coalesced Socket.IO broadcasts.
+
+Every `watch_check_update` signal used to build the complete watch data (error texts, a favicon glob on disk,
+timeago strings) and emit it to every client, plus a `general_stats_update`, and every queue put/get emitted a
+`queue_size`. During a large "recheck all" that is thousands of events per second.
+
+Signals now only mark the watch UUID dirty (or remember the latest queue length), and a background task flushes
+every SOCKETIO_BROADCAST_INTERVAL_SECONDS (default 0.25):
+- the watch data is built once per dirty watch per flush, only the fields that changed since the last emit are sent
+  (plus 'uuid' and 'event_timestamp'), realtime.js applies whatever fields are present
+- watch events go to the Socket.IO room of that watch, clients join the rooms of the watches they show with the
+  'watch_updates_subscribe' event (the rows of the current watch list page, or the watch being viewed), clients
+  that never subscribe get everything like before
+- `general_stats_update` and `queue_size` are sent once per flush, only when they changed
+
+A client that connects triggers a full (not delta) emit for the next flush, its page was rendered from the current
+state which may be newer than what was last sent.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from loguru import logger
+
+ALL_WATCHES_ROOM = 'watch-updates-all'
+
+
+def watch_room(uuid):
+    return f"watch-{uuid}"
+
+
+class WatchUpdateBroadcaster:
+
+    def __init__(self, socketio, datastore, app=None, interval_seconds=None):
+        self.socketio = socketio
+        self.datastore = datastore
+        self.app = app
+        if interval_seconds is None:
+            interval_seconds = float(os.getenv('SOCKETIO_BROADCAST_INTERVAL_SECONDS', 0.25))
+        self.interval_seconds = interval_seconds
+
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._queue_length = None
+        self._last_sent = {}
+        self._last_general_stats = None
+        self._last_queue_length = None
+        self._stopped = False
+        self._task = None
+
+        # (time.time() of a flush, events emitted by it)
+        self._recent = deque(maxlen=1000)
+        self.stats = {'signals': 0, 'coalesced': 0, 'flushes': 0, 'emitted': 0, 'fields_skipped': 0}
+
+    def start(self):
+        if self._task is None:
+            self._task = self.socketio.start_background_task(self._run)
+
+    def stop(self):
+        self._stopped = True
+
+    def _run(self):
+        while not self._stopped:
+            self.socketio.sleep(self.interval_seconds)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Socket.IO broadcast flush error: {str(e)}")
+
+    def mark_dirty(self, uuid):
+        with self._lock:
+            self.stats['signals'] += 1
+            if uuid in self._dirty:
+                self.stats['coalesced'] += 1
+            self._dirty.add(uuid)
+
+    def set_queue_length(self, length):
+        with self._lock:
+            self.stats['signals'] += 1
+            self._queue_length = length
+
+    def forget(self, uuid):
+        with self._lock:
+            self._dirty.discard(uuid)
+            self._last_sent.pop(uuid, None)
+
+    def client_connected(self):
+        with self._lock:
+            self._last_sent.clear()
+            self._last_general_stats = None
+            self._last_queue_length = None
+
+    def _emit(self, event, data, to=None):
+        self.socketio.emit(event, data, to=to)
+        self.stats['emitted'] += 1
+
+    def flush(self):
+        with self._lock:
+            dirty = self._dirty
+            self._dirty = set()
+            queue_length = self._queue_length
+
+        emitted_before = self.stats['emitted']
+
+        if queue_length is not None and queue_length != self._last_queue_length:
+            self._emit("queue_size", {"q_length": queue_length, "event_timestamp": time.time()})
+            self._last_queue_length = queue_length
+
+        if dirty:
+            if self.app is not None:
+                with self.app.app_context(), self.app.test_request_context():
+                    self._flush_watches(dirty)
+            else:
+                self._flush_watches(dirty)
+
+        self.stats['flushes'] += 1
+        emitted = self.stats['emitted'] - emitted_before
+        if emitted:
+            self._recent.append((time.time(), emitted))
+
+    def _flush_watches(self, dirty):
+        from .socket_server import get_watch_update_data
+
+        for uuid in dirty:
+            watch = self.datastore.data['watching'].get(uuid)
+            if not watch:
+                continue
+            data = get_watch_update_data(watch=watch, datastore=self.datastore)
+            last = self._last_sent.get(uuid)
+            if last is None:
+                delta = dict(data)
+            else:
+                delta = {k: v for k, v in data.items() if last.get(k) != v}
+                self.stats['fields_skipped'] += len(data) - len(delta)
+            self._last_sent[uuid] = data
+            # Nothing but the timestamp changed
+            if last is not None and set(delta) <= {'event_timestamp'}:
+                continue
+            delta['uuid'] = uuid
+            self._emit("watch_update", {'watch': delta}, to=[watch_room(uuid), ALL_WATCHES_ROOM])
+
+        general_stats = {
+            'count_errors': self.datastore.aggregates.errored_count,
+            'unread_changes_count': self.datastore.aggregates.unread_changes_count
+        }
+        if general_stats != self._last_general_stats:
+            self._emit("general_stats_update", general_stats)
+            self._last_general_stats = general_stats
+
+    def get_stats(self):
+        now = time.time()
+        last_10s = sum(n for t, n in self._recent if now - t <= 10)
+        return {
+            **self.stats,
+            'emitted_per_second': round(last_10s / 10, 2),
+            'interval_seconds': self.interval_seconds,
+            'pending': len(self._dirty),
+        }
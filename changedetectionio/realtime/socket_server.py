@@ -1,5 +1,5 @@
 import timeago
-from flask_socketio import SocketIO
+from flask_socketio import SocketIO, join_room, leave_room, rooms
 from flask_babel import gettext, get_locale
 
 import time
@@ -9,14 +9,18 @@ from blinker import signal
 
 from changedetectionio import strtobool
 from changedetectionio.languages import get_timeago_locale
+from .broadcaster import WatchUpdateBroadcaster, ALL_WATCHES_ROOM, watch_room
 
 
 class SignalHandler:
     """A standalone class to receive signals"""
 
-    def __init__(self, socketio_instance, datastore):
+    def __init__(self, socketio_instance, datastore, app=None):
         self.socketio_instance = socketio_instance
         self.datastore = datastore
+        # Watch updates, stats and queue size are coalesced and sent a few times per second, see broadcaster.py
+        self.broadcaster = WatchUpdateBroadcaster(socketio_instance, datastore, app=app)
+        self.broadcaster.start()
 
         # Connect to the watch_check_update signal
         from changedetectionio.flask_app import watch_check_update as wcc
@@ -50,12 +54,12 @@ class SignalHandler:
 
         if watch_uuid and status:
             logger.debug(f"Socket.IO: Received watch small status update '{status}' for UUID {watch_uuid}")
-            # Emit the status update to all connected clients
+            # Emit the status update to the clients showing this watch
             self.socketio_instance.emit("watch_small_status_comment", {
                 "uuid": watch_uuid,
                 "status": status,
                 "event_timestamp": time.time()
-            })
+            }, to=[watch_room(watch_uuid), ALL_WATCHES_ROOM])
 
 
 
@@ -63,22 +67,11 @@ class SignalHandler:
         logger.trace(f"SignalHandler: Signal received with {len(args)} args and {len(kwargs)} kwargs")
         # Safely extract the watch UUID from kwargs
         watch_uuid = kwargs.get('watch_uuid')
-        app_context = kwargs.get('app_context')
 
         if watch_uuid:
-            # Get the watch object from the datastore
-            watch = self.datastore.data['watching'].get(watch_uuid)
-            if watch:
-                if app_context:
-                    # note
-                    with app_context.app_context():
-                        with app_context.test_request_context():
-                            # Forward to handle_watch_update with the watch parameter
-                            handle_watch_update(self.socketio_instance, watch=watch, datastore=self.datastore)
-                else:
-                    handle_watch_update(self.socketio_instance, watch=watch, datastore=self.datastore)
-
-                logger.trace(f"Signal handler processed watch UUID {watch_uuid}")
+            if watch_uuid in self.datastore.data['watching']:
+                # Sent with the next broadcast flush, many signals for the same watch become one update
+                self.broadcaster.mark_dirty(watch_uuid)
             else:
                 logger.warning(f"Watch UUID {watch_uuid} not found in datastore")
 
@@ -89,17 +82,17 @@ class SignalHandler:
             self.socketio_instance.emit("watch_bumped_favicon", {
                 "uuid": watch_uuid,
                 "event_timestamp": time.time()
-            })
+            }, to=[watch_room(watch_uuid), ALL_WATCHES_ROOM])
         logger.debug(f"Watch UUID {watch_uuid} got its favicon updated")
 
     def handle_deleted_signal(self, *args, **kwargs):
         watch_uuid = kwargs.get('watch_uuid')
         if watch_uuid:
-            # Emit the queue size to all connected clients
+            self.broadcaster.forget(watch_uuid)
             self.socketio_instance.emit("watch_deleted", {
                 "uuid": watch_uuid,
                 "event_timestamp": time.time()
-            })
+            }, to=[watch_room(watch_uuid), ALL_WATCHES_ROOM])
         logger.debug(f"Watch UUID {watch_uuid} was deleted")
 
     def handle_queue_length(self, *args, **kwargs):
@@ -108,11 +101,8 @@ class SignalHandler:
             queue_length = kwargs.get('length', 0)
             logger.debug(f"SignalHandler: Queue length update received: {queue_length}")
 
-            # Emit the queue size to all connected clients
-            self.socketio_instance.emit("queue_size", {
-                "q_length": queue_length,
-                "event_timestamp": time.time()
-            })
+            # Sent to all connected clients with the next broadcast flush, only the latest length
+            self.broadcaster.set_queue_length(queue_length)
 
         except Exception as e:
             logger.error(f"Socket.IO error in handle_queue_length: {str(e)}")
@@ -136,67 +126,33 @@ class SignalHandler:
 
 
 
-def handle_watch_update(socketio, **kwargs):
-    """Handle watch update signal from blinker"""
-    try:
-        watch = kwargs.get('watch')
-        datastore = kwargs.get('datastore')
+def get_watch_update_data(watch, datastore):
+    """The watch fields realtime.js updates the watch list row with, needs an app and request context"""
+    from changedetectionio.flask_app import update_q
+    from changedetectionio.flask_app import _jinja2_filter_datetime
+    from changedetectionio import worker_pool
 
-        # Emit the watch update to all connected clients
-        from changedetectionio.flask_app import update_q
-        from changedetectionio.flask_app import _jinja2_filter_datetime
-        from changedetectionio import worker_pool
+    # Get the error texts from the watch
+    error_texts = watch.compile_error_texts()
+
+    return {
+        'checking_now': True if worker_pool.is_watch_running(watch.get('uuid')) else False,
+        'error_text': error_texts,
+        'event_timestamp': time.time(),
+        'fetch_time': watch.get('fetch_time'),
+        'has_error': True if error_texts else False,
+        'has_favicon': True if watch.get_favicon_filename() else False,
+        'history_n': watch.history_n,
+        'last_changed_text': timeago.format(int(watch.last_changed), time.time(), get_timeago_locale(str(get_locale()))) if watch.history_n >= 2 and int(watch.last_changed) > 0 else gettext('Not yet'),
+        'last_checked': watch.get('last_checked'),
+        'last_checked_text': _jinja2_filter_datetime(watch),
+        'notification_muted': True if watch.get('notification_muted') else False,
+        'paused': True if watch.get('paused') else False,
+        'queued': update_q.is_queued(watch.get('uuid')),
+        'unviewed': watch.has_unviewed,
+        'uuid': watch.get('uuid'),
+    }
 
-        # Get list of watches that are currently running
-        running_uuids = worker_pool.get_running_uuids()
-
-        # Get list of watches in the queue (efficient single-lock method)
-        queue_list = update_q.get_queued_uuids()
-
-        # Get the error texts from the watch
-        error_texts = watch.compile_error_texts()
-        # Create a simplified watch data object to send to clients
-
-        watch_data = {
-            'checking_now': True if watch.get('uuid') in running_uuids else False,
-            'error_text': error_texts,
-            'event_timestamp': time.time(),
-            'fetch_time': watch.get('fetch_time'),
-            'has_error': True if error_texts else False,
-            'has_favicon': True if watch.get_favicon_filename() else False,
-            'history_n': watch.history_n,
-            'last_changed_text': timeago.format(int(watch.last_changed), time.time(), get_timeago_locale(str(get_locale()))) if watch.history_n >= 2 and int(watch.last_changed) > 0 else gettext('Not yet'),
-            'last_checked': watch.get('last_checked'),
-            'last_checked_text': _jinja2_filter_datetime(watch),
-            'notification_muted': True if watch.get('notification_muted') else False,
-            'paused': True if watch.get('paused') else False,
-            'queued': True if watch.get('uuid') in queue_list else False,
-            'unviewed': watch.has_unviewed,
-            'uuid': watch.get('uuid'),
-        }
-
-        errored_count = 0
-        for watch_uuid_iter, watch_iter in datastore.data['watching'].items():
-            if watch_iter.get('last_error'):
-                errored_count += 1
-
-        general_stats = {
-            'count_errors': errored_count,
-            'unread_changes_count': datastore.unread_changes_count
-        }
-
-        # Debug what's being emitted
-        # logger.debug(f"Emitting 'watch_update' event for {watch.get('uuid')}, data: {watch_data}")
-
-        # Emit to all clients (no 'broadcast' parameter needed - it's the default behavior)
-        socketio.emit("watch_update", {'watch': watch_data})
-        socketio.emit("general_stats_update", general_stats)
-
-        # Log after successful emit - use watch_data['uuid'] to avoid variable shadowing issues
-        logger.trace(f"Socket.IO: Emitted update for watch {watch_data['uuid']}, Checking now: {watch_data['checking_now']}")
-
-    except Exception as e:
-        logger.error(f"Socket.IO error in handle_watch_update: {str(e)}")
 
 def init_socketio(app, datastore):
     """Initialize SocketIO with the main Flask app"""
@@ -299,6 +255,11 @@ def init_socketio(app, datastore):
             logger.warning("Socket.IO: Rejecting unauthenticated connection")
             return False  # Reject the connection
 
+        # Everything in a watch list row until the client tells us which watches it shows
+        join_room(ALL_WATCHES_ROOM)
+        # Its page may be newer than the last update sent, so the next flush sends complete watch data
+        signal_handler.broadcaster.client_connected()
+
         # Send the current queue size to the newly connected client
         try:
             queue_size = update_q.qsize()
@@ -312,6 +273,23 @@ def init_socketio(app, datastore):
 
         logger.info("Socket.IO: Client connected")
 
+    @socketio.on('watch_updates_subscribe')
+    def handle_watch_updates_subscribe(data):
+        """Only send watch events for the watches this client shows (watch list page rows, the watch being viewed)"""
+        from flask import request
+
+        uuids = data.get('uuids') if isinstance(data, dict) else None
+        if not isinstance(uuids, list):
+            return
+
+        for room in rooms(sid=request.sid):
+            if room == ALL_WATCHES_ROOM or room.startswith('watch-'):
+                leave_room(room)
+        for uuid in uuids[:1000]:
+            if isinstance(uuid, str) and uuid in socketio.datastore.data['watching']:
+                join_room(watch_room(uuid))
+        logger.trace(f"Socket.IO: Client {request.sid} subscribed to {len(uuids)} watches")
+
     #    logger.info("Socket.IO: Registering disconnect event handler")
     @socketio.on('disconnect')
     def handle_disconnect():
@@ -319,7 +297,8 @@ def init_socketio(app, datastore):
         logger.info("Socket.IO: Client disconnected")
 
     # Create a dedicated signal handler that will receive signals and emit them to clients
-    signal_handler = SignalHandler(socketio, datastore)
+    signal_handler = SignalHandler(socketio, datastore, app=app)
+    socketio.broadcaster = signal_handler.broadcaster
 
     # Register watch operation event handlers
     from .events import register_watch_operation_handlers
@@ -335,6 +314,7 @@ def init_socketio(app, datastore):
         """Shutdown the SocketIO server fast and aggressively"""
         try:
             logger.info("Socket.IO: Fast shutdown initiated...")
+            signal_handler.broadcaster.stop()
             logger.info("Socket.IO: Fast shutdown complete")
         except Exception as e:
             logger.error(f"Socket.IO error during shutdown: {str(e)}")
@@ -0,0 +1,184 @@
+"""
+Deadline based recheck scheduler.
+
+The ticker thread used to sort every watch by `last_checked` once a second and walk the whole list,
+which is O(n log n) per tick no matter how many watches are actually due. `RecheckScheduler` instead keeps
+a min-heap keyed on each watch's next due time, so a tick only has to look at the top of the heap and
+costs O(k log n) for the k watches that are due.
+
+The heap is maintained incrementally, like the other watch trackers (see store/watch_tracker.py):
+- `watch_check_update` (queued, started, finished, cleared, viewed), `watch_committed` (edited, paused,
+  unpaused, API/UI changes) and `watch_updated` mark a watch "dirty" and its due time is recalculated on the next tick
+- `watch_deleted` drops the watch
+- Changes to the global recheck/jitter settings, or the `watching` dict being replaced (reload_state, tests),
+  trigger a full reschedule
+- A slow periodic reconcile pass covers any code path that changes a watch without sending a signal
+
+Entries are invalidated lazily, the current due time for each UUID lives in `_due` and any heap entry that
+does not match it is simply discarded when it reaches the top.
+"""
+
+import heapq
+import random
+import time
+
+from loguru import logger
+
+from changedetectionio.store.watch_tracker import WatchChangeTracker
+
+
+class RecheckScheduler(WatchChangeTracker):
+    # Rebuild the heap when it is this many times bigger than the number of tracked watches
+    COMPACT_RATIO = 4
+    reconcile_env = 'SCHEDULER_RECONCILE_SECONDS'
+
+    def __init__(self, datastore, recheck_time_minimum_seconds=3, reconcile_interval_seconds=None):
+        super().__init__(datastore, reconcile_interval_seconds=reconcile_interval_seconds)
+        self.recheck_time_minimum_seconds = recheck_time_minimum_seconds
+
+        self._heap = []
+        self._due = {}
+
+        self._watching_len = 0
+        self._settings_fingerprint = None
+
+        self.stats = {
+            'full_reschedules': 0,
+            'incremental_updates': 0,
+            'popped': 0,
+            'stale_discarded': 0,
+        }
+
+    def connect_signals(self, weak=False):
+        """Subscribe to the signals that tell us when a watch needs its due time recalculated."""
+        # Only the ticker thread's loop holds the scheduler, weak references would let it go
+        super().connect_signals(weak=weak)
+
+    def __len__(self):
+        return len(self._due)
+
+    def _global_settings_fingerprint(self):
+        settings = self.datastore.data['settings']
+        return (int(self.datastore.threshold_seconds),
+                settings['requests'].get('jitter_seconds', 0),
+                # Not used for the due time, but watches deferred by the time schedule should be looked at again
+                repr(settings['requests'].get('time_schedule_limit')),
+                settings['application'].get('scheduler_timezone_default'))
+
+    def _calculate_due(self, watch, recheck_time_system_seconds, jitter):
+        """Next epoch time this watch should be queued at, jitter is kept on the watch exactly as before."""
+        if jitter > 0 and watch.jitter_seconds == 0:
+            watch.jitter_seconds = random.uniform(-abs(jitter), jitter)
+
+        threshold = recheck_time_system_seconds if watch.get('time_between_check_use_default') else watch.threshold_seconds()
+        wait = max(threshold + watch.jitter_seconds, self.recheck_time_minimum_seconds)
+        return watch.get('last_checked', 0) + wait
+
+    def _schedule(self, uuid, due):
+        self._due[uuid] = due
+        heapq.heappush(self._heap, (due, uuid))
+
+    def _update_one(self, uuid, watching, recheck_time_system_seconds, jitter):
+        watch = watching.get(uuid)
+        if not watch or watch.get('paused'):
+            # Paused watches are re-added by the commit signal when they are unpaused
+            self._due.pop(uuid, None)
+            return
+        due = self._calculate_due(watch, recheck_time_system_seconds, jitter)
+        if self._due.get(uuid) != due:
+            self._schedule(uuid, due)
+
+    def reschedule_all(self):
+        """Rebuild the whole heap from the datastore, O(n)."""
+        watching = self.datastore.data['watching']
+        fingerprint = self._global_settings_fingerprint()
+        recheck_time_system_seconds, jitter = fingerprint[:2]
+
+        while True:
+            try:
+                items = list(watching.items())
+            except RuntimeError:
+                # RuntimeError: dictionary changed size during iteration
+                time.sleep(0.1)
+            else:
+                break
+
+        self._take_dirty()
+        self._reconciled(watching)
+
+        self._due = {}
+        for uuid, watch in items:
+            if watch.get('paused'):
+                continue
+            self._due[uuid] = self._calculate_due(watch, recheck_time_system_seconds, jitter)
+        self._heap = [(due, uuid) for uuid, due in self._due.items()]
+        heapq.heapify(self._heap)
+
+        self._watching_len = len(watching)
+        self._settings_fingerprint = fingerprint
+        self.stats['full_reschedules'] += 1
+        logger.debug(f"Recheck scheduler - full reschedule of {len(self._due)} watches")
+
+    def refresh(self, now=None):
+        """
+        Bring the heap up to date, call once per tick before `pop_due()`.
+
+        Cheap when nothing changed: a couple of identity/length comparisons plus draining the dirty set.
+        """
+        now = now if now is not None else time.time()
+        watching = self.datastore.data['watching']
+        fingerprint = self._global_settings_fingerprint()
+
+        if fingerprint != self._settings_fingerprint or self._reconcile_due(watching, now=now):
+            self.reschedule_all()
+            return
+
+        dirty = self._take_dirty()
+
+        # A watch added/removed without a signal (import, API add etc) shows up as a change in length
+        if len(watching) != self._watching_len:
+            dirty.update(set(watching.keys()) ^ set(self._due.keys()))
+            self._watching_len = len(watching)
+
+        if dirty:
+            recheck_time_system_seconds, jitter = fingerprint[:2]
+            for uuid in dirty:
+                self._update_one(uuid, watching, recheck_time_system_seconds, jitter)
+            self.stats['incremental_updates'] += len(dirty)
+
+        if len(self._heap) > self.COMPACT_RATIO * max(len(self._due), 64):
+            self._heap = [(due, uuid) for uuid, due in self._due.items()]
+            heapq.heapify(self._heap)
+
+    def peek_due_time(self):
+        """Due time of the next watch, or None if nothing is scheduled."""
+        while self._heap:
+            due, uuid = self._heap[0]
+            if self._due.get(uuid) == due:
+                return due
+            heapq.heappop(self._heap)
+            self.stats['stale_discarded'] += 1
+        return None
+
+    def pop_due(self, now=None):
+        """
+        Return the UUID of the most over-due watch and stop tracking it, or None if nothing is due yet.
+
+        The caller is expected to either queue the watch (a `watch_check_update` signal will re-add it
+        once it has been checked) or put it back with `defer()`.
+        """
+        now = now if now is not None else time.time()
+        due = self.peek_due_time()
+        if due is None or due > now:
+            return None
+        _, uuid = heapq.heappop(self._heap)
+        del self._due[uuid]
+        self.stats['popped'] += 1
+        return uuid
+
+    def defer(self, uuid, until):
+        """Put a popped watch back in the heap to be looked at again at `until`."""
+        self._schedule(uuid, until)
+
+    def discard(self, uuid):
+        self._due.pop(uuid, None)
@@ -96,6 +96,16 @@ $(document).ready(function () {
                 console.log('Socket.IO connected with path:', socketio_url);
                 console.log('Socket transport:', socket.io.engine.transport.name);
                 bindSocketHandlerButtonsEvents(socket);
+
+                // Only receive watch events for the watches on this page (the list rows, or the watch being viewed)
+                const watchUuids = $('tr[data-watch-uuid]').map(function () {
+                    return $(this).data('watch-uuid');
+                }).get();
+                const pageUuid = window.location.pathname.match(/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}/);
+                if (pageUuid) {
+                    watchUuids.push(pageUuid[0]);
+                }
+                socket.emit('watch_updates_subscribe', {'uuids': watchUuids});
             });
 
             socket.on('connect_error', function(error) {
@@ -206,32 +216,58 @@ $(document).ready(function () {
             });
 
             socket.on('watch_update', function (data) {
+                // Only the fields that changed since the last update are sent
                 const watch = data.watch;
+                const has = (field) => Object.prototype.hasOwnProperty.call(watch, field);
 
                 // Updating watch table rows
                 const $watchRow = $('tr[data-watch-uuid="' + watch.uuid + '"]');
-                console.log('Found watch row elements:', $watchRow.length);
 
                 if ($watchRow.length) {
-                    $($watchRow).toggleClass('checking-now', watch.checking_now);
-                    $($watchRow).toggleClass('queued', watch.queued);
-                    $($watchRow).toggleClass('unviewed', watch.unviewed);
-                    $($watchRow).toggleClass('has-error', watch.has_error);
-                    $($watchRow).toggleClass('has-favicon', watch.has_favicon);
-                    $($watchRow).toggleClass('notification_muted', watch.notification_muted);
-                    $($watchRow).toggleClass('paused', watch.paused);
-                    $($watchRow).toggleClass('single-history', watch.history_n === 1);
-                    $($watchRow).toggleClass('multiple-history', watch.history_n >= 2);
-
-                    $('td.title-col .error-text', $watchRow).html(watch.error_text)
-                    $('td.last-changed', $watchRow).text(watch.last_changed_text)
-                    $('td.last-checked .innertext', $watchRow).text(watch.last_checked_text)
-                    $('td.last-checked', $watchRow).data('timestamp', watch.last_checked).data('fetchduration', watch.fetch_time);
-                    $('td.last-checked', $watchRow).data('eta_complete', watch.last_checked + watch.fetch_time);
+                    const rowClasses = {
+                        'checking_now': 'checking-now',
+                        'queued': 'queued',
+                        'unviewed': 'unviewed',
+                        'has_error': 'has-error',
+                        'has_favicon': 'has-favicon',
+                        'notification_muted': 'notification_muted',
+                        'paused': 'paused',
+                    };
+                    for (const [field, cssClass] of Object.entries(rowClasses)) {
+                        if (has(field)) {
+                            $watchRow.toggleClass(cssClass, watch[field]);
+                        }
+                    }
+                    if (has('history_n')) {
+                        $watchRow.toggleClass('single-history', watch.history_n === 1);
+                        $watchRow.toggleClass('multiple-history', watch.history_n >= 2);
+                    }
+
+                    if (has('error_text')) {
+                        $('td.title-col .error-text', $watchRow).html(watch.error_text)
+                    }
+                    if (has('last_changed_text')) {
+                        $('td.last-changed', $watchRow).text(watch.last_changed_text)
+                    }
+                    if (has('last_checked_text')) {
+                        $('td.last-checked .innertext', $watchRow).text(watch.last_checked_text)
+                    }
+                    const $lastChecked = $('td.last-checked', $watchRow);
+                    if (has('last_checked')) {
+                        $lastChecked.data('timestamp', watch.last_checked);
+                    }
+                    if (has('fetch_time')) {
+                        $lastChecked.data('fetchduration', watch.fetch_time);
+                    }
+                    if (has('last_checked') || has('fetch_time')) {
+                        $lastChecked.data('eta_complete', $lastChecked.data('timestamp') + $lastChecked.data('fetchduration'));
+                    }
 
                     console.log('Updated UI for watch:', watch.uuid);
                 }
-                $('body').toggleClass('checking-now', watch.checking_now && window.location.href.includes(watch.uuid));
+                if (has('checking_now')) {
+                    $('body').toggleClass('checking-now', watch.checking_now && window.location.href.includes(watch.uuid));
+                }
             });
 
         } catch (e) {
@@ -9,7 +9,7 @@ from flask import (
 )
 from flask_babel import gettext
 
-from ..model import App, Watch
+from ..model import App, Watch, watch_base
 from copy import deepcopy
 from os import path, unlink
 import json
@@ -37,6 +37,11 @@ from ..processors import get_custom_watch_obj_for_processor
 # Import the base class and helpers
 from .file_saving_datastore import FileSavingDataStore, load_all_watches, load_all_tags, save_json_atomic
 from .updates import DatastoreUpdatesMixin
+from .write_behind import WatchWriteBehind
+from .aggregates import WatchAggregates
+from .watch_index import WatchIndex
+from .search_index import WatchSearchIndex
+from .effective_config import EffectiveConfigCache, _file_signature
 
 # Because the server will run as a daemon and wont know the URL for notification links when firing off a notification
 BASE_URL_NOT_SET_TEXT = '("Base URL" not set - see settings - notifications)'
@@ -58,6 +63,20 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
         # logging.basicConfig(filename='/dev/stdout', level=logging.INFO)
         self.datastore_path = datastore_path
         self.start_time = time.time()
+        # Coalesces the watch.json writes from update_watch(), see write_behind.py
+        self.write_behind = WatchWriteBehind(self)
+        # Tag/errored/unread sets and sort orders for paging the watch list, see watch_index.py
+        self.watch_index = WatchIndex(self)
+        self.watch_index.connect_signals()
+        # Errored/unread/per tag counts, the sizes of the watch index sets, see aggregates.py
+        self.aggregates = WatchAggregates(self.watch_index)
+        # SQLite FTS5 index of the watch URL/title/error and newest snapshot text, see search_index.py
+        self.search_index = WatchSearchIndex(self)
+        self.search_index.connect_signals()
+        # Each watch's tags, textfile headers and proxy merged once, see effective_config.py
+        self.effective_config = EffectiveConfigCache(self)
+        self.effective_config.connect_signals()
+        self._proxy_list_cache = None
         self.save_version_copy_json_db(version_tag)
         self.reload_state(datastore_path=datastore_path, include_default_watches=include_default_watches, version_tag=version_tag)
 
@@ -157,7 +176,10 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
         logger.info(f"Rehydrating {watch_count} watches...")
         watching_rehydrated = {}
         for uuid, watch_dict in self.__data.get('watching', {}).items():
-            if isinstance(watch_dict, dict):
+            # Watches loaded from watch.json are already Watch objects (which are dicts too), don't build them twice
+            if isinstance(watch_dict, watch_base):
+                watching_rehydrated[uuid] = watch_dict
+            elif isinstance(watch_dict, dict):
                 watching_rehydrated[uuid] = self.rehydrate_entity(uuid, watch_dict)
             else:
                 logger.error(f"Watch UUID {uuid} already rehydrated")
@@ -202,8 +224,15 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
         # CRITICAL: Update datastore_path (was using old path from __init__)
         self.datastore_path = datastore_path
 
+        # Pending writes belong to the watches being replaced
+        if hasattr(self, 'write_behind'):
+            self.write_behind.discard()
+
         # Initialize data structure
         self.__data = App.model(datastore_path=datastore_path)
+        # .data sets settings.application.active_base_url, do it now so other threads reading .data never add a key
+        # to the settings while they are being copied for saving
+        bump = self.data
         self.json_store_path = os.path.join(self.datastore_path, "changedetection.json")
 
         # Base definition for all watchers (deepcopy part of #569)
@@ -245,6 +274,13 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
             # Maybe they copied a bunch of watch subdirs across too
             self._load_state()
 
+        # Snapshot blobs whose watch directories were removed while we weren't running, see model/blob_store.py
+        from ..model.blob_store import BLOBS_DIRNAME, get_blob_store
+        if os.path.isdir(os.path.join(self.datastore_path, BLOBS_DIRNAME)):
+            import threading
+            threading.Thread(target=get_blob_store(self.datastore_path, enabled=True).collect_garbage,
+                             daemon=True, name="SnapshotBlobGC").start()
+
     def init_fresh_install(self, include_default_watches, version_tag):
       # Generate app_guid FIRST (required for all operations)
         if "pytest" in sys.modules or "PYTEST_CURRENT_TEST" in os.environ:
@@ -387,6 +423,7 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
         settings_data = self._build_settings_data()
         changedetection_json = os.path.join(self.datastore_path, "changedetection.json")
         save_json_atomic(changedetection_json, settings_data, label="settings")
+        self.effective_config.invalidate_all()
 
     def _load_watches(self):
         """
@@ -446,9 +483,13 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
         Args:
             uuid: Watch UUID to delete
         """
+        from ..model.blob_store import SnapshotBlobStore, release_snapshots
+
         watch_dir = os.path.join(self.datastore_path, uuid)
         if os.path.exists(watch_dir):
+            snapshot_names = SnapshotBlobStore.snapshot_names(watch_dir)
             shutil.rmtree(watch_dir)
+            release_snapshots(self.datastore_path, snapshot_names)
             logger.info(f"Deleted watch directory: {watch_dir}")
 
     # ============================================================================
@@ -557,8 +598,10 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
 
             self.__data['watching'][uuid].update(update_obj)
 
-        # Immediate save
-        self.__data['watching'][uuid].commit()
+        # Written to disk by the write-behind thread, several updates during one check become one write
+        self.write_behind.mark_dirty(uuid)
+        # Everything kept per watch in memory listens for this, see watch_tracker.py
+        signal('watch_updated').send(watch_uuid=uuid)
 
     @property
     def threshold_seconds(self):
@@ -571,12 +614,7 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
 
     @property
     def unread_changes_count(self):
-        unread_changes_count = 0
-        for uuid, watch in self.__data['watching'].items():
-            if watch.history_n >= 2 and watch.viewed == False:
-                unread_changes_count += 1
-
-        return unread_changes_count
+        return self.aggregates.unread_changes_count
 
     @property
     def data(self):
@@ -607,7 +645,9 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
         Args:
             uuid: Watch UUID to delete, or 'all' to delete all watches
         """
-        with self.lock:
+        # Hold off the write-behind thread so it can't write a watch back after its directory is removed
+        with self.write_behind.flush_lock, self.lock:
+            self.write_behind.discard(uuid=None if uuid == 'all' else uuid)
             if uuid == 'all':
                 # Delete all watches - capture UUIDs first before modifying dict
                 all_uuids = list(self.__data['watching'].keys())
@@ -822,8 +862,20 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
 
     # Old sync_to_json and save_datastore methods removed - now handled by FileSavingDataStore parent class
 
+    def proxy_list_signature(self):
+        """Changes whenever proxy_list would be different"""
+        return (_file_signature(os.path.join(self.datastore_path, 'proxies.json')),
+                repr(self.data['settings']['requests'].get('extra_proxies')),
+                os.getenv('ENABLE_NO_PROXY_OPTION', 'True'))
+
     @property
     def proxy_list(self):
+        # proxies.json is only read again when it changed on disk
+        signature = self.proxy_list_signature()
+        cached = self._proxy_list_cache
+        if cached is not None and cached[0] == signature:
+            return dict(cached[1]) if cached[1] is not None else None
+
         proxy_list = {}
         proxy_list_file = os.path.join(self.datastore_path, 'proxies.json')
 
@@ -850,40 +902,42 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
         if proxy_list and strtobool(os.getenv('ENABLE_NO_PROXY_OPTION', 'True')):
             proxy_list["no-proxy"] = {'label': "No proxy", 'url': ''}
 
-        return proxy_list if len(proxy_list) else None
+        proxy_list = proxy_list if len(proxy_list) else None
+        self._proxy_list_cache = (signature, proxy_list)
+        return dict(proxy_list) if proxy_list is not None else None
 
-    def get_preferred_proxy_for_watch(self, uuid):
+    def resolve_preferred_proxy(self, watch):
         """
-        Returns the preferred proxy by ID key
-        :param uuid: UUID
-        :return: proxy "key" id
+        Works out the proxy "key" id for this watch, see get_preferred_proxy_for_watch()
         """
-
-        if self.proxy_list is None:
+        proxy_list = self.proxy_list
+        if proxy_list is None:
             return None
 
-        # If it's a valid one
-        watch = self.data['watching'].get(uuid)
-
         if strtobool(os.getenv('ENABLE_NO_PROXY_OPTION', 'True')) and watch.get('proxy') == "no-proxy":
             return None
 
-        if watch.get('proxy') and watch.get('proxy') in list(self.proxy_list.keys()):
+        # If it's a valid one
+        if watch.get('proxy') and watch.get('proxy') in proxy_list:
             return watch.get('proxy')
 
         # not valid (including None), try the system one
-        else:
-            system_proxy_id = self.data['settings']['requests'].get('proxy')
-            # Is not None and exists
-            if self.proxy_list.get(system_proxy_id):
-                return system_proxy_id
+        system_proxy_id = self.data['settings']['requests'].get('proxy')
+        # Is not None and exists
+        if proxy_list.get(system_proxy_id):
+            return system_proxy_id
 
         # Fallback - Did not resolve anything, or doesnt exist, use the first available
-        if system_proxy_id is None or not self.proxy_list.get(system_proxy_id):
-            first_default = list(self.proxy_list)[0]
-            return first_default
+        return next(iter(proxy_list))
 
-        return None
+    def get_preferred_proxy_for_watch(self, uuid):
+        """
+        Returns the preferred proxy by ID key
+        :param uuid: UUID
+        :return: proxy "key" id
+        """
+        config = self.effective_config.get(uuid)
+        return config.preferred_proxy_id if config else None
 
     @property
     def has_extra_headers_file(self):
@@ -898,51 +952,23 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
         return headers
 
     def get_all_headers_in_textfile_for_watch(self, uuid):
-        from ..model.App import parse_headers_from_text_file
-        headers = {}
-
-        # Global in /datastore/headers.txt
-        filepath = os.path.join(self.datastore_path, 'headers.txt')
-        try:
-            if os.path.isfile(filepath):
-                headers.update(parse_headers_from_text_file(filepath))
-        except Exception as e:
-            logger.error(f"ERROR reading headers.txt at {filepath} {str(e)}")
-
-        watch = self.data['watching'].get(uuid)
-        if watch:
-
-            # In /datastore/xyz-xyz/headers.txt
-            filepath = os.path.join(watch.data_dir, 'headers.txt')
+        config = self.effective_config.get(uuid)
+        if config is None:
+            # Only the global /datastore/headers.txt
+            from ..model.App import parse_headers_from_text_file
+            filepath = os.path.join(self.datastore_path, 'headers.txt')
             try:
                 if os.path.isfile(filepath):
-                    headers.update(parse_headers_from_text_file(filepath))
+                    return parse_headers_from_text_file(filepath)
             except Exception as e:
                 logger.error(f"ERROR reading headers.txt at {filepath} {str(e)}")
+            return {}
 
-            # In /datastore/tag-name.txt
-            tags = self.get_all_tags_for_watch(uuid=uuid)
-            for tag_uuid, tag in tags.items():
-                fname = "headers-" + re.sub(r'[\W_]', '', tag.get('title')).lower().strip() + ".txt"
-                filepath = os.path.join(self.datastore_path, fname)
-                try:
-                    if os.path.isfile(filepath):
-                        headers.update(parse_headers_from_text_file(filepath))
-                except Exception as e:
-                    logger.error(f"ERROR reading headers.txt at {filepath} {str(e)}")
-
-        return headers
+        return dict(config.headers_from_textfiles())
 
     def get_tag_overrides_for_watch(self, uuid, attr):
-        tags = self.get_all_tags_for_watch(uuid=uuid)
-        ret = []
-
-        if tags:
-            for tag_uuid, tag in tags.items():
-                if attr in tag and tag[attr]:
-                    ret = [*ret, *tag[attr]]
-
-        return ret
+        config = self.effective_config.get(uuid)
+        return list(config.tag_overrides(attr)) if config else []
 
     def add_tag(self, title):
         # If name exists, return that
@@ -979,13 +1005,10 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
 
     def get_all_tags_for_watch(self, uuid):
         """This should be in Watch model but Watch doesn't have access to datastore, not sure how to solve that yet"""
-        watch = self.data['watching'].get(uuid)
+        config = self.effective_config.get(uuid)
 
         # Should return a dict of full tag info linked by UUID
-        if watch:
-            return dictfilt(self.__data['settings']['application']['tags'], watch.get('tags', []))
-
-        return {}
+        return dict(config.tags) if config else {}
 
     @property
     def extra_browsers(self):
@@ -1011,13 +1034,14 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
                 return True
         return False
 
-    def search_watches_for_url(self, query, tag_limit=None, partial=False):
+    def search_watches_for_url(self, query, tag_limit=None, partial=False, content=False):
         """Search watches by URL, title, or error messages
 
         Args:
             query (str): Search term to match against watch URLs, titles, and error messages
             tag_limit (str, optional): Optional tag name to limit search results
             partial: (bool, optional): sub-string matching
+            content: (bool, optional): also match the words of the newest snapshot text (needs the search index)
 
         Returns:
             list: List of UUIDs of watches that match the search criteria
@@ -1026,6 +1050,14 @@ class ChangeDetectionStore(DatastoreUpdatesMixin, FileSavingDataStore):
         query = query.lower().strip()
         tag = self.tag_exists_by_name(tag_limit) if tag_limit else False
 
+        # Best match first from the search index, the scan below is only used when it isn't available
+        indexed = self.search_index.search(query=query, partial=partial, content=content)
+        if indexed is not None:
+            if tag_limit:
+                members = self.watch_index.tag_members(tag.get('uuid')) if tag else set()
+                indexed = [uuid for uuid in indexed if uuid in members]
+            return indexed
+
         for uuid, watch in self.data['watching'].items():
             # Filter by tag if requested
             if tag_limit:
@@ -0,0 +1,36 @@
+"""
+Watch counters for the UI and the realtime layer (errored, unread changes, per tag, per processor).
+
+These used to be counted by walking every watch, on every `watch_update` Socket.IO emit and every watch list render,
+so with tens of thousands of watches and many checks per second most of the time went into the badge numbers.
+
+The per-watch state they come from (errored?, unread?, its tags, its processor) is kept in one place, the sets of
+WatchIndex (watch_index.py), which is brought up to date from the watch signals. The counters are the sizes of those
+sets, a tag's errored/unread count the size of its members intersected with the errored/unread sets.
+
+Reads are then O(number of watches that changed since the last read), plus the size of the tag for a tag's counts.
+"""
+
+
+class WatchAggregates:
+
+    def __init__(self, watch_index):
+        self.watch_index = watch_index
+
+    @property
+    def errored_count(self):
+        return self.watch_index.counts()['errored']
+
+    @property
+    def unread_changes_count(self):
+        return self.watch_index.counts()['unread']
+
+    def for_tag(self, tag_uuid):
+        """{'watches', 'errored', 'unread'} of the watches with this tag"""
+        return self.watch_index.counts(tag_uuid=tag_uuid)
+
+    def for_processor(self, processor):
+        return self.watch_index.counts(processor=processor)
+
+    def get_summary(self):
+        return self.watch_index.count_summary()
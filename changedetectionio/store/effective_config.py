@@ -0,0 +1,192 @@
+"""
+Per-watch "effective configuration", the watch, its tags and the global settings merged once.
+
+Every check used to work these out again from scratch:
+- the watch's tags, filtered out of all tags once per attribute (get_tag_overrides_for_watch, get_all_tags_for_watch)
+- headers.txt, <uuid>/headers.txt and headers-<tag>.txt stat'ed and parsed (get_all_headers_in_textfile_for_watch)
+- proxies.json read and parsed up to five times to pick the proxy (get_preferred_proxy_for_watch)
+- the processor's JSON config files read (difference_detection_processor.get_extra_watch_config)
+
+An EffectiveWatchConfig is built on first use and kept until something it was built from changes:
+- the watch is committed, changed through store.update_watch() or deleted (`watch_committed`, `watch_updated`,
+  `watch_deleted`, see watch_tracker.py)
+- any tag is committed (`tag_committed`) or the settings are saved, every watch's config is rebuilt on next use
+- the watch's tag list or proxy, the set of tags or proxies.json changed in memory without a commit, these are part
+  of the fingerprint compared on every use
+Files are only parsed again when their mtime/size changes, so editing a headers*.txt on disk still applies on the
+next check.
+"""
+
+import copy
+import json
+import os
+import re
+import threading
+
+from blinker import signal
+from loguru import logger
+
+from .watch_tracker import WatchSignalListener
+
+
+def _file_signature(filepath):
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class EffectiveWatchConfig:
+    """The settings of one watch as a check uses them, see the module docstring"""
+
+    def __init__(self, datastore, watch, fingerprint):
+        self.datastore = datastore
+        self.data_dir = watch.data_dir
+        self.fingerprint = fingerprint
+
+        # Same order as the tags in settings, like dictfilt() gave
+        watch_tags = set(watch.get('tags') or ())
+        all_tags = datastore.data['settings']['application'].get('tags', {})
+        self.tags = {tag_uuid: tag for tag_uuid, tag in all_tags.items() if tag_uuid in watch_tags}
+
+        self.preferred_proxy_id = datastore.resolve_preferred_proxy(watch)
+
+        self._tag_overrides = {}
+        self._header_files = self._headers_files_for(datastore, self.data_dir, self.tags)
+        self._headers_signature = None
+        self._headers = {}
+        # filename -> (file signature, parsed JSON)
+        self._extra_config = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _headers_files_for(datastore, data_dir, tags):
+        # Global in /datastore/headers.txt, then /datastore/xyz-xyz/headers.txt, then /datastore/headers-tagname.txt
+        files = [os.path.join(datastore.datastore_path, 'headers.txt')]
+        if data_dir:
+            files.append(os.path.join(data_dir, 'headers.txt'))
+        for tag in tags.values():
+            fname = "headers-" + re.sub(r'[\W_]', '', tag.get('title')).lower().strip() + ".txt"
+            files.append(os.path.join(datastore.datastore_path, fname))
+        return files
+
+    def tag_overrides(self, attr):
+        """All the values of this attribute set in the watch's tags, in tag order"""
+        ret = self._tag_overrides.get(attr)
+        if ret is None:
+            ret = []
+            for tag in self.tags.values():
+                if attr in tag and tag[attr]:
+                    ret = [*ret, *tag[attr]]
+            self._tag_overrides[attr] = ret
+        return ret
+
+    def headers_from_textfiles(self):
+        """Headers from the headers*.txt files, later files win"""
+        from ..model.App import parse_headers_from_text_file
+
+        signature = tuple(_file_signature(filepath) for filepath in self._header_files)
+        with self._lock:
+            if signature != self._headers_signature:
+                headers = {}
+                for filepath, file_signature in zip(self._header_files, signature):
+                    if file_signature is None:
+                        continue
+                    try:
+                        headers.update(parse_headers_from_text_file(filepath))
+                    except Exception as e:
+                        logger.error(f"ERROR reading headers.txt at {filepath} {str(e)}")
+                self._headers = headers
+                self._headers_signature = signature
+            return self._headers
+
+    def extra_watch_config(self, filename):
+        """Parsed processor JSON config file from the watch's data directory, {} when there isn't one"""
+        if not self.data_dir:
+            return {}
+
+        filepath = os.path.join(self.data_dir, filename)
+        signature = _file_signature(filepath)
+        if signature is None:
+            return {}
+
+        with self._lock:
+            cached = self._extra_config.get(filename)
+            if cached is not None and cached[0] == signature:
+                return copy.deepcopy(cached[1])
+
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Failed to read extra watch config {filename}: {e}")
+            return {}
+
+        with self._lock:
+            self._extra_config[filename] = (signature, data)
+        return copy.deepcopy(data)
+
+
+class EffectiveConfigCache(WatchSignalListener):
+    # Check progress doesn't change the configuration
+    watch_signals = ('watch_committed', 'watch_updated', 'watch_deleted')
+
+    def __init__(self, datastore):
+        self.datastore = datastore
+        self._lock = threading.Lock()
+        self._configs = {}
+        # Bumped by any tag or settings commit, every config built before is stale
+        self._generation = 0
+
+        self.stats = {'hits': 0, 'builds': 0, 'invalidations': 0}
+
+    def connect_signals(self, weak=True):
+        super().connect_signals(weak=weak)
+        signal('tag_committed').connect(self._on_tag_committed, weak=weak)
+
+    def watch_changed(self, uuid):
+        self.forget(uuid)
+
+    def _on_tag_committed(self, sender=None, **kwargs):
+        self.invalidate_all()
+
+    def forget(self, uuid):
+        with self._lock:
+            if self._configs.pop(uuid, None) is not None:
+                self.stats['invalidations'] += 1
+
+    def invalidate_all(self):
+        with self._lock:
+            self._generation += 1
+            self._configs = {}
+
+    def _fingerprint(self, watch):
+        tags = self.datastore.data['settings']['application'].get('tags', {})
+        return (self._generation, tuple(watch.get('tags') or ()), watch.get('proxy'), id(tags), len(tags),
+                self.datastore.proxy_list_signature())
+
+    def get(self, uuid):
+        """The EffectiveWatchConfig of a watch, None if it doesn't exist"""
+        watch = self.datastore.data['watching'].get(uuid)
+        if not watch:
+            return None
+
+        fingerprint = self._fingerprint(watch)
+        with self._lock:
+            config = self._configs.get(uuid)
+            if config is not None and config.fingerprint == fingerprint:
+                self.stats['hits'] += 1
+                return config
+
+        config = EffectiveWatchConfig(self.datastore, watch, fingerprint)
+        with self._lock:
+            # Not kept if a commit happened while it was being built
+            if fingerprint[0] == self._generation:
+                self._configs[uuid] = config
+            self.stats['builds'] += 1
+        return config
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, 'watches': len(self._configs)}
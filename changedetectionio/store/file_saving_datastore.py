@@ -208,31 +208,48 @@ def save_watch_atomic(watch_dir, uuid, watch_dict):
 
 
 
-def load_watch_from_file(watch_json, uuid, rehydrate_entity_func):
+MAX_WATCH_SIZE = 10 * 1024 * 1024  # 10MB
+
+# Startup loading, see load_all_watches()
+STARTUP_LOAD_WORKERS = int(os.getenv('STARTUP_LOAD_WORKERS', min(8, (os.cpu_count() or 1) * 2)))
+STARTUP_MANIFEST = bool(strtobool(os.getenv('STARTUP_MANIFEST', 'False')))
+STARTUP_MANIFEST_FILENAME = "startup-manifest.json"
+
+
+def _watch_file_signature(st):
+    """Identifies one version of a watch.json, an atomic save always gives a new inode/mtime"""
+    return [st.st_ino, st.st_mtime_ns, st.st_size]
+
+
+def read_watch_file(watch_json, uuid, manifest_entry=None):
     """
-    Load a watch from its JSON file.
+    Read and parse a watch.json, safe to call from the startup loader threads (no rehydration here).
 
     Args:
         watch_json: Path to the watch.json file
         uuid: Watch UUID
-        rehydrate_entity_func: Function to convert dict to Watch object
+        manifest_entry: Optional [signature, data] from the startup manifest, used instead of reading the
+                        file when the file has not changed since the manifest was written
 
     Returns:
-        Watch object or None if failed
+        (watch data dict, file signature, True if it came from the manifest) or None if failed
     """
     try:
         # Check file size before reading
-        file_size = os.path.getsize(watch_json)
-        MAX_WATCH_SIZE = 10 * 1024 * 1024  # 10MB
-        if file_size > MAX_WATCH_SIZE:
+        st = os.stat(watch_json)
+        if st.st_size > MAX_WATCH_SIZE:
             logger.critical(
                 f"CORRUPTED WATCH DATA: Watch {uuid} file is unexpectedly large: "
-                f"{file_size / 1024 / 1024:.2f}MB (max: {MAX_WATCH_SIZE / 1024 / 1024}MB). "
+                f"{st.st_size / 1024 / 1024:.2f}MB (max: {MAX_WATCH_SIZE / 1024 / 1024}MB). "
                 f"File: {watch_json}. This indicates a bug or data corruption. "
                 f"Watch will be skipped."
             )
             return None
 
+        signature = _watch_file_signature(st)
+        if manifest_entry and manifest_entry[0] == signature:
+            return manifest_entry[1], signature, True
+
         if HAS_ORJSON:
             with open(watch_json, 'rb') as f:
                 watch_data = orjson.loads(f.read())
@@ -240,9 +257,7 @@ def load_watch_from_file(watch_json, uuid, rehydrate_entity_func):
             with open(watch_json, 'r', encoding='utf-8') as f:
                 watch_data = json.load(f)
 
-        # Rehydrate and return watch object
-        watch_obj = rehydrate_entity_func(uuid, watch_data)
-        return watch_obj
+        return watch_data, signature, False
 
     except json.JSONDecodeError as e:
         logger.critical(
@@ -270,17 +285,72 @@ def load_watch_from_file(watch_json, uuid, rehydrate_entity_func):
         return None
 
 
-def load_all_watches(datastore_path, rehydrate_entity_func):
+def load_watch_from_file(watch_json, uuid, rehydrate_entity_func):
+    """
+    Load a watch from its JSON file.
+
+    Args:
+        watch_json: Path to the watch.json file
+        uuid: Watch UUID
+        rehydrate_entity_func: Function to convert dict to Watch object
+
+    Returns:
+        Watch object or None if failed
+    """
+    result = read_watch_file(watch_json, uuid)
+    if not result:
+        return None
+
+    try:
+        # Rehydrate and return watch object
+        return rehydrate_entity_func(uuid, result[0])
+    except Exception as e:
+        logger.error(f"Failed to load watch {uuid} from {watch_json}: {e}")
+        return None
+
+
+def _read_watch_files(batch):
+    """read_watch_file() for a batch of (watch_json, uuid, manifest_entry), one thread pool task per batch"""
+    return [read_watch_file(*args) for args in batch]
+
+
+def _load_startup_manifest(manifest_path):
+    """{uuid: [watch.json signature, watch data]} from the last boot, empty when missing or unreadable"""
+    try:
+        with open(manifest_path, 'rb') as f:
+            manifest = orjson.loads(f.read()) if HAS_ORJSON else json.loads(f.read().decode('utf-8'))
+        return manifest.get('watches', {})
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable startup manifest {manifest_path}: {e}")
+        return {}
+
+
+def load_all_watches(datastore_path, rehydrate_entity_func, workers=None, use_manifest=None):
     """
     Load all watches from individual watch.json files.
 
     SYNCHRONOUS loading: Blocks until all watches are loaded.
     This ensures data consistency - web server won't accept requests
-    until all watches are available. Progress logged every 100 watches.
+    until all watches are available. Progress logged every 1000 watches.
+
+    The stat/read/parse of each watch.json runs in a thread pool (STARTUP_LOAD_WORKERS threads, 0 or 1 = one by one),
+    file I/O releases the GIL so this mostly helps on slow or networked storage. Watch objects are built here in the
+    calling thread as the results come in, in the original order; they hold a reference to the live datastore so
+    they can't be built in another process, and pickling parsed dicts back from a process pool costs more than
+    parsing them.
+
+    With STARTUP_MANIFEST=True, every parsed watch.json is also kept in {datastore}/startup-manifest.json together
+    with its inode/mtime/size, and the next boot takes the data from there for every file that has not changed,
+    only a stat() per watch instead of open/read/parse. The manifest is only a cache, watch.json stays the source of
+    truth, deleting the manifest is always safe.
 
     Args:
         datastore_path: Path to the datastore directory
         rehydrate_entity_func: Function to convert dict to Watch object
+        workers: Loader thread count, default STARTUP_LOAD_WORKERS
+        use_manifest: Use/write the startup manifest, default STARTUP_MANIFEST
 
     Returns:
         Dictionary of uuid -> Watch object
@@ -293,6 +363,9 @@ def load_all_watches(datastore_path, rehydrate_entity_func):
     if not os.path.exists(datastore_path):
         return watching
 
+    workers = STARTUP_LOAD_WORKERS if workers is None else workers
+    use_manifest = STARTUP_MANIFEST if use_manifest is None else use_manifest
+
     # Find all watch.json files using glob (faster than manual directory traversal)
     glob_start = time.time()
     watch_files = glob.glob(os.path.join(datastore_path, "*", "watch.json"))
@@ -301,24 +374,64 @@ def load_all_watches(datastore_path, rehydrate_entity_func):
     total = len(watch_files)
     logger.debug(f"Found {total} watch.json files in {glob_time:.3f}s")
 
+    manifest_path = os.path.join(datastore_path, STARTUP_MANIFEST_FILENAME)
+    manifest = _load_startup_manifest(manifest_path) if use_manifest else {}
+    new_manifest = {}
+    from_manifest = 0
+
+    # Extract UUID from path: /datastore/{uuid}/watch.json
+    uuids = [os.path.basename(os.path.dirname(watch_json)) for watch_json in watch_files]
+    jobs = [(watch_json, uuid, manifest.get(uuid)) for watch_json, uuid in zip(watch_files, uuids)]
+
+    executor = None
+    if workers > 1 and total > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        import itertools
+        # Batches keep the per-task overhead down, results still come back in order
+        batch_size = 200
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="WatchLoader")
+        batches = executor.map(_read_watch_files, [jobs[i:i + batch_size] for i in range(0, total, batch_size)])
+        results = itertools.chain.from_iterable(batches)
+    else:
+        results = (read_watch_file(*job) for job in jobs)
+
     loaded = 0
     failed = 0
 
-    for watch_json in watch_files:
-        # Extract UUID from path: /datastore/{uuid}/watch.json
-        uuid_dir = os.path.basename(os.path.dirname(watch_json))
-        watch = load_watch_from_file(watch_json, uuid_dir, rehydrate_entity_func)
-        if watch:
-            watching[uuid_dir] = watch
-            loaded += 1
-
-            if loaded % 100 == 0:
-                logger.info(f"Loaded {loaded}/{total} watches...")
-        else:
-            # load_watch_from_file already logged the specific error
-            failed += 1
-
-    elapsed = time.time() - start_time
+    try:
+        for watch_json, uuid_dir, result in zip(watch_files, uuids, results):
+            watch = None
+            if result:
+                watch_data, signature, cached = result
+                if use_manifest:
+                    new_manifest[uuid_dir] = [signature, watch_data]
+                    from_manifest += cached
+                try:
+                    watch = rehydrate_entity_func(uuid_dir, watch_data)
+                except Exception as e:
+                    logger.error(f"Failed to load watch {uuid_dir} from {watch_json}: {e}")
+
+            if watch:
+                watching[uuid_dir] = watch
+                loaded += 1
+
+                if loaded % 1000 == 0:
+                    logger.info(f"Loaded {loaded}/{total} watches...")
+            else:
+                # read_watch_file already logged the specific error
+                failed += 1
+    finally:
+        if executor:
+            executor.shutdown(wait=True)
+
+    # Only rewrite the manifest when something changed since it was written
+    if use_manifest and (from_manifest != len(new_manifest) or len(manifest) != len(new_manifest)):
+        try:
+            save_json_atomic(manifest_path, {'watches': new_manifest}, label="startup manifest", max_size_mb=2048)
+        except Exception as e:
+            logger.warning(f"Could not write startup manifest {manifest_path}: {e}")
+
+    elapsed = max(time.time() - start_time, 0.001)
 
     if failed > 0:
         logger.critical(
@@ -327,7 +440,8 @@ def load_all_watches(datastore_path, rehydrate_entity_func):
             f"in {elapsed:.2f}s ({loaded/elapsed:.0f} watches/sec)"
         )
     else:
-        logger.info(f"Loaded {loaded} watches from disk in {elapsed:.2f}s ({loaded/elapsed:.0f} watches/sec)")
+        logger.info(f"Loaded {loaded} watches from disk in {elapsed:.2f}s ({loaded/elapsed:.0f} watches/sec, "
+                    f"{from_manifest} unchanged from startup manifest, {workers} loader threads)")
 
     return watching
 
@@ -0,0 +1,397 @@
+"""
+Full text search over the watches (URL, title, last error) and the text of their newest snapshot.
+
+search_watches_for_url() (the /api/v1/search endpoint) and the watch list `q=` filter compared the query with every
+watch's URL, title and last error one by one, and there was no way at all to search the snapshot text.
+
+The index is an SQLite FTS5 database in the datastore directory (search-index.db). It is a cache: it is not part of
+backups, and it is rebuilt when it is missing, unreadable or has an older schema.
+- watch metadata, lower cased in a plain table (exact matches use its indexes) and a trigram FTS5 table on top of it
+  (substring matches, what `partial` has always meant)
+- newest snapshot text in a word FTS5 table, ranked with bm25, at most SEARCH_INDEX_CONTENT_MAX_CHARS (default
+  100000) characters of it per watch
+
+Kept current the same way as the other watch trackers (see watch_tracker.py):
+- `watch_check_update`, `watch_committed` and `watch_updated` mark a watch dirty, its metadata is compared with what
+  is indexed before the next search
+- `watch_snapshot_saved` (save_history_blob()) hands over the new text, no need to read it back from disk
+- `watch_deleted` removes it
+- The `watching` dict being replaced or its size changing without a signal compares every watch again
+- A background thread applies pending changes every SEARCH_INDEX_INTERVAL_SECONDS (default 5) and reads the
+  snapshots that aren't indexed yet (first start, snapshots written by an older version) a batch at a time
+
+search() returns None when the index can't answer (SQLite without FTS5, SEARCH_INDEX_ENABLED=false, or the
+database failing), callers then fall back to the old scan.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+from blinker import signal
+from loguru import logger
+
+from changedetectionio.strtobool import strtobool
+from .watch_tracker import WatchChangeTracker
+
+SCHEMA_VERSION = 1
+SEARCH_INDEX_FILENAME = 'search-index.db'
+# Snapshots read from disk per background pass
+CONTENT_BATCH_SIZE = 200
+# The trigram tokenizer can't match anything shorter
+MIN_TRIGRAM_QUERY_LENGTH = 3
+
+SCHEMA = [
+    """CREATE TABLE watches (
+        id INTEGER PRIMARY KEY,
+        uuid TEXT UNIQUE NOT NULL,
+        url TEXT NOT NULL DEFAULT '',
+        title TEXT NOT NULL DEFAULT '',
+        last_error TEXT NOT NULL DEFAULT '',
+        content_key TEXT
+    )""",
+    "CREATE INDEX watches_url ON watches(url)",
+    "CREATE INDEX watches_title ON watches(title)",
+    "CREATE INDEX watches_last_error ON watches(last_error)",
+    """CREATE VIRTUAL TABLE watch_meta USING fts5(url, title, last_error, content='watches', content_rowid='id',
+        tokenize='trigram')""",
+    """CREATE TRIGGER watches_ai AFTER INSERT ON watches BEGIN
+        INSERT INTO watch_meta(rowid, url, title, last_error) VALUES (new.id, new.url, new.title, new.last_error);
+    END""",
+    """CREATE TRIGGER watches_ad AFTER DELETE ON watches BEGIN
+        INSERT INTO watch_meta(watch_meta, rowid, url, title, last_error) VALUES ('delete', old.id, old.url, old.title, old.last_error);
+        DELETE FROM watch_content WHERE rowid = old.id;
+    END""",
+    """CREATE TRIGGER watches_au AFTER UPDATE OF url, title, last_error ON watches BEGIN
+        INSERT INTO watch_meta(watch_meta, rowid, url, title, last_error) VALUES ('delete', old.id, old.url, old.title, old.last_error);
+        INSERT INTO watch_meta(rowid, url, title, last_error) VALUES (new.id, new.url, new.title, new.last_error);
+    END""",
+    "CREATE VIRTUAL TABLE watch_content USING fts5(content, tokenize='unicode61 remove_diacritics 2')",
+]
+
+
+def fts5_available():
+    try:
+        connection = sqlite3.connect(':memory:')
+        connection.execute("CREATE VIRTUAL TABLE t USING fts5(a, tokenize='trigram')")
+        connection.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def _metadata(watch):
+    return (
+        (watch.get('url') or '').lower(),
+        (watch.get('title') or '').lower(),
+        str(watch.get('last_error') or '').lower(),
+    )
+
+
+def _newest_snapshot_key(watch):
+    history = watch.history
+    if not history:
+        return None
+    # history.txt is appended to, the last entry is the newest
+    return next(reversed(history))
+
+
+def _fts_phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _fts_words(query, prefix=False):
+    """Every word of the query has to be in the text, quoted so nothing in it is FTS5 syntax"""
+    return ' '.join(_fts_phrase(word) + ('*' if prefix else '') for word in query.split())
+
+
+def _like_pattern(text):
+    return '%' + text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+
+class WatchSearchIndex(WatchChangeTracker):
+
+    def __init__(self, datastore, interval_seconds=None, content_max_chars=None):
+        super().__init__(datastore)
+        self.interval_seconds = interval_seconds if interval_seconds is not None else float(os.getenv('SEARCH_INDEX_INTERVAL_SECONDS', 5))
+        self.content_max_chars = content_max_chars or int(os.getenv('SEARCH_INDEX_CONTENT_MAX_CHARS', 100000))
+        self.enabled = strtobool(os.getenv('SEARCH_INDEX_ENABLED', 'True')) and fts5_available()
+
+        self._lock = threading.RLock()
+        # uuid -> (snapshot key, text) handed over by save_history_blob(), guarded by _dirty_lock like _dirty
+        self._pending_content = {}
+        # Snapshot text that has to be read from disk
+        self._content_dirty = set()
+
+        self._connection = None
+        self._db_path = None
+        # uuid -> [row id, url, title, last_error, content_key], what is in the database
+        self._rows = {}
+
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+        self.stats = {'searches': 0, 'metadata_updates': 0, 'content_updates': 0, 'content_reads': 0, 'full_syncs': 0, 'errors': 0}
+
+    def connect_signals(self, weak=True):
+        super().connect_signals(weak=weak)
+        signal('watch_snapshot_saved').connect(self._on_snapshot_saved, weak=weak)
+
+    def _on_snapshot_saved(self, sender=None, **kwargs):
+        watch_uuid = kwargs.get('watch_uuid')
+        if not watch_uuid or not self.enabled:
+            return
+        contents = kwargs.get('contents')
+        with self._dirty_lock:
+            self._dirty.add(watch_uuid)
+            self._pending_content[watch_uuid] = (str(kwargs.get('timestamp')), contents[:self.content_max_chars] if isinstance(contents, str) else '')
+            pending = len(self._pending_content)
+        self._ensure_thread()
+        # The texts wait in memory until they are written
+        if pending >= CONTENT_BATCH_SIZE:
+            self._wakeup.set()
+
+    def mark_dirty(self, uuid):
+        if not self.enabled:
+            return
+        super().mark_dirty(uuid)
+        self._ensure_thread()
+
+    def _ensure_thread(self):
+        if self._stopped:
+            return
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True, name="WatchSearchIndex")
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(timeout=self.interval_seconds)
+            self._wakeup.clear()
+            if self._stopped:
+                break
+            try:
+                # Keep going while there are snapshots to read, a batch at a time so searches get the lock in between
+                while self.sync(content_batch=CONTENT_BATCH_SIZE) and not self._stopped:
+                    time.sleep(0)
+            except Exception as e:
+                logger.error(f"Search index update failed: {e}")
+
+    def stop(self):
+        self._stopped = True
+        self._wakeup.set()
+        with self._lock:
+            self._close()
+
+    def _close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            except sqlite3.Error:
+                pass
+        self._connection = None
+        self._rows = {}
+        self._watching_ref = None
+
+    def _open(self):
+        db_path = os.path.join(self.datastore.datastore_path, SEARCH_INDEX_FILENAME)
+        if self._connection is not None and self._db_path == db_path:
+            return self._connection
+        self._close()
+
+        for attempt in range(2):
+            connection = None
+            try:
+                connection = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+                if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                    if connection.execute("SELECT count(*) FROM sqlite_master").fetchone()[0]:
+                        raise sqlite3.DatabaseError(f"schema is not version {SCHEMA_VERSION}")
+                    connection.execute("PRAGMA journal_mode=WAL")
+                    connection.execute("BEGIN")
+                    for statement in SCHEMA:
+                        connection.execute(statement)
+                    connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+                    connection.execute("COMMIT")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                rows = connection.execute("SELECT uuid, id, url, title, last_error, content_key FROM watches").fetchall()
+                break
+            except sqlite3.DatabaseError as e:
+                # Only a cache, start again from nothing
+                logger.warning(f"Search index {db_path} unusable ({e}), rebuilding it")
+                if connection is not None:
+                    connection.close()
+                if attempt:
+                    raise
+                for suffix in ('', '-wal', '-shm'):
+                    if os.path.exists(db_path + suffix):
+                        os.unlink(db_path + suffix)
+
+        self._connection = connection
+        self._db_path = db_path
+        self._rows = {uuid: [row_id, url, title, last_error, content_key] for uuid, row_id, url, title, last_error, content_key in rows}
+        self._watching_ref = None
+        logger.debug(f"Search index {db_path} opened, {len(self._rows)} watches indexed")
+        return connection
+
+    def _index_watch(self, connection, uuid, watch):
+        """Bring one watch's row up to date, returns True when its snapshot text has to be read from disk"""
+        if watch is None:
+            if uuid in self._rows:
+                connection.execute("DELETE FROM watches WHERE uuid = ?", (uuid,))
+                del self._rows[uuid]
+            return False
+
+        metadata = _metadata(watch)
+        row = self._rows.get(uuid)
+        if row is None:
+            row_id = connection.execute("INSERT INTO watches(uuid, url, title, last_error) VALUES (?, ?, ?, ?)", (uuid, *metadata)).lastrowid
+            row = self._rows[uuid] = [row_id, *metadata, None]
+            self.stats['metadata_updates'] += 1
+        elif tuple(row[1:4]) != metadata:
+            connection.execute("UPDATE watches SET url = ?, title = ?, last_error = ? WHERE id = ?", (*metadata, row[0]))
+            row[1:4] = metadata
+            self.stats['metadata_updates'] += 1
+
+        newest = _newest_snapshot_key(watch)
+        if newest == row[4]:
+            return False
+        if newest is None:
+            self._set_content(connection, row, None, None)
+            return False
+        return True
+
+    def _set_content(self, connection, row, content_key, text):
+        connection.execute("DELETE FROM watch_content WHERE rowid = ?", (row[0],))
+        if text:
+            connection.execute("INSERT INTO watch_content(rowid, content) VALUES (?, ?)", (row[0], text))
+        connection.execute("UPDATE watches SET content_key = ? WHERE id = ?", (content_key, row[0]))
+        row[4] = content_key
+        self.stats['content_updates'] += 1
+
+    def _read_content(self, watch, content_key):
+        try:
+            text = watch.get_history_snapshot(timestamp=content_key)
+        except Exception as e:
+            logger.debug(f"Search index could not read snapshot {content_key} of {watch.get('uuid')}: {e}")
+            return ''
+        self.stats['content_reads'] += 1
+        return text[:self.content_max_chars] if isinstance(text, str) else ''
+
+    def sync(self, content_batch=0):
+        """
+        Apply the pending changes, and read up to content_batch snapshots that are not indexed yet from disk.
+        Returns True when there are more snapshots to read.
+        """
+        if not self.enabled:
+            return False
+
+        with self._lock:
+            connection = self._open()
+            watching = self.datastore.data['watching']
+
+            with self._dirty_lock:
+                dirty = self._dirty
+                self._dirty = set()
+                pending_content = self._pending_content
+                self._pending_content = {}
+
+            full = self._reconcile_due(watching) or len(watching) != len(self._rows)
+            if not full and not dirty and not (self._content_dirty and content_batch):
+                return bool(self._content_dirty)
+            if full:
+                dirty = set(watching.keys()) | set(self._rows.keys())
+                self._content_dirty.clear()
+                self.stats['full_syncs'] += 1
+
+            t = time.time()
+            connection.execute("BEGIN")
+            try:
+                for uuid in dirty:
+                    watch = watching.get(uuid)
+                    if self._index_watch(connection, uuid, watch):
+                        content_key = _newest_snapshot_key(watch)
+                        pending = pending_content.get(uuid)
+                        if pending is not None and pending[0] == content_key:
+                            self._set_content(connection, self._rows[uuid], content_key, pending[1])
+                            self._content_dirty.discard(uuid)
+                        else:
+                            self._content_dirty.add(uuid)
+                    else:
+                        self._content_dirty.discard(uuid)
+
+                read = 0
+                while self._content_dirty and read < content_batch:
+                    uuid = self._content_dirty.pop()
+                    watch = watching.get(uuid)
+                    row = self._rows.get(uuid)
+                    if watch is None or row is None:
+                        continue
+                    content_key = _newest_snapshot_key(watch)
+                    if content_key != row[4]:
+                        self._set_content(connection, row, content_key, self._read_content(watch, content_key) if content_key else None)
+                        read += 1
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                # Compare everything with the database again next time
+                self._close()
+                raise
+
+            self._reconciled(watching)
+            if full:
+                logger.debug(f"Search index compared {len(watching)} watches in {(time.time() - t) * 1000:.0f}ms, "
+                             f"{len(self._content_dirty)} snapshots to read")
+            return bool(self._content_dirty)
+
+    def search(self, query, partial=False, content=False):
+        """
+        UUIDs of the watches matching query, best match first, or None when the index can't be used.
+
+        :param partial: Sub-string match of URL, title or last error, otherwise the whole value has to match
+        :param content: Also match the words of the newest snapshot text (as word prefixes when partial)
+        """
+        if not self.enabled:
+            return None
+        query = query.lower().strip()
+
+        try:
+            self.sync()
+            with self._lock:
+                connection = self._open()
+                self.stats['searches'] += 1
+                if not partial:
+                    rows = connection.execute("SELECT uuid FROM watches WHERE url = ? OR title = ? OR last_error = ?", (query, query, query)).fetchall()
+                elif len(query) >= MIN_TRIGRAM_QUERY_LENGTH:
+                    rows = connection.execute("SELECT w.uuid FROM watch_meta JOIN watches w ON w.id = watch_meta.rowid "
+                                              "WHERE watch_meta MATCH ? ORDER BY rank", (_fts_phrase(query),)).fetchall()
+                else:
+                    pattern = _like_pattern(query)
+                    rows = connection.execute("SELECT uuid FROM watches WHERE url LIKE ?1 ESCAPE '\\' OR title LIKE ?1 ESCAPE '\\' "
+                                              "OR last_error LIKE ?1 ESCAPE '\\' ORDER BY id", (pattern,)).fetchall()
+                uuids = [uuid for (uuid,) in rows]
+
+                words = _fts_words(query, prefix=partial)
+                if content and words:
+                    found = set(uuids)
+                    for (uuid,) in connection.execute("SELECT w.uuid FROM watch_content JOIN watches w ON w.id = watch_content.rowid "
+                                                      "WHERE watch_content MATCH ? ORDER BY rank", (words,)):
+                        if uuid not in found:
+                            uuids.append(uuid)
+                            found.add(uuid)
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            logger.error(f"Search index query failed, searching without it: {e}")
+            with self._lock:
+                self._close()
+            return None
+
+        # Rows of watches deleted since the last sync
+        watching = self.datastore.data['watching']
+        return [uuid for uuid in uuids if uuid in watching]
+
+    def get_stats(self):
+        with self._dirty_lock:
+            pending = len(self._dirty) + len(self._content_dirty)
+        return {**self.stats, 'enabled': self.enabled, 'indexed': len(self._rows), 'pending': pending}
@@ -134,7 +134,8 @@ class DatastoreUpdatesMixin:
         """
         import inspect
         updates_available = []
-        for i, o in inspect.getmembers(self, predicate=inspect.ismethod):
+        # Look at the class, getmembers() on the instance would evaluate every property (unread_changes_count etc)
+        for i, o in inspect.getmembers(type(self), predicate=inspect.isfunction):
             m = re.search(r'update_(\d+)$', i)
             if m:
                 updates_available.append(int(m.group(1)))
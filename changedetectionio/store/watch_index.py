@@ -0,0 +1,297 @@
+"""
+Secondary indexes for the watch list (tag/processor -> watches, errored, unread, and the watch list sort orders).
+
+The watch list page used to walk every watch to filter it, then sort the whole list in the template and slice one
+page out of it, every page view was O(n) in Python and Jinja for `pager_size` rows. /api/v1/watch did the same walk
+to filter by tag.
+
+Here every watch's sort keys and filter memberships are remembered and only updated when the watch changes, the
+same way as the other watch trackers (see watch_tracker.py):
+- `watch_check_update`, `watch_committed` and `watch_updated` mark a watch "dirty", it is re-indexed on the next read
+- `watch_deleted` drops it
+- The `watching` dict being replaced or its size changing without a signal rebuilds everything
+- A periodic reconcile (WATCH_INDEX_RECONCILE_SECONDS, default 60) covers code paths that change a watch without
+  sending a signal
+
+Each sort attribute has an order-statistics index (see queue_handlers._SortedKeyIndex), an unfiltered page is
+O(page + log n), a filtered page only looks at the watches that pass the filter.
+
+The order is the one the template used to produce with Jinja's `sort(attribute=..., reverse=...)`, strings compared
+case-insensitive and equal keys in the order the watches were added.
+
+The same sets are all the counters need (see aggregates.py), counts() is the size of a set or of its intersection
+with the errored/unread sets.
+"""
+
+import threading
+
+from loguru import logger
+
+from changedetectionio.queue_handlers import _SortedKeyIndex
+from .watch_tracker import WatchChangeTracker
+
+SORT_ATTRIBUTES = ('date_created', 'paused', 'notification_muted', 'label', 'last_checked', 'last_changed')
+DEFAULT_SORT_ATTRIBUTE = 'last_changed'
+
+# Below this share of all watches the filtered watches are sorted directly instead of walking the index
+DIRECT_SORT_RATIO = 0.2
+ORDERED_CACHE_SIZE = 32
+
+
+def _sort_key(watch, attribute):
+    value = getattr(watch, attribute) if attribute in ('label', 'last_changed') else watch.get(attribute)
+    if isinstance(value, str):
+        # Jinja's sort() ignores case by default
+        return (1, value.lower())
+    return (0, float(value or 0))
+
+
+class WatchIndex(WatchChangeTracker):
+    reconcile_env = 'WATCH_INDEX_RECONCILE_SECONDS'
+
+    def __init__(self, datastore, reconcile_interval_seconds=None):
+        super().__init__(datastore, reconcile_interval_seconds=reconcile_interval_seconds)
+        self._lock = threading.RLock()
+
+        # uuid -> {'seq', 'errored', 'unread', 'tags', 'processor'}
+        self._entries = {}
+        self._next_seq = 0
+        # attribute -> index of (key, seq, uuid) for ascending pages, and of (key, -seq, uuid) for descending pages
+        # so equal keys stay in the order the watches were added both ways, and attribute -> {uuid: that tuple}
+        self._ascending = {}
+        self._descending = {}
+        self._ascending_keys = {}
+        self._descending_keys = {}
+        self._errored = set()
+        self._unread = set()
+        self._by_tag = {}
+        self._by_processor = {}
+        # Sorted filtered lists, so paging through a tag doesn't sort it again, emptied by any change
+        self._ordered_cache = {}
+
+        self.stats = {'full_rebuilds': 0, 'incremental_updates': 0, 'queries': 0, 'index_walks': 0, 'direct_sorts': 0}
+
+    def _entry(self, watch, seq):
+        return {
+            'seq': seq,
+            'errored': bool(watch.get('last_error')),
+            'unread': watch.history_n >= 2 and not watch.viewed,
+            'tags': tuple(watch.get('tags') or ()),
+            'processor': watch.get('processor'),
+        }
+
+    def _add_to_sets(self, uuid, entry):
+        if entry['errored']:
+            self._errored.add(uuid)
+        if entry['unread']:
+            self._unread.add(uuid)
+        for tag_uuid in entry['tags']:
+            self._by_tag.setdefault(tag_uuid, set()).add(uuid)
+        self._by_processor.setdefault(entry['processor'], set()).add(uuid)
+
+    def _add(self, uuid, watch, seq):
+        entry = self._entries[uuid] = self._entry(watch, seq)
+        for attribute in SORT_ATTRIBUTES:
+            key = _sort_key(watch, attribute)
+            self._ascending[attribute].add(self._ascending_keys[attribute].setdefault(uuid, (key, seq, uuid)))
+            self._descending[attribute].add(self._descending_keys[attribute].setdefault(uuid, (key, -seq, uuid)))
+        self._add_to_sets(uuid, entry)
+
+    @staticmethod
+    def _discard_member(by, key, uuid):
+        members = by.get(key)
+        if members is not None:
+            members.discard(uuid)
+            if not members:
+                del by[key]
+
+    def _remove(self, uuid):
+        entry = self._entries.pop(uuid, None)
+        if entry is None:
+            return None
+        for attribute in SORT_ATTRIBUTES:
+            self._ascending[attribute].remove(self._ascending_keys[attribute].pop(uuid))
+            self._descending[attribute].remove(self._descending_keys[attribute].pop(uuid))
+        self._errored.discard(uuid)
+        self._unread.discard(uuid)
+        for tag_uuid in entry['tags']:
+            self._discard_member(self._by_tag, tag_uuid, uuid)
+        self._discard_member(self._by_processor, entry['processor'], uuid)
+        return entry['seq']
+
+    def _rebuild(self):
+        watching = self.datastore.data['watching']
+        # Changes from here on are applied on the next refresh
+        self._take_dirty()
+        self._reconciled(watching)
+        self._entries = {}
+        self._errored = set()
+        self._unread = set()
+        self._by_tag = {}
+        self._by_processor = {}
+        self._ascending_keys = {attribute: {} for attribute in SORT_ATTRIBUTES}
+        self._descending_keys = {attribute: {} for attribute in SORT_ATTRIBUTES}
+        for seq, (uuid, watch) in enumerate(list(watching.items())):
+            entry = self._entries[uuid] = self._entry(watch, seq)
+            self._add_to_sets(uuid, entry)
+            for attribute in SORT_ATTRIBUTES:
+                key = _sort_key(watch, attribute)
+                self._ascending_keys[attribute][uuid] = (key, seq, uuid)
+                self._descending_keys[attribute][uuid] = (key, -seq, uuid)
+        self._next_seq = len(self._entries)
+
+        self._ascending = {}
+        self._descending = {}
+        for attribute in SORT_ATTRIBUTES:
+            self._ascending[attribute] = _SortedKeyIndex()
+            self._ascending[attribute].load(self._ascending_keys[attribute].values())
+            self._descending[attribute] = _SortedKeyIndex()
+            self._descending[attribute].load(self._descending_keys[attribute].values())
+
+        self._ordered_cache = {}
+        self.stats['full_rebuilds'] += 1
+        logger.trace(f"Watch index rebuilt for {len(self._entries)} watches")
+
+    def _update(self, uuid):
+        seq = self._remove(uuid)
+        watch = self.datastore.data['watching'].get(uuid)
+        if watch is not None:
+            if seq is None:
+                seq = self._next_seq
+                self._next_seq += 1
+            self._add(uuid, watch, seq)
+        self.stats['incremental_updates'] += 1
+
+    def refresh(self):
+        """Bring the index up to date, called by every read"""
+        with self._lock:
+            watching = self.datastore.data['watching']
+            if self._reconcile_due(watching):
+                self._rebuild()
+                return
+
+            dirty = self._take_dirty()
+            for uuid in dirty:
+                self._update(uuid)
+            if dirty:
+                self._ordered_cache = {}
+
+            # A watch was added or removed without a signal
+            if len(self._entries) != len(watching):
+                self._rebuild()
+
+    def _counts(self, members=None):
+        if members is None:
+            return {'watches': len(self._entries), 'errored': len(self._errored), 'unread': len(self._unread)}
+        return {'watches': len(members), 'errored': len(self._errored.intersection(members)),
+                'unread': len(self._unread.intersection(members))}
+
+    def counts(self, tag_uuid=None, processor=None):
+        """{'watches', 'errored', 'unread'} of all watches, or of the watches with this tag or processor"""
+        self.refresh()
+        with self._lock:
+            if tag_uuid is not None:
+                return self._counts(self._by_tag.get(tag_uuid, set()))
+            if processor is not None:
+                return self._counts(self._by_processor.get(processor, set()))
+            return self._counts()
+
+    def count_summary(self):
+        """counts() of all watches, and by_tag / by_processor for every tag and processor in use"""
+        self.refresh()
+        with self._lock:
+            return {
+                **self._counts(),
+                'by_tag': {k: self._counts(v) for k, v in self._by_tag.items()},
+                'by_processor': {k: self._counts(v) for k, v in self._by_processor.items()},
+            }
+
+    def tag_members(self, tag_uuid):
+        """UUIDs of the watches with this tag"""
+        self.refresh()
+        with self._lock:
+            return set(self._by_tag.get(tag_uuid, ()))
+
+    def query(self, sort_attribute=DEFAULT_SORT_ATTRIBUTE, reverse=False, tag_uuids=None, with_errors=False,
+              unread_only=False, uuids=None, skip=0, limit=None):
+        """
+        One page of the watch list.
+
+        :param tag_uuids: Only watches with any of these tags
+        :param uuids: Only these watches (for example the result of a search)
+        :return: (total number of watches passing the filters, [uuid, ...] of the page in order)
+        """
+        if sort_attribute not in SORT_ATTRIBUTES:
+            sort_attribute = DEFAULT_SORT_ATTRIBUTE
+        skip = max(skip or 0, 0)
+
+        self.refresh()
+        with self._lock:
+            self.stats['queries'] += 1
+            filters = []
+            if tag_uuids is not None:
+                members = set()
+                for tag_uuid in tag_uuids:
+                    members |= self._by_tag.get(tag_uuid, set())
+                filters.append(members)
+            if with_errors:
+                filters.append(self._errored)
+            if unread_only:
+                filters.append(self._unread)
+            if uuids is not None:
+                filters.append(set(uuids) & self._entries.keys())
+
+            index = self._descending[sort_attribute] if reverse else self._ascending[sort_attribute]
+            if not filters:
+                total = len(index)
+                stop = total if limit is None else min(skip + limit, total)
+                if skip >= stop:
+                    return total, []
+                if reverse:
+                    page = list(index.islice(total - stop, total - skip))
+                    page.reverse()
+                else:
+                    page = list(index.islice(skip, stop))
+                return total, [uuid for _key, _seq, uuid in page]
+
+            filters.sort(key=len)
+            matching = filters[0].intersection(*filters[1:])
+            total = len(matching)
+            stop = total if limit is None else min(skip + limit, total)
+            if skip >= stop:
+                return total, []
+
+            if total <= len(self._entries) * DIRECT_SORT_RATIO:
+                cache_key = None
+                if uuids is None:
+                    cache_key = (sort_attribute, reverse, frozenset(tag_uuids) if tag_uuids is not None else None, with_errors, unread_only)
+                    ordered = self._ordered_cache.get(cache_key)
+                    if ordered is not None:
+                        return total, ordered[skip:stop]
+
+                self.stats['direct_sorts'] += 1
+                keys = self._descending_keys[sort_attribute] if reverse else self._ascending_keys[sort_attribute]
+                ordered = [uuid for _key, _seq, uuid in sorted((keys[u] for u in matching), reverse=reverse)]
+                if cache_key is not None:
+                    if len(self._ordered_cache) >= ORDERED_CACHE_SIZE:
+                        self._ordered_cache.clear()
+                    self._ordered_cache[cache_key] = ordered
+                return total, ordered[skip:stop]
+
+            # Most watches pass the filter, walk the index in order until the page is complete
+            self.stats['index_walks'] += 1
+            keys = reversed(index) if reverse else iter(index)
+            page = []
+            position = 0
+            for _key, _seq, uuid in keys:
+                if uuid not in matching:
+                    continue
+                if position >= skip:
+                    page.append(uuid)
+                    if len(page) == stop - skip:
+                        break
+                position += 1
+            return total, page
+
+    def get_stats(self):
+        return {**self.stats, 'watches': len(self._entries), 'tags': len(self._by_tag)}
@@ -0,0 +1,87 @@
+"""
+Base classes of everything kept in memory per watch and brought up to date from the watch signals (the watch index,
+search index, recheck scheduler, effective config and RSS caches).
+
+The signals, all sent with watch_uuid=:
+- `watch_check_update`   queued, started, finished, cleared, viewed (worker.py, Watch.py)
+- `watch_committed`      watch.json written, edited in the UI or API, paused, unpaused (model/__init__.py commit())
+- `watch_updated`        changed in memory through store.update_watch(), before it is written to disk
+- `watch_deleted`        removed from the datastore
+
+A new cache subscribes here instead of being called from update_watch() or the other places that change a watch.
+
+WatchSignalListener only calls watch_changed(uuid) for each of `watch_signals`. WatchChangeTracker adds the dirty set
+that is drained on the next read, and the bookkeeping for a full rebuild when the `watching` dict was replaced
+(reload_state, tests) or the periodic reconcile (for code paths that change a watch without a signal) is due.
+"""
+
+import os
+import threading
+import time
+
+from blinker import signal
+
+WATCH_CHANGE_SIGNALS = ('watch_check_update', 'watch_committed', 'watch_updated', 'watch_deleted')
+
+
+class WatchSignalListener:
+    watch_signals = WATCH_CHANGE_SIGNALS
+
+    def connect_signals(self, weak=True):
+        """weak=False for an object nothing else holds on to, otherwise it goes away with its owner"""
+        for name in self.watch_signals:
+            signal(name).connect(self._on_watch_changed, weak=weak)
+
+    def _on_watch_changed(self, sender=None, **kwargs):
+        watch_uuid = kwargs.get('watch_uuid')
+        if watch_uuid:
+            self.watch_changed(watch_uuid)
+
+    def watch_changed(self, uuid):
+        raise NotImplementedError
+
+
+class WatchChangeTracker(WatchSignalListener):
+    # Environment variable with the seconds between full reconciles, None for no periodic reconcile
+    reconcile_env = None
+    reconcile_default_seconds = 60
+
+    def __init__(self, datastore, reconcile_interval_seconds=None):
+        self.datastore = datastore
+        if reconcile_interval_seconds is None and self.reconcile_env:
+            reconcile_interval_seconds = float(os.getenv(self.reconcile_env, self.reconcile_default_seconds))
+        self.reconcile_interval_seconds = reconcile_interval_seconds
+
+        self._dirty = set()
+        self._dirty_lock = threading.Lock()
+        self._watching_ref = None
+        self._last_reconcile = 0
+
+    def watch_changed(self, uuid):
+        self.mark_dirty(uuid)
+
+    def mark_dirty(self, uuid):
+        """Thread safe, may be called from any worker or Flask request thread."""
+        with self._dirty_lock:
+            self._dirty.add(uuid)
+
+    def _take_dirty(self):
+        """The watches marked dirty since the last call"""
+        with self._dirty_lock:
+            dirty = self._dirty
+            self._dirty = set()
+        return dirty
+
+    def _reconcile_due(self, watching, now=None):
+        """True when `watching` was replaced since the last full rebuild or the periodic reconcile is due"""
+        if watching is not self._watching_ref:
+            return True
+        if self.reconcile_interval_seconds is None:
+            return False
+        now = now if now is not None else time.time()
+        return now - self._last_reconcile >= self.reconcile_interval_seconds
+
+    def _reconciled(self, watching):
+        """Record a full rebuild from `watching`"""
+        self._watching_ref = watching
+        self._last_reconcile = time.time()
@@ -0,0 +1,126 @@
+"""
+Write-behind persistence for watch.json.
+
+datastore.update_watch() is called several times per check (last_checked, previous_md5, last_error,
+consecutive_filter_failures...) and each call used to run a full watch.commit() (deepcopy + serialize + tempfile
++ rename). Instead the watch UUID is marked dirty here and a background thread commits every dirty watch once per
+interval, so all the updates made to a watch in between are coalesced into a single write.
+
+The in-memory watch is always current, only the on-disk copy lags by at most WATCH_WRITE_BEHIND_SECONDS.
+flush() is called on shutdown (SIGTERM/SIGINT) and before backups so nothing pending is lost.
+
+- WATCH_WRITE_BEHIND_SECONDS      how often dirty watches are written, default 5, 0 disables (commit immediately)
+- WATCH_WRITE_BEHIND_MAX_DIRTY    flush early when this many watches are waiting, default 500
+"""
+
+import os
+import threading
+import time
+
+from loguru import logger
+
+
+class WatchWriteBehind:
+
+    def __init__(self, datastore, interval_seconds=None, max_dirty=None):
+        self.datastore = datastore
+        self.interval_seconds = interval_seconds if interval_seconds is not None else float(os.getenv('WATCH_WRITE_BEHIND_SECONDS', 5))
+        self.max_dirty = max_dirty or int(os.getenv('WATCH_WRITE_BEHIND_MAX_DIRTY', 500))
+
+        self._dirty = set()
+        self._dirty_lock = threading.Lock()
+        # Held while committing, delete() takes it too so a watch is never written back after its directory is removed
+        self.flush_lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+        self.stats = {'updates': 0, 'coalesced': 0, 'writes': 0, 'flushes': 0}
+
+    @property
+    def enabled(self):
+        return self.interval_seconds > 0
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True, name="WatchWriteBehind")
+            self._thread.start()
+
+    def mark_dirty(self, uuid):
+        """Schedule a watch.json write, or write it now when write-behind is disabled or stopped"""
+        if not self.enabled or self._stopped:
+            watch = self.datastore.data['watching'].get(uuid)
+            if watch:
+                watch.commit()
+            return
+
+        with self._dirty_lock:
+            self.stats['updates'] += 1
+            if uuid in self._dirty:
+                self.stats['coalesced'] += 1
+            else:
+                self._dirty.add(uuid)
+            pending = len(self._dirty)
+
+        self._ensure_thread()
+        if pending >= self.max_dirty:
+            self._wakeup.set()
+
+    def discard(self, uuid=None):
+        """Forget pending writes for one watch (or all of them), waits for a flush in progress to finish"""
+        with self.flush_lock:
+            with self._dirty_lock:
+                if uuid is None:
+                    self._dirty.clear()
+                else:
+                    self._dirty.discard(uuid)
+
+    def flush(self):
+        """Write every dirty watch now, returns how many were written"""
+        with self.flush_lock:
+            with self._dirty_lock:
+                dirty = self._dirty
+                self._dirty = set()
+
+            if not dirty:
+                return 0
+
+            t = time.time()
+            written = 0
+            watching = self.datastore.data['watching']
+            for uuid in dirty:
+                # Deleted (or the datastore reloaded) since it was marked, nothing to write
+                watch = watching.get(uuid)
+                if watch:
+                    watch.commit()
+                    written += 1
+
+            self.stats['writes'] += written
+            self.stats['flushes'] += 1
+            logger.debug(f"Write-behind flushed {written} watches in {(time.time() - t) * 1000:.0f}ms")
+            return written
+
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait(timeout=self.interval_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Write-behind flush failed: {e}")
+
+    def stop(self):
+        """Flush everything and commit immediately from now on (shutdown)"""
+        self._stopped = True
+        self._wakeup.set()
+        written = self.flush()
+        if written:
+            logger.success(f"Write-behind: flushed {written} pending watch writes")
+        return written
+
+    def get_stats(self):
+        with self._dirty_lock:
+            stats = dict(self.stats)
+            stats['pending'] = len(self._dirty)
+        stats['interval_seconds'] = self.interval_seconds
+        return stats
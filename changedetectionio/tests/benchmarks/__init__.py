@@ -0,0 +1 @@
+"""Benchmarks, not collected by pytest, run each module directly with `python3 -m`."""
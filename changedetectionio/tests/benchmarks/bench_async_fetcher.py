@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m changedetectionio.tests.benchmarks.bench_async_fetcher [50 200 500]
+
+"""
+Run N fetches concurrently on ONE event loop (like a single async worker) against a local test server that adds
+LATENCY seconds to every response (standing in for a slow remote site), comparing html_requests (blocking requests
+in the default thread pool) against html_aiohttp (native asyncio).
+
+html_requests is capped by the executor thread count, so its wall time grows in steps of LATENCY per batch of
+threads, html_aiohttp should stay close to a single LATENCY until the local machine saturates.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+os.environ.setdefault('ALLOW_IANA_RESTRICTED_ADDRESSES', 'true')
+
+from changedetectionio.content_fetchers import aiohttp_fetcher
+from changedetectionio.content_fetchers.requests import fetcher as requests_fetcher
+
+LATENCY = 0.2
+BODY = ('<html><body>' + '<p>Some text content for the page</p>' * 200 + '</body></html>').encode('utf-8')
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BenchServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+async def fetch_all(fetcher_class, url, count):
+    fetchers = [fetcher_class() for _ in range(count)]
+    t = time.perf_counter()
+    await asyncio.gather(*[f.run(url=url, timeout=30, request_headers={}, request_method='GET') for f in fetchers])
+    elapsed = time.perf_counter() - t
+    assert all(f.content and f.status_code == 200 for f in fetchers)
+    if fetcher_class is aiohttp_fetcher.fetcher:
+        await aiohttp_fetcher.close_sessions()
+    return elapsed
+
+
+if __name__ == '__main__':
+    counts = [int(c) for c in sys.argv[1:]] or [50, 200, 500]
+    server = BenchServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    print(f"{LATENCY * 1000:.0f}ms server latency, default executor has {min(32, (os.cpu_count() or 1) + 4)} threads")
+    print(f"{'fetches':>8} {'requests s':>11} {'aiohttp s':>10} {'requests/s':>11} {'aiohttp/s':>10} {'speedup':>8}")
+    for count in counts:
+        requests_s = asyncio.run(fetch_all(requests_fetcher, url, count))
+        aiohttp_s = asyncio.run(fetch_all(aiohttp_fetcher.fetcher, url, count))
+        print(f"{count:>8} {requests_s:>11.2f} {aiohttp_s:>10.2f} {count / requests_s:>11.0f} {count / aiohttp_s:>10.0f} {requests_s / aiohttp_s:>7.1f}x")
+
+    server.shutdown()
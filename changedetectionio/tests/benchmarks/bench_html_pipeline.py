@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m changedetectionio.tests.benchmarks.bench_html_pipeline [1 10]
+
+"""
+Compare the string based filter chain (include_filters/xpath_filter per rule, element_removal, html_to_text)
+against the single parse lxml pipeline (HTML_SINGLE_PARSE_PIPELINE) on SPA style pages of N megabytes.
+
+Peak memory is measured with tracemalloc, so only Python allocations are counted (BeautifulSoup trees are
+Python objects, libxml2 trees are not), treat it as a relative indicator.
+"""
+
+import sys
+import time
+import tracemalloc
+
+from changedetectionio import html_tools
+
+INCLUDE_FILTERS = ['.product .price', '#description', '//ul[@class="specs"]/li']
+SUBTRACTIVE_SELECTORS = ['.advert', '//footer']
+
+
+def make_page(megabytes):
+    # SPAs typically carry most of their weight as inline JS/CSS and JSON state in <head>/<script>
+    bloat = "var state = " + ('{"k": "' + 'x' * 80 + '"},' * 1) * int(megabytes * 1024 * 1024 * 0.6 / 90) + ";"
+    items = []
+    for i in range(int(megabytes * 1024 * 1024 * 0.4 / 400)):
+        items.append(f'<div class="product" data-id="{i}"><h2>Item {i}</h2><span class="price">${i}.99</span>'
+                     f'<span class="advert">Sponsored</span><p>Some description text for item number {i} goes here.</p></div>')
+    return (f'<html><head><title>Shop</title><style>.x{{color:red}}</style><script>{bloat}</script></head>'
+            f'<body style="display:none"><p id="description">The shop</p>{"".join(items)}'
+            f'<ul class="specs"><li>a</li><li>b</li></ul><footer>Footer</footer></body></html>')
+
+
+def legacy(content):
+    filtered = ""
+    for rule in INCLUDE_FILTERS:
+        if rule[0] == '/':
+            filtered += html_tools.xpath_filter(rule, content, append_pretty_line_formatting=True)
+        else:
+            filtered += html_tools.include_filters(rule, content, append_pretty_line_formatting=True)
+    filtered = html_tools.element_removal(SUBTRACTIVE_SELECTORS, filtered)
+    return html_tools.html_to_text(filtered)
+
+
+def single_parse(content):
+    tree = html_tools.html_to_tree(content)
+    tree = html_tools.tree_include_filters(tree, INCLUDE_FILTERS, append_pretty_line_formatting=True)
+    html_tools.tree_element_removal(tree, SUBTRACTIVE_SELECTORS)
+    return html_tools.tree_to_text(tree)
+
+
+def measure(func, content):
+    tracemalloc.start()
+    t = time.perf_counter()
+    text = func(content)
+    elapsed = time.perf_counter() - t
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, text
+
+
+if __name__ == '__main__':
+    sizes = [float(s) for s in sys.argv[1:]] or [1, 10]
+    print(f"{'page MB':>8} {'legacy s':>10} {'single s':>10} {'legacy peak MB':>16} {'single peak MB':>16}")
+    for size in sizes:
+        content = make_page(size)
+        legacy_s, legacy_peak, legacy_text = measure(legacy, content)
+        single_s, single_peak, single_text = measure(single_parse, content)
+        assert legacy_text == single_text, "Both pipelines should produce the same text"
+        print(f"{len(content) / 1024 / 1024:>8.1f} {legacy_s:>10.2f} {single_s:>10.2f} "
+              f"{legacy_peak / 1024 / 1024:>16.1f} {single_peak / 1024 / 1024:>16.1f}")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m changedetectionio.tests.benchmarks.bench_memory_governor [200 brotli writes] [4 threads]
+
+"""
+Brotli snapshot writes from several threads with a heap the size of a few thousand loaded watches.
+
+  - every write   the previous _brotli_save(), full gc.collect() and malloc_trim() after each write
+  - governor      memory_governor.maybe_collect(), collects only when the RSS grew enough (gc_cleanup.py)
+
+Reports the total time, the time spent in full collections (summed over all threads) and how many there were.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from loguru import logger
+
+from changedetectionio.gc_cleanup import MemoryGovernor, _malloc_trim
+from changedetectionio.model.Watch import _brotli_save
+
+
+class EveryWrite:
+    """What _brotli_save() did before, a full collection after every write"""
+
+    def __init__(self):
+        self.collections = 0
+        self.pause = 0.0
+        self._lock = threading.Lock()
+
+    def maybe_collect(self, reason=''):
+        import gc
+        t = time.perf_counter()
+        gc.collect()
+        _malloc_trim()
+        with self._lock:
+            self.collections += 1
+            self.pause += time.perf_counter() - t
+        return True
+
+
+def run(governor, writes, threads, path):
+    text = "".join(f"Product {i} - price {i % 97}.99 EUR, in stock\n" for i in range(3000))
+
+    def writer(n):
+        for i in range(writes // threads):
+            _brotli_save(text, os.path.join(path, f"{n}-{i}.txt.br"))
+
+    with mock.patch('changedetectionio.gc_cleanup.memory_governor', governor):
+        t = time.perf_counter()
+        workers = [threading.Thread(target=writer, args=(n,)) for n in range(threads)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+        return time.perf_counter() - t
+
+
+if __name__ == '__main__':
+    logger.remove()
+    writes = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    # Something like the watches, their history indexes and settings in memory
+    heap = [{'uuid': str(i), 'url': f"https://example.com/{i}", 'tags': [i], 'history': {str(t): f"{t}.txt" for t in range(20)}}
+            for i in range(20000)]
+
+    print(f"{'mode':>12} {'total':>10} {'in gc':>10} {'collections':>12}")
+    for name in ('every write', 'governor'):
+        path = tempfile.mkdtemp(prefix='bench-memory-governor-')
+        try:
+            if name == 'every write':
+                governor = EveryWrite()
+                elapsed = run(governor, writes, threads, path)
+                pause, collections = governor.pause, governor.collections
+            else:
+                governor = MemoryGovernor()
+                elapsed = run(governor, writes, threads, path)
+                pause, collections = governor.stats['pause_seconds_total'], governor.stats['collections']
+            print(f"{name:>12} {elapsed * 1000:>8.0f}ms {pause * 1000:>8.0f}ms {collections:>12}")
+        finally:
+            shutil.rmtree(path)
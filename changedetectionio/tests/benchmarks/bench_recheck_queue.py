@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m changedetectionio.tests.benchmarks.bench_recheck_queue [1000 5000 20000]
+
+"""
+Time the RecheckPriorityQueue operations the UI and ticker use with N queued watches
+
+  - put/get       queue and drain all N
+  - positions     get_uuid_position() for every queued watch, what rendering the watch list does per row
+                  (the previous heap copied the queue and counted linearly for each one, O(n^2) per page)
+  - is_queued     membership check for every watch, what the ticker did by rebuilding a set from update_q.queue
+"""
+
+import sys
+import time
+import random
+
+from loguru import logger
+
+from changedetectionio.queue_handlers import RecheckPriorityQueue
+from changedetectionio.queuedWatchMetaData import PrioritizedItem
+
+
+def legacy_position(queue_list, target_uuid):
+    for item in queue_list:
+        if item.item.get('uuid') == target_uuid:
+            return sum(1 for other in queue_list if other.priority < item.priority)
+
+
+def timed(func):
+    t = time.perf_counter()
+    result = func()
+    return time.perf_counter() - t, result
+
+
+if __name__ == '__main__':
+    logger.remove()
+    random.seed(42)
+    counts = [int(c) for c in sys.argv[1:]] or [1000, 5000, 20000]
+
+    print(f"{'queued':>8} {'put':>9} {'positions':>10} {'legacy':>10} {'is_queued':>10} {'get':>9}")
+    for count in counts:
+        q = RecheckPriorityQueue()
+        uuids = [f"uuid-{i}" for i in range(count)]
+        now = int(time.time())
+        items = [PrioritizedItem(priority=now + random.randint(0, 3600), item={'uuid': u}) for u in uuids]
+        put_s, _ = timed(lambda q=q, items=items: [q.put(item) for item in items])
+
+        positions_s, positions = timed(lambda q=q, uuids=uuids: [q.get_uuid_position(u)['position'] for u in uuids])
+        legacy_s = None
+        if count <= 5000:
+            queue_list = q.queue
+            legacy_s, legacy = timed(lambda queue_list=queue_list, uuids=uuids: [legacy_position(list(queue_list), u) for u in uuids])
+            assert legacy == positions
+
+        member_s, _ = timed(lambda q=q, uuids=uuids: [q.is_queued(u) for u in uuids])
+        get_s, _ = timed(lambda q=q, uuids=uuids: [q.get(block=False) for _ in uuids])
+        assert q.empty()
+
+        legacy_txt = f"{legacy_s * 1000:>8.0f}ms" if legacy_s is not None else f"{'-':>10}"
+        print(f"{count:>8} {put_s * 1000:>7.0f}ms {positions_s * 1000:>8.1f}ms {legacy_txt} "
+              f"{member_s * 1000:>8.2f}ms {get_s * 1000:>7.0f}ms")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m changedetectionio.tests.benchmarks.bench_recheck_scheduler [1000 10000 100000]
+
+"""
+Compare the per-tick cost of the old ticker (sort every watch by last_checked, walk the whole list)
+against the deadline heap in RecheckScheduler.
+
+Watches have a 5 minute recheck time with last_checked spread evenly over the last 5 minutes,
+so roughly 1/300th of them fall due each simulated one second tick. Due watches are "checked"
+immediately (last_checked = now) to keep the workload steady.
+"""
+
+import random
+import sys
+import time
+
+from changedetectionio.model import Watch
+from changedetectionio.recheck_scheduler import RecheckScheduler
+
+THRESHOLD = 300
+TICKS = 20
+RECHECK_MINIMUM = 3
+
+
+class BenchDatastore:
+    def __init__(self, count, now):
+        self.data = {
+            'settings': {
+                'application': {},
+                'requests': {'jitter_seconds': 0, 'time_between_check': {'minutes': THRESHOLD // 60}},
+            },
+            'watching': {}
+        }
+        for i in range(count):
+            watch = Watch.model(datastore_path=None, __datastore=self.data,
+                                default={'last_checked': now - random.uniform(0, THRESHOLD), 'paused': False,
+                                         'time_between_check_use_default': True})
+            self.data['watching'][watch['uuid']] = watch
+
+    @property
+    def threshold_seconds(self):
+        return THRESHOLD
+
+
+def legacy_tick(datastore, now):
+    """The previous ticker_thread_check_time_launch_checks inner loop, minus the actual queueing."""
+    due = []
+    watch_uuid_list = [k[0] for k in sorted(datastore.data['watching'].items(), key=lambda item: item[1].get('last_checked', 0))]
+    recheck_time_system_seconds = int(datastore.threshold_seconds)
+    for uuid in watch_uuid_list:
+        watch = datastore.data['watching'].get(uuid)
+        if watch['paused']:
+            continue
+        threshold = recheck_time_system_seconds if watch.get('time_between_check_use_default') else watch.threshold_seconds()
+        seconds_since_last_recheck = now - watch['last_checked']
+        if seconds_since_last_recheck >= (threshold + watch.jitter_seconds) and seconds_since_last_recheck >= RECHECK_MINIMUM:
+            due.append(uuid)
+    return due
+
+
+def heap_tick(scheduler, now):
+    due = []
+    scheduler.refresh(now=now)
+    while (uuid := scheduler.pop_due(now=now)) is not None:
+        due.append(uuid)
+    return due
+
+
+def run(count):
+    start = time.time()
+    results = {}
+    for name in ('legacy', 'heap'):
+        random.seed(count)
+        datastore = BenchDatastore(count, now=start)
+        scheduler = RecheckScheduler(datastore=datastore, recheck_time_minimum_seconds=RECHECK_MINIMUM, reconcile_interval_seconds=3600)
+        if name == 'heap':
+            scheduler.refresh(now=start)
+
+        elapsed = 0
+        total_due = 0
+        for tick in range(1, TICKS + 1):
+            now = start + tick
+            t = time.perf_counter()
+            due = legacy_tick(datastore, now) if name == 'legacy' else heap_tick(scheduler, now)
+            elapsed += time.perf_counter() - t
+            total_due += len(due)
+            # Simulate the check completing, which in the app sends watch_check_update
+            for uuid in due:
+                datastore.data['watching'][uuid]['last_checked'] = now
+                scheduler.mark_dirty(uuid)
+
+        results[name] = (elapsed / TICKS, total_due)
+    return results
+
+
+if __name__ == '__main__':
+    counts = [int(c) for c in sys.argv[1:]] or [1000, 10000, 50000, 100000]
+    print(f"{'watches':>10} {'due/tick':>10} {'legacy ms/tick':>16} {'heap ms/tick':>14} {'speedup':>9}")
+    for count in counts:
+        r = run(count)
+        legacy_ms, due = r['legacy'][0] * 1000, r['legacy'][1] / TICKS
+        heap_ms = r['heap'][0] * 1000
+        assert r['legacy'][1] == r['heap'][1], "Both schedulers should find the same number of due watches"
+        print(f"{count:>10} {due:>10.1f} {legacy_ms:>16.2f} {heap_ms:>14.3f} {legacy_ms / heap_ms:>8.0f}x")
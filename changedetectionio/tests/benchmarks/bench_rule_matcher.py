@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m changedetectionio.tests.benchmarks.bench_rule_matcher [10000 lines] [500 rules]
+
+r"""
+Time ignore_text + trigger_text + text_should_not_be_present evaluation on a LINES line document with RULES rules in
+each list (all plain text, then 10% of them /regex/), as done on every check of a text_json_diff watch.
+
+  - legacy      the previous strip_ignore_text(), recompiles the regexes and lowercases each line once per word,
+                called three times
+  - compiled    html_tools.CompiledRules.evaluate(), rules compiled once, one combined matcher for the plain text
+
+/regex/ rules still have to be searched line by line (^, $ and \s must behave as they do on a single line), so they
+dominate the time once there are many of them.
+"""
+
+import random
+import re
+import string
+import sys
+import time
+
+from changedetectionio import html_tools
+
+
+def legacy_strip_ignore_text(content, wordlist, mode="content"):
+    ignore_text = []
+    ignore_regex = []
+    ignored_lines = []
+
+    for k in wordlist:
+        if not k or not k.strip():
+            continue
+        if re.search(html_tools.PERL_STYLE_REGEX, k, re.IGNORECASE):
+            ignore_regex.append(re.compile(html_tools.perl_style_slash_enclosed_regex_to_options(k)))
+        else:
+            ignore_text.append(k.strip())
+
+    lines = content.splitlines(keepends=True)
+    for line_index, line in enumerate(lines):
+        got_match = False
+        for text in ignore_text:
+            if text.lower() in line.lower():
+                got_match = True
+        if not got_match:
+            for r in ignore_regex:
+                if r.search(line):
+                    got_match = True
+        if got_match:
+            ignored_lines.append(line_index)
+
+    return [i + 1 for i in sorted(set(ignored_lines))]
+
+
+def words(n):
+    return ' '.join(''.join(random.choices(string.ascii_lowercase, k=random.randint(3, 9))) for _ in range(n))
+
+
+def make_rules(count, regex_share):
+    regex_count = int(count * regex_share)
+    rules = [words(2) for _ in range(count - regex_count)]
+    rules += [f"/{words(1)}\\s+\\d+/" for _ in range(regex_count)]
+    return rules
+
+
+def timed(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - t
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(line_count, rule_count, regex_share):
+    ignore, trigger, block = (make_rules(rule_count, regex_share) for _ in range(3))
+    lines = [words(random.randint(4, 16)) for _ in range(line_count)]
+    # Make some lines hit each list
+    for i in range(0, line_count, 50):
+        lines[i] += ' ' + random.choice(ignore + trigger + block).strip('/').replace('\\s+\\d+', ' 42')
+    content = '\n'.join(lines)
+
+    legacy_s, legacy = timed(lambda: [legacy_strip_ignore_text(content, wordlist) for wordlist in (ignore, trigger, block)], repeat=1)
+
+    html_tools._compile_wordlist.cache_clear()
+    cold_s, _ = timed(lambda: html_tools.CompiledRules(ignore, trigger, block).evaluate(content), repeat=1)
+
+    rules = html_tools.CompiledRules(ignore, trigger, block)
+    warm_s, matches = timed(lambda: rules.evaluate(content))
+
+    compiled = [[i + 1 for i in sorted(m)] for m in (matches.ignored, matches.triggered, matches.blocked)]
+    assert compiled == legacy, "Compiled rules must match exactly the same lines"
+
+    print(f"{line_count} lines, {rule_count} rules per list ({regex_share:.0%} regex), {sum(len(m) for m in legacy)} matching lines")
+    print(f"{'legacy':>26} {legacy_s * 1000:>9.1f}ms")
+    print(f"{'compiled (incl. compile)':>26} {cold_s * 1000:>9.1f}ms {legacy_s / cold_s:>7.1f}x")
+    print(f"{'compiled (cached)':>26} {warm_s * 1000:>9.1f}ms {legacy_s / warm_s:>7.1f}x")
+
+
+if __name__ == '__main__':
+    random.seed(42)
+    line_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rule_count = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    for regex_share in (0, 0.1):
+        run(line_count, rule_count, regex_share)
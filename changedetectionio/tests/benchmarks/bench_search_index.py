@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m changedetectionio.tests.benchmarks.bench_search_index [10000 50000]
+
+"""
+Cost of one search (/api/v1/search, the watch list q= filter)
+
+  - scan     previous search_watches_for_url(), every watch's URL/title/last error compared with the query
+  - index    WatchSearchIndex, SQLite FTS5, also searching the newest snapshot text of every watch
+
+Each watch has ~2KB of snapshot text, "build s" is the first full index of all of it.
+"""
+
+import random
+import sys
+import tempfile
+import time
+
+from loguru import logger
+
+from changedetectionio.store.search_index import WatchSearchIndex
+
+SEARCHES = 50
+WORDS = [f"word{i}" for i in range(5000)]
+
+
+class BenchWatch(dict):
+    def __init__(self, *args, text='', **kwargs):
+        super().__init__(*args, **kwargs)
+        self.history = {'1000': '/bench/1000.txt'}
+        self.text = text
+
+    def get_history_snapshot(self, timestamp=None, filepath=None):
+        return self.text
+
+
+class BenchDatastore:
+    def __init__(self, datastore_path, count):
+        self.datastore_path = datastore_path
+        self.data = {'watching': {}}
+        rnd = random.Random(count)
+        for i in range(count):
+            uuid = f"uuid-{i}"
+            self.data['watching'][uuid] = BenchWatch(uuid=uuid, url=f"https://site{i % 997}.example.com/page/{i}",
+                                                     title=f"Product page {i}", last_error='Timeout' if i % 50 == 0 else False,
+                                                     text=' '.join(rnd.choice(WORDS) for _ in range(250)))
+
+
+def legacy_search(datastore, query):
+    matching_uuids = []
+    for uuid, watch in datastore.data['watching'].items():
+        if ((watch.get('title') and query in watch.get('title').lower()) or
+                query in watch.get('url', '').lower() or
+                (watch.get('last_error') and query in watch.get('last_error').lower())):
+            matching_uuids.append(uuid)
+    return matching_uuids
+
+
+if __name__ == '__main__':
+    logger.remove()
+    counts = [int(c) for c in sys.argv[1:]] or [10000, 50000]
+    queries = [f"site{i}.example" for i in range(SEARCHES)]
+
+    print(f"{'watches':>8} {'scan ms':>8} {'index ms':>9} {'content ms':>11} {'build s':>8}")
+    for count in counts:
+        with tempfile.TemporaryDirectory() as datastore_path:
+            datastore = BenchDatastore(datastore_path, count)
+            index = WatchSearchIndex(datastore, interval_seconds=3600)
+            t = time.perf_counter()
+            while index.sync(content_batch=5000):
+                pass
+            build_s = time.perf_counter() - t
+
+            t = time.perf_counter()
+            for query in queries:
+                legacy = legacy_search(datastore, query)
+            scan_ms = (time.perf_counter() - t) * 1000 / SEARCHES
+
+            t = time.perf_counter()
+            for query in queries:
+                current = index.search(query, partial=True)
+            index_ms = (time.perf_counter() - t) * 1000 / SEARCHES
+            assert sorted(current) == sorted(legacy)
+
+            t = time.perf_counter()
+            for word in WORDS[:SEARCHES]:
+                found = index.search(f"{word} {WORDS[-1]}", content=True)
+            content_ms = (time.perf_counter() - t) * 1000 / SEARCHES
+
+            index.stop()
+            print(f"{count:>8} {scan_ms:>8.2f} {index_ms:>9.2f} {content_ms:>11.2f} {build_s:>8.1f}")
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m changedetectionio.tests.benchmarks.bench_snapshot_delta [100 500 snapshots]
+
+"""
+Disk use, write and read time of N text snapshots of ~500 lines where a few lines change every version, saved as
+full .txt.br copies (SNAPSHOT_DELTA=False) and as delta chains (SNAPSHOT_DELTA=True, default keyframe interval).
+
+  - disk        total size of the snapshot files
+  - write       save_history_blob() for all N snapshots
+  - read cold   every snapshot read once oldest first, empty snapshot cache
+  - read one    one random version with an empty cache, the worst case for a delta is the end of a full chain
+"""
+
+import hashlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from unittest import mock
+
+from loguru import logger
+
+from changedetectionio.model import Watch
+from changedetectionio.model.snapshot_cache import snapshot_cache
+
+
+def snapshots(count):
+    random.seed(42)
+    lines = [f"Product {i} - price {random.randint(1, 1000)} EUR - {'lorem ipsum ' * 4}" for i in range(500)]
+    for n in range(count):
+        for _ in range(3):
+            lines[random.randrange(len(lines))] = f"Product changed at {n} - price {random.randint(1, 1000)} EUR"
+        yield "\n".join(lines)
+
+
+def run(count, delta):
+    path = tempfile.mkdtemp(prefix='bench-snapshot-delta-')
+    try:
+        with mock.patch.dict(os.environ, {'SNAPSHOT_DELTA': str(delta)}):
+            watch = Watch.model(datastore_path=path, __datastore={'settings': {'application': {}}, 'watching': {}},
+                                default={'url': 'https://example.com'})
+            watch.ensure_data_dir_exists()
+
+            versions = list(snapshots(count))
+            t = time.perf_counter()
+            for n, text in enumerate(versions):
+                watch.save_history_blob(contents=text, timestamp=1000 + n, snapshot_id=hashlib.md5(text.encode()).hexdigest())
+            write_s = time.perf_counter() - t
+
+            disk = sum(os.path.getsize(v) for v in set(watch.history.values()))
+
+            snapshot_cache.clear()
+            t = time.perf_counter()
+            for n, timestamp in enumerate(watch.history.keys()):
+                assert watch.get_history_snapshot(timestamp=timestamp) == versions[n]
+            read_cold_s = time.perf_counter() - t
+
+            timestamps = list(watch.history.keys())
+            read_one_s = 0
+            for _ in range(20):
+                snapshot_cache.clear()
+                t = time.perf_counter()
+                watch.get_history_snapshot(timestamp=random.choice(timestamps))
+                read_one_s += (time.perf_counter() - t) / 20
+
+            return disk, write_s, read_cold_s, read_one_s
+    finally:
+        shutil.rmtree(path)
+        snapshot_cache.clear()
+
+
+if __name__ == '__main__':
+    logger.remove()
+    counts = [int(c) for c in sys.argv[1:]] or [100, 500]
+
+    print(f"{'snapshots':>10} {'format':>8} {'disk':>10} {'write':>10} {'read cold':>10} {'read one':>10}")
+    for count in counts:
+        for delta in (False, True):
+            disk, write_s, read_cold_s, read_one_s = run(count, delta)
+            print(f"{count:>10} {'delta' if delta else 'txt.br':>8} {disk / 1024:>8.0f}KB {write_s * 1000:>8.0f}ms "
+                  f"{read_cold_s * 1000:>8.0f}ms {read_one_s * 1000:>8.2f}ms")
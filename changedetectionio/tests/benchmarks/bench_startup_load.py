@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m changedetectionio.tests.benchmarks.bench_startup_load [1000 10000 40000]
+
+"""
+Time how long ChangeDetectionStore takes to come up with N watches on disk (each with a watch.json and a 20 entry
+history.txt), and report watches/sec for
+
+  - sequential   one file after another (STARTUP_LOAD_WORKERS=0)
+  - threaded     reads/parses spread over STARTUP_LOAD_WORKERS threads
+  - manifest     warm boot from startup-manifest.json (STARTUP_MANIFEST=True), only unchanged files are skipped
+
+The history index is no longer read while loading, 'history' is the time to then read every watch's history.txt the
+first time (what the first full page render used to pay during startup).
+
+Set DROP_CACHES=1 (needs root) to drop the page cache before every run, which is closer to a real cold boot.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid as uuid_builder
+
+import orjson
+from loguru import logger
+
+from changedetectionio.store import ChangeDetectionStore
+from changedetectionio.store import file_saving_datastore
+
+
+def make_datastore(path, count):
+    now = int(time.time())
+    for i in range(count):
+        uuid = str(uuid_builder.uuid4())
+        watch_dir = os.path.join(path, uuid)
+        os.mkdir(watch_dir)
+        watch = {
+            'uuid': uuid,
+            'url': f"https://example{i % 500}.com/page/{i}",
+            'title': f"Watch {i}",
+            'processor': 'text_json_diff',
+            'date_created': now,
+            'last_checked': now,
+            'include_filters': ['#content', '.price'],
+            'ignore_text': ['Last updated', '/\\d+ views/'],
+            'headers': {'User-Agent': 'bench'},
+            'notification_urls': ['posts://localhost/notify'],
+        }
+        with open(os.path.join(watch_dir, 'watch.json'), 'wb') as f:
+            f.write(orjson.dumps(watch, option=orjson.OPT_INDENT_2))
+        with open(os.path.join(watch_dir, 'history.txt'), 'w') as f:
+            f.writelines(f"{now - 3600 * n},{uuid_builder.uuid4().hex}.txt.br\n" for n in range(20, 0, -1))
+
+
+def drop_caches():
+    if os.getenv('DROP_CACHES'):
+        os.sync()
+        with open('/proc/sys/vm/drop_caches', 'w') as f:
+            f.write('3')
+
+
+def boot(path, workers, manifest):
+    file_saving_datastore.STARTUP_LOAD_WORKERS = workers
+    file_saving_datastore.STARTUP_MANIFEST = manifest
+    drop_caches()
+    t = time.perf_counter()
+    datastore = ChangeDetectionStore(datastore_path=path, include_default_watches=False)
+    elapsed = time.perf_counter() - t
+    datastore.write_behind.stop()
+    return datastore, elapsed
+
+
+if __name__ == '__main__':
+    logger.remove()
+    counts = [int(c) for c in sys.argv[1:]] or [1000, 10000, 40000]
+    workers = int(os.getenv('STARTUP_LOAD_WORKERS', 8))
+
+    print(f"{'watches':>8} {'mode':>11} {'seconds':>8} {'watches/s':>10} {'history s':>10}")
+    for count in counts:
+        path = tempfile.mkdtemp(prefix='bench-startup-')
+        try:
+            make_datastore(path, count)
+            # First boot creates changedetection.json, and the manifest for the warm boot below
+            boot(path, workers=workers, manifest=True)
+
+            for mode, mode_workers, manifest in (('sequential', 0, False), ('threaded', workers, False), ('manifest', workers, True)):
+                datastore, elapsed = boot(path, workers=mode_workers, manifest=manifest)
+                assert len(datastore.data['watching']) == count
+
+                t = time.perf_counter()
+                assert all(watch.history_n == 20 for watch in datastore.data['watching'].values())
+                history_s = time.perf_counter() - t
+                print(f"{count:>8} {mode:>11} {elapsed:>8.2f} {count / elapsed:>10.0f} {history_s:>10.2f}")
+                del datastore
+        finally:
+            shutil.rmtree(path)
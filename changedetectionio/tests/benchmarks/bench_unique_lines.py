@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m changedetectionio.tests.benchmarks.bench_unique_lines [100 1000 3000 snapshots]
+
+"""
+Time check_unique_lines (Watch.lines_contain_something_unique_compared_to_history) for a watch with N brotli
+compressed snapshots of ~500 lines each.
+
+  - full scan   the previous implementation, every snapshot decompressed and split on every check
+  - first       first check, builds history-lines.idx from all snapshots once
+  - indexed     every check after that, loads the index and hashes only the new lines
+"""
+
+import shutil
+import sys
+import tempfile
+import time
+import random
+
+from loguru import logger
+
+from changedetectionio.model import Watch
+from changedetectionio.model.history_line_index import HistoryLineIndex
+
+
+def full_scan(watch, lines):
+    local_lines = set(l.strip().lower() for l in lines)
+    existing_history = set()
+    for v in watch.history.values():
+        existing_history |= set(line.strip().lower() for line in watch.get_history_snapshot(filepath=v).splitlines())
+    return not local_lines.issubset(existing_history)
+
+
+def timed(func):
+    t = time.perf_counter()
+    result = func()
+    return time.perf_counter() - t, result
+
+
+if __name__ == '__main__':
+    logger.remove()
+    random.seed(42)
+    counts = [int(c) for c in sys.argv[1:]] or [100, 1000, 3000]
+
+    print(f"{'snapshots':>10} {'full scan':>10} {'first':>10} {'indexed':>10}")
+    for count in counts:
+        path = tempfile.mkdtemp(prefix='bench-unique-lines-')
+        try:
+            datastore = {'settings': {'application': {}}, 'watching': {}}
+            watch = Watch.model(datastore_path=path, __datastore=datastore, default={'url': 'https://example.com'})
+            watch.ensure_data_dir_exists()
+            base = [f"Product {i} - price {random.randint(1, 1000)} EUR" for i in range(500)]
+            for n in range(count):
+                base[random.randrange(len(base))] = f"Product changed at {n} - price {random.randint(1, 1000)} EUR"
+                watch.save_history_blob(contents="\n".join(base), timestamp=1000 + n, snapshot_id=f"s{n}")
+
+            lines = list(base)
+            full_s, expected = timed(lambda watch=watch, lines=lines: full_scan(watch, lines))
+            first_s, first = timed(lambda watch=watch, lines=lines: watch.lines_contain_something_unique_compared_to_history(lines))
+            indexed_s, indexed = timed(lambda watch=watch, lines=lines: watch.lines_contain_something_unique_compared_to_history(lines))
+            assert not expected and not first and not indexed
+            assert watch.lines_contain_something_unique_compared_to_history(lines + ['Something new'])
+            assert len(HistoryLineIndex.load(HistoryLineIndex.filename(watch.data_dir)).snapshots) == count
+
+            print(f"{count:>10} {full_s * 1000:>8.0f}ms {first_s * 1000:>8.0f}ms {indexed_s * 1000:>8.1f}ms")
+        finally:
+            shutil.rmtree(path)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m changedetectionio.tests.benchmarks.bench_watch_aggregates [1000 10000 30000]
+
+"""
+Cost of the badge numbers sent with every Socket.IO 'watch_update' (errored count + unread changes count)
+
+  - scan        previous handle_watch_update(), walk every watch for last_error and history_n/viewed
+  - aggregates  WatchAggregates over the WatchIndex sets, only the watch that signalled a change is looked at again
+"""
+
+import sys
+import tempfile
+import time
+
+from loguru import logger
+
+from changedetectionio.model import Watch
+from changedetectionio.store.aggregates import WatchAggregates
+from changedetectionio.store.watch_index import WatchIndex
+
+UPDATES = 200
+
+
+class BenchDatastore:
+    def __init__(self, datastore_path, count):
+        self.data = {'settings': {'application': {}}, 'watching': {}}
+        for i in range(count):
+            watch = Watch.model(datastore_path=datastore_path, __datastore=self.data,
+                                default={'url': f"https://example.com/{i}", 'last_error': 'Timeout' if i % 10 == 0 else False})
+            self.data['watching'][watch['uuid']] = watch
+
+
+def legacy_counts(datastore):
+    errored = sum(1 for watch in datastore.data['watching'].values() if watch.get('last_error'))
+    unread = sum(1 for watch in datastore.data['watching'].values() if watch.history_n >= 2 and watch.viewed == False)
+    return errored, unread
+
+
+if __name__ == '__main__':
+    logger.remove()
+    counts = [int(c) for c in sys.argv[1:]] or [1000, 10000, 30000]
+
+    print(f"{'watches':>8} {'scan ms/update':>15} {'aggregates ms/update':>21}")
+    with tempfile.TemporaryDirectory() as datastore_path:
+        for count in counts:
+            datastore = BenchDatastore(datastore_path, count)
+            uuids = list(datastore.data['watching'].keys())
+            index = WatchIndex(datastore, reconcile_interval_seconds=3600)
+            aggregates = WatchAggregates(index)
+            index.refresh()
+
+            t = time.perf_counter()
+            for i in range(UPDATES):
+                legacy = legacy_counts(datastore)
+            scan_ms = (time.perf_counter() - t) * 1000 / UPDATES
+
+            t = time.perf_counter()
+            for i in range(UPDATES):
+                index.mark_dirty(uuids[i % count])
+                current = (aggregates.errored_count, aggregates.unread_changes_count)
+            aggregates_ms = (time.perf_counter() - t) * 1000 / UPDATES
+
+            assert current == legacy
+            print(f"{count:>8} {scan_ms:>15.3f} {aggregates_ms:>21.4f}")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m changedetectionio.tests.benchmarks.bench_watch_index [1000 10000 30000]
+
+"""
+Cost of fetching one page (50 rows) of the watch list, sorted by "last changed", unfiltered and for one tag
+
+  - scan   previous watchlist index(), walk every watch for the filters then sort the list and slice the page
+           (what the template did with watches|sort(...)|pagination_slice)
+  - index  WatchIndex.query(), the page comes from the already sorted index
+"""
+
+import sys
+import tempfile
+import time
+
+from loguru import logger
+
+from changedetectionio.model import Watch
+from changedetectionio.store.watch_index import WatchIndex
+
+PAGES = 50
+PER_PAGE = 50
+
+
+class BenchDatastore:
+    def __init__(self, datastore_path, count):
+        self.data = {'settings': {'application': {}}, 'watching': {}}
+        for i in range(count):
+            watch = Watch.model(datastore_path=datastore_path, __datastore=self.data,
+                                default={'url': f"https://example.com/{i}", 'title': f"Watch {i}",
+                                         'last_checked': (i * 7919) % count, 'tags': ['tag-a' if i % 10 == 0 else 'tag-b']})
+            self.data['watching'][watch['uuid']] = watch
+
+
+def legacy_page(datastore, page, tag_uuid=None):
+    watches = []
+    for uuid, watch in datastore.data['watching'].items():
+        if tag_uuid and not tag_uuid in watch['tags']:
+            continue
+        watches.append(watch)
+    watches = sorted(watches, key=lambda w: w['last_checked'], reverse=True)
+    skip = page * PER_PAGE
+    return len(watches), [w['uuid'] for w in watches[skip:skip + PER_PAGE]]
+
+
+if __name__ == '__main__':
+    logger.remove()
+    counts = [int(c) for c in sys.argv[1:]] or [1000, 10000, 30000]
+
+    print(f"{'watches':>8} {'filter':>7} {'scan ms/page':>13} {'index ms/page':>14} {'index build ms':>15}")
+    with tempfile.TemporaryDirectory() as datastore_path:
+        for count in counts:
+            datastore = BenchDatastore(datastore_path, count)
+            index = WatchIndex(datastore, reconcile_interval_seconds=3600)
+            t = time.perf_counter()
+            index.refresh()
+            build_ms = (time.perf_counter() - t) * 1000
+
+            for tag_uuid in (None, 'tag-a'):
+                t = time.perf_counter()
+                for page in range(PAGES):
+                    legacy = legacy_page(datastore, page, tag_uuid)
+                scan_ms = (time.perf_counter() - t) * 1000 / PAGES
+
+                t = time.perf_counter()
+                for page in range(PAGES):
+                    current = index.query(sort_attribute='last_checked', reverse=True, tag_uuids=[tag_uuid] if tag_uuid else None,
+                                          skip=page * PER_PAGE, limit=PER_PAGE)
+                index_ms = (time.perf_counter() - t) * 1000 / PAGES
+
+                assert current[0] == legacy[0]
+                assert [datastore.data['watching'][u]['last_checked'] for u in current[1]] == \
+                       [datastore.data['watching'][u]['last_checked'] for u in legacy[1]]
+                print(f"{count:>8} {tag_uuid or '-':>7} {scan_ms:>13.3f} {index_ms:>14.4f} {build_ms:>15.1f}")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m changedetectionio.tests.benchmarks.bench_worker_wakeup [10 200 1000 workers]
+
+"""
+Start N idle async workers the way worker_pool.py does (one thread + event loop each), then trickle items into the
+RecheckPriorityQueue and time how long each takes to reach a worker (put() -> async_get() returned).
+
+  - executor    previous async_get(), every idle worker parks a thread of the shared executor in a blocking get()
+  - futures     async_get() waits on a future of the worker's own loop, put() wakes one via call_soon_threadsafe()
+
+'threads' is threading.active_count() while all workers are idle.
+"""
+
+import asyncio
+import queue
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from loguru import logger
+
+from changedetectionio.queue_handlers import RecheckPriorityQueue
+from changedetectionio.queuedWatchMetaData import PrioritizedItem
+
+ITEMS = 300
+
+
+async def legacy_async_get(q, executor, timeout=1.0):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, lambda: q.get(block=True, timeout=timeout))
+
+
+def run(n_workers, mode):
+    q = RecheckPriorityQueue()
+    executor = ThreadPoolExecutor(max_workers=n_workers, thread_name_prefix="QueueGetter-") if mode == 'executor' else None
+    stop = threading.Event()
+    latencies = []
+    latencies_lock = threading.Lock()
+    idle = threading.Semaphore(0)
+
+    async def worker():
+        idle.release()
+        while not stop.is_set():
+            try:
+                if executor:
+                    queued = await legacy_async_get(q, executor)
+                else:
+                    queued = await q.async_get(timeout=1.0)
+            except queue.Empty:
+                continue
+            received = time.perf_counter()
+            with latencies_lock:
+                latencies.append(received - queued.item['sent'])
+
+    threads = [threading.Thread(target=lambda: asyncio.run(worker()), daemon=True) for _ in range(n_workers)]
+    for t in threads:
+        t.start()
+    for _ in range(n_workers):
+        idle.acquire()
+    # Let every worker get parked in the queue
+    time.sleep(min(5.0, 0.5 + n_workers / 500))
+    thread_count = threading.active_count()
+
+    for i in range(ITEMS):
+        q.put(PrioritizedItem(priority=1, item={'uuid': str(i), 'sent': time.perf_counter()}))
+        time.sleep(0.002)
+
+    deadline = time.time() + 10
+    while len(latencies) < ITEMS and time.time() < deadline:
+        time.sleep(0.01)
+    stop.set()
+    for t in threads:
+        t.join(3)
+    if executor:
+        executor.shutdown(wait=False)
+
+    latencies.sort()
+    ms = [l * 1000 for l in latencies]
+    return thread_count, statistics.median(ms), ms[int(len(ms) * 0.99) - 1], len(ms)
+
+
+if __name__ == '__main__':
+    logger.remove()
+    counts = [int(c) for c in sys.argv[1:]] or [10, 200, 1000]
+
+    print(f"{'workers':>8} {'mode':>9} {'threads':>8} {'median ms':>10} {'p99 ms':>8}")
+    for n_workers in counts:
+        for mode in ('executor', 'futures'):
+            thread_count, median, p99, received = run(n_workers, mode)
+            assert received == ITEMS, f"Only {received}/{ITEMS} items were picked up"
+            print(f"{n_workers:>8} {mode:>9} {thread_count:>8} {median:>10.3f} {p99:>8.3f}")
@@ -109,6 +109,21 @@ def test_api_simple(client, live_server, measure_memory_usage, datastore_path):
         headers={'x-api-key': api_key}
     )
     assert len(res.json) == 0
+
+    # Paged listing
+    res = client.get(
+        url_for("createwatch", page=1, per_page=1, sort='label', order='asc'),
+        headers={'x-api-key': api_key}
+    )
+    assert res.status_code == 200
+    assert len(res.json) == 1
+    assert int(res.headers['X-Total-Count']) == len(live_server.app.config['DATASTORE'].data['watching'])
+    res = client.get(
+        url_for("createwatch", page=100, per_page=1),
+        headers={'x-api-key': api_key}
+    )
+    assert len(res.json) == 0
+
     time.sleep(2)
     wait_for_all_checks(client)
     set_modified_response(datastore_path=datastore_path)
@@ -271,6 +286,9 @@ def test_api_simple(client, live_server, measure_memory_usage, datastore_path):
     )
     assert res.json.get('watch_count') == 1
     assert res.json.get('uptime') > 0.5
+    assert res.json['requests_connection_pool']['requests'] > 0
+    assert res.json['dns_cache']['lookups'] > 0
+    assert res.json['watch_write_behind']['updates'] > 0
 
     ######################################################
     # Mute and Pause, check it worked
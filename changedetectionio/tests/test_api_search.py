@@ -99,3 +99,39 @@ def test_api_search(client, live_server, measure_memory_usage, datastore_path):
     assert len(res.json) == 1
     assert list(res.json.values())[0]['url'] == urls[2]
 
+
+
+def test_api_search_content(client, live_server, measure_memory_usage, datastore_path):
+    from .util import set_original_response, set_modified_response
+    api_key = live_server.app.config['DATASTORE'].data['settings']['application'].get('api_access_token')
+
+    set_original_response(datastore_path=datastore_path)
+    test_url = url_for('test_endpoint', _external=True)
+    res = client.post(
+        url_for("imports.import_page"),
+        data={"urls": "\r\n".join([test_url, url_for('test_endpoint2', _external=True)])},
+        follow_redirects=True
+    )
+    assert b"2 Imported" in res.data
+    wait_for_all_checks(client)
+
+    # Snapshot text is only searched with ?content=1
+    res = client.get(url_for("search") + "?q=multiple lines", headers={'x-api-key': api_key})
+    assert len(res.json) == 0
+    res = client.get(url_for("search") + "?q=multiple lines&content=1", headers={'x-api-key': api_key})
+    assert len(res.json) == 1
+    assert list(res.json.values())[0]['url'] == test_url
+
+    # The newest snapshot replaces the previous one
+    set_modified_response(datastore_path=datastore_path)
+    client.get(url_for("ui.form_watch_checknow"), follow_redirects=True)
+    wait_for_all_checks(client)
+    res = client.get(url_for("search") + "?q=multiple lines&content=1", headers={'x-api-key': api_key})
+    assert len(res.json) == 0
+    res = client.get(url_for("search") + "?q=this one new&content=1&partial=1", headers={'x-api-key': api_key})
+    assert len(res.json) == 1
+
+    # Paging
+    res = client.get(url_for("search") + "?q=http&partial=1&page=2&per_page=1", headers={'x-api-key': api_key})
+    assert len(res.json) == 1
+    assert res.headers['X-Total-Count'] == '2'
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+
+import os
+
+from flask import url_for
+from .util import set_original_response, set_modified_response, wait_for_all_checks
+
+
+def test_conditional_requests(client, live_server, measure_memory_usage, datastore_path):
+    set_original_response(datastore_path=datastore_path)
+    datastore = client.application.config.get('DATASTORE')
+    api_key = datastore.data['settings']['application'].get('api_access_token')
+
+    test_url = url_for('test_conditional_endpoint', _external=True)
+    uuid = datastore.add_watch(url=test_url, extras={'fetch_backend': 'html_requests'})
+    watch = datastore.data['watching'][uuid]
+
+    client.get(url_for("ui.form_watch_checknow"), follow_redirects=True)
+    wait_for_all_checks(client)
+    assert watch.history_n == 1
+    assert os.path.isfile(os.path.join(watch.data_dir, 'last-validators.json'))
+    assert watch.conditional_requests['requests'] == 0
+    watch.reset_watch_edited_flag()
+
+    # Same ETag, 304 Not Modified
+    client.get(url_for("ui.form_watch_checknow"), follow_redirects=True)
+    wait_for_all_checks(client)
+    assert watch.conditional_requests == {'requests': 1, 'not_modified': 1, 'hit_ratio': 1.0}
+    assert watch.history_n == 1
+    assert not watch.get('last_error')
+
+    # New content, new ETag, the full response is processed
+    set_modified_response(datastore_path=datastore_path)
+    client.get(url_for("ui.form_watch_checknow"), follow_redirects=True)
+    wait_for_all_checks(client)
+    assert watch.conditional_requests == {'requests': 2, 'not_modified': 1, 'hit_ratio': 0.5}
+    assert watch.history_n == 2
+
+    res = client.get(url_for("watch", uuid=uuid), headers={'x-api-key': api_key})
+    assert res.json['conditional_requests']['not_modified'] == 1
+    res = client.get(url_for("systeminfo"), headers={'x-api-key': api_key})
+    assert res.json['conditional_requests']['not_modified'] >= 1
+
+    # Edited since the last check, needs the body again
+    watch['title'] = 'Edited'
+    client.get(url_for("ui.form_watch_checknow"), follow_redirects=True)
+    wait_for_all_checks(client)
+    assert watch.conditional_requests['requests'] == 2
+
+    # Checksums cleared (force reprocess), no conditional request either
+    watch.reset_watch_edited_flag()
+    os.unlink(os.path.join(watch.data_dir, 'last-checksum.txt'))
+    client.get(url_for("ui.form_watch_checknow"), follow_redirects=True)
+    wait_for_all_checks(client)
+    assert watch.conditional_requests['requests'] == 2
@@ -106,6 +106,22 @@ def test_rss_and_token(client, live_server, measure_memory_usage, datastore_path
     )
     assert b"Access denied, bad token" not in res.data
     assert b"Random content" in res.data
+    etag = res.headers.get('ETag')
+    assert etag
+    assert res.headers.get('Last-Modified')
+
+    # Unchanged feed, the reader gets a 304 without anything being rendered
+    res = client.get(url_for("rss.feed", token=rss_token, _external=True), headers={'If-None-Match': etag})
+    assert res.status_code == 304
+    assert not res.data
+
+    # Editing the watch changes the ETag
+    client.application.config.get('DATASTORE').data['watching'][uuid].update({'title': 'RSS conditional GET'})
+    client.application.config.get('DATASTORE').data['watching'][uuid].commit()
+    res = client.get(url_for("rss.feed", token=rss_token, _external=True), headers={'If-None-Match': etag})
+    assert res.status_code == 200
+    assert b"RSS conditional GET" in res.data
+    assert res.headers.get('ETag') != etag
 
     delete_all_watches(client)
 
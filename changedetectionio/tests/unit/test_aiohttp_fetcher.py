@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_aiohttp_fetcher
+
+import asyncio
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from changedetectionio.content_fetchers import aiohttp_fetcher
+from changedetectionio.content_fetchers.exceptions import EmptyReply, Non200ErrorCodeReceived, checksumFromPreviousCheckWasTheSame
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def reply(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        port = self.server.server_address[1]
+        if self.path == '/redirect':
+            self.reply(302, headers={'Location': '/cookie', 'Set-Cookie': 'session=abc; Path=/'})
+        elif self.path == '/redirect-private':
+            self.reply(302, headers={'Location': f'http://localhost:{port}/'})
+        elif self.path == '/cookie':
+            self.reply(200, f"cookie={self.headers.get('Cookie')}".encode('utf-8'), {'Content-Type': 'text/plain'})
+        elif self.path == '/latin1':
+            self.reply(200, 'Caf\xe9 cr\xe8me br\xfbl\xe9e, d\xe9j\xe0 vu'.encode('iso-8859-1'), {'Content-Type': 'text/plain; charset=iso-8859-1'})
+        elif self.path == '/xml':
+            self.reply(200, '<?xml version="1.0" encoding="UTF-8"?><rss>caf\xe9</rss>'.encode('utf-8'), {'Content-Type': 'application/rss+xml'})
+        elif self.path == '/empty':
+            self.reply(200)
+        elif self.path == '/not-modified':
+            self.reply(304, headers={'ETag': '"abc"'})
+        elif self.path == '/404':
+            self.reply(404, b'<html>not found</html>', {'Content-Type': 'text/html'})
+        else:
+            self.reply(200, f"<html>{self.command} {self.headers.get('X-Test')}</html>".encode('utf-8'), {'Content-Type': 'text/html; charset=utf-8'})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.reply(200, b'posted=' + body, {'Content-Type': 'text/plain; charset=utf-8'})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAiohttpFetcher(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        patcher = mock.patch.dict(os.environ, {'ALLOW_IANA_RESTRICTED_ADDRESSES': 'true', 'REQUESTS_RETRY_MAX_COUNT': '0'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fetch(self, path, **kwargs):
+        async def _fetch():
+            f = aiohttp_fetcher.fetcher()
+            f.conditional_request = kwargs.pop('conditional_request', False)
+            try:
+                await f.run(url=self.url + path, timeout=5, request_headers=kwargs.pop('request_headers', {}),
+                            request_method=kwargs.pop('request_method', 'GET'), **kwargs)
+            finally:
+                await aiohttp_fetcher.close_sessions()
+            return f
+        return asyncio.run(_fetch())
+
+    def test_fetch(self):
+        f = self.fetch('/', request_headers={'X-Test': 'hello'})
+        self.assertEqual(f.status_code, 200)
+        self.assertEqual(f.content, '<html>GET hello</html>')
+        self.assertEqual(f.raw_content, b'<html>GET hello</html>')
+        self.assertEqual(f.headers.get('content-type'), 'text/html; charset=utf-8')
+
+        f = self.fetch('/', request_method='POST', request_body='a=1')
+        self.assertEqual(f.content, 'posted=a=1')
+
+        f = self.fetch('/', is_binary=True)
+        self.assertEqual(len(f.content), 32, "Binary content is replaced by its md5 checksum")
+
+    def test_encoding_detection(self):
+        self.assertEqual(self.fetch('/latin1').content, 'Caf\xe9 cr\xe8me br\xfbl\xe9e, d\xe9j\xe0 vu')
+        self.assertEqual(self.fetch('/xml').content, '<?xml version="1.0" encoding="UTF-8"?><rss>caf\xe9</rss>')
+
+    def test_errors(self):
+        with self.assertRaises(EmptyReply):
+            self.fetch('/empty')
+        self.assertEqual(self.fetch('/empty', empty_pages_are_a_change=True).content, '')
+
+        with self.assertRaises(Non200ErrorCodeReceived):
+            self.fetch('/404')
+        self.assertEqual(self.fetch('/404', ignore_status_codes=True).status_code, 404)
+
+    def test_not_modified(self):
+        with self.assertRaises(checksumFromPreviousCheckWasTheSame):
+            self.fetch('/not-modified', conditional_request=True)
+        # Without validators sent, a 304 has no body like any other empty reply
+        with self.assertRaises(EmptyReply):
+            self.fetch('/not-modified')
+
+    def test_redirects(self):
+        self.assertEqual(self.fetch('/redirect').content, 'cookie=session=abc', "Cookies set on a redirect are sent to the next hop")
+        self.assertEqual(self.fetch('/cookie').content, 'cookie=None', "Cookies are never shared between fetches")
+
+        os.environ['ALLOW_IANA_RESTRICTED_ADDRESSES'] = 'false'
+        with mock.patch.object(aiohttp_fetcher, 'is_private_hostname', lambda hostname: hostname == 'localhost'):
+            with self.assertRaisesRegex(Exception, 'Redirect blocked'):
+                self.fetch('/redirect-private')
+
+    def test_concurrent_fetches_on_one_loop(self):
+        async def _fetch_many():
+            fetchers = [aiohttp_fetcher.fetcher() for _ in range(50)]
+            try:
+                await asyncio.gather(*[f.run(url=self.url + '/', timeout=5, request_headers={}, request_method='GET') for f in fetchers])
+            finally:
+                await aiohttp_fetcher.close_sessions()
+            return fetchers
+
+        self.assertTrue(all(f.content == '<html>GET None</html>' for f in asyncio.run(_fetch_many())))
+
+
+if __name__ == '__main__':
+    unittest.main()
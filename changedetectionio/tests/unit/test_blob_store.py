@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_blob_store
+
+import os
+import shutil
+import tempfile
+import unittest
+import uuid as uuid_builder
+from unittest import mock
+
+from changedetectionio.model import Watch
+from changedetectionio.model.blob_store import SnapshotBlobStore, get_blob_store, BLOBS_DIRNAME
+
+BIG = "the same page content, bigger than the brotli threshold\n" * 1000
+
+
+class TestSnapshotBlobStore(unittest.TestCase):
+
+    def setUp(self):
+        self.datastore_path = tempfile.mkdtemp()
+        self.env = mock.patch.dict(os.environ, {'SNAPSHOT_DEDUP': 'True'})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        shutil.rmtree(self.datastore_path)
+
+    def new_watch(self):
+        watch = Watch.model(datastore_path=self.datastore_path, __datastore={'settings': {'application': {}}, 'watching': {}}, default={})
+        watch.ensure_data_dir_exists()
+        return watch
+
+    def save(self, watch, timestamp, contents):
+        watch.save_history_blob(contents=contents, timestamp=timestamp, snapshot_id=str(uuid_builder.uuid4()))
+
+    def blobs(self):
+        return sorted(name for _d, _s, names in os.walk(os.path.join(self.datastore_path, BLOBS_DIRNAME)) for name in names)
+
+    def test_identical_snapshots_are_stored_once(self):
+        blob_store = get_blob_store(self.datastore_path)
+        a = self.new_watch()
+        b = self.new_watch()
+
+        self.save(a, 100, BIG)
+        self.save(a, 101, "banner B")
+        self.save(a, 102, BIG)
+        self.save(b, 100, BIG)
+        self.save(b, 101, b"\x89PNG\r\n\x1a\n" + b"\x00" * 64)
+
+        self.assertEqual(len(self.blobs()), 3)
+        self.assertEqual(blob_store.stats['written'], 3)
+        # Both watches point at the same file
+        self.assertTrue(os.path.samefile(a.history['100'], b.history['100']))
+        self.assertEqual(a.history['100'], a.history['102'])
+        self.assertTrue(a.history['100'].endswith('.txt.br'))
+        self.assertEqual(b.get_history_snapshot(timestamp='100'), BIG)
+        self.assertEqual(a.get_history_snapshot(timestamp='101'), "banner B")
+
+        # Trimming must not remove a file a kept entry still uses
+        a.history_trim(newest_n_items=2)
+        self.assertEqual(a.get_history_snapshot(timestamp='102'), BIG)
+        a.history_trim(newest_n_items=1)
+        self.assertEqual(len(self.blobs()), 2)
+        self.assertEqual(a.get_history_snapshot(timestamp='102'), BIG)
+
+        # Still used by b
+        a.clear_watch()
+        self.assertEqual(len(self.blobs()), 2)
+        self.assertEqual(b.get_history_snapshot(timestamp='100'), BIG)
+        b.clear_watch()
+        self.assertEqual(self.blobs(), [])
+
+    def test_restore_and_garbage_collection(self):
+        blob_store = get_blob_store(self.datastore_path)
+        a = self.new_watch()
+        self.save(a, 100, BIG)
+
+        # A backup restored as another watch, a full copy
+        copy_dir = os.path.join(self.datastore_path, str(uuid_builder.uuid4()))
+        shutil.copytree(a.data_dir, copy_dir)
+        snapshot = os.path.basename(a.history['100'])
+        self.assertFalse(os.path.samefile(a.history['100'], os.path.join(copy_dir, snapshot)))
+        self.assertEqual(blob_store.adopt_directory(copy_dir), 1)
+        self.assertTrue(os.path.samefile(a.history['100'], os.path.join(copy_dir, snapshot)))
+
+        # Watch directories removed behind our back
+        names = SnapshotBlobStore.snapshot_names(copy_dir)
+        self.assertEqual(names, [snapshot])
+        shutil.rmtree(copy_dir)
+        shutil.rmtree(a.data_dir)
+        self.assertEqual(blob_store.collect_garbage(), 1)
+        self.assertEqual(self.blobs(), [])
+
+    def test_disabled(self):
+        with mock.patch.dict(os.environ, {'SNAPSHOT_DEDUP': 'False'}):
+            self.assertIsNone(get_blob_store(self.datastore_path))
+            a = self.new_watch()
+            self.save(a, 100, BIG)
+            self.assertFalse(os.path.exists(os.path.join(self.datastore_path, BLOBS_DIRNAME)))
+
+
+if __name__ == '__main__':
+    unittest.main()
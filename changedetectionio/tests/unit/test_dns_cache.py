@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_dns_cache
+
+import os
+import socket
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from changedetectionio import dns_cache as dns_cache_module
+from changedetectionio.dns_cache import BlockedAddressError, DNSCache, resolve_for_connection
+
+
+def addrinfo(*ips):
+    return [(socket.AF_INET6 if ':' in ip else socket.AF_INET, socket.SOCK_STREAM, 6, '', (ip, 0)) for ip in ips]
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestDNSCache(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        self.answers = {'example.com': addrinfo('93.184.215.14', '93.184.215.14', '2606:2800:21f:cb07:6820:80da:af6b:8b2c')}
+        self.calls = []
+        real_getaddrinfo = socket.getaddrinfo
+
+        # This patches the socket module itself, so let urllib3's connection to the pinned IP through
+        def getaddrinfo(host, port, *args, **kwargs):
+            if host[0].isdigit():
+                return real_getaddrinfo(host, port, *args, **kwargs)
+            self.calls.append(host)
+            if host not in self.answers:
+                raise socket.gaierror(socket.EAI_NONAME, 'Name or service not known')
+            return self.answers[host]
+
+        for target, replacement in (('socket.getaddrinfo', getaddrinfo), ('time.monotonic', lambda: self.now)):
+            patcher = mock.patch(f'changedetectionio.dns_cache.{target}', replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.cache = DNSCache(ttl=60, negative_ttl=10, max_entries=2)
+
+    def test_ttl(self):
+        self.assertEqual(self.cache.resolve('example.com'), ('93.184.215.14', '2606:2800:21f:cb07:6820:80da:af6b:8b2c'))
+        self.now += 59
+        self.cache.resolve('example.com')
+        self.assertEqual(self.calls, ['example.com'])
+
+        self.now += 1
+        self.cache.resolve('example.com')
+        self.assertEqual(self.calls, ['example.com', 'example.com'])
+
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['expired']), (1, 2, 1))
+
+    def test_negative_caching(self):
+        for i in range(3):
+            with self.assertRaises(socket.gaierror):
+                self.cache.resolve('nxdomain.example')
+        self.assertEqual(self.calls, ['nxdomain.example'])
+        self.assertEqual(self.cache.get_stats()['negative_hits'], 2)
+
+        self.now += 10
+        self.answers['nxdomain.example'] = addrinfo('93.184.215.15')
+        self.assertEqual(self.cache.resolve('nxdomain.example'), ('93.184.215.15',))
+
+    def test_bounded_size_and_ip_literals(self):
+        self.answers['a.example'] = self.answers['b.example'] = addrinfo('93.184.215.15')
+        self.cache.resolve('example.com')
+        self.cache.resolve('a.example')
+        self.cache.resolve('example.com')
+        self.cache.resolve('b.example')
+        self.assertIsNone(self.cache.get('a.example'), "Least recently used entry is dropped")
+        self.assertIsNotNone(self.cache.get('example.com'))
+        self.assertEqual(self.cache.get_stats()['evictions'], 1)
+
+        self.assertEqual(self.cache.resolve('[::1]'), ('::1',))
+        self.assertEqual(self.cache.resolve('10.0.0.1'), ('10.0.0.1',))
+        self.assertNotIn('10.0.0.1', self.calls, "IP addresses are never looked up")
+
+    def test_rebinding_is_pinned_and_rechecked(self):
+        with mock.patch.object(dns_cache_module, 'dns_cache', self.cache), \
+                mock.patch.dict(os.environ, {'ALLOW_IANA_RESTRICTED_ADDRESSES': 'false'}):
+            self.assertEqual(resolve_for_connection('example.com')[0], '93.184.215.14')
+
+            # Rebound to a private address, connections stay on the validated address until the answer expires
+            self.answers['example.com'] = addrinfo('169.254.169.254')
+            self.assertEqual(resolve_for_connection('example.com')[0], '93.184.215.14')
+
+            self.now += 60
+            with self.assertRaises(BlockedAddressError):
+                resolve_for_connection('example.com')
+
+    def test_requests_connections_use_the_cached_address(self):
+        from changedetectionio.content_fetchers.requests_session_pool import RequestsSessionPool
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        pool = RequestsSessionPool()
+        self.answers['pinned.example'] = addrinfo('127.0.0.1')
+        try:
+            with mock.patch.object(dns_cache_module, 'dns_cache', self.cache), \
+                    mock.patch.dict(os.environ, {'ALLOW_IANA_RESTRICTED_ADDRESSES': 'true', 'REQUESTS_RETRY_MAX_COUNT': '0'}):
+                url = f"http://pinned.example:{server.server_address[1]}/"
+                self.assertEqual(pool.get_session().get(url, timeout=5).text, 'ok')
+                # HTTP/1.0 server, so the second request needs a new connection, resolved from the cache
+                self.assertEqual(pool.get_session().get(url, timeout=5).text, 'ok')
+                self.assertEqual(self.calls, ['pinned.example'])
+
+                os.environ['ALLOW_IANA_RESTRICTED_ADDRESSES'] = 'false'
+                with self.assertRaises(BlockedAddressError):
+                    pool.get_session().get(url, timeout=5)
+        finally:
+            pool.close_all()
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
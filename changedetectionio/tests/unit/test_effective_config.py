@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_effective_config
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from changedetectionio.store import ChangeDetectionStore
+
+
+class TestEffectiveConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.test_datastore_path = tempfile.mkdtemp()
+        self.store = ChangeDetectionStore(datastore_path=self.test_datastore_path, include_default_watches=False)
+        self.tag_uuid = self.store.add_tag('Shops')
+        self.uuid = self.store.add_watch(url='https://example.com', extras={'tags': [self.tag_uuid]})
+
+    def tearDown(self):
+        self.store.stop_thread = True
+        self.store.search_index.stop()
+        shutil.rmtree(self.test_datastore_path)
+
+    def test_built_once_and_invalidated(self):
+        tag = self.store.data['settings']['application']['tags'][self.tag_uuid]
+        tag['include_filters'] = ['.price']
+        tag.commit()
+
+        config = self.store.effective_config.get(self.uuid)
+        self.assertEqual(list(config.tags), [self.tag_uuid])
+        self.assertEqual(self.store.get_tag_overrides_for_watch(self.uuid, 'include_filters'), ['.price'])
+        self.assertIs(self.store.effective_config.get(self.uuid), config)
+
+        # Tag commit
+        tag['include_filters'] = ['.price', '.stock']
+        tag.commit()
+        self.assertEqual(self.store.get_tag_overrides_for_watch(self.uuid, 'include_filters'), ['.price', '.stock'])
+
+        # Watch commit
+        config = self.store.effective_config.get(self.uuid)
+        self.store.data['watching'][self.uuid].commit()
+        self.assertIsNot(self.store.effective_config.get(self.uuid), config)
+
+        # update_watch(), before the write-behind commit
+        config = self.store.effective_config.get(self.uuid)
+        self.store.update_watch(uuid=self.uuid, update_obj={'title': 'Edited'})
+        self.assertIsNot(self.store.effective_config.get(self.uuid), config)
+
+        # Tags changed in memory
+        self.store.data['watching'][self.uuid]['tags'] = []
+        self.assertEqual(self.store.get_all_tags_for_watch(self.uuid), {})
+        self.assertEqual(self.store.get_tag_overrides_for_watch('not-a-watch', 'include_filters'), [])
+
+    def test_header_files_and_proxies(self):
+        watch = self.store.data['watching'][self.uuid]
+        watch.ensure_data_dir_exists()
+        self.assertEqual(self.store.get_all_headers_in_textfile_for_watch(self.uuid), {})
+
+        with open(os.path.join(self.test_datastore_path, 'headers.txt'), 'w') as f:
+            f.write("X-Global: 1\nX-Override: global\n")
+        with open(os.path.join(self.test_datastore_path, 'headers-shops.txt'), 'w') as f:
+            f.write("# comment\nX-Override: tag\n")
+        self.assertEqual(self.store.get_all_headers_in_textfile_for_watch(self.uuid), {'X-Global': '1', 'X-Override': 'tag'})
+
+        with open(os.path.join(watch.data_dir, 'headers.txt'), 'w') as f:
+            f.write("X-Watch: yes\n")
+        self.assertEqual(self.store.get_all_headers_in_textfile_for_watch(self.uuid)['X-Watch'], 'yes')
+
+        self.assertIsNone(self.store.get_preferred_proxy_for_watch(self.uuid))
+        with open(os.path.join(self.test_datastore_path, 'proxies.json'), 'w') as f:
+            json.dump({'proxy-one': {'label': 'One', 'url': 'http://one:3128'},
+                       'proxy-two': {'label': 'Two', 'url': 'http://two:3128'}}, f)
+        self.assertEqual(self.store.get_preferred_proxy_for_watch(self.uuid), 'proxy-one')
+
+        watch['proxy'] = 'proxy-two'
+        self.assertEqual(self.store.get_preferred_proxy_for_watch(self.uuid), 'proxy-two')
+        watch['proxy'] = 'no-proxy'
+        self.assertIsNone(self.store.get_preferred_proxy_for_watch(self.uuid))
+
+        self.store.data['settings']['requests']['proxy'] = 'proxy-two'
+        watch['proxy'] = None
+        self.store.commit()
+        self.assertEqual(self.store.get_preferred_proxy_for_watch(self.uuid), 'proxy-two')
+
+
+if __name__ == '__main__':
+    unittest.main()
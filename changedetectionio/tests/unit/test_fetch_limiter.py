@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_fetch_limiter
+
+import unittest
+
+from changedetectionio.fetch_limiter import FetchLimiter, CONCURRENCY_RETRY_SECONDS
+from changedetectionio.tests.unit.util import FakeDatastore
+
+
+class MockDatastore(FakeDatastore):
+    def __init__(self, requests_settings, proxy_list=None, proxy=None):
+        super().__init__(requests_settings=requests_settings)
+        self.proxy_list = proxy_list
+        self.proxy = proxy
+
+    def get_preferred_proxy_for_watch(self, uuid):
+        return self.proxy
+
+
+class TestFetchLimiter(unittest.TestCase):
+
+    def test_domain_concurrency(self):
+        datastore = MockDatastore({'domain_concurrency_limit': 2})
+        for i, url in enumerate(['https://shop.example.com/1', 'https://SHOP.example.com/2', 'https://shop.example.com/3', 'https://other.com']):
+            datastore.add_model(uuid=str(i), url=url)
+        limiter = FetchLimiter()
+
+        first, _, _ = limiter.acquire_for_watch(datastore, '0', now=100)
+        second, _, _ = limiter.acquire_for_watch(datastore, '1', now=100)
+        blocked, retry_at, key = limiter.acquire_for_watch(datastore, '2', now=100)
+        self.assertIsNone(blocked)
+        self.assertEqual((retry_at, key), (100 + CONCURRENCY_RETRY_SECONDS, 'domain:shop.example.com'))
+        self.assertIsNotNone(limiter.acquire_for_watch(datastore, '3', now=100)[0], "Other domains are not held up")
+
+        self.assertEqual(limiter.release(first), ('domain:shop.example.com',))
+        self.assertIsNotNone(limiter.acquire_for_watch(datastore, '2', now=100)[0])
+        self.assertEqual(limiter.get_stats()['keys']['domain:shop.example.com']['in_flight'], 2)
+        self.assertEqual(limiter.get_stats()['blocked_concurrency'], 1)
+
+    def test_rate_and_proxy_reuse_time(self):
+        proxy_list = {'p1': {'label': 'one', 'url': 'http://p1', 'reuse_time_minimum': 30}}
+        datastore = MockDatastore({'domain_requests_per_minute': 6}, proxy_list=proxy_list, proxy='p1')
+        datastore.add_model(uuid='a', url='https://example.com/a')
+        datastore.add_model(uuid='b', url='https://example.com/b')
+        limiter = FetchLimiter()
+
+        lease, _, _ = limiter.acquire_for_watch(datastore, 'a', now=1000)
+        self.assertEqual(lease.keys, ('domain:example.com', 'proxy:p1'))
+        limiter.release(lease, now=1001)
+
+        # 6/minute = 10s apart for the domain, but the proxy wants 30s
+        self.assertEqual(limiter.acquire_for_watch(datastore, 'b', now=1005)[1:], (1010, 'domain:example.com'))
+        self.assertEqual(limiter.acquire_for_watch(datastore, 'b', now=1010)[1:], (1030, 'proxy:p1'))
+        self.assertIsNotNone(limiter.acquire_for_watch(datastore, 'b', now=1030)[0])
+
+    def test_unlimited_by_default(self):
+        datastore = MockDatastore({'domain_concurrency_limit': None})
+        datastore.add_model(uuid='a', url='https://example.com')
+        limiter = FetchLimiter()
+        leases = [limiter.acquire_for_watch(datastore, 'a')[0] for _ in range(50)]
+        self.assertTrue(all(lease is not None and lease.keys == () for lease in leases))
+        self.assertEqual(limiter.acquire_for_watch(datastore, 'deleted')[0].keys, ())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_history_line_index
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from changedetectionio.model import Watch
+from changedetectionio.model.history_line_index import HistoryLineIndex
+
+
+class TestHistoryLineIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        datastore = {'settings': {'application': {}}, 'watching': {}}
+        self.watch = Watch.model(datastore_path=self.path, __datastore=datastore, default={'url': 'https://example.com'})
+        self.watch.ensure_data_dir_exists()
+
+    def index_path(self, ignore_whitespace=False):
+        return HistoryLineIndex.filename(self.watch.data_dir, ignore_whitespace)
+
+    def test_unique_lines(self):
+        self.watch.save_history_blob(contents="Price 100\n  In stock  \n", timestamp=100, snapshot_id='a')
+        self.watch.save_history_blob(contents="Price 200\n", timestamp=200, snapshot_id='b')
+        self.assertFalse(os.path.isfile(self.index_path()), "Only created once check_unique_lines needs it")
+
+        self.assertFalse(self.watch.lines_contain_something_unique_compared_to_history(['price 100', 'IN STOCK']))
+        self.assertTrue(self.watch.lines_contain_something_unique_compared_to_history(['Price 300']))
+        self.assertTrue(self.watch.lines_contain_something_unique_compared_to_history(['In  stock']))
+        self.assertFalse(self.watch.lines_contain_something_unique_compared_to_history([b'In  stock'], ignore_whitespace=True))
+        self.assertFalse(self.watch.lines_contain_something_unique_compared_to_history([]))
+        self.assertTrue(os.path.isfile(self.index_path()))
+        self.assertTrue(os.path.isfile(self.index_path(ignore_whitespace=True)))
+
+    def test_updated_on_save_and_trim_without_rereading_history(self):
+        self.watch.save_history_blob(contents="one\ntwo\n", timestamp=100, snapshot_id='a')
+        self.watch.save_history_blob(contents="two\nthree\n", timestamp=200, snapshot_id='b')
+        self.assertTrue(self.watch.lines_contain_something_unique_compared_to_history(['four']))
+
+        with mock.patch.object(Watch.model, 'get_history_snapshot', side_effect=AssertionError("History was read")):
+            self.watch.save_history_blob(contents="four\n", timestamp=300, snapshot_id='c')
+            self.assertFalse(self.watch.lines_contain_something_unique_compared_to_history(['four', 'one']))
+
+        # Trimming subtracts the deleted snapshot, lines still in other snapshots are kept
+        self.watch.history_trim(newest_n_items=2)
+        self.assertTrue(self.watch.lines_contain_something_unique_compared_to_history(['one']))
+        self.assertFalse(self.watch.lines_contain_something_unique_compared_to_history(['two', 'three', 'four']))
+        self.assertEqual(HistoryLineIndex.load(self.index_path()).snapshots, {'200', '300'})
+
+    def test_saves_append_to_the_journal(self):
+        self.watch.save_history_blob(contents="one\ntwo\n" * 20, timestamp=100, snapshot_id='a')
+        self.assertFalse(self.watch.lines_contain_something_unique_compared_to_history(['one']))
+        journal = HistoryLineIndex.journal_path(self.index_path())
+        with open(self.index_path(), 'rb') as f:
+            index_data = f.read()
+
+        # The index file itself is not rewritten on save, only once the journal is bigger than it
+        self.watch.save_history_blob(contents="three\n", timestamp=200, snapshot_id='b')
+        with open(self.index_path(), 'rb') as f:
+            self.assertEqual(f.read(), index_data)
+        self.assertTrue(os.path.isfile(journal))
+        self.assertEqual(HistoryLineIndex.load(self.index_path()).snapshots, {'100', '200'})
+        self.assertFalse(self.watch.lines_contain_something_unique_compared_to_history(['three']))
+
+        for n in range(3, 10):
+            self.watch.save_history_blob(contents=f"line {n}\n", timestamp=n * 100, snapshot_id=f"s{n}")
+        with open(self.index_path(), 'rb') as f:
+            self.assertNotEqual(f.read(), index_data, "Journal was compacted into the index")
+        self.assertLessEqual(os.path.getsize(journal) if os.path.isfile(journal) else 0, os.path.getsize(self.index_path()))
+        index = HistoryLineIndex.load(self.index_path())
+        self.assertEqual(len(index.snapshots), 9)
+        self.assertFalse(index.needs_compaction)
+
+        # A torn record at the end, that snapshot is read back from the history
+        self.watch.save_history_blob(contents="ten\n", timestamp=1000, snapshot_id='s10')
+        with open(journal, 'r+b') as f:
+            f.truncate(os.path.getsize(journal) - 3)
+        self.assertFalse(self.watch.lines_contain_something_unique_compared_to_history(['ten']))
+        self.assertFalse(os.path.isfile(journal))
+
+    def test_out_of_sync_index_is_rebuilt(self):
+        self.watch.save_history_blob(contents="one\n", timestamp=100, snapshot_id='a')
+        self.assertFalse(self.watch.lines_contain_something_unique_compared_to_history(['one']))
+
+        # Snapshot replaced behind our back (restored backup etc), the index covers a timestamp that no longer exists
+        with open(os.path.join(self.watch.data_dir, 'history.txt'), 'w') as f:
+            f.write("150,b.txt\n")
+        with open(os.path.join(self.watch.data_dir, 'b.txt'), 'w') as f:
+            f.write("two\n")
+        self.assertTrue(self.watch.lines_contain_something_unique_compared_to_history(['one']))
+        self.assertFalse(self.watch.lines_contain_something_unique_compared_to_history(['two']))
+
+        with open(self.index_path(), 'wb') as f:
+            f.write(b'{"version": 1, "snapshots": ["150"], "lines": 5}\n1234')
+        self.assertIsNone(HistoryLineIndex.load(self.index_path()), "Truncated file is ignored")
+        self.assertFalse(self.watch.lines_contain_something_unique_compared_to_history(['two']))
+
+    def test_clear_watch_removes_index(self):
+        self.watch.save_history_blob(contents="one\n", timestamp=100, snapshot_id='a')
+        self.watch.lines_contain_something_unique_compared_to_history(['one'])
+        self.watch.clear_watch()
+        self.assertFalse(os.path.isfile(self.index_path()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_memory_governor
+
+import threading
+import unittest
+from unittest import mock
+
+from changedetectionio.gc_cleanup import MemoryGovernor
+
+
+class TestMemoryGovernor(unittest.TestCase):
+
+    def governor(self, rss, **kwargs):
+        settings = {'rss_growth_mb': 64, 'rss_limit_mb': 0, 'min_interval': 0, 'max_interval': 3600, **kwargs}
+        with mock.patch.object(MemoryGovernor, '_rss', side_effect=lambda: rss[0]):
+            governor = MemoryGovernor(**settings)
+        governor._rss = lambda: rss[0]
+        return governor
+
+    @mock.patch('changedetectionio.gc_cleanup._malloc_trim')
+    @mock.patch('changedetectionio.gc_cleanup.gc.collect', return_value=0)
+    def test_collects_on_growth_and_limit(self, collect, malloc_trim):
+        rss = [100 * 1024 * 1024]
+        governor = self.governor(rss)
+
+        for _ in range(100):
+            self.assertFalse(governor.maybe_collect())
+        self.assertEqual(collect.call_count, 0)
+
+        rss[0] += 64 * 1024 * 1024
+        self.assertTrue(governor.maybe_collect(reason='test'))
+        self.assertEqual(collect.call_count, 1)
+        self.assertEqual(malloc_trim.call_count, 1)
+        # Measured from the RSS after the collection
+        self.assertFalse(governor.maybe_collect())
+
+        governor = self.governor(rss, rss_limit_mb=150)
+        self.assertTrue(governor.maybe_collect())
+        stats = governor.get_stats()
+        self.assertEqual(stats['collections'], 1)
+        self.assertEqual(stats['checks'], 1)
+        self.assertGreaterEqual(stats['pause_seconds_total'], 0)
+
+    @mock.patch('changedetectionio.gc_cleanup._malloc_trim')
+    @mock.patch('changedetectionio.gc_cleanup.gc.collect', return_value=0)
+    def test_intervals(self, collect, malloc_trim):
+        rss = [500 * 1024 * 1024]
+        governor = self.governor(rss, rss_limit_mb=100, min_interval=60)
+        # Above the limit, but collected too recently
+        self.assertFalse(governor.maybe_collect())
+
+        governor = self.governor(rss, max_interval=0)
+        self.assertTrue(governor.maybe_collect())
+
+    @mock.patch('changedetectionio.gc_cleanup._malloc_trim')
+    def test_one_thread_collects(self, malloc_trim):
+        rss = [100 * 1024 * 1024]
+        governor = self.governor(rss)
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_collect():
+            started.set()
+            release.wait(5)
+            return 0
+
+        with mock.patch('changedetectionio.gc_cleanup.gc.collect', side_effect=slow_collect):
+            t = threading.Thread(target=governor.collect)
+            t.start()
+            started.wait(5)
+            self.assertFalse(governor.collect())
+            release.set()
+            t.join()
+        self.assertEqual(governor.stats['skipped'], 1)
+        self.assertEqual(governor.stats['collections'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
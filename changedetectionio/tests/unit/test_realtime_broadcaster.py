@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_realtime_broadcaster
+
+import unittest
+from unittest import mock
+
+from changedetectionio.realtime.broadcaster import WatchUpdateBroadcaster, ALL_WATCHES_ROOM, watch_room
+
+
+class FakeSocketIO:
+    def __init__(self):
+        self.emitted = []
+
+    def emit(self, event, data, to=None):
+        self.emitted.append((event, data, to))
+
+    def take(self, event=None):
+        emitted = [e for e in self.emitted if event is None or e[0] == event]
+        self.emitted = []
+        return emitted
+
+
+class FakeAggregates:
+    errored_count = 0
+    unread_changes_count = 0
+
+
+class FakeDatastore:
+    def __init__(self):
+        self.data = {'watching': {'a': {'paused': False}, 'b': {'paused': False}}}
+        self.aggregates = FakeAggregates()
+
+
+def fake_watch_data(watch, datastore):
+    return {'paused': watch['paused'], 'event_timestamp': 1}
+
+
+@mock.patch('changedetectionio.realtime.socket_server.get_watch_update_data', fake_watch_data)
+class TestWatchUpdateBroadcaster(unittest.TestCase):
+
+    def setUp(self):
+        self.socketio = FakeSocketIO()
+        self.datastore = FakeDatastore()
+        self.broadcaster = WatchUpdateBroadcaster(self.socketio, self.datastore, interval_seconds=0.25)
+
+    def test_signals_are_coalesced_into_deltas(self):
+        for _ in range(50):
+            self.broadcaster.mark_dirty('a')
+        self.broadcaster.flush()
+        updates = self.socketio.take('watch_update')
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(updates[0][1]['watch'], {'paused': False, 'event_timestamp': 1, 'uuid': 'a'})
+        self.assertEqual(updates[0][2], [watch_room('a'), ALL_WATCHES_ROOM])
+        self.assertEqual(self.broadcaster.stats['coalesced'], 49)
+
+        # Nothing changed, nothing sent
+        self.broadcaster.mark_dirty('a')
+        self.broadcaster.flush()
+        self.assertEqual(self.socketio.take(), [])
+
+        self.datastore.data['watching']['a']['paused'] = True
+        self.broadcaster.mark_dirty('a')
+        self.broadcaster.flush()
+        self.assertEqual(self.socketio.take('watch_update')[0][1]['watch'], {'paused': True, 'uuid': 'a'})
+
+        # A new client gets the complete data again
+        self.broadcaster.client_connected()
+        self.broadcaster.mark_dirty('a')
+        self.broadcaster.flush()
+        self.assertEqual([e[0] for e in self.socketio.take()], ['watch_update', 'general_stats_update'])
+
+    def test_queue_size_and_stats_only_when_changed(self):
+        for length in range(100):
+            self.broadcaster.set_queue_length(length)
+        self.broadcaster.mark_dirty('a')
+        self.broadcaster.flush()
+        self.assertEqual([e[0] for e in self.socketio.emitted], ['queue_size', 'watch_update', 'general_stats_update'])
+        self.assertEqual(self.socketio.take('queue_size')[0][1]['q_length'], 99)
+
+        self.broadcaster.set_queue_length(99)
+        self.broadcaster.mark_dirty('b')
+        self.broadcaster.flush()
+        self.assertEqual([e[0] for e in self.socketio.take()], ['watch_update'])
+
+        self.datastore.aggregates.errored_count = 1
+        self.broadcaster.mark_dirty('b')
+        self.broadcaster.flush()
+        self.assertEqual(self.socketio.take(), [('general_stats_update', {'count_errors': 1, 'unread_changes_count': 0}, None)])
+        self.assertGreater(self.broadcaster.get_stats()['emitted_per_second'], 0)
+
+    def test_deleted_watch_is_forgotten(self):
+        self.broadcaster.mark_dirty('a')
+        self.broadcaster.forget('a')
+        del self.datastore.data['watching']['a']
+        self.broadcaster.mark_dirty('a')
+        self.broadcaster.flush()
+        self.assertEqual(self.socketio.take('watch_update'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_recheck_queue
+
+import asyncio
+import queue
+import random
+import threading
+import time
+import unittest
+
+from changedetectionio.queue_handlers import RecheckPriorityQueue, _SortedKeyIndex
+from changedetectionio.queuedWatchMetaData import PrioritizedItem
+
+
+def item(uuid, priority):
+    return PrioritizedItem(priority=priority, item={'uuid': uuid})
+
+
+class TestRecheckPriorityQueue(unittest.TestCase):
+
+    def test_priority_order_and_positions(self):
+        q = RecheckPriorityQueue()
+        for uuid, priority in (('a', 1700000003), ('b', 1700000001), ('c', 1), ('d', 1700000001)):
+            q.put(item(uuid, priority))
+
+        self.assertTrue(q.is_queued('a'))
+        self.assertNotIn('x', q)
+        self.assertEqual(q.get_uuid_position('a'), {'position': 3, 'total_items': 4, 'priority': 1700000003, 'found': True, 'deferred': False})
+        self.assertEqual(q.get_uuid_position('d')['position'], 1, "Only higher priority items are counted")
+        self.assertFalse(q.get_uuid_position('x')['found'])
+
+        page = q.get_all_queued_uuids(limit=2, offset=1)
+        self.assertEqual([i['uuid'] for i in page['items']], ['b', 'd'], "Same priority is first in, first out")
+        self.assertTrue(page['has_more'])
+        self.assertEqual([i.item['uuid'] for i in q.queue], ['c', 'b', 'd', 'a'])
+
+        self.assertEqual([q.get(block=False).item['uuid'] for _ in range(4)], ['c', 'b', 'd', 'a'])
+        self.assertFalse(q.is_queued('a'))
+        with self.assertRaises(queue.Empty):
+            q.get(block=False)
+
+    def test_queued_uuid_is_reprioritised_not_duplicated(self):
+        q = RecheckPriorityQueue()
+        q.put(item('a', 1700000000))
+        q.put(item('b', 1700000001))
+        q.put(item('b', 1))
+        q.put(item('a', 1800000000))
+        self.assertEqual(q.qsize(), 2)
+        self.assertEqual(q.get_uuid_position('b')['position'], 0, "Recheck moves it to the front")
+        self.assertEqual(q.get_uuid_position('a')['priority'], 1700000000, "Never moved back")
+
+        self.assertTrue(q.reprioritise('b', 1900000000))
+        self.assertEqual(q.get(block=False).item['uuid'], 'a')
+        self.assertFalse(q.reprioritise('a', 1))
+
+    def test_remove(self):
+        q = RecheckPriorityQueue()
+        for i in range(3):
+            q.put(item(str(i), i))
+        self.assertTrue(q.remove('1'))
+        self.assertFalse(q.remove('1'))
+        self.assertEqual(q.get_queued_uuids(), ['0', '2'])
+        self.assertEqual([q.get(block=False).item['uuid'] for _ in range(2)], ['0', '2'])
+        with self.assertRaises(queue.Empty):
+            q.get(block=False)
+
+    def test_async_workers_on_separate_loops_are_woken(self):
+        q = RecheckPriorityQueue()
+        got = []
+
+        def worker():
+            async def run():
+                try:
+                    got.append((await q.async_get(timeout=5)).item['uuid'])
+                except queue.Empty:
+                    got.append(None)
+            asyncio.run(run())
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for t in threads:
+            t.start()
+        deadline = time.time() + 5
+        while len(q._async_waiters) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(q._async_waiters), 3, "Idle workers wait on futures, not executor threads")
+
+        for uuid in ('a', 'b', 'c'):
+            q.put(item(uuid, 1))
+        for t in threads:
+            t.join(5)
+        self.assertEqual(sorted(got), ['a', 'b', 'c'])
+        self.assertEqual(len(q._async_waiters), 0)
+
+    def test_async_get_timeout_and_cancel(self):
+        q = RecheckPriorityQueue()
+
+        async def run():
+            with self.assertRaises(queue.Empty):
+                await q.async_get(timeout=0.05)
+            self.assertEqual(len(q._async_waiters), 0, "Timed out waiter is removed")
+
+            # A cancelled waiter that was already picked by put() hands the wakeup on
+            first = asyncio.ensure_future(q.async_get(timeout=5))
+            second = asyncio.ensure_future(q.async_get(timeout=5))
+            await asyncio.sleep(0.01)
+            q.put(item('a', 1))
+            first.cancel()
+            self.assertEqual((await second).item['uuid'], 'a')
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+
+        asyncio.run(run())
+
+    def test_sync_get_blocks_until_put(self):
+        q = RecheckPriorityQueue()
+        threading.Timer(0.05, lambda: q.put(item('a', 1))).start()
+        self.assertEqual(q.get(timeout=5).item['uuid'], 'a')
+        with self.assertRaises(queue.Empty):
+            q.get(timeout=0.01)
+
+    def test_deferred_items_are_released_one_at_a_time(self):
+        q = RecheckPriorityQueue()
+        for uuid in ('a', 'b', 'c'):
+            q.defer(item(uuid, 1), not_before=time.time() + 3600, wait_key='domain:example.com')
+        q.defer(item('d', 1), not_before=time.time() - 1, wait_key='domain:other.com')
+
+        self.assertEqual(q.qsize(), 4, "Deferred items still count as queued")
+        self.assertTrue(q.is_queued('a'))
+        self.assertTrue(q.get_uuid_position('a')['deferred'])
+        self.assertEqual(q.get_queue_summary()['deferred_by_key'], {'domain:example.com': 3, 'domain:other.com': 1})
+        q.put(item('a', 1))
+        self.assertEqual(q.qsize(), 4, "Not duplicated by queuing it again")
+
+        self.assertEqual(q.get(block=False).item['uuid'], 'd', "Due, so it is back in the queue")
+        with self.assertRaises(queue.Empty):
+            q.get(block=False)
+
+        # A check on example.com finished, only the oldest waiting one goes
+        self.assertEqual(q.wake_deferred(['domain:example.com', 'domain:nothing-waiting.com']), 1)
+        self.assertEqual(q.get(block=False).item['uuid'], 'a')
+        with self.assertRaises(queue.Empty):
+            q.get(block=False)
+
+        q.remove('b')
+        q.wake_deferred(['domain:example.com'])
+        self.assertEqual(q.get(block=False).item['uuid'], 'c', "Removed items are skipped")
+        self.assertEqual(q.qsize(), 0)
+
+    def test_getters_wake_up_for_deferred_items(self):
+        q = RecheckPriorityQueue()
+        q.defer(item('a', 1), not_before=time.time() + 0.1, wait_key='proxy:one')
+        self.assertEqual(q.get(timeout=5).item['uuid'], 'a')
+
+        async def run():
+            q.defer(item('b', 1), not_before=time.time() + 0.1, wait_key='proxy:one')
+            return await q.async_get(timeout=5)
+        self.assertEqual(asyncio.run(run()).item['uuid'], 'b')
+
+    def test_sorted_key_index_matches_sorted_list(self):
+        random.seed(1)
+        index = _SortedKeyIndex()
+        index.LOAD = 4  # Lots of bucket splits and merges
+        expected = []
+        for n in range(3000):
+            if expected and random.random() < 0.4:
+                key = random.choice(expected)
+                expected.remove(key)
+                index.remove(key)
+            else:
+                key = (random.randint(0, 50), n)
+                expected.append(key)
+                index.add(key)
+            if n % 97 == 0:
+                expected.sort()
+                self.assertEqual(list(index), expected)
+                probe = (random.randint(0, 50), -1)
+                self.assertEqual(index.rank(probe), sum(1 for k in expected if k < probe))
+                self.assertEqual(list(index.islice(5, 20)), expected[5:20])
+
+        self.assertEqual(len(index), len(expected))
+        with self.assertRaises(KeyError):
+            index.remove((99, -1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_recheck_scheduler
+
+import unittest
+
+from changedetectionio.recheck_scheduler import RecheckScheduler
+from changedetectionio.tests.unit.util import FakeDatastore
+
+
+class TestRecheckScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.datastore = FakeDatastore(requests_settings={'jitter_seconds': 0, 'time_between_check': {'minutes': 5}})
+        self.scheduler = RecheckScheduler(datastore=self.datastore, recheck_time_minimum_seconds=3, reconcile_interval_seconds=3600)
+
+    def add(self, last_checked, paused=False, minutes=None):
+        default = {'last_checked': last_checked, 'paused': paused, 'time_between_check_use_default': minutes is None}
+        if minutes is not None:
+            default['time_between_check'] = {'minutes': minutes}
+        return self.datastore.add_model(**default)['uuid']
+
+    def pop_all(self, now):
+        popped = []
+        while (uuid := self.scheduler.pop_due(now=now)) is not None:
+            popped.append(uuid)
+        return popped
+
+    def test_most_overdue_first(self):
+        newest = self.add(last_checked=600)
+        oldest = self.add(last_checked=100)
+        not_due = self.add(last_checked=990)
+        self.scheduler.refresh(now=1000)
+
+        self.assertEqual(self.pop_all(now=1000), [oldest, newest])
+        self.assertEqual(self.scheduler.peek_due_time(), 990 + 300)
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertIn(not_due, self.scheduler._due)
+
+    def test_per_watch_threshold_and_minimum(self):
+        own = self.add(last_checked=1000, minutes=1)
+        self.add(last_checked=1000)
+        self.scheduler.refresh(now=1000)
+        self.assertEqual(self.scheduler.peek_due_time(), 1060)
+
+        # Nothing below MINIMUM_SECONDS_RECHECK_TIME
+        self.datastore.data['watching'][own]['time_between_check'] = {'seconds': 0}
+        self.scheduler.mark_dirty(own)
+        self.scheduler.refresh(now=1000)
+        self.assertEqual(self.scheduler.peek_due_time(), 1003)
+
+    def test_incremental_updates(self):
+        uuid = self.add(last_checked=100)
+        self.scheduler.refresh(now=1000)
+        self.assertEqual(self.pop_all(now=1000), [uuid])
+
+        # Checked, signal marks it dirty and it comes back with a new due time
+        self.datastore.data['watching'][uuid]['last_checked'] = 1000
+        self.scheduler.mark_dirty(uuid)
+        self.scheduler.refresh(now=1001)
+        self.assertEqual(self.scheduler.peek_due_time(), 1300)
+
+        # Paused watches are dropped
+        self.datastore.data['watching'][uuid]['paused'] = True
+        self.scheduler.mark_dirty(uuid)
+        self.scheduler.refresh(now=1001)
+        self.assertIsNone(self.scheduler.peek_due_time())
+
+        # Deleted watches too, even when the delete signal was never seen
+        self.datastore.data['watching'][uuid]['paused'] = False
+        self.scheduler.mark_dirty(uuid)
+        self.scheduler.refresh(now=1001)
+        del self.datastore.data['watching'][uuid]
+        self.scheduler.refresh(now=1001)
+        self.assertEqual(len(self.scheduler), 0)
+        self.assertIsNone(self.scheduler.pop_due(now=5000))
+
+    def test_added_without_signal_and_defer(self):
+        self.scheduler.refresh(now=1000)
+        uuid = self.add(last_checked=0)
+        self.scheduler.refresh(now=1000)
+        self.assertEqual(self.scheduler.pop_due(now=1000), uuid)
+
+        self.scheduler.defer(uuid, 1060)
+        self.assertIsNone(self.scheduler.pop_due(now=1059))
+        self.assertEqual(self.scheduler.pop_due(now=1060), uuid)
+
+    def test_global_settings_change_reschedules(self):
+        uuid = self.add(last_checked=1000)
+        self.scheduler.refresh(now=1000)
+        self.assertEqual(self.scheduler.peek_due_time(), 1300)
+
+        self.datastore.data['settings']['requests']['time_between_check'] = {'minutes': 1}
+        self.scheduler.refresh(now=1000)
+        self.assertEqual(self.scheduler.peek_due_time(), 1060)
+        self.assertEqual(self.scheduler.stats['full_reschedules'], 2)
+
+        # Jitter is kept on the watch until it is queued, exactly as the old ticker did
+        self.datastore.data['settings']['requests']['jitter_seconds'] = 10
+        self.scheduler.refresh(now=1000)
+        jitter = self.datastore.data['watching'][uuid].jitter_seconds
+        self.assertTrue(-10 <= jitter <= 10)
+        self.assertAlmostEqual(self.scheduler.peek_due_time(), 1060 + jitter)
+
+
+if __name__ == '__main__':
+    unittest.main()
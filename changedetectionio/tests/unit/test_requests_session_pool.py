@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_requests_session_pool
+
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from changedetectionio.content_fetchers.requests_session_pool import RequestsSessionPool
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/')
+            self.send_header('Set-Cookie', 'session=abc; Path=/')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = f"cookie={self.headers.get('Cookie')}".encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestRequestsSessionPool(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        cls.url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.pool = RequestsSessionPool()
+
+    def tearDown(self):
+        self.pool.close_all()
+
+    def test_connections_are_reused_across_sessions(self):
+        for i in range(3):
+            r = self.pool.get_session(proxies={}).get(self.url + '/', timeout=5)
+            self.assertEqual(r.status_code, 200)
+
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['requests'], 3)
+        self.assertEqual(stats['new_connections'], 1)
+        self.assertEqual(stats['reused_connections'], 2)
+        self.assertEqual(stats['adapters'], 1)
+
+    def test_pools_keyed_by_proxy(self):
+        self.assertIs(self.pool.get_adapter(proxies={}), self.pool.get_adapter(proxies={}))
+        self.assertIsNot(self.pool.get_adapter(proxies={}),
+                         self.pool.get_adapter(proxies={'http': 'http://proxy:3128', 'https': 'http://proxy:3128'}))
+        self.assertEqual(self.pool.get_stats()['adapters'], 2)
+
+    def test_cookies_are_not_shared_between_sessions(self):
+        session = self.pool.get_session(proxies={})
+        r = session.get(self.url + '/redirect', timeout=5)
+        self.assertEqual(r.text, 'cookie=session=abc', "Cookies still follow redirects within one session")
+
+        r = self.pool.get_session(proxies={}).get(self.url + '/', timeout=5)
+        self.assertEqual(r.text, 'cookie=None', "A new session must not see cookies from another check")
+
+    def test_idle_eviction(self):
+        self.pool.get_adapter(proxies={})
+        self.pool.idle_timeout = 0
+        self.pool._evict_idle(now=self.pool._last_eviction_scan + 1)
+        stats = self.pool.get_stats()
+        self.assertEqual(stats['adapters'], 0)
+        self.assertEqual(stats['evicted_adapters'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
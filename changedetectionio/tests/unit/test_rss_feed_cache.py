@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_rss_feed_cache
+
+import unittest
+
+from blinker import signal
+
+from changedetectionio.blueprint.rss._cache import RSSFeedCache
+
+
+class TestRSSFeedCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = RSSFeedCache(max_feeds=2, max_entries=3)
+        self.renders = 0
+
+    def render(self, body='body'):
+        def _render():
+            self.renders += 1
+            return {'body': body, 'change_datetime': 'now'}
+        return _render
+
+    def test_entries_are_memoized(self):
+        self.cache.entry('a', (1, 2, 'label'), self.render())
+        self.cache.entry('a', (1, 2, 'label'), self.render())
+        self.assertEqual(self.renders, 1)
+
+        # A different diff or label is another entry
+        self.cache.entry('a', (2, 3, 'label'), self.render())
+        self.cache.entry('a', (1, 2, 'other label'), self.render())
+        self.assertEqual(self.renders, 3)
+
+        # Least recently used goes first
+        self.cache.entry('b', (1, 2, 'label'), self.render())
+        self.assertEqual(self.cache.get_stats()['entries'], 3)
+        self.cache.entry('a', (1, 2, 'label'), self.render())
+        self.assertEqual(self.renders, 5)
+
+    def test_edited_watch_is_forgotten(self):
+        self.cache.entry('a', (1, 2), self.render())
+        generation = self.cache.watch_generation('a')
+        signal('watch_committed').send(watch_uuid='a')
+        # Not connected yet
+        self.assertEqual(self.cache.watch_generation('a'), generation)
+
+        self.cache.connect_signals()
+        signal('watch_committed').send(watch_uuid='a')
+        self.assertEqual(self.cache.watch_generation('a'), generation + 1)
+        self.cache.entry('a', (1, 2), self.render())
+        self.assertEqual(self.renders, 2)
+
+        signal('watch_deleted').send(watch_uuid='a')
+        self.assertEqual(self.cache.get_stats()['entries'], 0)
+
+    def test_feeds(self):
+        etag = self.cache.feed_etag('main', '', [('a', 1, 2)])
+        self.assertEqual(etag, self.cache.feed_etag('main', '', [('a', 1, 2)]))
+        self.assertNotEqual(etag, self.cache.feed_etag('main', '', [('a', 2, 3)]))
+        # Not the same after a restart
+        self.assertNotEqual(etag, RSSFeedCache().feed_etag('main', '', [('a', 1, 2)]))
+
+        self.assertIsNone(self.cache.get_feed(etag))
+        self.cache.put_feed(etag, b'<rss/>')
+        self.assertEqual(self.cache.get_feed(etag), b'<rss/>')
+        self.cache.put_feed('x', b'')
+        self.cache.put_feed('y', b'')
+        self.assertIsNone(self.cache.get_feed(etag))
+
+
+if __name__ == '__main__':
+    unittest.main()
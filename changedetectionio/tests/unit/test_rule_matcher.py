@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_rule_matcher
+
+import unittest
+
+from changedetectionio import html_tools
+from changedetectionio.model import Watch
+
+CONTENT = """Some Price: 100 EUR
+Out of Stock
+  Last updated 12:00
+İstanbul office
+visitors: 1234 today
+the end"""
+
+
+class TestRuleMatcher(unittest.TestCase):
+
+    def test_same_lines_as_strip_ignore_text(self):
+        wordlist = ['out of stock', 'LAST UPDATED', 'istanbul', '/\\d{4} today/', '/(a)\\1/', '/^the/', '   ', '']
+        matcher = html_tools.compile_wordlist(wordlist)
+        self.assertIs(matcher, html_tools.compile_wordlist(list(wordlist)), "Same list is only compiled once")
+        self.assertEqual(len(matcher.regexes), 2, "Regexes without groups are combined into one")
+
+        self.assertEqual(html_tools.strip_ignore_text(CONTENT, wordlist, mode="line numbers"), [2, 3, 5, 6])
+        self.assertEqual(html_tools.strip_ignore_text(CONTENT, matcher), "Some Price: 100 EUR\nİstanbul office\n")
+
+        # İ lowercases to two characters, the offsets must still line up with the right lines
+        self.assertEqual(html_tools.strip_ignore_text(CONTENT, ['i̇stanbul', 'visitors'], mode="line numbers"), [4, 5])
+
+    def test_terms_dont_match_across_lines(self):
+        self.assertEqual(html_tools.strip_ignore_text("abc\ndef", ["c\nd"], mode="line numbers"), [])
+        self.assertEqual(html_tools.strip_ignore_text("abc\r\ndef", ["c\r"], mode="line numbers"), [1])
+        self.assertEqual(html_tools.strip_ignore_text("abcdef\nab", ["abcd", "ab"], mode="line numbers"), [1, 2])
+
+    def test_compiled_rules_evaluate_all_lists(self):
+        rules = html_tools.CompiledRules(ignore_text=['last updated'], trigger_text=['/price: \\d+/'],
+                                         text_should_not_be_present=['out of stock'])
+        matches = rules.evaluate(CONTENT)
+        self.assertEqual((matches.ignored, matches.triggered, matches.blocked), ({2}, {0}, {1}))
+        self.assertNotIn('Last updated', matches.without_ignored_lines())
+        self.assertEqual(rules.evaluate(CONTENT, ignore=False).ignored, set())
+
+    def test_watch_rules_cache(self):
+        datastore = {'settings': {'application': {}}, 'watching': {}}
+        watch = Watch.model(datastore_path='/tmp', __datastore=datastore, default={})
+        watch.reset_watch_edited_flag()
+
+        rules = watch.compiled_rules(['a'], ['b'], [])
+        self.assertIs(watch.compiled_rules(['a'], ['b'], []), rules)
+        self.assertIsNot(watch.compiled_rules(['a', 'c'], ['b'], []), rules, "Changed (tag/global) rules are recompiled")
+
+        rules = watch.compiled_rules(['a'], ['b'], [])
+        watch['ignore_text'] = ['a']
+        self.assertTrue(watch.was_edited)
+        self.assertIsNot(watch.compiled_rules(['a'], ['b'], []), rules, "Editing the watch drops the compiled rules")
+
+
+if __name__ == '__main__':
+    unittest.main()
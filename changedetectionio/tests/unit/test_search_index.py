@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_search_index
+
+import os
+import tempfile
+import unittest
+
+from blinker import signal
+
+from changedetectionio.store.search_index import WatchSearchIndex, SEARCH_INDEX_FILENAME, fts5_available
+from changedetectionio.tests.unit.util import FakeDatastore
+
+
+@unittest.skipUnless(fts5_available(), "SQLite without FTS5")
+class TestWatchSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.datastore = FakeDatastore(datastore_path=self.tmp.name)
+        self.datastore.add('a', 'https://example.com/shop', title='Example Shop', text='Blue widgets are back in stock')
+        self.datastore.add('b', 'https://example.com/news', last_error='Connection timeout', text='Widgets widgets widgets, all the widgets')
+        self.datastore.add('c', 'https://other.org/', text='Nothing to see')
+        self.index = WatchSearchIndex(self.datastore, interval_seconds=3600)
+
+    def tearDown(self):
+        self.index.stop()
+        self.tmp.cleanup()
+
+    def test_metadata_search(self):
+        self.assertEqual(set(self.index.search('example.com', partial=True)), {'a', 'b'})
+        self.assertEqual(self.index.search('example.com'), [], "Not partial, the whole value has to match")
+        self.assertEqual(self.index.search('https://example.com/news'), ['b'])
+        self.assertEqual(self.index.search('EXAMPLE SHOP'), ['a'])
+        self.assertEqual(self.index.search('timeout', partial=True), ['b'])
+        self.assertEqual(self.index.search('/n', partial=True), ['b'], "Shorter than a trigram")
+        self.assertEqual(self.index.search('100%', partial=True), [])
+
+    def test_content_search_ranked(self):
+        # Nothing read from disk until the background pass
+        self.assertEqual(self.index.search('widgets', content=True), [])
+        while self.index.sync(content_batch=1):
+            pass
+        self.assertEqual(self.index.stats['content_reads'], 3)
+        self.assertEqual(self.index.search('widgets', content=True), ['b', 'a'])
+        self.assertEqual(self.index.search('widg', partial=True, content=True), ['b', 'a'])
+        self.assertEqual(self.index.search('blue widgets', content=True), ['a'])
+        self.assertEqual(self.index.search('"stock" OR', content=True), [], "Query text is never FTS5 syntax")
+
+    def test_updates_from_signals(self):
+        self.index.connect_signals()
+        self.index.sync(content_batch=10)
+
+        watch = self.datastore.data['watching']['c']
+        watch['title'] = 'Gadget tracker'
+        signal('watch_committed').send(watch_uuid='c')
+        self.assertEqual(self.index.search('gadget', partial=True), ['c'])
+
+        # The new text comes with the signal, nothing is read back
+        watch.add_snapshot(2000, 'Gadgets on sale now')
+        signal('watch_snapshot_saved').send(watch_uuid='c', timestamp='2000', contents='Gadgets on sale now')
+        self.assertEqual(self.index.search('sale', content=True), ['c'])
+        self.assertEqual(self.index.search('nothing', content=True), [])
+        self.assertEqual(self.index.stats['content_reads'], 3)
+
+        del self.datastore.data['watching']['a']
+        signal('watch_deleted').send(watch_uuid='a')
+        self.assertEqual(self.index.search('example.com', partial=True), ['b'])
+        self.assertEqual(self.index.search('blue', content=True), [])
+
+    def test_persisted_and_rebuilt(self):
+        self.index.sync(content_batch=10)
+        self.index.stop()
+
+        index = WatchSearchIndex(self.datastore, interval_seconds=3600)
+        self.assertEqual(index.search('blue', content=True), ['a'])
+        self.assertEqual(index.stats['content_reads'], 0, "Already indexed")
+        index.stop()
+
+        with open(os.path.join(self.tmp.name, SEARCH_INDEX_FILENAME), 'wb') as f:
+            f.write(b'not a database' * 100)
+        index = WatchSearchIndex(self.datastore, interval_seconds=3600)
+        self.assertEqual(set(index.search('example', partial=True)), {'a', 'b'})
+        index.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
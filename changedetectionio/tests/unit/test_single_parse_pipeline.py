@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_single_parse_pipeline
+
+import unittest
+
+from changedetectionio import html_tools
+
+TEST_HTML = """<html>
+<head><title>Title</title><style>body { color: red; }</style><script>var x = "<div>not content</div>";</script></head>
+<body style="display:none">
+    <div class="price">Price <b>$10</b></div> text after price
+    <p id="description">Some &amp; description</p>
+    <span class="advert">Buy now</span> text after advert
+    <ul><li>one</li><li>two</li><li>three</li></ul>
+    <svg><path d="M0 0L10 10"/></svg>
+</body>
+</html>
+"""
+
+
+def legacy_filtered_text(include_filters, subtractive_selectors=None):
+    html_content = TEST_HTML
+    if include_filters:
+        filtered = ""
+        for rule in include_filters:
+            if rule[0] == '/' or rule.startswith('xpath:'):
+                filtered += html_tools.xpath_filter(rule.replace('xpath:', ''), TEST_HTML, append_pretty_line_formatting=True)
+            elif rule.startswith('xpath1:'):
+                filtered += html_tools.xpath1_filter(rule.replace('xpath1:', ''), TEST_HTML, append_pretty_line_formatting=True)
+            else:
+                filtered += html_tools.include_filters(rule, TEST_HTML, append_pretty_line_formatting=True)
+        html_content = filtered
+    if subtractive_selectors:
+        html_content = html_tools.element_removal(subtractive_selectors, html_content)
+    return html_tools.html_to_text(html_content)
+
+
+def single_parse_text(include_filters, subtractive_selectors=None):
+    tree = html_tools.html_to_tree(TEST_HTML)
+    if include_filters:
+        tree = html_tools.tree_include_filters(tree, include_filters, append_pretty_line_formatting=True)
+    if subtractive_selectors:
+        html_tools.tree_element_removal(tree, subtractive_selectors)
+    return html_tools.tree_to_text(tree)
+
+
+class TestSingleParsePipeline(unittest.TestCase):
+
+    def test_same_text_as_string_based_filters(self):
+        for include_filters, subtractive_selectors in [
+            ([], []),
+            (['.price'], []),
+            (['li'], []),
+            (['//li'], []),
+            (['xpath1://li'], []),
+            (['li', '#description'], []),
+            (['xpath://li/text()'], []),
+            (['xpath:count(//li)'], []),
+            ([], ['.advert', '//ul']),
+            (['body'], ['span.advert']),
+        ]:
+            with self.subTest(include_filters=include_filters, subtractive_selectors=subtractive_selectors):
+                self.assertEqual(single_parse_text(include_filters, subtractive_selectors),
+                                 legacy_filtered_text(include_filters, subtractive_selectors))
+
+    def test_text_extraction(self):
+        text = single_parse_text([])
+        self.assertIn('Some & description', text)
+        self.assertIn('text after advert', text, "Text following a stripped element must be kept")
+        self.assertNotIn('not content', text, "<script> should be stripped")
+        self.assertNotIn('color: red', text, "<head> should be stripped")
+        self.assertNotIn('Title', text)
+
+    def test_nothing_found(self):
+        tree = html_tools.html_to_tree(TEST_HTML)
+        self.assertIsNone(html_tools.tree_include_filters(tree, ['.does-not-exist', '//nope']))
+        self.assertIsNone(html_tools.html_to_tree("   "))
+        self.assertEqual(html_tools.tree_to_text(None), '')
+
+    def test_shared_tree_is_not_modified_by_include_filters(self):
+        tree = html_tools.html_to_tree(TEST_HTML)
+        filtered = html_tools.tree_include_filters(tree, ['.price'])
+        html_tools.tree_element_removal(filtered, ['b'])
+        self.assertEqual(len(tree.xpath('//div[@class="price"]/b')), 1)
+        self.assertIn('text after price', html_tools.tree_to_html(tree))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_snapshot_cache
+
+import os
+import tempfile
+import unittest
+import uuid as uuid_builder
+from unittest import mock
+
+from changedetectionio.model import Watch
+from changedetectionio.model.snapshot_cache import SnapshotCache, snapshot_cache
+
+
+class TestSnapshotCache(unittest.TestCase):
+
+    def test_byte_bounded_lru(self):
+        cache = SnapshotCache(max_bytes=800)
+        cache.put(('a', 1, 100), 'a' * 100)
+        cache.put(('b', 1, 100), 'b' * 100)
+        self.assertEqual(cache.get(('a', 1, 100)), 'a' * 100)
+        self.assertIsNone(cache.get(('a', 2, 100)))
+
+        # Bigger than an eighth of the cache, never kept
+        cache.put(('huge', 1, 101), 'x' * 101)
+        self.assertIsNone(cache.get(('huge', 1, 101)))
+
+        for i in range(7):
+            cache.put((f"c{i}", 1, 100), 'c' * 100)
+        stats = cache.get_stats()
+        self.assertLessEqual(stats['bytes'], 800)
+        self.assertEqual(stats['evictions'], 1)
+        # 'b' was the least recently used
+        self.assertIsNone(cache.get(('b', 1, 100)))
+        self.assertIsNotNone(cache.get(('a', 1, 100)))
+
+        cache.invalidate_paths(['a.br'])
+        self.assertIsNone(cache.get(('a', 1, 100)))
+        cache.invalidate_dir('c0')
+        self.assertEqual(cache.get_stats()['entries'], 7)
+
+    # Counts reads of plain snapshots, rebuilding a delta also reads the snapshots it builds on
+    @mock.patch.dict(os.environ, {'SNAPSHOT_DELTA': 'False'})
+    def test_watch_snapshots(self):
+        datastore_path = tempfile.mkdtemp()
+        watch = Watch.model(datastore_path=datastore_path, __datastore={'settings': {'application': {}}, 'watching': {}}, default={})
+        watch.ensure_data_dir_exists()
+
+        big = "some text that is bigger than the brotli threshold\n" * 1000
+        for timestamp in (100, 101, 102):
+            watch.save_history_blob(contents=f"{timestamp}\n{big}", timestamp=timestamp, snapshot_id=str(uuid_builder.uuid4()))
+        self.assertTrue(watch.history['100'].endswith('.br'))
+
+        misses = snapshot_cache.stats['misses']
+        hits = snapshot_cache.stats['hits']
+        self.assertTrue(watch.get_history_snapshot(timestamp='102').startswith('102\n'))
+        self.assertTrue(watch.get_history_snapshot(timestamp='102').startswith('102\n'))
+        self.assertEqual(snapshot_cache.stats['misses'], misses + 1)
+        self.assertEqual(snapshot_cache.stats['hits'], hits + 1)
+
+        # Replaced on disk, read again
+        import brotli
+        with open(watch.history['102'], 'wb') as f:
+            f.write(brotli.compress(b"rewritten"))
+        os.utime(watch.history['102'], ns=(0, 0))
+        self.assertEqual(watch.get_history_snapshot(timestamp='102'), 'rewritten')
+
+        def cached_paths():
+            return [key[0] for key in snapshot_cache._entries if key[0].startswith(os.path.join(watch.data_dir, ''))]
+
+        oldest = watch.history['100']
+        watch.get_history_snapshot(timestamp='100')
+        self.assertIn(oldest, cached_paths())
+        watch.history_trim(newest_n_items=2)
+        self.assertEqual(cached_paths(), [watch.history['102']])
+
+        watch.clear_watch()
+        self.assertEqual(cached_paths(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
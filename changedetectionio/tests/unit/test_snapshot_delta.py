@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_snapshot_delta
+
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from changedetectionio.model import Watch
+from changedetectionio.model import snapshot_delta
+from changedetectionio.model.snapshot_cache import snapshot_cache
+
+
+def page(version):
+    lines = [f"Product {i} - in stock, price 1{i}.99\n" for i in range(300)]
+    lines[version % 300] = f"Product {version % 300} - SOLD OUT (version {version})\n"
+    return "".join(lines)
+
+
+class TestSnapshotDelta(unittest.TestCase):
+
+    def setUp(self):
+        self.datastore_path = tempfile.mkdtemp()
+        self.env = mock.patch.dict(os.environ, {'SNAPSHOT_DELTA': 'True', 'SNAPSHOT_DELTA_KEYFRAME_INTERVAL': '4'})
+        self.env.start()
+        snapshot_cache.clear()
+
+    def tearDown(self):
+        self.env.stop()
+        snapshot_cache.clear()
+        shutil.rmtree(self.datastore_path)
+
+    def new_watch(self):
+        watch = Watch.model(datastore_path=self.datastore_path, __datastore={'settings': {'application': {}}, 'watching': {}}, default={})
+        watch.ensure_data_dir_exists()
+        return watch
+
+    def save(self, watch, timestamp, contents):
+        watch.save_history_blob(contents=contents, timestamp=timestamp, snapshot_id=hashlib.md5(contents.encode('utf-8')).hexdigest())
+
+    def test_chain_with_keyframes(self):
+        watch = self.new_watch()
+        for version in range(10):
+            self.save(watch, 100 + version, page(version))
+
+        kinds = ['delta' if snapshot_delta.is_delta(v) else 'keyframe' for v in watch.history.values()]
+        self.assertEqual(kinds, ['keyframe', 'delta', 'delta', 'delta'] * 2 + ['keyframe', 'delta'])
+
+        snapshot_cache.clear()
+        for version in range(10):
+            self.assertEqual(watch.get_history_snapshot(timestamp=str(100 + version)), page(version))
+
+        # Same content as an earlier version, reuses its file
+        self.save(watch, 200, page(2))
+        self.assertEqual(watch.history['200'], watch.history['102'])
+
+        # Nothing in common, a full copy is smaller
+        self.save(watch, 201, "something else entirely\n")
+        self.assertFalse(snapshot_delta.is_delta(watch.history['201']))
+
+    def test_trim_keeps_deltas_readable(self):
+        watch = self.new_watch()
+        for version in range(7):
+            self.save(watch, 100 + version, page(version))
+
+        # 105 and 106 build on the 104 keyframe
+        watch.history_trim(newest_n_items=2)
+        self.assertEqual(list(watch.history.keys()), ['105', '106'])
+        self.assertEqual(len([f for f in os.listdir(watch.data_dir) if f != watch.history_index_filename]), 2)
+        snapshot_cache.clear()
+        self.assertEqual(watch.get_history_snapshot(timestamp='105'), page(5))
+        self.assertEqual(watch.get_history_snapshot(timestamp='106'), page(6))
+        self.assertEqual(snapshot_delta.chain(watch.history['105']), [])
+        self.assertEqual(snapshot_delta.chain(watch.history['106']), [os.path.basename(watch.history['105'])])
+
+    def test_migrate_and_back(self):
+        with mock.patch.dict(os.environ, {'SNAPSHOT_DELTA': 'False'}):
+            watch = self.new_watch()
+            for version in range(6):
+                self.save(watch, 100 + version, page(version))
+        self.assertFalse(any(snapshot_delta.is_delta(v) for v in watch.history.values()))
+
+        before, after = snapshot_delta.migrate_history(watch)
+        self.assertLess(after, before)
+        self.assertEqual(sum(snapshot_delta.is_delta(v) for v in watch.history.values()), 4)
+        snapshot_cache.clear()
+        for version in range(6):
+            self.assertEqual(watch.get_history_snapshot(timestamp=str(100 + version)), page(version))
+
+        # Twice is harmless
+        snapshot_delta.migrate_history(watch)
+        snapshot_delta.migrate_history(watch, to_delta=False)
+        self.assertFalse(any(snapshot_delta.is_delta(v) for v in watch.history.values()))
+        self.assertEqual(len(os.listdir(watch.data_dir)), 7)
+        snapshot_cache.clear()
+        for version in range(6):
+            self.assertEqual(watch.get_history_snapshot(timestamp=str(100 + version)), page(version))
+
+
+if __name__ == '__main__':
+    unittest.main()
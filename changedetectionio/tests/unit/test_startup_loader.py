@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_startup_loader
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from changedetectionio.model import Watch
+from changedetectionio.store import file_saving_datastore
+from changedetectionio.store.file_saving_datastore import load_all_watches, STARTUP_MANIFEST_FILENAME
+
+
+def rehydrate(uuid, data):
+    data['uuid'] = uuid
+    return data
+
+
+class TestStartupLoader(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.path)
+        for i in range(50):
+            self.write_watch(f"uuid-{i:02d}", {'url': f"https://example.com/{i}"})
+
+    def write_watch(self, uuid, data):
+        os.makedirs(os.path.join(self.path, uuid), exist_ok=True)
+        with open(os.path.join(self.path, uuid, 'watch.json'), 'w') as f:
+            json.dump(data, f)
+
+    def test_threaded_matches_sequential(self):
+        with open(os.path.join(self.path, 'uuid-07', 'watch.json'), 'w') as f:
+            f.write('{"url": broken')
+
+        sequential = load_all_watches(self.path, rehydrate, workers=0)
+        threaded = load_all_watches(self.path, rehydrate, workers=4)
+        self.assertEqual(threaded, sequential)
+        self.assertEqual(list(threaded), list(sequential), "Same order as the files were found")
+        self.assertEqual(len(threaded), 49, "Corrupted watch.json is skipped")
+        self.assertEqual(threaded['uuid-03'], {'url': 'https://example.com/3', 'uuid': 'uuid-03'})
+
+    def test_manifest_skips_unchanged_files(self):
+        load_all_watches(self.path, rehydrate, workers=2, use_manifest=True)
+        self.assertTrue(os.path.isfile(os.path.join(self.path, STARTUP_MANIFEST_FILENAME)))
+
+        self.write_watch('uuid-05', {'url': 'https://changed.example.com'})
+        shutil.rmtree(os.path.join(self.path, 'uuid-06'))
+
+        real_read = file_saving_datastore.read_watch_file
+        with mock.patch.object(file_saving_datastore, 'read_watch_file', wraps=real_read) as read, \
+                mock.patch('builtins.open', wraps=open) as opened:
+            watches = load_all_watches(self.path, rehydrate, workers=2, use_manifest=True)
+
+        self.assertEqual(read.call_count, 49)
+        self.assertEqual(watches['uuid-05']['url'], 'https://changed.example.com', "Changed file is read again")
+        self.assertNotIn('uuid-06', watches, "Deleted watch is not resurrected from the manifest")
+        opened_files = [os.path.basename(os.path.dirname(c.args[0])) for c in opened.call_args_list]
+        self.assertEqual(opened_files.count('uuid-05'), 1)
+        self.assertNotIn('uuid-04', opened_files, "Unchanged watch.json is not opened")
+
+        # The manifest was refreshed, so the next boot reads nothing but the manifest
+        with mock.patch('builtins.open', wraps=open) as opened:
+            self.assertEqual(load_all_watches(self.path, rehydrate, use_manifest=True), watches)
+        self.assertEqual([os.path.basename(c.args[0]) for c in opened.call_args_list], [STARTUP_MANIFEST_FILENAME])
+
+    def test_corrupt_manifest_is_ignored(self):
+        with open(os.path.join(self.path, STARTUP_MANIFEST_FILENAME), 'w') as f:
+            f.write('not json')
+        self.assertEqual(len(load_all_watches(self.path, rehydrate, use_manifest=True)), 50)
+
+    def test_history_index_read_on_first_use(self):
+        datastore = {'settings': {'application': {}}, 'watching': {}}
+        watch = Watch.model(datastore_path=self.path, __datastore=datastore, default={'url': 'https://example.com'})
+        watch.ensure_data_dir_exists()
+        with open(os.path.join(watch.data_dir, 'history.txt'), 'w') as f:
+            f.write("100,a.txt\n200,b.txt\n300,c.txt\n")
+
+        with mock.patch('builtins.open', wraps=open) as opened:
+            watch = Watch.model(datastore_path=self.path, __datastore=datastore, default=dict(watch))
+            self.assertEqual(opened.call_count, 0, "Creating the Watch does not read history.txt")
+            self.assertEqual(watch.history_n, 3)
+            self.assertEqual(watch.last_changed, 300)
+            self.assertTrue(watch.has_unviewed)
+            self.assertEqual(opened.call_count, 1)
+
+        # Saving a snapshot before anything read the index still counts the existing ones
+        watch = Watch.model(datastore_path=self.path, __datastore=datastore, default=dict(watch))
+        watch.save_history_blob(contents="hello", timestamp=400, snapshot_id='d')
+        self.assertEqual(watch.history_n, 4)
+        self.assertEqual(list(watch.history), ['100', '200', '300', '400'])
+
+
+if __name__ == '__main__':
+    unittest.main()
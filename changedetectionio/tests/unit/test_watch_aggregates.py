@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_watch_aggregates
+
+import unittest
+
+from blinker import signal
+
+from changedetectionio.store.aggregates import WatchAggregates
+from changedetectionio.store.watch_index import WatchIndex
+from changedetectionio.tests.unit.util import FakeDatastore
+
+
+class TestWatchAggregates(unittest.TestCase):
+
+    def setUp(self):
+        self.datastore = FakeDatastore()
+        self.datastore.add('a', tags=['t1'], last_error='Timeout', unread=True)
+        self.datastore.add('b', tags=['t1', 't2'], unread=True)
+        self.datastore.add('c', processor='restock_diff')
+        self.index = WatchIndex(self.datastore, reconcile_interval_seconds=3600)
+        self.aggregates = WatchAggregates(self.index)
+
+    def test_counts(self):
+        self.assertEqual(self.aggregates.errored_count, 1)
+        self.assertEqual(self.aggregates.unread_changes_count, 2)
+        self.assertEqual(self.aggregates.for_tag('t1'), {'watches': 2, 'errored': 1, 'unread': 2})
+        self.assertEqual(self.aggregates.for_tag('missing'), {'watches': 0, 'errored': 0, 'unread': 0})
+        self.assertEqual(self.aggregates.for_processor('restock_diff')['watches'], 1)
+        self.assertEqual(self.index.stats['full_rebuilds'], 1)
+
+    def test_incremental_updates_from_signals(self):
+        self.index.connect_signals()
+        self.index.refresh()
+
+        watch = self.datastore.data['watching']['a']
+        watch['last_error'] = False
+        watch['tags'] = ['t2']
+        watch.viewed = True
+        # Not seen until the watch signals a change
+        self.assertEqual(self.aggregates.errored_count, 1)
+        signal('watch_check_update').send(watch_uuid='a')
+
+        self.assertEqual(self.aggregates.errored_count, 0)
+        self.assertEqual(self.aggregates.unread_changes_count, 1)
+        self.assertEqual(self.aggregates.for_tag('t1'), {'watches': 1, 'errored': 0, 'unread': 1})
+        self.assertEqual(self.aggregates.for_tag('t2')['watches'], 2)
+
+        del self.datastore.data['watching']['b']
+        signal('watch_deleted').send(watch_uuid='b')
+        self.assertEqual(self.aggregates.get_summary()['by_tag'], {'t2': {'watches': 1, 'errored': 0, 'unread': 0}})
+        self.assertEqual(self.index.stats['full_rebuilds'], 1)
+
+    def test_rebuilds_when_watches_change_without_signals(self):
+        self.index.refresh()
+        self.datastore.add('d', last_error='Oops')
+        self.assertEqual(self.aggregates.errored_count, 2, "Size changed, counted again")
+
+        self.datastore.data['watching'] = {}
+        self.assertEqual(self.aggregates.get_summary()['watches'], 0, "watching replaced, counted again")
+        self.assertEqual(self.index.stats['full_rebuilds'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
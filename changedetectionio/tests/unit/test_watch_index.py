@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_watch_index
+
+import unittest
+
+from blinker import signal
+
+from changedetectionio.store.watch_index import WatchIndex
+from changedetectionio.tests.unit.util import FakeDatastore
+
+
+def jinja_order(datastore, attribute, reverse):
+    """What the template used to do with watches|sort(attribute=..., reverse=...)"""
+    def key(watch):
+        value = getattr(watch, attribute) if attribute in ('label', 'last_changed') else watch.get(attribute)
+        return value.lower() if isinstance(value, str) else value
+    return [w['uuid'] for w in sorted(datastore.data['watching'].values(), key=key, reverse=reverse)]
+
+
+class TestWatchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.datastore = FakeDatastore()
+        self.datastore.add('a', title='zebra', last_changed=300, last_checked=10, tags=['t1'], unread=True)
+        self.datastore.add('b', title='Apple', last_changed=0, last_checked=30, tags=['t1', 't2'], last_error='Timeout')
+        self.datastore.add('c', title='mango', last_changed=100, last_checked=20)
+        self.datastore.add('d', title='banana', last_changed=0, last_checked=30, tags=['t2'], unread=True)
+        self.datastore.add('e', title='cherry', last_changed=300, last_checked=5)
+        self.index = WatchIndex(self.datastore, reconcile_interval_seconds=3600)
+
+    def test_same_order_as_the_template_sort(self):
+        for attribute in ('label', 'last_changed', 'last_checked', 'paused'):
+            for reverse in (True, False):
+                total, uuids = self.index.query(sort_attribute=attribute, reverse=reverse)
+                self.assertEqual(total, 5)
+                self.assertEqual(uuids, jinja_order(self.datastore, attribute, reverse), f"{attribute} reverse={reverse}")
+
+    def test_pages_and_filters(self):
+        expected = jinja_order(self.datastore, 'last_changed', True)
+        self.assertEqual(self.index.query(reverse=True, skip=0, limit=2), (5, expected[:2]))
+        self.assertEqual(self.index.query(reverse=True, skip=2, limit=2), (5, expected[2:4]))
+        self.assertEqual(self.index.query(reverse=True, skip=4, limit=2), (5, expected[4:]))
+        self.assertEqual(self.index.query(reverse=True, skip=10, limit=2), (5, []))
+
+        self.assertEqual(self.index.query(sort_attribute='label', tag_uuids=['t1']), (2, ['b', 'a']))
+        self.assertEqual(self.index.query(sort_attribute='label', tag_uuids=['t1', 't2']), (3, ['b', 'd', 'a']))
+        self.assertEqual(self.index.query(with_errors=True), (1, ['b']))
+        self.assertEqual(self.index.query(sort_attribute='label', unread_only=True, limit=1), (2, ['d']))
+        self.assertEqual(self.index.query(sort_attribute='label', uuids=['c', 'e', 'missing']), (2, ['e', 'c']))
+        self.assertEqual(self.index.query(tag_uuids=['t1'], unread_only=True), (1, ['a']))
+        self.assertEqual(self.index.query(sort_attribute='not_an_attribute', reverse=True, limit=1)[1], expected[:1])
+        self.assertEqual(self.index.tag_members('t2'), {'b', 'd'})
+
+    def test_updates_from_signals(self):
+        self.index.connect_signals()
+        self.index.refresh()
+
+        watch = self.datastore.data['watching']['c']
+        watch['title'] = 'aardvark'
+        watch['last_error'] = 'Oops'
+        watch['tags'] = ['t2']
+        signal('watch_committed').send(watch_uuid='c')
+
+        self.assertEqual(self.index.query(sort_attribute='label', limit=1)[1], ['c'])
+        self.assertEqual(self.index.query(with_errors=True)[0], 2)
+        self.assertEqual(self.index.tag_members('t2'), {'b', 'c', 'd'})
+
+        del self.datastore.data['watching']['b']
+        signal('watch_deleted').send(watch_uuid='b')
+        self.assertEqual(self.index.query(with_errors=True), (1, ['c']))
+        self.assertEqual(self.index.tag_members('t1'), {'a'})
+
+        self.datastore.add('f', title='fig', tags=['t1'])
+        signal('watch_committed').send(watch_uuid='f')
+        self.assertEqual(self.index.query(sort_attribute='label', tag_uuids=['t1']), (2, ['f', 'a']))
+
+        # store.update_watch()
+        self.datastore.data['watching']['f']['last_error'] = 'Timeout'
+        signal('watch_updated').send(watch_uuid='f')
+        self.assertEqual(self.index.query(with_errors=True)[0], 2)
+        self.assertEqual(self.index.stats['full_rebuilds'], 1)
+
+    def test_rebuilds_when_watches_change_without_signals(self):
+        self.index.refresh()
+        self.datastore.add('f', title='fig', last_error='Oops')
+        self.assertEqual(self.index.query(with_errors=True)[0], 2, "Size changed, indexed again")
+
+        self.datastore.data['watching'] = {}
+        self.assertEqual(self.index.query(), (0, []), "watching replaced, indexed again")
+        self.assertEqual(self.index.stats['full_rebuilds'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
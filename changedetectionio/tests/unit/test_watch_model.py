@@ -70,6 +70,43 @@ class TestDiffBuilder(unittest.TestCase):
         p = watch.get_from_version_based_on_last_viewed
         assert p == "100", "Correct with only one history snapshot"
 
+    def test_watch_history_index_cache(self):
+        """The history index is parsed once and kept in sync by save_history_blob() and history_trim()."""
+        import uuid as uuid_builder
+        mock_datastore = {
+            'settings': {
+                'application': {}
+            },
+            'watching': {}
+        }
+        watch = Watch.model(datastore_path='/tmp', __datastore=mock_datastore, default={})
+        watch.ensure_data_dir_exists()
+
+        for t in (100, 105, 109):
+            watch.save_history_blob(contents=f"hello world {t}", timestamp=t, snapshot_id=str(uuid_builder.uuid4()))
+
+        history = watch.history
+        self.assertEqual(list(history.keys()), ['100', '105', '109'])
+        self.assertIs(watch.history, history, "Unchanged index should not be re-read")
+        self.assertEqual(watch.get_history_snapshot(timestamp='105'), "hello world 105")
+
+        # Trim rewrites the cached index without needing to re-parse
+        watch.history_trim(newest_n_items=2)
+        self.assertEqual(list(watch.history.keys()), ['105', '109'])
+        self.assertEqual(watch.history_n, 2)
+        self.assertEqual(watch.newest_history_key, '109')
+
+        # Something else changing the file on disk invalidates the cache
+        index_fname = os.path.join(watch.data_dir, watch.history_index_filename)
+        with open(index_fname, 'a', encoding='utf-8') as f:
+            f.write("200,something.txt\n")
+        self.assertEqual(list(watch.history.keys()), ['105', '109', '200'])
+        self.assertEqual(watch.history['200'], os.path.join(watch.data_dir, 'something.txt'))
+
+        watch.clear_watch()
+        self.assertEqual(watch.history, {})
+        self.assertEqual(watch.history_n, 0)
+
     def test_watch_deepcopy_doesnt_copy_datastore(self):
         """
         CRITICAL: Ensure deepcopy(watch) shares __datastore instead of copying it.
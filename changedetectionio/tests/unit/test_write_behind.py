@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+# run from dir above changedetectionio/ dir
+# python3 -m unittest changedetectionio.tests.unit.test_write_behind
+
+import threading
+import time
+import unittest
+
+from changedetectionio.store.write_behind import WatchWriteBehind
+from changedetectionio.tests.unit.util import FakeDatastore
+
+
+def datastore_with(count):
+    datastore = FakeDatastore()
+    for i in range(count):
+        datastore.add(str(i))
+    return datastore
+
+
+class TestWatchWriteBehind(unittest.TestCase):
+
+    def test_updates_are_coalesced(self):
+        datastore = datastore_with(3)
+        writer = WatchWriteBehind(datastore, interval_seconds=3600)
+        for i in range(5):
+            for uuid in datastore.data['watching']:
+                writer.mark_dirty(uuid)
+
+        self.assertEqual(sum(w.commits for w in datastore.data['watching'].values()), 0, "Nothing is written before the flush")
+        self.assertEqual(writer.flush(), 3)
+        self.assertTrue(all(w.commits == 1 for w in datastore.data['watching'].values()))
+
+        stats = writer.get_stats()
+        self.assertEqual((stats['updates'], stats['coalesced'], stats['writes'], stats['pending']), (15, 12, 3, 0))
+
+    def test_deleted_and_discarded_watches_are_not_written(self):
+        datastore = datastore_with(2)
+        writer = WatchWriteBehind(datastore, interval_seconds=3600)
+        deleted = datastore.data['watching'].pop('0')
+        writer.mark_dirty('0')
+        writer.mark_dirty('1')
+        writer.discard('1')
+        self.assertEqual(writer.flush(), 0)
+        self.assertEqual(deleted.commits, 0)
+
+    def test_background_flush_and_max_dirty(self):
+        datastore = datastore_with(4)
+        writer = WatchWriteBehind(datastore, interval_seconds=3600, max_dirty=4)
+        for uuid in datastore.data['watching']:
+            writer.mark_dirty(uuid)
+
+        # Reaching max_dirty wakes the thread long before the interval
+        deadline = time.time() + 5
+        while writer.get_stats()['writes'] < 4 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(writer.get_stats()['writes'], 4)
+        writer.stop()
+
+    def test_stop_flushes_and_disables(self):
+        datastore = datastore_with(1)
+        writer = WatchWriteBehind(datastore, interval_seconds=3600)
+        writer.mark_dirty('0')
+        self.assertEqual(writer.stop(), 1)
+
+        # After shutdown (and when disabled) updates are written immediately
+        writer.mark_dirty('0')
+        self.assertEqual(datastore.data['watching']['0'].commits, 2)
+        WatchWriteBehind(datastore, interval_seconds=0).mark_dirty('0')
+        self.assertEqual(datastore.data['watching']['0'].commits, 3)
+
+    def test_delete_waits_for_flush_in_progress(self):
+        datastore = datastore_with(1)
+        writer = WatchWriteBehind(datastore, interval_seconds=3600)
+        committing = threading.Event()
+        release = threading.Event()
+
+        def slow_commit():
+            committing.set()
+            release.wait(5)
+        datastore.data['watching']['0'].commit = slow_commit
+
+        writer.mark_dirty('0')
+        threading.Thread(target=writer.flush, daemon=True).start()
+        committing.wait(5)
+
+        acquired = writer.flush_lock.acquire(timeout=0.1)
+        self.assertFalse(acquired, "delete() must not get in while a watch is being written")
+        release.set()
+        self.assertTrue(writer.flush_lock.acquire(timeout=5))
+        writer.flush_lock.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
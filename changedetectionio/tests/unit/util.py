@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+"""
+Fake watches and datastore for the unit tests of the in-memory indexes, caches and schedulers, no Flask app needed.
+"""
+
+from changedetectionio.model import Watch
+
+
+class FakeWatch(dict):
+    """Only what the indexes read from a watch, history_n, viewed and last_changed are set directly"""
+    history_n = 0
+    viewed = False
+    last_changed = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.history = {}
+        self.snapshots = {}
+        self.commits = 0
+
+    @property
+    def label(self):
+        return self.get('title') or self.get('url')
+
+    def add_snapshot(self, timestamp, text):
+        self.history[str(timestamp)] = f"/fake/{timestamp}.txt"
+        self.snapshots[str(timestamp)] = text
+
+    def get_history_snapshot(self, timestamp=None, filepath=None):
+        return self.snapshots[timestamp]
+
+    def commit(self):
+        self.commits += 1
+
+
+class FakeDatastore:
+
+    def __init__(self, datastore_path=None, requests_settings=None):
+        self.datastore_path = datastore_path
+        self.data = {
+            'settings': {'application': {}, 'requests': dict(requests_settings or {})},
+            'watching': {},
+        }
+
+    @property
+    def threshold_seconds(self):
+        time_between_check = self.data['settings']['requests'].get('time_between_check') or {}
+        return sum((time_between_check.get(m) or 0) * n for m, n in Watch.mtable.items())
+
+    def add(self, uuid, url='', title='', tags=(), last_error=False, unread=False, last_changed=0, text=None, **extra):
+        """A FakeWatch, unread=True gives it two snapshots that weren't viewed, text its newest snapshot"""
+        watch = FakeWatch(uuid=uuid, url=url, title=title, tags=list(tags), last_error=last_error,
+                          processor='text_json_diff', paused=False, notification_muted=False, date_created=None,
+                          last_checked=0)
+        watch.update(extra)
+        watch.last_changed = last_changed
+        watch.history_n = 2 if unread else 0
+        if text is not None:
+            watch.add_snapshot(1000, text)
+        self.data['watching'][uuid] = watch
+        return watch
+
+    def add_model(self, uuid=None, **default):
+        """A real model.Watch, for the code that calls its methods"""
+        watch = Watch.model(datastore_path=self.datastore_path or '/tmp', __datastore=self.data, default=default)
+        if uuid is not None:
+            watch['uuid'] = uuid
+        self.data['watching'][watch['uuid']] = watch
+        return watch
@@ -313,6 +313,22 @@ def new_live_server_setup(live_server):
         except FileNotFoundError:
             return make_response('', status_code)
 
+    # Same content as /test-endpoint with an ETag, answers a matching If-None-Match with 304 Not Modified
+    @live_server.app.route('/test-conditional-endpoint')
+    def test_conditional_endpoint():
+        import hashlib
+        with _test_endpoint_content_lock:
+            content_data = _test_endpoint_content.get("endpoint-content.txt")
+        if content_data is None:
+            datastore_path = current_app.config.get('TEST_DATASTORE_PATH', 'test-datastore')
+            with open(os.path.join(datastore_path, "endpoint-content.txt"), "rb") as f:
+                content_data = f.read()
+
+        resp = make_response(content_data, 200)
+        resp.headers['Content-Type'] = 'text/html'
+        resp.set_etag(hashlib.md5(content_data).hexdigest())
+        return resp.make_conditional(request)
+
     # Just return the headers in the request
     @live_server.app.route('/test-headers')
     def test_headers():
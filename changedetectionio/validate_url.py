@@ -1,4 +1,3 @@
-import ipaddress
 import socket
 from functools import lru_cache
 from loguru import logger
@@ -62,13 +61,14 @@ def is_private_hostname(hostname):
     """Return True if hostname resolves to an IANA-restricted (private/reserved) IP address.
 
     Fails closed: unresolvable hostnames return True (block them).
-    Never cached — callers that need fresh DNS resolution (e.g. at fetch time) can call
-    this directly without going through the lru_cached is_safe_valid_url().
+    Lookups go through the TTL cache in dns_cache.py, the fetchers connect to those same cached (and re-checked)
+    addresses, so a rebound DNS answer can't slip in between this check and the connection.
     """
+    from changedetectionio.dns_cache import dns_cache, is_private_ip
+
     try:
-        for info in socket.getaddrinfo(hostname, None):
-            ip = ipaddress.ip_address(info[4][0])
-            if ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved:
+        for ip in dns_cache.resolve(hostname):
+            if is_private_ip(ip):
                 return True
     except socket.gaierror:
         return True
@@ -4,6 +4,7 @@ import changedetectionio.content_fetchers.exceptions as content_fetchers_excepti
 from changedetectionio.processors.text_json_diff.processor import FilterNotFoundInResponse
 from changedetectionio import html_tools
 from changedetectionio import worker_pool
+from changedetectionio.fetch_limiter import fetch_limiter
 from changedetectionio.queuedWatchMetaData import PrioritizedItem
 from changedetectionio.pluggy_interface import apply_update_handler_alter, apply_update_finalize
 
@@ -30,7 +31,7 @@ async def async_update_worker(worker_id, q, notification_q, app, datastore, exec
         notification_q: Standard queue for notifications
         app: Flask application instance
         datastore: Application datastore
-        executor: ThreadPoolExecutor for queue operations (optional)
+        executor: ThreadPoolExecutor for run_changedetection() (optional)
 
     Returns:
         "restart" if worker should restart, "shutdown" for clean exit
@@ -56,13 +57,12 @@ async def async_update_worker(worker_id, q, notification_q, app, datastore, exec
         update_handler = None
         watch = None
         processing_exception = None  # Reset at start of each iteration to prevent state bleeding
+        fetch_lease = None
 
         try:
-            # Efficient blocking via run_in_executor (no polling overhead!)
-            # Worker blocks in threading.Queue.get() which uses Condition.wait()
-            # Executor must be sized to match worker count (see worker_pool.py: 50 threads default)
-            # Single timeout (no double-timeout wrapper) = no race condition
-            queued_item_data = await q.async_get(executor=executor, timeout=1.0)
+            # Waits on a future of this worker's own loop, put() wakes it via call_soon_threadsafe()
+            # No executor thread is held while idle, the timeout only lets us look at app.config.exit
+            queued_item_data = await q.async_get(timeout=1.0)
 
             # CRITICAL: Claim UUID immediately after getting from queue to prevent race condition
             # in wait_for_all_checks() which checks qsize() and running_uuids separately
@@ -76,6 +76,15 @@ async def async_update_worker(worker_id, q, notification_q, app, datastore, exec
                 worker_pool.queue_item_async_safe(q, deferred_item, silent=True)
                 continue
 
+            # Per domain / per proxy limits, if this one can't start yet give it back and take the next one
+            fetch_lease, retry_at, blocked_by = fetch_limiter.acquire_for_watch(datastore, uuid)
+            if fetch_lease is None:
+                logger.debug(f"Worker {worker_id} deferring UUID {uuid}, limit reached for {blocked_by}")
+                # Back in the queue before letting go of the UUID, so wait_for_all_checks() never sees neither
+                q.defer(queued_item_data, not_before=retry_at, wait_key=blocked_by)
+                worker_pool.release_uuid_from_processing(uuid, worker_id)
+                continue
+
         except asyncio.TimeoutError:
             # No jobs available - check if we should restart based on time while idle
             runtime = time.time() - start_time
@@ -496,10 +505,6 @@ async def async_update_worker(worker_id, q, notification_q, app, datastore, exec
                         del update_handler
                         update_handler = None
 
-                # Force garbage collection
-                import gc
-                gc.collect()
-
         except Exception as e:
             # Store the processing exception for plugin finalization hook
             processing_exception = e
@@ -542,9 +547,9 @@ async def async_update_worker(worker_id, q, notification_q, app, datastore, exec
                     if 'contents' in locals():
                         del contents
 
-                    # Force garbage collection after all references are cleared
-                    import gc
-                    gc.collect()
+                    # Full collection only when memory grew enough, see gc_cleanup.MemoryGovernor
+                    from changedetectionio.gc_cleanup import memory_governor
+                    memory_governor.maybe_collect(reason='check')
 
                     logger.debug(f"Worker {worker_id} completed watch {uuid} in {time.time()-fetch_start_time:.2f}s")
                 except Exception as cleanup_error:
@@ -568,6 +573,12 @@ async def async_update_worker(worker_id, q, notification_q, app, datastore, exec
                     del finalize_handler
                     del finalize_watch
 
+                # Free the domain/proxy slot and let the next watch waiting on it go
+                try:
+                    q.wake_deferred(fetch_limiter.release(fetch_lease))
+                except Exception as limiter_error:
+                    logger.error(f"Worker {worker_id} error releasing fetch limits: {limiter_error}")
+
                 # Release UUID from processing AFTER all cleanup and hooks complete (thread-safe)
                 # This ensures wait_for_all_checks() waits for finalize hooks to complete
                 try:
@@ -22,11 +22,10 @@ _uuid_processing_lock = threading.Lock()  # Protects currently_processing_uuids
 # Configuration - async workers only
 USE_ASYNC_WORKERS = True
 
-# Custom ThreadPoolExecutor for queue operations with named threads
-# Scale executor threads to match FETCH_WORKERS (no minimum, no maximum)
+# Custom ThreadPoolExecutor for the CPU bound run_changedetection() step with named threads
+# Idle workers don't hold one of these, RecheckPriorityQueue.async_get() waits on a future of the worker's own loop
+# Scale executor threads to match FETCH_WORKERS (no minimum, no maximum), threads are only started when needed
 # Thread naming: "QueueGetter-N" for easy debugging in thread dumps/traces
-# With FETCH_WORKERS=10: 10 workers + 10 executor threads = 20 threads total
-# With FETCH_WORKERS=500: 500 workers + 500 executor threads = 1000 threads total (acceptable on modern systems)
 _max_executor_workers = int(os.getenv("FETCH_WORKERS", "10"))
 queue_executor = ThreadPoolExecutor(
     max_workers=_max_executor_workers,
@@ -80,6 +79,12 @@ class WorkerThread:
         finally:
             # Clean up
             if self.loop and not self.loop.is_closed():
+                # Close the keep-alive connections the async HTTP fetcher may have opened on this loop
+                try:
+                    from changedetectionio.content_fetchers.aiohttp_fetcher import close_sessions
+                    self.loop.run_until_complete(close_sessions())
+                except Exception as e:
+                    logger.debug(f"Worker {self.worker_id} could not close async HTTP sessions: {e}")
                 self.loop.close()
             self.running = False
             self.loop = None